@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vectorized catalog filtering vs. a SQLite scan
+
+Fills a throwaway catalog with synthetic recipe rows, builds its memory-mapped
+columns, then times the same diet/intolerance/ready-time/calorie filters as
+a NumPy mask and as the equivalent SQLite query.
+
+Usage:
+    python benchmarks/catalog_filter.py --rows 300000 --rounds 20
+"""
+
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from recipe_catalog import (RecipeCatalog, DIETS, INTOLERANCES, DIET_BITS, INTOLERANCE_BITS,
+                            INFO_KNOWN, INGREDIENTS_KNOWN)
+from catalog_columns import CatalogColumns
+
+FILTERS = [
+    {"diet": "vegetarian"},
+    {"diet": "vegan", "intolerances": ["soy"], "max_ready_time": 30},
+    {"intolerances": ["dairy", "gluten"], "max_calories": 600},
+    {"diet": "ketogenic", "min_calories": 300, "max_calories": 800},
+    {"max_ready_time": 60}
+]
+
+
+def fill(path, rows, seed):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO recipes (id, title, ready_in_minutes, servings, calories, likes, flags,"
+            " complete, payload, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            ((i, f"recipe {i}", rng.choice([None, rng.randint(5, 180)]), rng.randint(1, 8),
+              rng.choice([None, rng.uniform(80, 1200)]), rng.randint(0, 5000),
+              INFO_KNOWN | INGREDIENTS_KNOWN
+              | sum(DIET_BITS[d] for d in DIETS if rng.random() < 0.2)
+              | sum(INTOLERANCE_BITS[t] for t in INTOLERANCES if rng.random() < 0.15),
+              int(rng.random() < 0.5), b"", time.time())
+             for i in range(1, rows + 1))
+        )
+    conn.close()
+
+
+def sql_count(conn, diet=None, intolerances=None, max_ready_time=None, min_calories=None, max_calories=None):
+    required, forbidden = RecipeCatalog.filter_masks(diet, intolerances)
+    conditions, args = ["(flags & ?) = ?", "(flags & ?) = 0"], [required, required, forbidden]
+    if max_ready_time:
+        conditions.append("ready_in_minutes IS NOT NULL AND ready_in_minutes <= ?")
+        args.append(max_ready_time)
+    if min_calories:
+        conditions.append("calories IS NOT NULL AND calories >= ?")
+        args.append(min_calories)
+    if max_calories:
+        conditions.append("calories IS NOT NULL AND calories <= ?")
+        args.append(max_calories)
+    return conn.execute(f"SELECT COUNT(*) FROM recipes WHERE {' AND '.join(conditions)}", args).fetchone()[0]
+
+
+def summarize(label, samples):
+    print(f"{label:<8} n={len(samples):<4} mean={statistics.mean(samples):8.2f}ms  "
+          f"p50={statistics.median(samples):8.2f}ms  max={max(samples):8.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=300000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        catalog = RecipeCatalog(os.path.join(directory, "catalog.db"))
+        fill(catalog.path, args.rows, args.seed)
+        columns = CatalogColumns(catalog)
+
+        started = time.perf_counter()
+        columns.columns()
+        print(f"built {args.rows} rows of columns in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+        conn = sqlite3.connect(catalog.path)
+        vectorized, scanned = [], []
+        for _ in range(args.rounds):
+            for filters in FILTERS:
+                started = time.perf_counter()
+                matches = int(columns.mask(**filters).sum())
+                vectorized.append((time.perf_counter() - started) * 1000)
+                started = time.perf_counter()
+                expected = sql_count(conn, **filters)
+                scanned.append((time.perf_counter() - started) * 1000)
+                assert matches == expected, (filters, matches, expected)
+        conn.close()
+
+        summarize("numpy", vectorized)
+        summarize("sqlite", scanned)
+
+
+if __name__ == "__main__":
+    main()
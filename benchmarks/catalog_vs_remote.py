@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: local recipe catalog search vs. upstream complexSearch
+
+Warms a throwaway catalog by running a set of queries against the local stub
+server (with simulated upstream latency), then times the same queries
+answered upstream and from the catalog.
+
+Usage:
+    python benchmarks/catalog_vs_remote.py --latency-ms 250 --jitter-ms 100 --rounds 5
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.environ.setdefault("SPOONACULAR_API_KEY", "benchmark-key")
+
+from api_client import SpoonacularClient
+from recipe_catalog import RecipeCatalog
+from stub_server import StubServer
+
+QUERIES = ["chicken", "pasta", "tomato soup", "garlic", "salmon", "tofu", "spinach salad",
+           "mushroom risotto", "beef", "lemon", "rice bowl", "broccoli"]
+
+
+def timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    fn(*args, **kwargs)
+    return (time.perf_counter() - started) * 1000
+
+
+def summarize(label, samples):
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    print(f"{label:<10} n={len(samples):<4} mean={statistics.mean(samples):8.2f}ms  "
+          f"p50={statistics.median(samples):8.2f}ms  p95={p95:8.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency-ms", type=float, default=250.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--number", type=int, default=12)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory, \
+            StubServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms) as stub:
+        catalog = RecipeCatalog(os.path.join(directory, "catalog.db"))
+        client = SpoonacularClient(base_url=stub.base_url, enable_cache=False, enable_throttle=False,
+                                   batch_window=0, catalog=catalog)
+
+        remote = []
+        for _ in range(args.rounds):
+            for query in QUERIES:
+                remote.append(timed(client.search_recipes, query, number=args.number))
+
+        local = []
+        upstream_before = stub.counters["requests"]
+        for _ in range(args.rounds):
+            for query in QUERIES:
+                local.append(timed(client.search_recipes, query, number=args.number, offline_first=True))
+
+        summarize("remote", remote)
+        summarize("catalog", local)
+        print(f"upstream calls during catalog runs: {stub.counters['requests'] - upstream_before}")
+        print(f"catalog: {catalog.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: dad-joke ingredient matching for /random-recipe
+
+Times JokeMatcher.match over synthetic recipe texts against the previous
+per-keyword substring scan, then repeats the matcher run with the corpus
+padded to thousands of extra entries to show its cost does not grow with
+corpus size.
+
+Usage:
+    python benchmarks/dad_jokes.py --recipes 500 --extra-entries 5000
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from dad_jokes import (JOKES, JokeMatcher, INGREDIENT_JOKES, INGREDIENT_PRIORITIES, CATEGORY_TERMS,
+                       recipe_text)
+from stub_server import synthetic_recipe
+
+
+def substring_scan(text, priorities, jokes):
+    """The previous approach: one `in` scan of the text per keyword, then the categories."""
+    for ingredient in priorities:
+        if ingredient in text and ingredient in jokes:
+            return ingredient
+    for label, _, terms in CATEGORY_TERMS:
+        if any(term in text for term in terms):
+            return label
+    return "general"
+
+
+def time_per_recipe(fn, texts, rounds):
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for text in texts:
+            fn(text)
+        samples.append((time.perf_counter() - started) * 1e6 / len(texts))
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--recipes", type=int, default=500)
+    parser.add_argument("--extra-entries", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    texts = [recipe_text(synthetic_recipe(100000 + i)) for i in range(args.recipes)]
+    lowered = [text.lower() for text in texts]
+
+    # Pad the corpus with made-up ingredients that never occur in the recipes,
+    # ranked above the real ones so the substring scan has to try them all
+    extra = [f"zzingredient{i}" for i in range(args.extra_entries)]
+    big_jokes = dict(INGREDIENT_JOKES, **{name: [f"A joke about {name}"] for name in extra})
+    big_priorities = extra + INGREDIENT_PRIORITIES
+    big = JokeMatcher(big_jokes, big_priorities, CATEGORY_TERMS)
+
+    started = time.perf_counter()
+    JokeMatcher(big_jokes, big_priorities, CATEGORY_TERMS)
+    print(f"compiling {len(big_jokes)} entries took {(time.perf_counter() - started) * 1000:.1f}ms (once per process)")
+
+    mismatches = sum(JOKES.match(text)[0] != big.match(text)[0] for text in texts)
+    print(f"padded corpus changed {mismatches} of {len(texts)} matches")
+
+    rows = [
+        ("substring scan", len(INGREDIENT_JOKES),
+         time_per_recipe(lambda t: substring_scan(t, INGREDIENT_PRIORITIES, INGREDIENT_JOKES), lowered, args.rounds)),
+        ("substring scan", len(big_jokes),
+         time_per_recipe(lambda t: substring_scan(t, big_priorities, big_jokes), lowered, args.rounds)),
+        ("matcher", len(INGREDIENT_JOKES), time_per_recipe(JOKES.match, texts, args.rounds)),
+        ("matcher", len(big_jokes), time_per_recipe(big.match, texts, args.rounds)),
+    ]
+    for label, entries, micros in rows:
+        print(f"{label:<15} entries={entries:<6} {micros:9.1f}us/recipe")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: meal plan nutrition totals, per-meal dicts vs. one NumPy matrix
+
+Totals synthetic week-long meal plans two ways: the dict approach (one
+parse_nutrition_data call per meal, amounts scaled and merged into per-day
+dicts) and MealPlanNutrition (a recipes x nutrients matrix scaled and summed
+with vectorized operations), then times a cached repeat of the same plan.
+Nutrition payloads are served from memory, so only aggregation is measured.
+
+Usage:
+    python benchmarks/meal_nutrition.py --plans 200 --meals 28
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from data_parser import parse_nutrition_data
+from meal_nutrition import MealPlanNutrition, NUTRIENTS
+from stub_server import synthetic_nutrition
+
+
+def dict_totals(meals, payloads):
+    """The per-meal approach: parse each payload and merge amounts into day dicts."""
+    daily = [dict.fromkeys((name.lower() for name, _, _ in NUTRIENTS), 0.0) for _ in range(7)]
+    for recipe_id, day, servings in meals:
+        nutrients = parse_nutrition_data(payloads[recipe_id])["nutrients"]
+        for name, totals in nutrients.items():
+            if name in daily[day]:
+                daily[day][name] += totals["amount"] * servings
+    weekly = {name: sum(day[name] for day in daily) for name in daily[0]}
+    return daily, weekly
+
+
+def median_ms(fn, plans, rounds):
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for plan in plans:
+            fn(plan)
+        samples.append((time.perf_counter() - started) * 1000 / len(plans))
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--plans", type=int, default=200)
+    parser.add_argument("--meals", type=int, default=28, help="meals per plan (4 a day for a week)")
+    parser.add_argument("--recipes", type=int, default=500, help="distinct recipes to draw meals from")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    recipe_ids = list(range(300000, 300000 + args.recipes))
+    payloads = {recipe_id: synthetic_nutrition(recipe_id) for recipe_id in recipe_ids}
+    plans = [[(rng.choice(recipe_ids), meal % 7, rng.randint(1, 4)) for meal in range(args.meals)]
+             for _ in range(args.plans)]
+
+    def fetch(ids):
+        return {recipe_id: {"id": recipe_id, "nutrition": payloads[recipe_id]} for recipe_id in ids}
+
+    cached = MealPlanNutrition(fetch, max_plans=args.plans)
+    numbered = list(enumerate(plans))
+    for plan_id, plan in numbered:
+        cached.summarize(plan_id, plan)
+    # max_plans=0 keeps recipe rows but recomputes every plan's totals
+    uncached = MealPlanNutrition(fetch, max_plans=0)
+    for plan in plans:
+        uncached.summarize(None, plan)
+
+    rows = [
+        ("per-meal dicts", median_ms(lambda plan: dict_totals(plan, payloads), plans, args.rounds)),
+        ("matrix, uncached plan", median_ms(lambda plan: uncached.summarize(None, plan), plans, args.rounds)),
+        ("matrix, cached plan", median_ms(lambda item: cached.summarize(*item), numbered, args.rounds)),
+    ]
+    for label, millis in rows:
+        print(f"{label:<24} {millis * 1000:8.1f}us/plan ({args.meals} meals)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: recipe-name extraction from Guardian articles
+
+Extracts recipe names from synthetic Guardian articles (the stub server's
+titles and previews) with the previous per-call implementation, which built
+and ran one pattern per food keyword, and with the precompiled single-scan
+extract_recipes_from_text, checking that both give the same names. Then runs
+extract_recipe_names_batch inline and across a process pool.
+
+Usage:
+    python benchmarks/news_extraction.py --articles 5000 --processes 4
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from news_parser import FOOD_KEYWORDS, article_recipe_names, extract_recipe_names_batch
+from stub_server import StubServer
+
+
+def legacy_extract_recipes_from_text(text, food_keywords=FOOD_KEYWORDS):
+    """The previous NewsParser._extract_recipes_from_text, kept as a baseline."""
+    recipes = []
+    pattern1 = r'\b(?:best|perfect|ultimate|easy|simple)\s+([a-zA-Z\s]+?)\s+recipe\b'
+    matches1 = re.findall(pattern1, text, re.IGNORECASE)
+    pattern2 = r'\b([a-zA-Z\s]+?)\s+recipe\b'
+    matches2 = re.findall(pattern2, text, re.IGNORECASE)
+    for keyword in food_keywords:
+        if keyword in text:
+            pattern = rf'\b([a-zA-Z\s]*{keyword}[a-zA-Z\s]*)\b'
+            matches = re.findall(pattern, text, re.IGNORECASE)
+            recipes.extend([match.strip() for match in matches if len(match.strip()) > 3])
+    cleaned_recipes = []
+    for recipe in matches1 + matches2 + recipes:
+        recipe = recipe.strip()
+        if len(recipe) > 2 and recipe not in ['the', 'and', 'or', 'for', 'with']:
+            cleaned_recipes.append(recipe.title())
+    return cleaned_recipes[:3]
+
+
+def legacy_article_recipe_names(article):
+    return (legacy_extract_recipes_from_text(article.get("title", "").lower())
+            + legacy_extract_recipes_from_text(article.get("preview", "").lower()))
+
+
+def guardian_articles(count):
+    """Parsed articles (title and preview) from the stub's Guardian generator."""
+    server = StubServer()
+    try:
+        return [{"title": raw["webTitle"], "preview": raw["fields"]["trailText"]}
+                for raw in (server.guardian_article(index, ["trailText"]) for index in range(count))]
+    finally:
+        server.server_close()
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    articles = guardian_articles(args.articles)
+    legacy, legacy_seconds = timed(lambda: [legacy_article_recipe_names(a) for a in articles])
+    single, single_seconds = timed(lambda: [article_recipe_names(a) for a in articles])
+    pooled, pooled_seconds = timed(lambda: extract_recipe_names_batch(articles, processes=args.processes))
+    assert legacy == single == pooled, "extraction results differ"
+
+    per_article = lambda seconds: seconds * 1e6 / len(articles)
+    print(f"{len(articles)} articles, identical names from all three")
+    print(f"per-keyword patterns      {per_article(legacy_seconds):7.1f}us/article")
+    print(f"single scan               {per_article(single_seconds):7.1f}us/article "
+          f"({legacy_seconds / single_seconds:.1f}x)")
+    print(f"process pool ({args.processes} workers)  {per_article(pooled_seconds):7.1f}us/article "
+          f"(includes pool start-up)")
+
+
+if __name__ == "__main__":
+    main()
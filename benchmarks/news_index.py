@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: matching news to recipes with the in-memory index
+
+Fills an article store with the stub's synthetic Guardian articles, builds
+a NewsIndex over it, and times related-news lookups for synthetic recipes
+(title plus ingredients) against an FTS5 query on the same store, then an
+incremental refresh after a batch of new articles.
+
+Usage:
+    python benchmarks/news_index.py --articles 5000 --recipes 500
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from article_store import ArticleStore
+from data_parser import parse_recipe_record
+from news_index import NewsIndex
+from stub_server import StubServer, synthetic_recipe
+
+
+def percentiles_us(fn, items):
+    samples = []
+    for item in items:
+        started = time.perf_counter()
+        fn(item)
+        samples.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(0.99 * (len(samples) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--recipes", type=int, default=500)
+    parser.add_argument("--new", type=int, default=50, help="articles added before the incremental refresh")
+    args = parser.parse_args()
+
+    stub = StubServer()
+    try:
+        def article(index):
+            raw = stub.guardian_article(index, ["thumbnail", "trailText"])
+            return {"id": raw["id"], "title": raw["webTitle"], "url": raw["webUrl"],
+                    "preview": raw["fields"]["trailText"], "thumbnail": raw["fields"]["thumbnail"],
+                    "published_at": raw["webPublicationDate"]}
+        corpus = [article(index) for index in range(args.articles + args.new)]
+    finally:
+        stub.server_close()
+    recipes = [parse_recipe_record(synthetic_recipe(700000 + i)) for i in range(args.recipes)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ArticleStore(os.path.join(directory, "articles.db"))
+        store.upsert(corpus[:args.articles])
+        index = NewsIndex(store)
+        started = time.perf_counter()
+        index.refresh()
+        build_ms = (time.perf_counter() - started) * 1000
+
+        matched = percentiles_us(lambda recipe: index.match_recipe(recipe), recipes)
+        fts = percentiles_us(lambda recipe: store.search(",".join(
+            [recipe.title] + [i.name for i in recipe.ingredients]), 3), recipes)
+
+        store.upsert(corpus[args.articles:])
+        started = time.perf_counter()
+        index.refresh()
+        refresh_ms = (time.perf_counter() - started) * 1000
+        stats = index.stats()
+
+    print(f"index: {stats['articles']} articles, {stats['terms']} terms, {stats['postings']} postings; "
+          f"built in {build_ms:.0f}ms, +{args.new} articles in {refresh_ms:.1f}ms")
+    print(f"in-memory BM25 match  p50 {matched[0]:7.1f}us  p99 {matched[1]:7.1f}us")
+    print(f"FTS5 OR query         p50 {fts[0]:7.1f}us  p99 {fts[1]:7.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Guardian news searches from page views vs. a locally ingested store
+
+Replays news searches (one per recipe page view, for a handful of dish
+queries) against the stub Guardian API, first straight upstream and then
+through a NewsParser backed by an ArticleStore kept current by an
+ArticleIngestor. Reports upstream requests and time per view, and the cost
+of an ingestion run with nothing new published.
+
+Usage:
+    python benchmarks/news_ingestion.py --views 200 --backfill-days 30
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from article_store import ArticleStore
+from news_parser import ArticleIngestor, NewsParser
+from response_cache import TieredCache
+from stub_server import DISHES, StubServer
+
+
+def replay(parser, queries):
+    started = time.perf_counter()
+    for query in queries:
+        parser.fetch_food_news(query, page_size=3)
+    return (time.perf_counter() - started) * 1000 / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--views", type=int, default=200)
+    parser.add_argument("--backfill-days", type=float, default=30)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    queries = [rng.choice(DISHES).lower() for _ in range(args.views)]
+    with StubServer() as stub, tempfile.TemporaryDirectory() as directory:
+        upstream = NewsParser("test-key", base_url=stub.guardian_url, cache=TieredCache())
+        upstream_ms = replay(upstream, queries)
+        upstream_requests = stub.counters["requests"]
+
+        store = ArticleStore(os.path.join(directory, "articles.db"))
+        local = NewsParser("test-key", base_url=stub.guardian_url, cache=TieredCache(), store=store)
+        ingestor = ArticleIngestor(local, store, query="recipe", page_size=200, max_pages=100,
+                                   backfill_days=args.backfill_days)
+        before = stub.counters["requests"]
+        new, _ = ingestor.run_once()
+        backfill_requests = stub.counters["requests"] - before
+
+        before = stub.counters["requests"]
+        local_ms = replay(local, queries)
+        local_requests = stub.counters["requests"] - before
+
+        before = stub.counters["requests"]
+        ingestor.run_once()
+        rerun_requests = stub.counters["requests"] - before
+
+    print(f"{args.views} views over {len(set(queries))} queries")
+    print(f"upstream every view   {upstream_requests:5d} requests  {upstream_ms:7.2f}ms/view")
+    print(f"local store           {local_requests:5d} requests  {local_ms:7.2f}ms/view "
+          f"(hit rate {store.stats()['local_hits'] / args.views:.0%})")
+    print(f"backfill: {new} articles in {backfill_requests} requests; "
+          f"next run with nothing new: {rerun_requests} request(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Guardian article list with and without article bodies
+
+Fetches the popular-articles list from the stub Guardian API once with
+show-fields=thumbnail,trailText,body (as list fetches used to) and once
+without body, then reports the payload size and the time to decode and parse
+each with NewsParser._parse_articles, plus one on-demand body lookup.
+
+Usage:
+    python benchmarks/news_list_payload.py --page-size 20 --rounds 200
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from news_parser import NewsParser
+from response_cache import TieredCache
+from stub_server import StubServer
+
+
+def median_us(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    with StubServer() as stub:
+        news = NewsParser("test-key", base_url=stub.guardian_url, cache=TieredCache())
+        params = {"q": "recipes", "order-by": "newest", "page-size": args.page_size}
+        for label, fields in (("with bodies", "thumbnail,trailText,body"), ("without bodies", "thumbnail,trailText")):
+            raw = requests.get(news.search_url, params=dict(params, **{"show-fields": fields})).content
+            parse = lambda: news._parse_articles(json.loads(raw)["response"]["results"])
+            print(f"{label:<16} {len(raw) / 1024:8.1f}KiB  decode+parse {median_us(parse, args.rounds):8.1f}us")
+
+        article_id = news.fetch_food_news("recipe", page_size=1)[0]["id"]
+        first = median_us(lambda: news.get_article_body(article_id), 1)
+        cached = median_us(lambda: news.get_article_body(article_id), args.rounds)
+        print(f"one body on demand: {first / 1000:.1f}ms fetched, {cached:.1f}us cached")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memoized vs. fresh recipe parsing for repeated page views
+
+Replays a skewed stream of recipe page views (a few hot recipes, a long
+tail), handing each view a freshly decoded payload as the response cache
+does, and compares parse_recipe_record on every view with ParseMemo.
+Reports time per view, hit ratio and the memo's approximate memory.
+
+Usage:
+    python benchmarks/parse_memo.py --views 20000 --recipes 2000 --memo-size 512
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from data_parser import parse_recipe_record
+from parse_memo import ParseMemo
+from stub_server import synthetic_recipe
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--views", type=int, default=20000)
+    parser.add_argument("--recipes", type=int, default=2000)
+    parser.add_argument("--memo-size", type=int, default=512)
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of recipe popularity")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    encoded = [json.dumps(synthetic_recipe(600000 + i)) for i in range(args.recipes)]
+    weights = [1 / (rank + 1) ** args.skew for rank in range(args.recipes)]
+    # Decode up front so only parsing is timed
+    views = [json.loads(encoded[i]) for i in rng.choices(range(args.recipes), weights, k=args.views)]
+
+    def median_us(make_parse):
+        """Median time per view; make_parse() gives each round a fresh parser."""
+        samples = []
+        for _ in range(args.rounds):
+            parse = make_parse()
+            started = time.perf_counter()
+            for payload in views:
+                parse(payload)
+            samples.append((time.perf_counter() - started) * 1e6 / args.views)
+        return statistics.median(samples)
+
+    memos = []
+
+    def fresh_memo():
+        # A fresh memo per round, so every round pays its cold misses
+        memos.append(ParseMemo(max_entries=args.memo_size))
+        return memos[-1].parse
+
+    plain = median_us(lambda: parse_recipe_record)
+    memoized = median_us(fresh_memo)
+
+    stats = memos[-1].stats()
+    print(f"parse every view  {plain:6.1f}us/view")
+    print(f"memoized          {memoized:6.1f}us/view  hit rate {stats['hit_rate']:.1%}  "
+          f"{stats['entries']} records, {stats['bytes'] / 1024:,.0f}KiB")
+
+
+if __name__ == "__main__":
+    main()
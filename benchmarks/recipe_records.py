@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: slotted recipe records vs. parsed dicts
+
+Parses synthetic recipe payloads both ways, then compares the memory each
+parsed recipe holds (what a cache of parsed recipes pays per entry), parse
+time, and JSON serialization time: dicts through the stdlib json module (the
+previous jsonify path) vs. records through json_backend.
+
+Usage:
+    python benchmarks/recipe_records.py --recipes 2000 --rounds 5
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import json_backend
+from data_parser import parse_recipe_details, parse_recipe_record
+from stub_server import synthetic_recipe
+
+
+def retained_bytes(parse, payloads):
+    """Bytes allocated by parsing, kept alive by the parsed objects."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    parsed = [parse(payload) for payload in payloads]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del parsed
+    return after - before
+
+
+def median_us(fn, items, rounds):
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for item in items:
+            fn(item)
+        samples.append((time.perf_counter() - started) * 1e6 / len(items))
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--recipes", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = [synthetic_recipe(200000 + i) for i in range(args.recipes)]
+    dicts = [parse_recipe_details(payload) for payload in payloads]
+    records = [parse_recipe_record(payload) for payload in payloads]
+    assert all(record.to_dict() == parsed for record, parsed in zip(records, dicts))
+
+    dict_bytes = retained_bytes(parse_recipe_details, payloads) / args.recipes
+    record_bytes = retained_bytes(parse_recipe_record, payloads) / args.recipes
+    print(f"memory per parsed recipe: dict {dict_bytes:,.0f}B  record {record_bytes:,.0f}B  "
+          f"saved {dict_bytes - record_bytes:,.0f}B ({1 - record_bytes / dict_bytes:.0%})")
+
+    rows = [
+        ("parse dict", median_us(parse_recipe_details, payloads, args.rounds)),
+        ("parse record", median_us(parse_recipe_record, payloads, args.rounds)),
+        ("json.dumps(dict)", median_us(lambda d: json.dumps(d, sort_keys=True), dicts, args.rounds)),
+        (f"{json_backend.BACKEND} dumps(record)", median_us(json_backend.dumps, records, args.rounds)),
+        ("record round trip", median_us(lambda r: type(r).from_json(r.to_json()), records, args.rounds)),
+    ]
+    baseline = rows[2][1]
+    for label, micros in rows:
+        note = f"  ({baseline / micros:.1f}x vs json.dumps(dict))" if "dumps" in label else ""
+        print(f"{label:<22} {micros:8.1f}us/recipe{note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streamed vs. whole-body parsing of large bulk responses
+
+Fetches a /recipes/informationBulk page from the local stub server (run as
+a subprocess, so only the client's memory is traced) over a bandwidth-limited
+link, once with response.json() (the body is downloaded and parsed whole)
+and once with SpoonacularClient.iter_recipe_information_bulk (each recipe is
+parsed as it arrives). Reports time to the first recipe,
+total time, and peak memory of parsing (tracemalloc) for each.
+
+Usage:
+    python benchmarks/streaming_parse.py --recipes 100 --bytes-per-second 2000000
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import subprocess
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.environ.setdefault("SPOONACULAR_API_KEY", "benchmark-key")
+
+from api_client import SpoonacularClient
+
+STUB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "stub_server.py")
+
+
+def start_stub(bytes_per_second):
+    """Start the stub server in a subprocess; returns (process, base_url)."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    process = subprocess.Popen([sys.executable, STUB, "--port", str(port),
+                                "--bytes-per-second", str(bytes_per_second)],
+                               stdout=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    return process, f"http://127.0.0.1:{port}"
+
+
+def measure(consume):
+    """Run consume(on_first) and return (first_seconds, total_seconds, peak_bytes)."""
+    first = []
+    tracemalloc.start()
+    started = time.perf_counter()
+    consume(lambda: first or first.append(time.perf_counter() - started))
+    total = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return first[0], total, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--recipes", type=int, default=100, help="recipes per bulk request (max 100)")
+    parser.add_argument("--bytes-per-second", type=float, default=2_000_000, help="stub bandwidth (0 = unthrottled)")
+    parser.add_argument("--nutrition", action="store_true", help="include nutrition (larger payloads)")
+    args = parser.parse_args()
+
+    ids = list(range(500000, 500000 + min(args.recipes, SpoonacularClient.BULK_MAX_IDS)))
+    params = {"ids": ",".join(map(str, ids)), "includeNutrition": args.nutrition}
+
+    process, base_url = start_stub(args.bytes_per_second)
+    try:
+        client = SpoonacularClient(base_url=base_url, enable_cache=False, enable_throttle=False,
+                                   enable_catalog=False, batch_window=0, random_pool_size=0)
+
+        def whole(on_first):
+            for recipe in client._open_response("/recipes/informationBulk", params).json():
+                on_first()
+                recipe["id"]
+
+        def streamed(on_first):
+            for recipe in client.iter_recipe_information_bulk(ids, args.nutrition):
+                on_first()
+                recipe["id"]
+
+        body = len(client._open_response("/recipes/informationBulk", params).content)
+        bandwidth = f"{args.bytes_per_second / 1e6:g}MB/s" if args.bytes_per_second else "unthrottled"
+        print(f"{len(ids)} recipes, {body / 1024:,.0f}KiB body, bandwidth {bandwidth}")
+        for label, consume in (("response.json()", whole), ("streamed", streamed)):
+            first, total, peak = measure(consume)
+            print(f"{label:<16} first recipe {first * 1000:8.1f}ms  all {total * 1000:8.1f}ms  "
+                  f"peak memory {peak / 1024:8,.0f}KiB")
+        client.close()
+    finally:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: trending-ingredient snapshots per ingestion run
+
+Replays ingestion of the stub's synthetic Guardian articles, oldest first,
+in batches (one batch per ingestion run) into an article store. After every
+run it takes a TrendingIngredients snapshot, which counts only the new batch
+into a bounded Space-Saving sketch, and separately recomputes the exact
+decayed counts by rescanning the whole store, as a snapshot would without
+the sketch. Reports time per run for both and how many of the exact top
+ingredients the sketch's snapshot agrees on.
+
+Usage:
+    python benchmarks/trending_ingredients.py --articles 5000 --batch 50 --capacity 64
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from article_store import ArticleStore
+from stub_server import StubServer
+from trending_ingredients import TrendingIngredients, article_ingredients, published_timestamp
+
+
+def exact_top(store, half_life, top):
+    """Exact decayed ingredient counts over every stored article."""
+    now = time.time()
+    counts = Counter()
+    for _, article in store.since(0):
+        weight = 2.0 ** ((published_timestamp(article, now) - now) / half_life)
+        for ingredient in article_ingredients(article):
+            counts[ingredient] += weight
+    return [ingredient for ingredient, _ in counts.most_common(top)], len(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=50, help="articles per ingestion run")
+    parser.add_argument("--capacity", type=int, default=64, help="sketch counters")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--half-life-days", type=float, default=3.0)
+    args = parser.parse_args()
+
+    stub = StubServer()
+    try:
+        def article(index):
+            raw = stub.guardian_article(index, ["thumbnail", "trailText"])
+            return {"id": raw["id"], "title": raw["webTitle"], "url": raw["webUrl"],
+                    "preview": raw["fields"]["trailText"], "thumbnail": raw["fields"]["thumbnail"],
+                    "published_at": raw["webPublicationDate"]}
+        # Index 0 is the newest: ingest oldest first, as ArticleIngestor does
+        corpus = [article(index) for index in reversed(range(args.articles))]
+    finally:
+        stub.server_close()
+    half_life = args.half_life_days * 24 * 60 * 60
+
+    sketch_us, rescan_us, agreement = [], [], []
+    with tempfile.TemporaryDirectory() as directory:
+        store = ArticleStore(os.path.join(directory, "articles.db"))
+        trending = TrendingIngredients(store, capacity=args.capacity, half_life=half_life, top=args.top)
+        for start in range(0, len(corpus), args.batch):
+            store.upsert(corpus[start:start + args.batch])
+            started = time.perf_counter()
+            snapshot = trending.update()
+            sketch_us.append((time.perf_counter() - started) * 1e6)
+            started = time.perf_counter()
+            exact, distinct = exact_top(store, half_life, args.top)
+            rescan_us.append((time.perf_counter() - started) * 1e6)
+            agreement.append(len(set(exact) & {entry["ingredient"] for entry in snapshot["top"]}) / len(exact))
+        stats = trending.stats()
+
+    runs = len(sketch_us)
+    print(f"{runs} ingestion runs of {args.batch} articles; {distinct} distinct ingredients, "
+          f"{stats['counters']}/{stats['capacity']} counters, {stats['evictions']} evictions")
+    print(f"sketch snapshot (new batch only)  median {statistics.median(sketch_us):8.0f}us  "
+          f"last {sketch_us[-1]:8.0f}us")
+    print(f"exact rescan of the store         median {statistics.median(rescan_us):8.0f}us  "
+          f"last {rescan_us[-1]:8.0f}us ({rescan_us[-1] / sketch_us[-1]:.0f}x)")
+    print(f"top-{args.top} agreement with exact counts: mean {statistics.mean(agreement):.0%}, "
+          f"final run {agreement[-1]:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,9 +13,14 @@ Flow:
 6. Repeat or quit
 """
 
+import os
 import sys
+
+# The src modules import each other by bare module name, as they do under Flask
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
 from src.api_client import SpoonacularClient
-from src.data_parser import parse_recipe_search_results, parse_recipe_details, format_recipe_display
+from src.data_parser import parse_recipe_search_results, parse_recipe_details, format_recipe_display, SEARCH_RESULT_FIELDS
 from typing import List, Optional
 
 def get_valid_number(prompt: str, min_val: int, max_val: int) -> int:
@@ -130,7 +135,7 @@ def main():
             try:
                 # Search for recipes using the API client
                 print("\nSearching for recipes...")
-                search_results = client.search_recipes(query)
+                search_results = client.search_recipes(query, fields=SEARCH_RESULT_FIELDS)
                 recipes = parse_recipe_search_results(search_results)
                 
                 # Handle case where no recipes are found
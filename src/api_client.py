@@ -3,33 +3,184 @@ Spoonacular API Client Module
 
 This module provides a client for interacting with the Spoonacular API.
 It handles all direct communication with the API, including:
-- API key management
-- Request handling
-- Error handling
-- Response validation
+- API key management and request handling over a pooled session, with
+  timeouts and backoff on 429/5xx responses
+- Error handling and response validation
+- Spending the daily point budget sparingly (see quota.py): identical
+  concurrent requests are coalesced, responses are cached per endpoint and
+  served stale while they refresh (see response_cache.py), and recipe
+  lookups are micro-batched into bulk requests (see recipe_batcher.py)
+- Keeping every recipe it receives in a local catalog (see recipe_catalog.py)
+  that can answer searches and random draws without an upstream call
 
-The client uses environment variables for secure API key storage and
-implements proper error handling for API requests.
+Use get_shared_client() for the process-wide client the web app shares.
 """
 
 import os
+import re
+import time
+import random
+import logging
+import threading
+import itertools
+from collections import deque
+from email.utils import parsedate_to_datetime
 import requests
-from typing import Dict, Optional, Any, List
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, Optional, Any, Iterable, Iterator, List, Tuple
 from dotenv import load_dotenv
 
+from single_flight import SingleFlight
+from response_cache import TieredCache, StaleWhileRevalidate
+from quota import QuotaThrottle, QuotaExhaustedError, background_priority, estimate_point_cost
+from recipe_batcher import MissingRecipeError, RecipeBatcher
+from recipe_catalog import RecipeCatalog
+from catalog_columns import CatalogColumns
+from random_pool import RandomRecipePool
+from record_replay import mount_transport
+from json_stream import JSONArrayStream
+from meal_nutrition import MealPlanNutrition
+from parse_memo import ParseMemo
+from data_parser import parse_recipe_record
+from recipe_models import RecipeDetail
+
 # Load API key from environment variables
 load_dotenv()
 
-class SpoonacularClient:
+logger = logging.getLogger(__name__)
+
+# Status codes that are worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Parameters that never change the response and must not leak into keys
+_UNKEYED_PARAMS = frozenset({"apiKey"})
+
+# Comma-separated parameters whose item order does not matter upstream
+_LIST_PARAMS = frozenset({"intolerances", "tags", "ingredients", "ids"})
+
+# Free-text parameters that Spoonacular matches case-insensitively
+_CASE_INSENSITIVE_PARAMS = frozenset({"query", "food", "diet", "intolerances", "tags", "ingredients"})
+
+
+def canonical_request_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
     """
-    Client for interacting with the Spoonacular API.
+    Build a stable identity for an API request.
     
-    This class encapsulates all API interaction logic, providing a clean interface
-    for searching recipes and getting detailed recipe information.
+    The key is the same for requests that Spoonacular answers identically:
+    the API key is dropped, parameters are sorted, booleans are spelled
+    consistently, free text is trimmed and lower-cased, and list-valued
+    parameters are sorted. Unlike hash(), the result is identical across
+    processes, so it can be shared between workers.
+    
+    Args:
+        endpoint (str): API endpoint (e.g., "/recipes/complexSearch")
+        params (Dict[str, Any], optional): Query parameters
+        
+    Returns:
+        str: Canonical key such as "/food/wine/pairing?food=steak"
+    """
+    parts = []
+    for name in sorted(params or {}):
+        if name in _UNKEYED_PARAMS:
+            continue
+        value = params[name]
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        elif isinstance(value, (list, tuple, set)):
+            value = ",".join(str(item) for item in value)
+        value = str(value).strip()
+        if name in _CASE_INSENSITIVE_PARAMS:
+            value = value.lower()
+        if name in _LIST_PARAMS:
+            value = ",".join(sorted(item.strip() for item in value.split(",") if item.strip()))
+        parts.append(f"{name}={value}")
+    return f"{endpoint}?{'&'.join(parts)}" if parts else endpoint
+
+
+class EndpointLatencyTracker:
+    """
+    Thread-safe per-endpoint latency statistics.
+    
+    Recipe ids are collapsed out of the endpoint path so that e.g.
+    /recipes/123/information and /recipes/456/information are reported together.
+    Only the most recent ``window`` samples per endpoint are kept for percentiles.
+    """
+    
+    _ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+    
+    def __init__(self, window: int = 512):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, deque] = {}
+        self._totals: Dict[str, Dict[str, float]] = {}
+    
+    @classmethod
+    def normalize(cls, endpoint: str) -> str:
+        """Collapse numeric path segments into an {id} placeholder."""
+        return cls._ID_SEGMENT.sub("/{id}", endpoint)
+    
+    def record(self, endpoint: str, seconds: float, error: bool = False) -> None:
+        """Record one upstream attempt for an endpoint."""
+        key = self.normalize(endpoint)
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+                self._totals[key] = {"count": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            samples.append(seconds)
+            totals = self._totals[key]
+            totals["count"] += 1
+            totals["total_seconds"] += seconds
+            totals["max_seconds"] = max(totals["max_seconds"], seconds)
+            if error:
+                totals["errors"] += 1
+    
+    @staticmethod
+    def _percentile_ms(ordered: List[float], p: float) -> float:
+        """Nearest-rank percentile of sorted samples, in milliseconds."""
+        index = min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))
+        return round(ordered[index] * 1000, 2)
+    
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get a copy of the current statistics.
+        
+        Returns:
+            Dict[str, Dict[str, float]]: Per-endpoint count, errors, and
+                average/p50/p95/max latency in milliseconds
+        """
+        with self._lock:
+            items = [(key, sorted(samples), dict(self._totals[key])) for key, samples in self._samples.items()]
+        
+        stats = {}
+        for key, ordered, totals in items:
+            stats[key] = {
+                "count": totals["count"],
+                "errors": totals["errors"],
+                "avg_ms": round(totals["total_seconds"] / totals["count"] * 1000, 2),
+                "p50_ms": self._percentile_ms(ordered, 0.50),
+                "p95_ms": self._percentile_ms(ordered, 0.95),
+                "max_ms": round(totals["max_seconds"] * 1000, 2)
+            }
+        return stats
+
+
+class BaseSpoonacularClient:
+    """
+    Shared configuration, validation and request building for Spoonacular clients.
+    
+    Both the blocking SpoonacularClient and the asyncio AsyncSpoonacularClient
+    (see async_api_client.py) build identical endpoints and parameters from
+    this class, so the two stay interchangeable; subclasses only provide the
+    transport.
     
     Attributes:
-        BASE_URL (str): Base URL for all Spoonacular API endpoints
+        BASE_URL (str): Default base URL for all Spoonacular API endpoints
+        base_url (str): Base URL this client sends requests to
         api_key (str): API key loaded from environment variables
+        timeout (Tuple[float, float]): Connect and read timeouts in seconds
     """
     
     BASE_URL = "https://api.spoonacular.com"
@@ -53,9 +204,57 @@ class SpoonacularClient:
         "hard": 120
     }
     
-    def __init__(self):
+    # complexSearch result fields returned without any add* option
+    SEARCH_BASE_FIELDS = frozenset({"id", "title", "image", "imageType"})
+    
+    # Recipe information fields added by addRecipeInformation
+    SEARCH_INFO_FIELDS = frozenset({
+        "readyInMinutes", "preparationMinutes", "cookingMinutes", "servings", "summary",
+        "sourceName", "sourceUrl", "spoonacularSourceUrl", "creditsText", "license",
+        "vegetarian", "vegan", "glutenFree", "dairyFree", "veryHealthy", "cheap", "veryPopular",
+        "sustainable", "lowFodmap", "gaps", "weightWatcherSmartPoints", "healthScore",
+        "spoonacularScore", "pricePerServing", "aggregateLikes", "cuisines", "dishTypes",
+        "diets", "occasions"
+    })
+    
+    # Result fields each complexSearch option adds. addRecipeNutrition also
+    # returns the recipe information, so it covers addRecipeInformation too.
+    # extendedIngredients is derived from the fillIngredients lists.
+    SEARCH_OPTION_FIELDS = {
+        "addRecipeInformation": SEARCH_INFO_FIELDS,
+        "fillIngredients": frozenset({
+            "usedIngredients", "missedIngredients", "unusedIngredients",
+            "usedIngredientCount", "missedIngredientCount", "extendedIngredients"
+        }),
+        "addRecipeInstructions": frozenset({"analyzedInstructions"}),
+        "addRecipeNutrition": SEARCH_INFO_FIELDS | {"nutrition"}
+    }
+    
+    def __init__(self,
+                 connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None,
+                 max_retries: Optional[int] = None,
+                 backoff_factor: Optional[float] = None,
+                 max_backoff: float = 30.0,
+                 base_url: Optional[str] = None):
         """
-        Initialize the Spoonacular API client.
+        Load the API key and the timeout/retry settings.
+        
+        Every setting falls back to an environment variable and then to a
+        sensible default, so deployments can tune the client without code changes.
+        
+        Args:
+            connect_timeout (float, optional): Seconds to wait for a connection
+                (SPOONACULAR_CONNECT_TIMEOUT, default 3.05)
+            read_timeout (float, optional): Seconds to wait for a response
+                (SPOONACULAR_READ_TIMEOUT, default 10)
+            max_retries (int, optional): Retries on 429/5xx and connection errors
+                (SPOONACULAR_MAX_RETRIES, default 3)
+            backoff_factor (float, optional): Base delay in seconds for exponential
+                backoff (SPOONACULAR_BACKOFF_FACTOR, default 0.5)
+            max_backoff (float, optional): Upper bound for any single retry delay
+            base_url (str, optional): Where to send requests, e.g. a local stub
+                server (SPOONACULAR_BASE_URL, default BASE_URL)
         
         Raises:
             ValueError: If the SPOONACULAR_API_KEY environment variable is not set
@@ -64,10 +263,575 @@ class SpoonacularClient:
         self.api_key = os.getenv("SPOONACULAR_API_KEY")
         if not self.api_key:
             raise ValueError("Spoonacular API key not found in environment variables")
+        
+        self.base_url = (base_url or os.getenv("SPOONACULAR_BASE_URL") or self.BASE_URL).rstrip("/")
+        
+        self.timeout: Tuple[float, float] = (
+            connect_timeout if connect_timeout is not None else float(os.getenv("SPOONACULAR_CONNECT_TIMEOUT", "3.05")),
+            read_timeout if read_timeout is not None else float(os.getenv("SPOONACULAR_READ_TIMEOUT", "10"))
+        )
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("SPOONACULAR_MAX_RETRIES", "3"))
+        self.backoff_factor = backoff_factor if backoff_factor is not None else float(os.getenv("SPOONACULAR_BACKOFF_FACTOR", "0.5"))
+        self.max_backoff = max_backoff
+        self.latency = EndpointLatencyTracker()
+    
+    def get_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get per-endpoint latency statistics for upstream requests.
+        
+        Returns:
+            Dict[str, Dict[str, float]]: Statistics keyed by normalized endpoint
+        """
+        return self.latency.snapshot()
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay for the given attempt number."""
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** attempt)))
+    
+    def _retry_after_delay(self, headers: Any) -> Optional[float]:
+        """
+        Parse a Retry-After header, which may be seconds or an HTTP date.
+        
+        Args:
+            headers (Mapping[str, str]): Response headers
+        
+        Returns:
+            Optional[float]: Delay in seconds capped at max_backoff, or None if absent/invalid
+        """
+        value = headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return min(self.max_backoff, max(0.0, delay))
+    
+    def _validate_filters(self, diet: Optional[str], intolerances: Optional[List[str]]) -> None:
+        """
+        Validate diet and intolerance filters against the supported options.
+        
+        Raises:
+            ValueError: If the diet or any intolerance is not supported
+        """
+        # Validate diet
+        if diet and diet.lower() not in self.VALID_DIETS:
+            raise ValueError(f"Invalid diet. Valid options are: {', '.join(self.VALID_DIETS)}")
+        
+        # Validate intolerances
+        if intolerances:
+            invalid_intolerances = [i for i in intolerances if i.lower() not in self.VALID_INTOLERANCES]
+            if invalid_intolerances:
+                raise ValueError(f"Invalid intolerances: {', '.join(invalid_intolerances)}. "
+                               f"Valid options are: {', '.join(self.VALID_INTOLERANCES)}")
+    
+    def _difficulty_ready_time(self, difficulty: Optional[str], max_ready_time: Optional[int]) -> Optional[int]:
+        """
+        Convert a difficulty level to its max_ready_time, if one is given.
+        
+        Raises:
+            ValueError: If the difficulty is not supported
+        """
+        if not difficulty:
+            return max_ready_time
+        if difficulty.lower() not in self.DIFFICULTY_LEVELS:
+            raise ValueError(f"Invalid difficulty. Valid options are: {', '.join(self.DIFFICULTY_LEVELS.keys())}")
+        return self.DIFFICULTY_LEVELS[difficulty.lower()]
+    
+    @classmethod
+    def _search_options(cls, fields: Iterable[str], number: int) -> Dict[str, bool]:
+        """
+        Pick the cheapest complexSearch options that return every requested field.
+        
+        Args:
+            fields (Iterable[str]): Result fields the caller needs
+            number (int): Number of results (option surcharges are per result)
+            
+        Returns:
+            Dict[str, bool]: Options to set, e.g. {"addRecipeInformation": True}
+            
+        Raises:
+            ValueError: If a field cannot be returned by complexSearch
+        """
+        needed = set(fields) - cls.SEARCH_BASE_FIELDS
+        available = set().union(*cls.SEARCH_OPTION_FIELDS.values())
+        unknown = needed - available
+        if unknown:
+            raise ValueError(f"Unknown search fields: {', '.join(sorted(unknown))}")
+        
+        best, best_cost = None, None
+        options = list(cls.SEARCH_OPTION_FIELDS)
+        for size in range(len(options) + 1):
+            for combo in itertools.combinations(options, size):
+                covered = set().union(*(cls.SEARCH_OPTION_FIELDS[option] for option in combo))
+                if not needed <= covered:
+                    continue
+                chosen = {option: True for option in combo}
+                cost = estimate_point_cost("/recipes/complexSearch", dict(chosen, number=number))
+                if best_cost is None or cost < best_cost:
+                    best, best_cost = chosen, cost
+        return best
+    
+    @staticmethod
+    def _project_result(result: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+        """
+        Reduce a search result to the requested fields (plus id).
+        
+        Fields the response did not include are left out rather than set to None.
+        """
+        projected = {"id": result.get("id")}
+        for field in fields:
+            if field == "extendedIngredients" and field not in result:
+                if "usedIngredients" in result or "missedIngredients" in result:
+                    projected[field] = (list(result.get("usedIngredients", [])) +
+                                        list(result.get("missedIngredients", [])))
+            elif field in result:
+                projected[field] = result[field]
+        return projected
+    
+    def _search_params(self,
+                       query: str,
+                       number: int = 5,
+                       diet: Optional[str] = None,
+                       intolerances: Optional[List[str]] = None,
+                       max_ready_time: Optional[int] = None,
+                       difficulty: Optional[str] = None,
+                       min_calories: Optional[int] = None,
+                       max_calories: Optional[int] = None,
+                       fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Validate search filters and build /recipes/complexSearch parameters.
+        
+        Without fields, every result carries recipe information and
+        ingredients. With fields, only the cheapest options returning them are
+        set (see _search_options); instructions are requested only when
+        analyzedInstructions is among them.
+        
+        Raises:
+            ValueError: If a diet, intolerance, difficulty or field is not supported
+        """
+        self._validate_filters(diet, intolerances)
+        max_ready_time = self._difficulty_ready_time(difficulty, max_ready_time)
+        
+        # Build search parameters. By default information and ingredients are
+        # added (0.05 points per result); a harvested result then lacks only
+        # instructions, which SpoonacularClient.get_recipe_details fetches on
+        # a click.
+        params = {"query": query, "number": number}
+        if fields is None:
+            params.update({
+                "addRecipeInformation": True,
+                "fillIngredients": True
+            })
+        else:
+            params.update(self._search_options(fields, number))
+        params["instructionsRequired"] = True
+        
+        # Add optional filters
+        if diet:
+            params["diet"] = diet.lower()
+        
+        if intolerances:
+            params["intolerances"] = ",".join(intolerances)
+        
+        if max_ready_time:
+            params["maxReadyTime"] = max_ready_time
+        
+        if min_calories:
+            params["minCalories"] = min_calories
+        
+        if max_calories:
+            params["maxCalories"] = max_calories
+        
+        return params
+    
+    def _random_params(self,
+                       number: int = 1,
+                       tags: Optional[List[str]] = None,
+                       diet: Optional[str] = None,
+                       intolerances: Optional[List[str]] = None,
+                       max_ready_time: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Validate filters and build /recipes/random parameters.
+        
+        Raises:
+            ValueError: If a diet or intolerance is not supported
+        """
+        self._validate_filters(diet, intolerances)
+        
+        # Build parameters
+        params = {
+            "number": number,
+            "addRecipeInformation": True,
+            "fillIngredients": True,
+            "instructionsRequired": True
+        }
+        
+        # Add optional filters
+        if tags:
+            params["tags"] = ",".join(tags)
+        
+        if diet:
+            params["diet"] = diet.lower()
+        
+        if intolerances:
+            params["intolerances"] = ",".join(intolerances)
+        
+        if max_ready_time:
+            params["maxReadyTime"] = max_ready_time
+        
+        return params
+
+
+class SpoonacularClient(BaseSpoonacularClient):
+    """
+    Client for interacting with the Spoonacular API.
+    
+    This class encapsulates all API interaction logic, providing a clean interface
+    for searching recipes and getting detailed recipe information.
+    
+    Attributes:
+        base_url (str): Base URL for all Spoonacular API endpoints
+        api_key (str): API key loaded from environment variables
+        session (requests.Session): Pooled keep-alive session used for every request
+        latency (EndpointLatencyTracker): Per-endpoint latency statistics
+        coalesce (bool): Whether concurrent identical requests share one upstream call
+        cache (TieredCache): Response cache, or None when caching is disabled
+        throttle (QuotaThrottle): Point budget, or None when throttling is disabled
+        catalog (RecipeCatalog): Local recipe catalog, or None when disabled
+        catalog_columns (CatalogColumns): Vectorized filters over the catalog, or
+            None when the catalog is disabled
+    """
+    
+    # Seconds each endpoint's responses stay cached, keyed by normalized endpoint.
+    # Endpoints not listed here (e.g. /recipes/random) are never cached.
+    CACHE_TTLS = {
+        "/recipes/complexSearch": 10 * 60,
+        "/recipes/{id}/information": 24 * 60 * 60,
+        "/recipes/{id}/nutritionWidget.json": 24 * 60 * 60,
+        "/recipes/{id}/analyzedInstructions": 24 * 60 * 60,
+        "/recipes/findByIngredients": 6 * 60 * 60,
+        "/food/wine/pairing": 7 * 24 * 60 * 60
+    }
+    
+    # Fields the recipe detail page needs; a harvested record holding all of
+    # them is complete and needs no further upstream call
+    DETAIL_FIELDS = ("title", "image", "readyInMinutes", "servings", "summary",
+                     "extendedIngredients", "analyzedInstructions")
+    
+    # (stale-while-revalidate, stale-if-error) seconds past the TTL during which
+    # an expired response may still be served; see StaleWhileRevalidate.
+    # Recipe details barely change, so a hot recipe expiring should never make
+    # a user wait on an upstream round trip.
+    STALE_WINDOWS = {
+        "/recipes/{id}/information": (7 * 24 * 60 * 60, 30 * 24 * 60 * 60),
+        "/recipes/{id}/nutritionWidget.json": (7 * 24 * 60 * 60, 30 * 24 * 60 * 60),
+        "/food/wine/pairing": (30 * 24 * 60 * 60, 90 * 24 * 60 * 60)
+    }
+    
+    # Max ids sent in one /recipes/informationBulk request
+    BULK_MAX_IDS = 100
+    
+    # Bytes read per network chunk, and recipes harvested together, when streaming
+    STREAM_CHUNK_SIZE = 64 * 1024
+    STREAM_BATCH = 25
+    
+    def __init__(self,
+                 pool_size: Optional[int] = None,
+                 connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None,
+                 max_retries: Optional[int] = None,
+                 backoff_factor: Optional[float] = None,
+                 max_backoff: float = 30.0,
+                 coalesce: bool = True,
+                 cache: Optional[TieredCache] = None,
+                 enable_cache: bool = True,
+                 throttle: Optional[QuotaThrottle] = None,
+                 enable_throttle: bool = True,
+                 batch_window: Optional[float] = None,
+                 base_url: Optional[str] = None,
+                 transport: Optional[str] = None,
+                 catalog: Optional[RecipeCatalog] = None,
+                 enable_catalog: bool = True,
+                 random_pool_size: Optional[int] = None,
+                 parse_memo_size: Optional[int] = None):
+        """
+        Initialize the Spoonacular API client.
+        
+        Args:
+            pool_size (int, optional): Max pooled connections (SPOONACULAR_POOL_SIZE, default 10)
+            connect_timeout, read_timeout, max_retries, backoff_factor, max_backoff:
+                See BaseSpoonacularClient
+            coalesce (bool, optional): Share one upstream call between concurrent
+                identical requests. Defaults to True.
+            cache (TieredCache, optional): Response cache. Defaults to one built
+                from the environment (see TieredCache.from_env).
+            enable_cache (bool, optional): Set to False to disable response caching.
+            throttle (QuotaThrottle, optional): Point budget. Defaults to one built
+                from the environment (see QuotaThrottle.from_env).
+            enable_throttle (bool, optional): Set to False to disable quota throttling.
+            batch_window (float, optional): Seconds to gather get_recipe_information
+                calls into one bulk request (SPOONACULAR_BATCH_WINDOW_MS, default 5ms;
+                0 disables batching)
+            base_url (str, optional): See BaseSpoonacularClient
+            transport (str, optional): "live", "record", "replay" or "replay-timed"
+                (SPOONACULAR_TRANSPORT, default live); see record_replay.py
+            catalog (RecipeCatalog, optional): Local recipe catalog. Defaults to one
+                built from the environment (see RecipeCatalog.from_env).
+            enable_catalog (bool, optional): Set to False to disable the catalog.
+            random_pool_size (int, optional): Random recipes fetched per pool refill
+                for get_random_recipes(pooled=True) (SPOONACULAR_RANDOM_POOL_SIZE,
+                default 50; 0 disables pooling). Pools are topped up in the
+                background below SPOONACULAR_RANDOM_POOL_LOW_WATER (default 10).
+            parse_memo_size (int, optional): Parsed recipe records memoized for
+                get_recipe_record (SPOONACULAR_PARSE_MEMO_SIZE, default 1024;
+                0 disables the memo)
+        
+        Raises:
+            ValueError: If the SPOONACULAR_API_KEY environment variable is not set
+        """
+        super().__init__(connect_timeout, read_timeout, max_retries, backoff_factor, max_backoff, base_url)
+        self.pool_size = pool_size if pool_size is not None else int(os.getenv("SPOONACULAR_POOL_SIZE", "10"))
+        
+        # One pooled session per client; retries are handled in _make_request so
+        # that Retry-After can be honored and every attempt is timed.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        mount_transport(self.session, transport,
+                        pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=0)
+        
+        self.coalesce = coalesce
+        self._single_flight = SingleFlight()
+        self.cache = (cache or TieredCache.from_env()) if enable_cache else None
+        self._revalidator = (StaleWhileRevalidate(self.cache, background=background_priority)
+                             if self.cache is not None else None)
+        self.throttle = (throttle or QuotaThrottle.from_env()) if enable_throttle else None
+        self.catalog = (catalog or RecipeCatalog.from_env()) if enable_catalog else None
+        self.catalog_columns = CatalogColumns.from_env(self.catalog) if self.catalog is not None else None
+        
+        self._harvest_lock = threading.Lock()
+        self._harvest_counters = {"harvested": 0, "complete_hits": 0, "partial_hits": 0, "misses": 0}
+        
+        if batch_window is None:
+            batch_window = float(os.getenv("SPOONACULAR_BATCH_WINDOW_MS", "5")) / 1000
+        self._batcher = RecipeBatcher(self.get_recipe_information_bulk, window=batch_window) if batch_window > 0 else None
+        
+        if random_pool_size is None:
+            random_pool_size = int(os.getenv("SPOONACULAR_RANDOM_POOL_SIZE", "50"))
+        self._random_pool = RandomRecipePool(
+            lambda number, **filters: self.get_random_recipes(number, **filters).get("recipes", []),
+            batch_size=random_pool_size,
+            low_water=min(random_pool_size, int(os.getenv("SPOONACULAR_RANDOM_POOL_LOW_WATER", "10")))
+        ) if random_pool_size > 0 else None
+        
+        self._meal_nutrition = MealPlanNutrition(
+            lambda recipe_ids: self.get_recipe_information_bulk(recipe_ids, include_nutrition=True))
+        
+        if parse_memo_size is None:
+            parse_memo_size = int(os.getenv("SPOONACULAR_PARSE_MEMO_SIZE", "1024"))
+        self._parse_memo = ParseMemo(max_entries=parse_memo_size) if parse_memo_size > 0 else None
+    
+    def close(self) -> None:
+        """Close the pooled session and release its connections."""
+        self.session.close()
+    
+    def __enter__(self) -> "SpoonacularClient":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def get_coalescing_stats(self) -> Dict[str, int]:
+        """
+        Get counters for request coalescing.
+        
+        Returns:
+            Dict[str, int]: calls, executed (upstream), collapsed and in_flight counts
+        """
+        return self._single_flight.stats()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get response cache counters and tier sizes.
+        
+        Returns:
+            Dict[str, Any]: Cache statistics, including fresh vs stale serves
+                under "revalidation", or an empty dict if caching is disabled
+        """
+        if self.cache is None:
+            return {}
+        stats = self.cache.stats()
+        stats["revalidation"] = self._revalidator.stats()
+        return stats
+    
+    def get_quota_stats(self) -> Dict[str, Any]:
+        """
+        Get the remaining point budget.
+        
+        Returns:
+            Dict[str, Any]: Quota statistics, or an empty dict if throttling is disabled
+        """
+        return self.throttle.stats() if self.throttle is not None else {}
+    
+    def get_batching_stats(self) -> Dict[str, int]:
+        """
+        Get counters for batched recipe lookups.
+        
+        Returns:
+            Dict[str, int]: Batching statistics, or an empty dict if batching is disabled
+        """
+        return self._batcher.stats() if self._batcher is not None else {}
+    
+    def get_random_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get random recipe pool sizes, hit rate and refill cost.
+        
+        Returns:
+            Dict[str, Any]: Pool statistics, or an empty dict if pooling is disabled
+        """
+        return self._random_pool.stats() if self._random_pool is not None else {}
+    
+    def get_nutrition_stats(self) -> Dict[str, Any]:
+        """
+        Get meal plan nutrition cache hit rate and recipe fetch counters.
+        
+        Returns:
+            Dict[str, Any]: Nutrition cache statistics
+        """
+        return self._meal_nutrition.stats()
+    
+    def get_parse_memo_stats(self) -> Dict[str, Any]:
+        """
+        Get parsed-record memo hit ratio, size and approximate memory.
+        
+        Returns:
+            Dict[str, Any]: Memo statistics, or an empty dict if the memo is disabled
+        """
+        return self._parse_memo.stats() if self._parse_memo is not None else {}
+    
+    def get_catalog_stats(self) -> Dict[str, Any]:
+        """
+        Get local recipe catalog size and hit counters.
+        
+        Returns:
+            Dict[str, Any]: Catalog statistics, or an empty dict if the catalog is disabled
+        """
+        if self.catalog is None:
+            return {}
+        stats = self.catalog.stats()
+        stats["columns"] = self.catalog_columns.stats()
+        return stats
+    
+    def get_harvest_stats(self) -> Dict[str, int]:
+        """
+        Get counters for recipe records harvested from search results.
+        
+        Returns:
+            Dict[str, int]: Records harvested, and detail lookups answered by a
+                complete record, completed from a partial one, or missed
+        """
+        with self._harvest_lock:
+            return dict(self._harvest_counters)
+    
+    def _count_harvest(self, counter: str, amount: int = 1) -> None:
+        with self._harvest_lock:
+            self._harvest_counters[counter] += amount
+    
+    def _cache_ttl(self, endpoint: str) -> int:
+        """Seconds to cache responses from an endpoint (0 means not cached)."""
+        if self.cache is None:
+            return 0
+        return self.CACHE_TTLS.get(EndpointLatencyTracker.normalize(endpoint), 0)
+    
+    def _cache_lookup(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """Get the cached response for a request, or None if missing or not cacheable."""
+        if not self._cache_ttl(endpoint):
+            return None
+        return self.cache.get(canonical_request_key(endpoint, params))
+    
+    def _cache_store(self, endpoint: str, params: Optional[Dict[str, Any]], data: Any) -> None:
+        """Cache a response as if it had come from the given request."""
+        ttl = self._cache_ttl(endpoint)
+        if ttl:
+            stale_ttl = max(self.STALE_WINDOWS.get(EndpointLatencyTracker.normalize(endpoint), (0, 0)))
+            self.cache.set(canonical_request_key(endpoint, params), data, ttl, stale_ttl)
+    
+    def _cached(self, endpoint: str, params: Optional[Dict[str, Any]], fetch: Callable[[], Any]) -> Any:
+        """
+        Answer a request from the cache, falling back to fetch.
+        
+        Endpoints listed in STALE_WINDOWS are served stale while they are
+        refreshed in the background, or when fetch fails with a request or
+        quota error. fetch must cache what it returns.
+        """
+        if not self._cache_ttl(endpoint):
+            return fetch()
+        stale_while_revalidate, stale_if_error = self.STALE_WINDOWS.get(
+            EndpointLatencyTracker.normalize(endpoint), (0, 0))
+        return self._revalidator.get(canonical_request_key(endpoint, params), fetch,
+                                     stale_while_revalidate, stale_if_error,
+                                     errors=(requests.exceptions.RequestException, QuotaExhaustedError))
+    
+    def _make_request(self,
+                      endpoint: str,
+                      params: Optional[Dict[str, Any]] = None,
+                      on_response: Optional[Callable[[Any], None]] = None) -> Dict[str, Any]:
+        """
+        Make a request to the Spoonacular API through the cache and coalescer.
+        
+        Cacheable endpoints (see CACHE_TTLS) are answered from the response
+        cache when possible, including stale entries within their STALE_WINDOWS.
+        On a miss, requests with the same canonical key
+        (see canonical_request_key) that arrive while one is already in flight
+        wait for it and receive the same result or exception, so a burst of
+        views of one trending recipe costs a single upstream call. Results
+        shared between coalesced waiters must be treated as read-only.
+        
+        Args:
+            endpoint (str): API endpoint to call (e.g., "/recipes/search")
+            params (Dict[str, Any], optional): Query parameters for the request
+            on_response (Callable, optional): Called with each response that
+                actually came from upstream (not from the cache)
+            
+        Returns:
+            Dict[str, Any]: JSON response from the API
+        """
+        return self._cached(endpoint, params, self._upstream_fetch(endpoint, params, on_response))
     
-    def _make_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def _upstream_fetch(self,
+                        endpoint: str,
+                        params: Optional[Dict[str, Any]] = None,
+                        on_response: Optional[Callable[[Any], None]] = None) -> Callable[[], Dict[str, Any]]:
+        """
+        Build the cache-miss fetch of _make_request: coalesced, sent, then cached.
+        
+        Returns:
+            Callable[[], Dict[str, Any]]: Fetches the response from upstream
         """
-        Make a request to the Spoonacular API.
+        key = canonical_request_key(endpoint, params)
+        
+        def fetch() -> Dict[str, Any]:
+            data = self._send_request(endpoint, params)
+            self._cache_store(endpoint, params, data)
+            if on_response is not None:
+                on_response(data)
+            return data
+        
+        def shared_fetch() -> Dict[str, Any]:
+            if not self.coalesce:
+                return fetch()
+            return self._single_flight.do(key, fetch)
+        
+        return shared_fetch
+    
+    def _send_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Send a request to the Spoonacular API.
         
         This is a private helper method that handles:
         1. Adding the API key to parameters
@@ -76,6 +840,15 @@ class SpoonacularClient:
         4. Handling response validation
         5. Converting response to JSON
         
+        Rate-limited (429) and transient server errors (5xx), as well as
+        connection errors and timeouts, are retried up to ``max_retries`` times
+        with jittered exponential backoff. A Retry-After header takes
+        precedence over the computed delay.
+        
+        The estimated point cost is charged to the quota throttle before
+        anything is sent and reconciled with the quota headers afterwards, or
+        refunded if no attempt got a response.
+        
         Args:
             endpoint (str): API endpoint to call (e.g., "/recipes/search")
             params (Dict[str, Any], optional): Query parameters for the request
@@ -84,20 +857,72 @@ class SpoonacularClient:
             Dict[str, Any]: JSON response from the API
             
         Raises:
+            QuotaExhaustedError: If the point budget cannot cover the request
             requests.exceptions.RequestException: If the API request fails
             ValueError: If the response is not valid JSON
         """
-        if params is None:
-            params = {}
+        return self._open_response(endpoint, params).json()
+    
+    def _open_response(self,
+                       endpoint: str,
+                       params: Optional[Dict[str, Any]] = None,
+                       stream: bool = False) -> requests.Response:
+        """
+        Send a request (see _send_request) and return the successful response.
         
-        # Always include API key in parameters
-        params["apiKey"] = self.api_key
+        With stream, only the headers have been read when this returns; the
+        caller must consume or close the response.
         
-        # Make the request and validate response
-        response = requests.get(f"{self.BASE_URL}{endpoint}", params=params)
-        response.raise_for_status()  # Raises an HTTPError for bad responses (4xx, 5xx)
+        Raises:
+            QuotaExhaustedError: If the point budget cannot cover the request
+            requests.exceptions.RequestException: If the API request fails
+        """
+        cost = estimate_point_cost(endpoint, params)
+        if self.throttle is not None:
+            self.throttle.acquire(cost)
         
-        return response.json()
+        # Always include API key in parameters (without mutating the caller's dict)
+        params = dict(params or {})
+        params["apiKey"] = self.api_key
+        url = f"{self.base_url}{endpoint}"
+        
+        attempt = 0
+        answered = False
+        while True:
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout, stream=stream)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self.latency.record(endpoint, time.perf_counter() - started, error=True)
+                if attempt >= self.max_retries:
+                    if self.throttle is not None and not answered:
+                        self.throttle.refund(cost)
+                    raise
+                delay = self._backoff_delay(attempt)
+                logger.warning("Spoonacular %s failed (%s); retrying in %.2fs", endpoint, e, delay)
+            else:
+                answered = True
+                failed = response.status_code >= 400
+                self.latency.record(endpoint, time.perf_counter() - started, error=failed)
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    if self.throttle is not None:
+                        if response.status_code == 402:
+                            self.throttle.mark_exhausted()
+                        else:
+                            self.throttle.reconcile(cost, response.headers)
+                    if failed and stream:
+                        response.close()
+                    response.raise_for_status()  # Raises an HTTPError for bad responses (4xx, 5xx)
+                    return response
+                delay = self._retry_after_delay(response.headers)
+                if delay is None:
+                    delay = self._backoff_delay(attempt)
+                response.close()
+                logger.warning("Spoonacular %s returned %s; retrying in %.2fs",
+                               endpoint, response.status_code, delay)
+            
+            time.sleep(delay)
+            attempt += 1
     
     def search_recipes(self, 
                       query: str,
@@ -107,7 +932,9 @@ class SpoonacularClient:
                       max_ready_time: Optional[int] = None,
                       difficulty: Optional[str] = None,
                       min_calories: Optional[int] = None,
-                      max_calories: Optional[int] = None) -> Dict[str, Any]:
+                      max_calories: Optional[int] = None,
+                      fields: Optional[Iterable[str]] = None,
+                      offline_first: bool = False) -> Dict[str, Any]:
         """
         Search for recipes with advanced filtering options.
         
@@ -125,6 +952,13 @@ class SpoonacularClient:
             difficulty (str, optional): Recipe difficulty ("easy", "medium", "hard")
             min_calories (int, optional): Minimum calories per serving
             max_calories (int, optional): Maximum calories per serving
+            fields (Iterable[str], optional): Result fields the caller needs, e.g.
+                ("id", "title", "image", "readyInMinutes", "servings"). Only the
+                cheapest options returning them are requested and each result is
+                reduced to them. Defaults to complete detail-page records.
+            offline_first (bool, optional): Answer from the local recipe catalog
+                when it covers the query (see RecipeCatalog.search_if_covered),
+                going upstream only otherwise. Defaults to False.
             
         Returns:
             Dict[str, Any]: Search results containing:
@@ -132,51 +966,65 @@ class SpoonacularClient:
                 - offset: Starting position of results
                 - number: Number of results returned
                 - totalResults: Total number of matches
-        """
-        # Validate diet
-        if diet and diet.lower() not in self.VALID_DIETS:
-            raise ValueError(f"Invalid diet. Valid options are: {', '.join(self.VALID_DIETS)}")
+                - source: "catalog" when answered locally
         
-        # Validate intolerances
-        if intolerances:
-            invalid_intolerances = [i for i in intolerances if i.lower() not in self.VALID_INTOLERANCES]
-            if invalid_intolerances:
-                raise ValueError(f"Invalid intolerances: {', '.join(invalid_intolerances)}. "
-                               f"Valid options are: {', '.join(self.VALID_INTOLERANCES)}")
+        Raises:
+            ValueError: If a filter or field is not supported
+        """
+        params = self._search_params(query, number, diet, intolerances, max_ready_time,
+                                     difficulty, min_calories, max_calories, fields)
+        filters = self._catalog_filters(params)
         
-        # Validate difficulty and convert to max_ready_time if provided
-        if difficulty:
-            if difficulty.lower() not in self.DIFFICULTY_LEVELS:
-                raise ValueError(f"Invalid difficulty. Valid options are: {', '.join(self.DIFFICULTY_LEVELS.keys())}")
-            max_ready_time = self.DIFFICULTY_LEVELS[difficulty.lower()]
+        data = None
+        if offline_first and self.catalog is not None:
+            data = self.catalog.search_if_covered(query, number, detail=self._catalog_detail(fields), **filters)
         
-        # Build search parameters
-        params = {
-            "query": query,
-            "number": number,
-            "addRecipeInformation": True,
-            "fillIngredients": True,
-            "instructionsRequired": True
+        if data is None:
+            data = self._make_request("/recipes/complexSearch", params,
+                                      on_response=self._search_response_hook(query, filters))
+        if fields is None:
+            return data
+        fields = list(fields)
+        return dict(data, results=[self._project_result(result, fields) for result in data.get("results", [])])
+    
+    def _search_response_hook(self, query: str, filters: Dict[str, Any]) -> Callable[[Dict[str, Any]], None]:
+        """Harvest an upstream search response and record its total in the catalog."""
+        def on_response(data: Dict[str, Any]) -> None:
+            self._harvest(data.get("results", []))
+            if self.catalog is not None:
+                self.catalog.record_query(data.get("totalResults", 0), query, **filters)
+        return on_response
+    
+    @staticmethod
+    def _catalog_filters(params: Dict[str, Any]) -> Dict[str, Any]:
+        """Translate complexSearch parameters into RecipeCatalog.search filters."""
+        return {
+            "diet": params.get("diet"),
+            "intolerances": params["intolerances"].split(",") if params.get("intolerances") else None,
+            "max_ready_time": params.get("maxReadyTime"),
+            "min_calories": params.get("minCalories"),
+            "max_calories": params.get("maxCalories")
         }
-        
-        # Add optional filters
-        if diet:
-            params["diet"] = diet.lower()
-        
-        if intolerances:
-            params["intolerances"] = ",".join(intolerances)
-        
-        if max_ready_time:
-            params["maxReadyTime"] = max_ready_time
-        
-        if min_calories:
-            params["minCalories"] = min_calories
-        
-        if max_calories:
-            params["maxCalories"] = max_calories
-        
-        endpoint = "/recipes/complexSearch"
-        return self._make_request(endpoint, params)
+    
+    @classmethod
+    def _catalog_detail(cls, fields: Optional[Iterable[str]]) -> str:
+        """Least catalog detail level (see RecipeCatalog.search) that provides the fields."""
+        if fields is None:
+            return "ingredients"
+        needed = set(fields) - cls.SEARCH_BASE_FIELDS
+        if not needed:
+            return "any"
+        if needed <= cls.SEARCH_INFO_FIELDS:
+            return "info"
+        if "analyzedInstructions" not in needed and needed <= (
+                cls.SEARCH_INFO_FIELDS | cls.SEARCH_OPTION_FIELDS["fillIngredients"]):
+            return "ingredients"
+        return "complete"
+    
+    def _ingest(self, recipes: List[Dict[str, Any]]) -> None:
+        """Add recipe payloads received from upstream to the local catalog."""
+        if self.catalog is not None:
+            self.catalog.ingest(recipes)
     
     def get_recipe_information(self, recipe_id: int) -> Dict[str, Any]:
         """
@@ -189,20 +1037,376 @@ class SpoonacularClient:
         - Cooking time and servings
         - Dietary information (vegetarian, vegan, etc.)
         
+        Cache misses and background refreshes of stale entries are
+        micro-batched: lookups from other threads arriving within the batch
+        window share one /recipes/informationBulk request.
+        
         Args:
             recipe_id (int): ID of the recipe to fetch
             
         Returns:
             Dict[str, Any]: Complete recipe information including
                 ingredients, instructions, and nutritional data
+        
+        Raises:
+            requests.exceptions.HTTPError: If the request fails, with status
+                404 for an unknown recipe whether batched or not
         """
         endpoint = f"/recipes/{recipe_id}/information"
         params = {
             "includeNutrition": False  # Exclude nutritional info to reduce response size
         }
         
-        return self._make_request(endpoint, params)
+        if self._batcher is None:
+            return self._make_request(endpoint, params, on_response=lambda data: self._ingest([data]))
+        return self._cached(endpoint, params, lambda: self._batched_information(recipe_id))
+    
+    def _batched_information(self, recipe_id: int) -> Dict[str, Any]:
+        """Look up a recipe through the batcher, failing like /recipes/{id}/information would."""
+        try:
+            return self._batcher.get(recipe_id)
+        except MissingRecipeError:
+            response = requests.Response()
+            response.status_code = 404
+            response.reason = "Not Found"
+            response.url = f"{self.base_url}/recipes/{recipe_id}/information"
+            raise requests.exceptions.HTTPError(f"404 Client Error: Not Found for recipe {recipe_id}",
+                                                response=response) from None
+    
+    def get_recipe_information_bulk(self,
+                                    recipe_ids: List[int],
+                                    include_nutrition: bool = False) -> Dict[int, Dict[str, Any]]:
+        """
+        Get detailed information for many recipes in as few requests as possible.
+        
+        Recipes already cached are served from the cache; the rest are fetched
+        with /recipes/informationBulk (up to BULK_MAX_IDS per request), and
+        each returned recipe is cached as its own /recipes/{id}/information
+        entry so later single lookups hit the cache.
+        
+        Args:
+            recipe_ids (List[int]): IDs of the recipes to fetch (duplicates are ignored)
+            include_nutrition (bool, optional): Include nutrition data. Defaults to False.
+            
+        Returns:
+            Dict[int, Dict[str, Any]]: Recipe information keyed by recipe id;
+                ids Spoonacular does not know are left out
+        """
+        params = {"includeNutrition": include_nutrition}
+        recipes = {}
+        missing = []
+        for recipe_id in dict.fromkeys(int(recipe_id) for recipe_id in recipe_ids):
+            cached = self._cache_lookup(f"/recipes/{recipe_id}/information", params)
+            if cached is not None:
+                recipes[recipe_id] = cached
+            else:
+                missing.append(recipe_id)
+        
+        for start in range(0, len(missing), self.BULK_MAX_IDS):
+            chunk = missing[start:start + self.BULK_MAX_IDS]
+            bulk_params = dict(params, ids=",".join(str(recipe_id) for recipe_id in chunk))
+            for recipe in self._make_request("/recipes/informationBulk", bulk_params, on_response=self._ingest):
+                recipe_id = recipe.get("id")
+                if recipe_id is None:
+                    continue
+                self._cache_store(f"/recipes/{recipe_id}/information", params, recipe)
+                recipes[int(recipe_id)] = recipe
+        
+        return recipes
+    
+    def iter_recipe_information_bulk(self,
+                                     recipe_ids: List[int],
+                                     include_nutrition: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Stream detailed information for many recipes, one recipe at a time.
+        
+        Like get_recipe_information_bulk, but each /recipes/informationBulk
+        response is parsed while it downloads (see JSONArrayStream), so memory
+        stays flat however many recipes are fetched and the first recipe is
+        available before the last byte arrives. Cached recipes come first.
+        Recipes are cached and added to the local catalog as they stream.
+        
+        Args:
+            recipe_ids (List[int]): IDs of the recipes to fetch (duplicates are ignored)
+            include_nutrition (bool, optional): Include nutrition data. Defaults to False.
+            
+        Yields:
+            Dict[str, Any]: Recipe information, in no particular order; ids
+                Spoonacular does not know are left out
+        
+        Raises:
+            QuotaExhaustedError: If the point budget cannot cover a request
+            requests.exceptions.RequestException: If an API request fails
+            ValueError: If a response is not valid JSON
+        """
+        params = {"includeNutrition": include_nutrition}
+        missing = []
+        for recipe_id in dict.fromkeys(int(recipe_id) for recipe_id in recipe_ids):
+            cached = self._cache_lookup(f"/recipes/{recipe_id}/information", params)
+            if cached is not None:
+                yield cached
+            else:
+                missing.append(recipe_id)
+        
+        for start in range(0, len(missing), self.BULK_MAX_IDS):
+            chunk = missing[start:start + self.BULK_MAX_IDS]
+            bulk_params = dict(params, ids=",".join(str(recipe_id) for recipe_id in chunk))
+            for recipe in self._stream("/recipes/informationBulk", bulk_params, None, self._ingest):
+                recipe_id = recipe.get("id")
+                if recipe_id is None:
+                    continue
+                self._cache_store(f"/recipes/{recipe_id}/information", params, recipe)
+                yield recipe
+    
+    def iter_search_results(self,
+                            query: str,
+                            number: int = 100,
+                            diet: Optional[str] = None,
+                            intolerances: Optional[List[str]] = None,
+                            max_ready_time: Optional[int] = None,
+                            difficulty: Optional[str] = None,
+                            min_calories: Optional[int] = None,
+                            max_calories: Optional[int] = None,
+                            fields: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream search results one at a time as the response downloads.
+        
+        Takes the same arguments as search_recipes, but skips the response
+        cache and request coalescing: it is meant for large result pages that
+        should not be held in memory whole. Results are harvested (see
+        get_recipe_details) in batches as they stream.
+        
+        Yields:
+            Dict[str, Any]: Each result, reduced to fields if given
+        
+        Raises:
+            ValueError: If a filter or field is not supported, or the response
+                is not valid JSON
+            QuotaExhaustedError: If the point budget cannot cover the request
+            requests.exceptions.RequestException: If the API request fails
+        """
+        params = self._search_params(query, number, diet, intolerances, max_ready_time,
+                                     difficulty, min_calories, max_calories, fields)
+        filters = self._catalog_filters(params)
+        
+        def on_fields(members: Dict[str, Any]) -> None:
+            if self.catalog is not None and "totalResults" in members:
+                self.catalog.record_query(members["totalResults"], query, **filters)
+        
+        fields = list(fields) if fields is not None else None
+        for result in self._stream("/recipes/complexSearch", params, "results", self._harvest, on_fields):
+            yield self._project_result(result, fields) if fields is not None else result
+    
+    def _stream(self,
+                endpoint: str,
+                params: Dict[str, Any],
+                key: Optional[str],
+                on_batch: Callable[[List[Dict[str, Any]]], None],
+                on_fields: Optional[Callable[[Dict[str, Any]], None]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Request an endpoint and yield the elements of its recipe array as they arrive.
+        
+        Every STREAM_BATCH elements (and at the end, even if the caller stops
+        early) the elements seen are passed to on_batch. Once the whole
+        response has been read, its other top-level members go to on_fields.
+        """
+        response = self._open_response(endpoint, params, stream=True)
+        stream = JSONArrayStream(response.iter_content(self.STREAM_CHUNK_SIZE), key)
+        batch: List[Dict[str, Any]] = []
+        try:
+            for item in stream:
+                batch.append(item)
+                yield item
+                if len(batch) >= self.STREAM_BATCH:
+                    on_batch(batch)
+                    batch = []
+            if on_fields is not None:
+                on_fields(stream.fields)
+        finally:
+            response.close()
+            if batch:
+                on_batch(batch)
+    
+    @staticmethod
+    def _harvest_key(recipe_id: int) -> str:
+        """Cache key of the record harvested for a recipe."""
+        return f"harvest:/recipes/{int(recipe_id)}"
+    
+    def _harvest(self, results: List[Dict[str, Any]]) -> None:
+        """
+        Cache each search or random result as a per-recipe detail record.
+        
+        Results carry usedIngredients/missedIngredients (fillIngredients)
+        rather than extendedIngredients, so those are mapped across. Each
+        record is marked complete when it has every DETAIL_FIELDS entry. A
+        partial record is kept only when it lacks nothing but
+        analyzedInstructions, the one gap get_recipe_details can fill, and
+        never replaces a complete one. Results are also added to the local
+        catalog.
+        """
+        self._ingest(results)
+        ttl = self._cache_ttl("/recipes/{id}/information")
+        if not ttl:
+            return
+        harvested = 0
+        for result in results:
+            recipe_id = result.get("id")
+            if recipe_id is None:
+                continue
+            recipe = dict(result)
+            if "extendedIngredients" not in recipe and ("usedIngredients" in recipe or "missedIngredients" in recipe):
+                recipe["extendedIngredients"] = (list(result.get("usedIngredients", [])) +
+                                                 list(result.get("missedIngredients", [])))
+            missing = [field for field in self.DETAIL_FIELDS if field not in recipe]
+            if missing and missing != ["analyzedInstructions"]:
+                continue
+            complete = not missing
+            key = self._harvest_key(recipe_id)
+            if not complete:
+                existing = self.cache.get(key)
+                if existing is not None and existing["complete"]:
+                    continue
+            self.cache.set(key, {"recipe": recipe, "complete": complete}, ttl)
+            harvested += 1
+        self._count_harvest("harvested", harvested)
+    
+    def get_recipe_details(self, recipe_id: int) -> Dict[str, Any]:
+        """
+        Get everything the recipe detail page needs, as cheaply as possible.
+        
+        Lookups are answered, in order, from:
+        1. A fresh /recipes/{id}/information cache entry
+        2. A complete record harvested from an earlier search (no upstream call)
+        3. A partial harvested record lacking only analyzedInstructions, completed
+           with a /recipes/{id}/analyzedInstructions call
+        4. get_recipe_information
+        
+        Args:
+            recipe_id (int): ID of the recipe
+            
+        Returns:
+            Dict[str, Any]: Recipe information in the /recipes/{id}/information shape
+        """
+        recipe_id = int(recipe_id)
+        cached = self._cache_lookup(f"/recipes/{recipe_id}/information", {"includeNutrition": False})
+        if cached is not None:
+            return cached
+        
+        record = self.cache.get(self._harvest_key(recipe_id)) if self.cache is not None else None
+        if record is not None:
+            recipe = record["recipe"]
+            if record["complete"]:
+                self._count_harvest("complete_hits")
+                return recipe
+            missing = [field for field in self.DETAIL_FIELDS if field not in recipe]
+            if missing == ["analyzedInstructions"]:
+                self._count_harvest("partial_hits")
+                recipe["analyzedInstructions"] = self._make_request(f"/recipes/{recipe_id}/analyzedInstructions")
+                self.cache.set(self._harvest_key(recipe_id), {"recipe": recipe, "complete": True},
+                               self._cache_ttl("/recipes/{id}/information"))
+                return recipe
+        
+        self._count_harvest("misses")
+        return self.get_recipe_information(recipe_id)
+    
+    def get_recipe_record(self, recipe_id: int) -> RecipeDetail:
+        """
+        Get the parsed record the recipe detail page renders.
+        
+        The payload comes from get_recipe_details; its parse is memoized
+        until the payload changes (see ParseMemo).
+        
+        Args:
+            recipe_id (int): ID of the recipe
+            
+        Returns:
+            RecipeDetail: The parsed recipe, shared with other callers
+        """
+        recipe_id = int(recipe_id)
+        payload = self.get_recipe_details(recipe_id)
+        if self._parse_memo is None:
+            return parse_recipe_record(payload)
+        return self._parse_memo.parse(payload, recipe_id)
 
+    @staticmethod
+    def normalize_ingredients(ingredients: List[str]) -> List[str]:
+        """
+        Normalize a pantry list into a sorted set of ingredient names.
+        
+        Names are trimmed, lower-cased and whitespace-collapsed, and duplicates
+        and blanks are dropped, so lists that differ only in order, case or
+        spacing produce the same request (and therefore the same cache entry).
+        
+        Args:
+            ingredients (List[str]): Ingredient names
+            
+        Returns:
+            List[str]: Sorted, de-duplicated ingredient names
+        """
+        names = {" ".join(str(name).lower().split()) for name in ingredients}
+        names.discard("")
+        return sorted(names)
+    
+    def search_recipes_by_ingredients(self,
+                                      ingredients: List[str],
+                                      number: int = 10,
+                                      ranking: int = 1,
+                                      ignore_pantry: bool = True) -> List[Dict[str, Any]]:
+        """
+        Find recipes that use the given ingredients.
+        
+        This method uses the /recipes/findByIngredients endpoint. Results are
+        cached under the normalized ingredient set (see normalize_ingredients).
+        
+        Each result is shaped for inventory matching: alongside the upstream
+        usedIngredients/missedIngredients lists it carries extendedIngredients
+        (used followed by missed, each with name, amount and unit), the same
+        key /recipes/{id}/information uses.
+        
+        Args:
+            ingredients (List[str]): Ingredients on hand
+            number (int, optional): Max number of recipes to return. Defaults to 10.
+            ranking (int, optional): 1 to maximize used ingredients, 2 to minimize
+                missing ingredients. Defaults to 1.
+            ignore_pantry (bool, optional): Ignore typical pantry items such as
+                water, salt and flour. Defaults to True.
+            
+        Returns:
+            List[Dict[str, Any]]: Matching recipes, each containing:
+                - id, title, image
+                - usedIngredientCount, missedIngredientCount
+                - usedIngredients, missedIngredients, unusedIngredients
+                - extendedIngredients: used + missed ingredients
+        
+        Raises:
+            ValueError: If ranking is not 1 or 2
+        """
+        if ranking not in (1, 2):
+            raise ValueError("Invalid ranking. Valid options are: 1 (maximize used), 2 (minimize missing)")
+        
+        names = self.normalize_ingredients(ingredients)
+        if not names:
+            return []
+        
+        params = {
+            "ingredients": ",".join(names),
+            "number": number,
+            "ranking": ranking,
+            "ignorePantry": ignore_pantry
+        }
+        
+        endpoint = "/recipes/findByIngredients"
+        results = self._make_request(endpoint, params)
+        
+        # Build new top-level dicts so callers can annotate results freely
+        recipes = []
+        for result in results:
+            recipe = dict(result)
+            recipe["extendedIngredients"] = (list(result.get("usedIngredients", [])) +
+                                             list(result.get("missedIngredients", [])))
+            recipes.append(recipe)
+        return recipes
+    
     def get_recipe_nutrition(self, recipe_id: int) -> Dict[str, Any]:
         """
         Get detailed nutritional information for a recipe.
@@ -219,6 +1423,32 @@ class SpoonacularClient:
         """
         endpoint = f"/recipes/{recipe_id}/nutritionWidget.json"
         return self._make_request(endpoint)
+    
+    def get_meal_plan_nutrition(self, plan_id: Any, meals: Iterable[Any]) -> Dict[str, Any]:
+        """
+        Get daily and weekly nutrition totals for a meal plan.
+        
+        Recipes not seen before are fetched with one bulk information request
+        (with nutrition) rather than one nutrition request per meal; totals
+        are cached per plan until its meals change (see MealPlanNutrition).
+        
+        Args:
+            plan_id (Any): Meal plan id
+            meals (Iterable): MealPlanItem rows, or (recipe_id, day_of_week,
+                servings) tuples
+            
+        Returns:
+            Dict[str, Any]: Totals as returned by MealPlanNutrition.summarize
+        
+        Raises:
+            QuotaExhaustedError: If the point budget cannot cover the request
+            requests.exceptions.RequestException: If the API request fails
+        """
+        return self._meal_nutrition.summarize(plan_id, meals)
+    
+    def invalidate_meal_plan_nutrition(self, plan_id: Any) -> None:
+        """Drop a meal plan's cached nutrition totals after its meals change."""
+        self._meal_nutrition.invalidate(plan_id)
 
     def get_wine_pairing(self, food: str) -> Dict[str, Any]:
         """
@@ -244,12 +1474,18 @@ class SpoonacularClient:
                           tags: Optional[List[str]] = None,
                           diet: Optional[str] = None,
                           intolerances: Optional[List[str]] = None,
-                          max_ready_time: Optional[int] = None) -> Dict[str, Any]:
+                          max_ready_time: Optional[int] = None,
+                          offline_first: bool = False,
+                          pooled: bool = False) -> Dict[str, Any]:
         """
         Get random recipes from the Spoonacular API.
         
         This method uses the /recipes/random endpoint to fetch random recipes
         with optional filtering by tags, diet, intolerances, and cooking time.
+        With offline_first, untagged requests are drawn from complete records
+        in the local catalog when enough of them match. With pooled, untagged
+        requests are taken from a pre-fetched pool for the filter combination
+        (see RandomRecipePool), so only an empty pool waits on upstream.
         
         Args:
             number (int, optional): Number of random recipes to return. Defaults to 1.
@@ -257,42 +1493,56 @@ class SpoonacularClient:
             diet (str, optional): Specific diet (e.g., "vegetarian", "vegan")
             intolerances (List[str], optional): List of intolerances
             max_ready_time (int, optional): Maximum total minutes for recipe
+            offline_first (bool, optional): Draw from the local catalog first.
+                Defaults to False.
+            pooled (bool, optional): Take recipes from the random recipe pool.
+                Defaults to False.
             
         Returns:
             Dict[str, Any]: Random recipe results containing:
                 - recipes: List of random recipe objects
+                - source: "catalog" or "pool" when not fetched for this call
         """
-        # Validate diet
-        if diet and diet.lower() not in self.VALID_DIETS:
-            raise ValueError(f"Invalid diet. Valid options are: {', '.join(self.VALID_DIETS)}")
+        params = self._random_params(number, tags, diet, intolerances, max_ready_time)
         
-        # Validate intolerances
-        if intolerances:
-            invalid_intolerances = [i for i in intolerances if i.lower() not in self.VALID_INTOLERANCES]
-            if invalid_intolerances:
-                raise ValueError(f"Invalid intolerances: {', '.join(invalid_intolerances)}. "
-                               f"Valid options are: {', '.join(self.VALID_INTOLERANCES)}")
+        if pooled and not tags and self._random_pool is not None:
+            recipes = self._random_pool.get(number, diet, intolerances, max_ready_time)
+            return {"recipes": recipes, "source": "pool"}
         
-        # Build parameters
-        params = {
-            "number": number,
-            "addRecipeInformation": True,
-            "fillIngredients": True,
-            "instructionsRequired": True
-        }
-        
-        # Add optional filters
-        if tags:
-            params["tags"] = ",".join(tags)
-        
-        if diet:
-            params["diet"] = diet.lower()
-        
-        if intolerances:
-            params["intolerances"] = ",".join(intolerances)
-        
-        if max_ready_time:
-            params["maxReadyTime"] = max_ready_time
+        if offline_first and not tags and self.catalog_columns is not None:
+            ids = self.catalog_columns.sample_ids(number, diet=diet, intolerances=intolerances,
+                                                  max_ready_time=max_ready_time, complete_only=True)
+            if len(ids) == number:
+                recipes = self.catalog.get_many(ids)
+                if len(recipes) == number:
+                    return {"recipes": recipes, "source": "catalog"}
         
         endpoint = "/recipes/random"
-        return self._make_request(endpoint, params) 
\ No newline at end of file
+        return self._make_request(endpoint, params,
+                                  on_response=lambda data: self._harvest(data.get("recipes", [])))
+
+
+_shared_client: Optional[SpoonacularClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_shared_client() -> SpoonacularClient:
+    """
+    Get the process-wide SpoonacularClient.
+    
+    Routes and services should use this instead of constructing a client per
+    request, so that the pooled session (and its warm keep-alive connections)
+    and latency statistics are shared by all threads of a worker.
+    
+    Returns:
+        SpoonacularClient: The shared client instance
+        
+    Raises:
+        ValueError: If the SPOONACULAR_API_KEY environment variable is not set
+    """
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _shared_client = SpoonacularClient()
+    return _shared_client
@@ -2,6 +2,7 @@ import os
 import sys
 import logging
 import random
+import requests
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from flask import Flask, render_template, request, jsonify, Blueprint, redirect, url_for, flash
@@ -11,9 +12,11 @@ from flask_login import LoginManager, login_user, logout_user, login_required, c
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from models import db, User, UserPreference, RecipeRating, Favorite, RecipeCollection, CollectionRecipe, MealPlan, MealPlanItem
-from api_client import SpoonacularClient
-from data_parser import parse_recipe_search_results, parse_recipe_details
-from news_parser import NewsParser
+from api_client import get_shared_client, QuotaExhaustedError
+from data_parser import parse_recipe_search_results, parse_recipe_details, SEARCH_RESULT_FIELDS
+from json_backend import RecordJSONProvider
+from news_parser import get_shared_news_feed, get_shared_ingestor, get_shared_news_parser, start_shared_news_jobs
+from dad_jokes import JOKES
 from auth import auth
 from routes.favorites import favorites_bp
 from routes.inventory import inventory_bp
@@ -32,6 +35,7 @@ def create_app() -> Flask:
     Flask application factory. Registers blueprints and initializes extensions.
     """
     app = Flask(__name__)
+    app.json = RecordJSONProvider(app)
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key')
     app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///recipes.db'
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
@@ -56,6 +60,20 @@ def create_app() -> Flask:
     with app.app_context():
         db.create_all()
 
+    # Keep the Guardian feed and the local article store current in the
+    # background; pages only read what these threads fetch. The threads are
+    # started in each worker process, after any fork (see start_shared_news_jobs).
+    app.config['GUARDIAN_NEWS'] = bool(os.getenv('GUARDIAN_API_KEY'))
+    if app.config['GUARDIAN_NEWS']:
+        @app.before_request
+        def start_news_jobs():
+            try:
+                start_shared_news_jobs()
+            except Exception as e:
+                logging.warning(f"Food news jobs not started: {str(e)}")
+    else:
+        logging.info("GUARDIAN_API_KEY not set; food news is disabled")
+
     # Main routes
     @app.route('/')
     def index():
@@ -145,6 +163,13 @@ def create_app() -> Flask:
         collection = RecipeCollection.query.filter_by(id=collection_id, user_id=current_user.id).first_or_404()
         return render_template('view_collection.html', collection=collection)
 
+    def invalidate_nutrition(plan_id: int) -> None:
+        """Drop a meal plan's cached nutrition totals after its meals change."""
+        try:
+            get_shared_client().invalidate_meal_plan_nutrition(plan_id)
+        except ValueError:
+            pass  # No API key: nothing was cached
+
     @app.route('/meal-plan')
     @login_required
     def meal_plan():
@@ -171,7 +196,14 @@ def create_app() -> Flask:
             days.append({'date': day_date, 'day_short': day_short, 'day_number': day_number, 'meals': day_meals})
         prev_week = week_start - timedelta(days=7)
         next_week = week_start + timedelta(days=7)
-        return render_template('meal_plan.html', days=days, meal_types=meal_types, meal_plan=meal_plan, week_start=week_start, prev_week=prev_week, next_week=next_week, timedelta=timedelta)
+        nutrition = None
+        if meals:
+            try:
+                # One bulk fetch for recipes not seen before, cached per plan
+                nutrition = get_shared_client().get_meal_plan_nutrition(meal_plan.id, meals)
+            except Exception as e:
+                logging.warning(f"Meal plan nutrition unavailable: {str(e)}")
+        return render_template('meal_plan.html', days=days, meal_types=meal_types, meal_plan=meal_plan, week_start=week_start, prev_week=prev_week, next_week=next_week, timedelta=timedelta, nutrition=nutrition)
 
     @app.route('/meal-plan/add', methods=['POST'])
     @login_required
@@ -204,6 +236,7 @@ def create_app() -> Flask:
         )
         db.session.add(meal)
         db.session.commit()
+        invalidate_nutrition(meal_plan.id)
         return jsonify({'status': 'added'})
 
     @app.route('/meal-plan/remove', methods=['POST'])
@@ -217,6 +250,7 @@ def create_app() -> Flask:
         if meal_plan:
             MealPlanItem.query.filter_by(meal_plan_id=meal_plan.id, day_of_week=day_of_week, meal_type=meal_type).delete()
             db.session.commit()
+            invalidate_nutrition(meal_plan.id)
         return jsonify({'status': 'removed'})
 
     @app.route('/kitchen-inventory')
@@ -253,8 +287,10 @@ def create_app() -> Flask:
             # Delete all meal items for this plan
             MealPlanItem.query.filter_by(meal_plan_id=meal_plan.id).delete()
             # Delete the meal plan itself
+            plan_id = meal_plan.id
             db.session.delete(meal_plan)
             db.session.commit()
+            invalidate_nutrition(plan_id)
         return jsonify({'status': 'cleared'})
 
     @app.route('/preferences')
@@ -266,27 +302,88 @@ def create_app() -> Flask:
     @app.route('/food-news')
     def food_news():
         articles = []
-        try:
-            from news_parser import NewsParser
-            import os
-            api_key = os.getenv('GUARDIAN_API_KEY')
-            articles = NewsParser(api_key).fetch_popular_recipe_articles()
-        except Exception as e:
-            print(f"Error fetching articles: {e}")
+        if app.config['GUARDIAN_NEWS']:
+            try:
+                # Read from memory; a background thread keeps the feed fresh
+                articles = get_shared_news_feed().articles()
+            except Exception as e:
+                logging.warning(f"Food news unavailable: {str(e)}")
         return render_template('food_news.html', articles=articles)
 
+    @app.route('/food-news/article/<path:article_id>')
+    def food_news_article(article_id):
+        """Body of one news article, loaded when a reader expands it."""
+        try:
+            body = get_shared_news_feed().parser.get_article_body(article_id)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        except requests.exceptions.HTTPError as e:
+            status = 404 if e.response is not None and e.response.status_code == 404 else 502
+            return jsonify({'success': False, 'error': 'Article not available'}), status
+        except requests.exceptions.RequestException as e:
+            logging.warning(f"Article {article_id} unavailable: {str(e)}")
+            return jsonify({'success': False, 'error': 'Article not available'}), 502
+        return jsonify({'success': True, 'id': article_id, 'body': body})
+
+    @app.route('/api/metrics/guardian')
+    def guardian_metrics():
+        """Food news feed freshness and upstream Guardian latency for this worker process."""
+        if not app.config['GUARDIAN_NEWS']:
+            return jsonify({'success': False, 'error': 'GUARDIAN_API_KEY is not set'})
+        try:
+            feed = get_shared_news_feed()
+            ingestor = get_shared_ingestor()
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)})
+        return jsonify({
+            'success': True,
+            'feed': feed.stats(),
+            'bodies': feed.parser.get_article_body_stats(),
+            'store': feed.parser.store.stats() if feed.parser.store is not None else {},
+            'ingestion': ingestor.stats() if ingestor is not None else {},
+            'index': feed.parser.index.stats() if feed.parser.index is not None else {},
+            'trending': feed.parser.trending.stats() if feed.parser.trending is not None else {}
+        })
+
+    @app.route('/api/metrics/spoonacular')
+    def spoonacular_metrics():
+        """Upstream Spoonacular statistics for this worker process."""
+        try:
+            api_client = get_shared_client()
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)})
+        return jsonify({
+            'success': True,
+            'latency': api_client.get_latency_stats(),
+            'coalescing': api_client.get_coalescing_stats(),
+            'cache': api_client.get_cache_stats(),
+            'quota': api_client.get_quota_stats(),
+            'batching': api_client.get_batching_stats(),
+            'harvest': api_client.get_harvest_stats(),
+            'catalog': api_client.get_catalog_stats(),
+            'random_pool': api_client.get_random_pool_stats(),
+            'nutrition': api_client.get_nutrition_stats(),
+            'parse_memo': api_client.get_parse_memo_stats()
+        })
+
     @app.route('/recipe/<int:recipe_id>')
     def recipe(recipe_id):
         """Display detailed recipe information."""
         try:
-            # Get recipe details from API
-            api_client = SpoonacularClient()
-            recipe_data = api_client.get_recipe_information(recipe_id)
-            recipe = parse_recipe_details(recipe_data)
+            # Get recipe details, from a harvested search result when possible,
+            # reusing the parsed record while the payload is unchanged
+            api_client = get_shared_client()
+            recipe = api_client.get_recipe_record(recipe_id)
             avg_rating = 0
             total_ratings = 0
             ratings = []
             related_news = []
+            if app.config['GUARDIAN_NEWS']:
+                try:
+                    # Matched against the locally ingested articles, no Guardian request
+                    related_news = get_shared_news_parser().match_news_to_recipe(recipe)
+                except Exception as e:
+                    logging.warning(f"Related news unavailable: {str(e)}")
             return render_template(
                 'recipe.html',
                 recipe=recipe,
@@ -365,7 +462,7 @@ def create_app() -> Flask:
                 max_ready_time = int(max_time)
             
             # Initialize API client
-            api_client = SpoonacularClient()
+            api_client = get_shared_client()
             
             # Search for recipes
             result = api_client.search_recipes(
@@ -375,7 +472,11 @@ def create_app() -> Flask:
                 intolerances=intolerances if intolerances else None,
                 max_ready_time=max_ready_time,
                 min_calories=int(min_calories) if min_calories else None,
-                max_calories=int(max_calories) if max_calories else None
+                max_calories=int(max_calories) if max_calories else None,
+                # What the results grid shows, plus what the detail page needs,
+                # so a click on a result is answered from the harvested record
+                fields=set(SEARCH_RESULT_FIELDS) | set(api_client.DETAIL_FIELDS),
+                offline_first=True  # Answer from the local catalog when it covers the query
             )
             
             # Parse the results
@@ -386,6 +487,13 @@ def create_app() -> Flask:
                 'recipes': recipes
             })
                 
+        except QuotaExhaustedError as e:
+            logging.warning(f"Recipe search throttled: {str(e)}")
+            return jsonify({
+                'success': False,
+                'error': 'We have hit our recipe lookup limit. Please try again later.',
+                'retry_after': int(e.retry_after)
+            })
         except Exception as e:
             logging.error(f"Error searching recipes: {str(e)}")
             return jsonify({
@@ -396,100 +504,6 @@ def create_app() -> Flask:
     @app.route('/random-recipe', methods=['POST'])
     def random_recipe():
         """Get a random recipe with optional filters."""
-        # Comprehensive ingredient-specific dad jokes
-        ingredient_jokes = {
-            # Pasta & Noodles
-            'pasta': ["What do you call a fake noodle? An impasta! 🍝", "Why did the spaghetti go to the doctor? Because it was feeling a little saucy! 🍝"],
-            'spaghetti': ["What do you call a fake noodle? An impasta! 🍝", "Why did the spaghetti go to the doctor? Because it was feeling a little saucy! 🍝"],
-            'noodle': ["What do you call a fake noodle? An impasta! 🍝", "Why did the noodle go to therapy? It had too many issues to work through! 🍜"],
-            'penne': ["What do you call a fake noodle? An impasta! 🍝", "Why did the penne pasta feel left out? Because it was tubular! 🍝"],
-            
-            # Meats
-            'chicken': ["Why did the chicken go to the doctor? Because it was feeling a little under the weather! 🌤️", "What do you call a chicken that crosses the road? A road runner! 🐔"],
-            'beef': ["What do you call a cow that plays hide and seek? A moo-ving target! 🐄", "Why did the cow go to the gym? To get some beef-cake! 💪"],
-            'pork': ["What do you call a pig that does karate? A pork chop! 🥋", "Why did the pig go to the spa? To get a mud bath! 🐷"],
-            'lamb': ["What do you call a sheep that's been in the sun? A sun-baa! 🌞", "Why did the lamb go to school? To get a little sheep-diploma! 🐑"],
-            'turkey': ["What do you call a turkey on Thanksgiving? Dinner! 🦃", "Why did the turkey cross the road? To prove it wasn't chicken! 🦃"],
-            
-            # Fish & Seafood
-            'salmon': ["What do you call a fish wearing a bowtie? So-fish-ticated! 🐟", "Why did the salmon blush? Because it saw the ocean's bottom! 🐠"],
-            'tuna': ["What do you call a fish that's good at math? A calcu-lator! 🧮", "Why did the tuna go to the doctor? Because it was feeling a little fishy! 🐟"],
-            'shrimp': ["What do you call a shrimp that's been in the gym? A prawn! 💪", "Why did the shrimp go to the party? Because it was a little shellfish! 🦐"],
-            'cod': ["What do you call a fish that's been in the fridge too long? Cold fish! 🐟", "Why did the cod go to the bank? To get some fishy money! 🐟"],
-            
-            # Vegetables
-            'tomato': ["Why did the tomato turn red? Because it saw the salad dressing! 🍅", "What do you call a tomato that's been in the sun? A sun-dried tomato! 🍅"],
-            'lettuce': ["Why did the lettuce win the race? Because it was ahead! 🥬", "What do you call lettuce that's been in the fridge too long? Wilted! 🥬"],
-            'carrot': ["What do you call a carrot that's been in the gym? A buff carrot! 🥕", "Why did the carrot go to the doctor? Because it was feeling a little orange! 🥕"],
-            'onion': ["Why did the onion go to the doctor? Because it was feeling a little tearful! 🧅", "What do you call an onion that's been in the sun? A sun-burned onion! 🧅"],
-            'garlic': ["What do you call garlic that's been in the fridge? Cold garlic! 🧄", "Why did the garlic go to the party? Because it was a little spicy! 🧄"],
-            'potato': ["What do you call a lazy vegetable? A couch potato! 🥔", "Why did the potato go to the doctor? Because it was feeling a little mashed! 🥔"],
-            'broccoli': ["What do you call broccoli that's been in the gym? Buff broccoli! 🥦", "Why did the broccoli go to the doctor? Because it was feeling a little green! 🥦"],
-            'spinach': ["What do you call spinach that's been in the sun? Sun-dried spinach! 🥬", "Why did the spinach go to the party? Because it was a little leafy! 🥬"],
-            'mushroom': ["Why did the mushroom go to the party? Because he was a fungi! 🍄", "What do you call a mushroom that's been in the rain? A wet one! 🍄"],
-            
-            # Dairy
-            'cheese': ["What do you call cheese that isn't yours? Nacho cheese! 🧀", "Why did the cheese go to the doctor? Because it was feeling a little blue! 🧀"],
-            'milk': ["What do you call milk that's been in the fridge too long? Sour milk! 🥛", "Why did the milk go to the doctor? Because it was feeling a little curdled! 🥛"],
-            'butter': ["What do you call butter that's been in the sun? Melted butter! 🧈", "Why did the butter go to the party? Because it was a little spread! 🧈"],
-            'cream': ["What do you call cream that's been in the fridge? Cold cream! 🥛", "Why did the cream go to the doctor? Because it was feeling a little whipped! 🥛"],
-            
-            # Eggs
-            'egg': ["Why don't eggs tell jokes? They'd crack each other up! 🥚", "What do you call an egg that's been in the fridge too long? Hard-boiled! 🥚"],
-            'eggs': ["Why don't eggs tell jokes? They'd crack each other up! 🥚", "What do you call an egg that's been in the fridge too long? Hard-boiled! 🥚"],
-            
-            # Grains & Bread
-            'bread': ["Why did the baker go to the bank? To get some dough! 🥖", "What do you call bread that's been in the oven too long? Toast! 🍞"],
-            'rice': ["What do you call rice that's been in the sun? Sun-dried rice! 🍚", "Why did the rice go to the doctor? Because it was feeling a little grainy! 🍚"],
-            'quinoa': ["What do you call quinoa that's been in the gym? Buff quinoa! 🍚", "Why did the quinoa go to the party? Because it was a little nutty! 🍚"],
-            'oat': ["What do you call oats that's been in the sun? Sun-dried oats! 🥣", "Why did the oats go to the doctor? Because they were feeling a little rolled! 🥣"],
-            
-            # Fruits
-            'apple': ["What do you call an apple that's been in the sun? A sun-burned apple! 🍎", "Why did the apple go to the doctor? Because it was feeling a little bruised! 🍎"],
-            'banana': ["What do you call a banana that's been in the sun? A sun-burned banana! 🍌", "Why did the banana go to the doctor? Because it was feeling a little yellow! 🍌"],
-            'orange': ["What do you call an orange that's been in the sun? A sun-burned orange! 🍊", "Why did the orange go to the doctor? Because it was feeling a little peely! 🍊"],
-            'lemon': ["What do you call a lemon that's been in the sun? A sun-burned lemon! 🍋", "Why did the lemon go to the doctor? Because it was feeling a little sour! 🍋"],
-            'lime': ["What do you call a lime that's been in the sun? A sun-burned lime! 🍋", "Why did the lime go to the doctor? Because it was feeling a little green! 🍋"],
-            'grape': ["Why did the grape stop in the middle of the road? Because it ran out of juice! 🍇", "What do you call a grape that's been in the sun? A raisin! 🍇"],
-            
-            # Herbs & Spices
-            'basil': ["What do you call basil that's been in the sun? Sun-dried basil! 🌿", "Why did the basil go to the party? Because it was a little herby! 🌿"],
-            'oregano': ["What do you call oregano that's been in the sun? Sun-dried oregano! 🌿", "Why did the oregano go to the doctor? Because it was feeling a little spicy! 🌿"],
-            'thyme': ["What do you call thyme that's been in the sun? Sun-dried thyme! 🌿", "Why did the thyme go to the party? Because it was a little herby! 🌿"],
-            'rosemary': ["What do you call rosemary that's been in the sun? Sun-dried rosemary! 🌿", "Why did the rosemary go to the doctor? Because it was feeling a little woody! 🌿"],
-            'pepper': ["What do you call pepper that's been in the sun? Sun-dried pepper! 🌶️", "Why did the pepper go to the party? Because it was a little spicy! 🌶️"],
-            'salt': ["What do you call salt that's been in the sun? Sun-dried salt! 🧂", "Why did the salt go to the doctor? Because it was feeling a little salty! 🧂"],
-            
-            # Nuts & Seeds
-            'almond': ["What do you call an almond that's been in the sun? A sun-burned almond! 🥜", "Why did the almond go to the doctor? Because it was feeling a little nutty! 🥜"],
-            'walnut': ["What do you call a walnut that's been in the sun? A sun-burned walnut! 🥜", "Why did the walnut go to the party? Because it was a little nutty! 🥜"],
-            'peanut': ["What do you call a peanut that's been in the sun? A sun-burned peanut! 🥜", "Why did the peanut go to the doctor? Because it was feeling a little nutty! 🥜"],
-            
-            # Desserts & Sweeteners
-            'chocolate': ["What do you call chocolate that's been in the sun? Melted chocolate! 🍫", "Why did the chocolate go to the doctor? Because it was feeling a little sweet! 🍫"],
-            'sugar': ["What do you call sugar that's been in the sun? Sun-dried sugar! 🍯", "Why did the sugar go to the party? Because it was a little sweet! 🍯"],
-            'honey': ["What do you call honey that's been in the sun? Sun-dried honey! 🍯", "Why did the honey go to the doctor? Because it was feeling a little sticky! 🍯"],
-            
-            # Beverages
-            'coffee': ["Why did the coffee file a police report? It got mugged! ☕", "What do you call coffee that's been in the fridge? Cold brew! ☕"],
-            'tea': ["What do you call tea that's been in the sun? Sun tea! ☕", "Why did the tea go to the doctor? Because it was feeling a little steeped! ☕"],
-            'wine': ["What do you call wine that's been in the sun? Sun-dried wine! 🍷", "Why did the wine go to the party? Because it was a little grape! 🍷"],
-            
-            # General fallbacks
-            'general': [
-                "Why did the chef go to the doctor? Because he was feeling a little under the weather! 🌤️",
-                "What do you call a can opener that doesn't work? A can't opener! 🥫",
-                "Why did the grape stop in the middle of the road? Because it ran out of juice! 🍇",
-                "What do you call a lazy kangaroo? A pouch potato! 🦘",
-                "Why did the scarecrow win an award? Because he was outstanding in his field! 🌾",
-                "What do you call a dinosaur that crashes his car? Tyrannosaurus wrecks! 🦖",
-                "Why did the math book look so sad? Because it had too many problems! 📚",
-                "What do you call a bear with no teeth? A gummy bear! 🐻",
-                "Why did the cookie go to the doctor? Because it was feeling crumbly! 🍪",
-                "What do you call a fish wearing a bowtie? So-fish-ticated! 🐟"
-            ]
-        }
-        
         try:
             # Get form data
             diet = request.form.get('diet')
@@ -510,86 +524,23 @@ def create_app() -> Flask:
                 max_ready_time = int(max_time)
             
             # Initialize API client
-            api_client = SpoonacularClient()
+            api_client = get_shared_client()
             
-            # Get random recipe
+            # Get random recipe from the pre-fetched pool for these filters
             result = api_client.get_random_recipes(
                 number=1,
                 diet=diet if diet != 'none' else None,
                 intolerances=intolerances if intolerances else None,
-                max_ready_time=max_ready_time
+                max_ready_time=max_ready_time,
+                pooled=True
             )
             
-            import re
-            
-            # Function to find the most relevant ingredient joke based on recipe ingredients
-            def find_ingredient_joke(recipe_data):
-                """Find the most relevant joke based on the actual ingredients in the recipe."""
-                # Extract ingredients from the recipe data
-                ingredients_text = ""
-                
-                # Check for ingredients in different possible locations
-                if 'extendedIngredients' in recipe_data:
-                    for ingredient in recipe_data['extendedIngredients']:
-                        if 'name' in ingredient:
-                            ingredients_text += " " + ingredient['name'].lower()
-                        if 'original' in ingredient:
-                            ingredients_text += " " + ingredient['original'].lower()
-                
-                # Also check title and summary for additional context
-                title_lower = recipe_data.get('title', '').lower()
-                summary_lower = recipe_data.get('summary', '').lower()
-                combined_text = title_lower + " " + summary_lower + " " + ingredients_text
-                
-                # Priority order for ingredient matching (most specific first)
-                ingredient_priorities = [
-                    # Specific ingredients that should take priority
-                    'salmon', 'tuna', 'shrimp', 'cod', 'pork', 'lamb', 'turkey',
-                    'tomato', 'lettuce', 'carrot', 'onion', 'garlic', 'potato', 'broccoli', 'spinach',
-                    'mushroom', 'apple', 'banana', 'orange', 'lemon', 'lime', 'grape',
-                    'basil', 'oregano', 'thyme', 'rosemary', 'pepper', 'salt',
-                    'almond', 'walnut', 'peanut', 'chocolate', 'honey',
-                    'quinoa', 'oat', 'tea', 'wine',
-                    # General categories
-                    'pasta', 'spaghetti', 'noodle', 'penne',
-                    'chicken', 'beef', 'fish', 'cheese', 'milk', 'butter', 'cream',
-                    'egg', 'eggs', 'bread', 'rice', 'coffee', 'sugar'
-                ]
-                
-                # Find the first matching ingredient
-                for ingredient in ingredient_priorities:
-                    if ingredient in combined_text:
-                        if ingredient in ingredient_jokes:
-                            return ingredient, ingredient_jokes[ingredient]
-                
-                # If no specific ingredient found, try broader categories
-                if any(word in combined_text for word in ['pasta', 'spaghetti', 'noodle', 'penne', 'fettuccine', 'linguine']):
-                    return 'pasta', ingredient_jokes['pasta']
-                elif any(word in combined_text for word in ['chicken', 'poultry', 'breast', 'thigh', 'wing']):
-                    return 'chicken', ingredient_jokes['chicken']
-                elif any(word in combined_text for word in ['beef', 'steak', 'burger', 'meatball', 'roast']):
-                    return 'beef', ingredient_jokes['beef']
-                elif any(word in combined_text for word in ['fish', 'seafood']):
-                    return 'fish', ingredient_jokes['salmon']  # Use salmon jokes as default fish
-                elif any(word in combined_text for word in ['dessert', 'cake', 'cookie', 'pie', 'ice cream']):
-                    return 'dessert', ingredient_jokes['chocolate']  # Use chocolate jokes as default dessert
-                elif any(word in combined_text for word in ['bread', 'toast', 'sandwich', 'bun', 'roll']):
-                    return 'bread', ingredient_jokes['bread']
-                elif any(word in combined_text for word in ['cheese', 'cheddar', 'mozzarella', 'parmesan']):
-                    return 'cheese', ingredient_jokes['cheese']
-                elif any(word in combined_text for word in ['egg', 'omelette', 'scrambled']):
-                    return 'eggs', ingredient_jokes['eggs']
-                elif any(word in combined_text for word in ['vegetarian', 'vegan', 'salad', 'vegetable', 'tofu']):
-                    return 'vegetarian', ingredient_jokes['tomato']  # Use tomato jokes as default vegetarian
-                else:
-                    return 'general', ingredient_jokes['general']
-            
             # Parse the recipe data
             if result.get('recipes') and len(result['recipes']) > 0:
                 recipe = result['recipes'][0]
                 
                 # Find the most relevant ingredient joke
-                ingredient_name, ingredient_joke_list = find_ingredient_joke(recipe)
+                ingredient_name, ingredient_joke_list = JOKES.match_recipe(recipe)
                 selected_joke = random.choice(ingredient_joke_list)
                 
                 parsed_recipe = parse_recipe_details(recipe)
@@ -602,19 +553,27 @@ def create_app() -> Flask:
                 })
             else:
                 # If no recipe found, use a general joke
-                selected_joke = random.choice(ingredient_jokes['general'])
+                selected_joke = JOKES.general_joke()
                 return jsonify({
                     'success': False,
                     'error': 'No random recipe found. Try adjusting your filters!',
                     'dad_joke': selected_joke
                 })
                 
+        except QuotaExhaustedError as e:
+            logging.warning(f"Random recipe throttled: {str(e)}")
+            return jsonify({
+                'success': False,
+                'error': 'We have hit our recipe lookup limit. Please try again later.',
+                'retry_after': int(e.retry_after),
+                'dad_joke': JOKES.general_joke()
+            })
         except Exception as e:
             logging.error(f"Error getting random recipe: {str(e)}")
             return jsonify({
                 'success': False,
                 'error': f'Error getting random recipe: {str(e)}',
-                'dad_joke': random.choice(ingredient_jokes['general'])
+                'dad_joke': JOKES.general_joke()
             })
 
     return app
@@ -0,0 +1,338 @@
+"""
+Article Store Module
+
+This module keeps a persistent local store of Guardian articles, filled by
+incremental ingestion (see news_parser.ArticleIngestor) rather than by page
+views, so article searches can be answered without an upstream call:
+
+- articles: one row per article (the parsed list fields: title, preview,
+  thumbnail, URL and publication date), keyed by Guardian content id
+- articles_fts: an FTS5 index over title and trail text
+- ingest_state: per ingestion query, the publication-date watermark up to
+  which articles have been ingested, and when the query last ran
+
+Articles are numbered in the order they were first stored (seq), so readers
+that index the corpus can pick up only the articles added since their last
+look (see since()).
+"""
+
+import os
+import re
+import time
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARTICLE_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance",
+                                          "guardian_articles.db")
+
+# Article fields stored, in column order (the keys of NewsParser._parse_articles)
+ARTICLE_FIELDS = ("id", "title", "url", "preview", "thumbnail", "published_at")
+
+_TAG = re.compile(r"<[^>]+>")
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def match_expression(query: str) -> Optional[str]:
+    """
+    Build an FTS5 MATCH expression for a Guardian search query.
+
+    Comma-separated terms are alternatives, as the search endpoint treats
+    them ("food,recipes" matches either); the words of one term must all match.
+
+    Returns:
+        Optional[str]: The expression, or None if the query has no words
+    """
+    alternatives = []
+    for term in query.lower().split(","):
+        tokens = _TOKEN.findall(term)
+        if tokens:
+            alternatives.append("(" + " ".join(f'"{token}"' for token in tokens) + ")")
+    return " OR ".join(alternatives) or None
+
+
+def covers(ingest_query: str, query: str) -> bool:
+    """
+    Whether every article a query matches is also matched by an ingestion query.
+
+    Each comma-separated alternative of query must contain all the words of
+    some alternative of ingest_query ("vegan recipes" is covered by
+    "food,recipes", "salad" is not). A query without words is never covered.
+    """
+    ingested = [set(_TOKEN.findall(term)) for term in ingest_query.lower().split(",")]
+    ingested = [tokens for tokens in ingested if tokens]
+    wanted = [set(_TOKEN.findall(term)) for term in query.lower().split(",")]
+    wanted = [tokens for tokens in wanted if tokens]
+    return bool(wanted) and all(any(tokens <= term for tokens in ingested) for term in wanted)
+
+
+class ArticleStore:
+    """
+    Persistent SQLite store of Guardian articles with full-text search.
+
+    Each thread gets its own connection; the database runs in WAL mode so
+    searches are never blocked by ingestion in another thread or worker.
+
+    Attributes:
+        path (str): Path of the SQLite database file
+        max_age (float): Seconds after an ingestion run that its query's
+            articles are considered current enough to answer searches
+    """
+
+    def __init__(self, path: str = DEFAULT_ARTICLE_STORE_PATH, max_age: float = 2 * 60 * 60):
+        self.path = path
+        self.max_age = max_age
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = {"upserted": 0, "inserted": 0, "local_hits": 0, "local_misses": 0}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            " seq INTEGER PRIMARY KEY,"
+            " id TEXT NOT NULL UNIQUE,"
+            " title TEXT NOT NULL,"
+            " url TEXT,"
+            " preview TEXT,"
+            " thumbnail TEXT,"
+            " published_at TEXT,"
+            " updated_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS ix_articles_published_at ON articles (published_at);"
+            "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+            " title, preview, tokenize='porter unicode61');"
+            "CREATE TABLE IF NOT EXISTS ingest_state ("
+            " query TEXT PRIMARY KEY,"
+            " watermark TEXT,"
+            " ran_at REAL NOT NULL);"
+        )
+        conn.commit()
+
+    @classmethod
+    def from_env(cls) -> Optional["ArticleStore"]:
+        """
+        Build a store configured from environment variables.
+
+        GUARDIAN_ARTICLE_STORE_PATH sets the SQLite file (an empty value
+        disables the store) and GUARDIAN_ARTICLE_STORE_MAX_AGE the seconds an
+        ingestion run keeps its query current.
+
+        Returns:
+            Optional[ArticleStore]: The store, or None if disabled
+        """
+        path = os.getenv("GUARDIAN_ARTICLE_STORE_PATH", DEFAULT_ARTICLE_STORE_PATH)
+        if not path:
+            return None
+        return cls(path, float(os.getenv("GUARDIAN_ARTICLE_STORE_MAX_AGE", 2 * 60 * 60)))
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += amount
+
+    def upsert(self, articles: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add articles, or update the ones already stored.
+
+        An updated article keeps its seq unless its title or preview changed;
+        then it is renumbered, so since() reports it again.
+
+        Args:
+            articles (Iterable[Dict[str, Any]]): Parsed articles (see
+                NewsParser._parse_articles) with at least id and title
+
+        Returns:
+            int: Number of articles that were not stored before
+        """
+        conn = self._connection()
+        upserted = inserted = 0
+        now = time.time()
+        try:
+            with conn:
+                for article in articles:
+                    if not article.get("id") or not article.get("title"):
+                        continue
+                    values = tuple(article.get(field) for field in ARTICLE_FIELDS)
+                    row = conn.execute("SELECT seq, title, preview FROM articles WHERE id = ?",
+                                       (article["id"],)).fetchone()
+                    upserted += 1
+                    if row is None:
+                        cursor = conn.execute(
+                            "INSERT INTO articles (id, title, url, preview, thumbnail, published_at, updated_at)"
+                            " VALUES (?, ?, ?, ?, ?, ?, ?)", values + (now,))
+                        seq = cursor.lastrowid
+                        inserted += 1
+                    else:
+                        seq = row[0]
+                        conn.execute(
+                            "UPDATE articles SET title = ?, url = ?, preview = ?, thumbnail = ?, published_at = ?,"
+                            " updated_at = ? WHERE seq = ?", values[1:] + (now, seq))
+                        if (row[1], row[2]) == (article["title"], article.get("preview")):
+                            continue
+                        # Changed text: renumber, so since() readers re-index it
+                        conn.execute("DELETE FROM articles_fts WHERE rowid = ?", (seq,))
+                        seq = conn.execute("SELECT MAX(seq) + 1 FROM articles").fetchone()[0]
+                        conn.execute("UPDATE articles SET seq = ? WHERE id = ?", (seq, article["id"]))
+                    conn.execute("INSERT INTO articles_fts (rowid, title, preview) VALUES (?, ?, ?)",
+                                 (seq, article["title"], _TAG.sub(" ", article.get("preview") or "")))
+        except sqlite3.Error as e:
+            logger.warning("Article store upsert failed: %s", e)
+            return 0
+        self._count("upserted", upserted)
+        self._count("inserted", inserted)
+        return inserted
+
+    @staticmethod
+    def _article(row: Tuple) -> Dict[str, Any]:
+        return dict(zip(ARTICLE_FIELDS, row))
+
+    def search(self, query: str, limit: int = 10) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Search stored articles.
+
+        Matches are ranked by BM25 with the title weighted above the trail
+        text (with Porter stemming); an empty query returns the newest articles.
+
+        Args:
+            query (str): Guardian search query (see match_expression)
+            limit (int, optional): Articles to return. Defaults to 10.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], int]: The best matches and the total
+                number of matches
+        """
+        columns = ", ".join(f"a.{field}" for field in ARTICLE_FIELDS)
+        conn = self._connection()
+        expression = match_expression(query)
+        if expression is None:
+            total = conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            rows = conn.execute(f"SELECT {columns} FROM articles a ORDER BY a.published_at DESC LIMIT ?",
+                                (limit,)).fetchall()
+            return [self._article(row) for row in rows], total
+
+        source = "articles_fts JOIN articles a ON a.seq = articles_fts.rowid"
+        total = conn.execute(f"SELECT COUNT(*) FROM {source} WHERE articles_fts MATCH ?",
+                             (expression,)).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT {columns} FROM {source} WHERE articles_fts MATCH ?"
+            f" ORDER BY bm25(articles_fts, 4.0, 1.0), a.published_at DESC LIMIT ?",
+            (expression, limit)
+        ).fetchall()
+        return [self._article(row) for row in rows], total
+
+    def search_if_current(self, query: str, limit: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """
+        Answer a search locally if the store is current and holds enough matches.
+
+        The store is current for a query when an ingestion query that covers
+        it (see covers) has ingested articles and last ran within max_age;
+        it answers when it also holds at least limit matches.
+
+        Args:
+            query (str): Guardian search query
+            limit (int, optional): Articles wanted. Defaults to 10.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: The best matches, or None if the
+                store cannot answer
+        """
+        try:
+            ingested = self._connection().execute(
+                "SELECT query FROM ingest_state WHERE watermark IS NOT NULL AND ran_at >= ?",
+                (time.time() - self.max_age,)
+            ).fetchall()
+            if any(covers(ingest_query, query) for ingest_query, in ingested):
+                articles, total = self.search(query, limit)
+                if total >= limit:
+                    self._count("local_hits")
+                    return articles
+        except sqlite3.Error as e:
+            logger.warning("Article store search failed: %s", e)
+        self._count("local_misses")
+        return None
+
+    def since(self, seq: int = 0, limit: Optional[int] = None) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Get articles stored (or re-indexed) after a sequence number.
+
+        Args:
+            seq (int, optional): Last sequence number already seen. Defaults to 0.
+            limit (int, optional): Most articles to return. Defaults to all.
+
+        Returns:
+            List[Tuple[int, Dict[str, Any]]]: (seq, article) pairs in seq order
+        """
+        columns = ", ".join(ARTICLE_FIELDS)
+        rows = self._connection().execute(
+            f"SELECT seq, {columns} FROM articles WHERE seq > ? ORDER BY seq LIMIT ?",
+            (seq, -1 if limit is None else limit)).fetchall()
+        return [(row[0], self._article(row[1:])) for row in rows]
+
+    def get(self, article_id: str) -> Optional[Dict[str, Any]]:
+        """Get a stored article by its Guardian id."""
+        columns = ", ".join(ARTICLE_FIELDS)
+        row = self._connection().execute(f"SELECT {columns} FROM articles WHERE id = ?",
+                                         (article_id,)).fetchone()
+        return self._article(row) if row is not None else None
+
+    def watermark(self, query: str) -> Optional[str]:
+        """Publication date (ISO 8601) up to which a query has been ingested, if any."""
+        row = self._connection().execute("SELECT watermark FROM ingest_state WHERE query = ?",
+                                         (query,)).fetchone()
+        return row[0] if row is not None else None
+
+    def record_run(self, query: str, watermark: Optional[str]) -> None:
+        """
+        Record an ingestion run of a query and the watermark it reached.
+
+        The watermark never moves backwards.
+        """
+        conn = self._connection()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT INTO ingest_state (query, watermark, ran_at) VALUES (?, ?, ?)"
+                    " ON CONFLICT(query) DO UPDATE SET ran_at = excluded.ran_at,"
+                    " watermark = CASE WHEN watermark IS NULL OR excluded.watermark > watermark"
+                    " THEN COALESCE(excluded.watermark, watermark) ELSE watermark END",
+                    (query, watermark, time.time())
+                )
+        except sqlite3.Error as e:
+            logger.warning("Article store run record failed: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get store size, ingestion watermarks and local hit counters.
+
+        Returns:
+            Dict[str, Any]: Articles, newest publication date, watermark and
+                seconds since the last run per ingestion query, articles
+                upserted/inserted and local hits/misses
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+        conn = self._connection()
+        try:
+            stats["articles"], stats["newest"] = conn.execute(
+                "SELECT COUNT(*), MAX(published_at) FROM articles").fetchone()
+            now = time.time()
+            stats["queries"] = {
+                query: {"watermark": watermark, "age_seconds": round(now - ran_at, 1)}
+                for query, watermark, ran_at in conn.execute("SELECT query, watermark, ran_at FROM ingest_state")
+            }
+        except sqlite3.Error as e:
+            stats["error"] = str(e)
+        return stats
@@ -0,0 +1,383 @@
+"""
+Async Spoonacular API Client Module
+
+This module provides an asyncio-native twin of SpoonacularClient built on
+aiohttp. It exposes the same method surface (search_recipes,
+get_recipe_information, get_recipe_nutrition, get_wine_pairing,
+get_random_recipes) over one pooled connector, with a semaphore bounding how
+many upstream requests are in flight at once.
+
+Only the transport is its own: requests go through the response cache,
+request coalescing and point budget of a SpoonacularClient (by default the
+shared one), so sync and async calls hit the same cache entries, coalesce
+with each other and spend from one quota, and responses feed the same local
+recipe catalog. Recipe lookups are sent one per request rather than
+micro-batched; concurrency takes the batcher's place.
+
+Flask routes are synchronous, so the module also provides AsyncBridge, which
+runs the async client on a private event loop thread and lets a route fire
+several calls concurrently and wait for all of them:
+
+    bridge = get_shared_bridge()
+    client = bridge.client
+    info, wine = bridge.gather(client.get_recipe_information(716429),
+                               client.get_wine_pairing("steak"))
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional, Any, Iterable, List, Awaitable, Callable
+
+import aiohttp
+import requests
+
+from api_client import (BaseSpoonacularClient, SpoonacularClient, EndpointLatencyTracker, RETRY_STATUS_CODES,
+                        canonical_request_key, get_shared_client)
+from quota import QuotaExhaustedError, estimate_point_cost
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSpoonacularClient(BaseSpoonacularClient):
+    """
+    asyncio client for the Spoonacular API.
+
+    The aiohttp session is created lazily on first use so that it binds to the
+    event loop the client is actually used from. Cache lookups and quota
+    charges are quick local SQLite calls and run on the event loop.
+
+    Attributes:
+        client (SpoonacularClient): Client whose cache, coalescer, point budget,
+            catalog and latency statistics are shared
+        pool_size (int): Max pooled connections in the aiohttp connector
+        max_concurrency (int): Max upstream requests in flight at once
+    """
+
+    def __init__(self,
+                 client: Optional[SpoonacularClient] = None,
+                 pool_size: Optional[int] = None,
+                 max_concurrency: Optional[int] = None,
+                 connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None,
+                 max_retries: Optional[int] = None,
+                 backoff_factor: Optional[float] = None,
+                 max_backoff: float = 30.0,
+                 base_url: Optional[str] = None):
+        """
+        Initialize the async Spoonacular API client.
+
+        Args:
+            client (SpoonacularClient, optional): Client whose shared components
+                are used. Defaults to get_shared_client().
+            pool_size (int, optional): Max pooled connections (SPOONACULAR_POOL_SIZE, default 10)
+            max_concurrency (int, optional): Max concurrent upstream requests
+                (SPOONACULAR_MAX_CONCURRENCY, default 8)
+            connect_timeout, read_timeout, max_retries, backoff_factor, max_backoff:
+                See BaseSpoonacularClient
+            base_url (str, optional): Defaults to the shared client's base URL
+
+        Raises:
+            ValueError: If the SPOONACULAR_API_KEY environment variable is not set
+        """
+        self.client = client if client is not None else get_shared_client()
+        super().__init__(connect_timeout, read_timeout, max_retries, backoff_factor, max_backoff,
+                         base_url or self.client.base_url)
+        self.latency = self.client.latency
+        self.pool_size = pool_size if pool_size is not None else int(os.getenv("SPOONACULAR_POOL_SIZE", "10"))
+        self.max_concurrency = (max_concurrency if max_concurrency is not None
+                                else int(os.getenv("SPOONACULAR_MAX_CONCURRENCY", "8")))
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Create the pooled session and concurrency semaphore on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size)
+            timeout = aiohttp.ClientTimeout(sock_connect=self.timeout[0], sock_read=self.timeout[1])
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def close(self) -> None:
+        """Close the pooled session and release its connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self) -> "AsyncSpoonacularClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @staticmethod
+    def _encode_params(params: Dict[str, Any]) -> Dict[str, str]:
+        """aiohttp only accepts str/int/float query values, so encode booleans explicitly."""
+        encoded = {}
+        for key, value in params.items():
+            if isinstance(value, bool):
+                encoded[key] = "true" if value else "false"
+            else:
+                encoded[key] = value
+        return encoded
+
+    async def _make_request(self,
+                            endpoint: str,
+                            params: Optional[Dict[str, Any]] = None,
+                            on_response: Optional[Callable[[Any], None]] = None) -> Dict[str, Any]:
+        """
+        Make a request through the shared cache and coalescer.
+
+        Mirrors SpoonacularClient._make_request: cacheable endpoints are
+        answered from the cache, stale entries within their windows included
+        (background refreshes run on the shared client's workers), and on a
+        miss identical sync or async calls in flight are coalesced.
+
+        Args:
+            endpoint (str): API endpoint to call (e.g., "/recipes/search")
+            params (Dict[str, Any], optional): Query parameters for the request
+            on_response (Callable, optional): Called with each response that
+                actually came from upstream (not from the cache)
+
+        Returns:
+            Dict[str, Any]: JSON response from the API
+        """
+        client = self.client
+        key = canonical_request_key(endpoint, params)
+
+        async def fetch() -> Dict[str, Any]:
+            data = await self._send_request(endpoint, params)
+            client._cache_store(endpoint, params, data)
+            if on_response is not None:
+                on_response(data)
+            return data
+
+        async def shared_fetch() -> Dict[str, Any]:
+            if not client.coalesce:
+                return await fetch()
+            return await client._single_flight.do_async(key, fetch)
+
+        if not client._cache_ttl(endpoint):
+            return await shared_fetch()
+        stale_while_revalidate, stale_if_error = client.STALE_WINDOWS.get(
+            EndpointLatencyTracker.normalize(endpoint), (0, 0))
+        return await client._revalidator.get_async(
+            key, shared_fetch, client._upstream_fetch(endpoint, params, on_response),
+            stale_while_revalidate, stale_if_error,
+            errors=(aiohttp.ClientError, asyncio.TimeoutError, requests.exceptions.RequestException,
+                    QuotaExhaustedError))
+
+    async def _send_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Send a request to the Spoonacular API.
+
+        Retries follow the same policy as SpoonacularClient._send_request,
+        and points are charged to, reconciled with or refunded to the shared
+        quota throttle the same way. The concurrency semaphore is only held
+        while a request is on the wire, not while backing off.
+
+        Args:
+            endpoint (str): API endpoint to call (e.g., "/recipes/search")
+            params (Dict[str, Any], optional): Query parameters for the request
+
+        Returns:
+            Dict[str, Any]: JSON response from the API
+
+        Raises:
+            QuotaExhaustedError: If the point budget cannot cover the request
+            aiohttp.ClientError: If the API request fails
+            asyncio.TimeoutError: If the request times out on the last attempt
+        """
+        throttle = self.client.throttle
+        cost = estimate_point_cost(endpoint, params)
+        if throttle is not None:
+            throttle.acquire(cost)
+
+        params = dict(params or {})
+        params["apiKey"] = self.api_key
+        params = self._encode_params(params)
+        url = f"{self.base_url}{endpoint}"
+        session = self._get_session()
+
+        attempt = 0
+        answered = False
+        while True:
+            async with self._semaphore:
+                started = time.perf_counter()
+                try:
+                    async with session.get(url, params=params) as response:
+                        answered = True
+                        failed = response.status >= 400
+                        if response.status not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                            self.latency.record(endpoint, time.perf_counter() - started, error=failed)
+                            if throttle is not None:
+                                if response.status == 402:
+                                    throttle.mark_exhausted()
+                                else:
+                                    throttle.reconcile(cost, response.headers)
+                            response.raise_for_status()
+                            return await response.json(content_type=None)
+                        self.latency.record(endpoint, time.perf_counter() - started, error=failed)
+                        delay = self._retry_after_delay(response.headers)
+                        if delay is None:
+                            delay = self._backoff_delay(attempt)
+                        logger.warning("Spoonacular %s returned %s; retrying in %.2fs",
+                                       endpoint, response.status, delay)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    self.latency.record(endpoint, time.perf_counter() - started, error=True)
+                    if attempt >= self.max_retries:
+                        if throttle is not None and not answered:
+                            throttle.refund(cost)
+                        raise
+                    delay = self._backoff_delay(attempt)
+                    logger.warning("Spoonacular %s failed (%s); retrying in %.2fs", endpoint, e, delay)
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def search_recipes(self,
+                             query: str,
+                             number: int = 5,
+                             diet: Optional[str] = None,
+                             intolerances: Optional[List[str]] = None,
+                             max_ready_time: Optional[int] = None,
+                             difficulty: Optional[str] = None,
+                             min_calories: Optional[int] = None,
+                             max_calories: Optional[int] = None,
+                             fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Async version of SpoonacularClient.search_recipes."""
+        params = self._search_params(query, number, diet, intolerances, max_ready_time,
+                                     difficulty, min_calories, max_calories, fields)
+        on_response = self.client._search_response_hook(query, self.client._catalog_filters(params))
+        data = await self._make_request("/recipes/complexSearch", params, on_response)
+        if fields is None:
+            return data
+        fields = list(fields)
+        return dict(data, results=[self._project_result(result, fields) for result in data.get("results", [])])
+
+    async def get_recipe_information(self, recipe_id: int) -> Dict[str, Any]:
+        """Async version of SpoonacularClient.get_recipe_information."""
+        return await self._make_request(f"/recipes/{recipe_id}/information", {"includeNutrition": False},
+                                        lambda data: self.client._ingest([data]))
+
+    async def get_recipe_nutrition(self, recipe_id: int) -> Dict[str, Any]:
+        """Async version of SpoonacularClient.get_recipe_nutrition."""
+        return await self._make_request(f"/recipes/{recipe_id}/nutritionWidget.json")
+
+    async def get_wine_pairing(self, food: str) -> Dict[str, Any]:
+        """Async version of SpoonacularClient.get_wine_pairing."""
+        return await self._make_request("/food/wine/pairing", {"food": food})
+
+    async def get_random_recipes(self,
+                                 number: int = 1,
+                                 tags: Optional[List[str]] = None,
+                                 diet: Optional[str] = None,
+                                 intolerances: Optional[List[str]] = None,
+                                 max_ready_time: Optional[int] = None) -> Dict[str, Any]:
+        """Async version of SpoonacularClient.get_random_recipes."""
+        params = self._random_params(number, tags, diet, intolerances, max_ready_time)
+        return await self._make_request("/recipes/random", params,
+                                        lambda data: self.client._harvest(data.get("recipes", [])))
+
+
+class AsyncBridge:
+    """
+    Run an AsyncSpoonacularClient from synchronous code.
+
+    The bridge owns an event loop running in a daemon thread. Coroutines
+    created from ``bridge.client`` in any thread are scheduled on that loop,
+    so a Flask request thread can fan out several upstream calls and block
+    only until the slowest one finishes.
+    """
+
+    def __init__(self,
+                 client_factory: Callable[[], AsyncSpoonacularClient] = AsyncSpoonacularClient,
+                 timeout: Optional[float] = None):
+        """
+        Start the event loop thread and create the client.
+
+        Args:
+            client_factory (Callable, optional): Builds the async client. Defaults to AsyncSpoonacularClient.
+            timeout (float, optional): Default seconds to wait for a result
+                (SPOONACULAR_BRIDGE_TIMEOUT, default 30)
+        """
+        self.timeout = timeout if timeout is not None else float(os.getenv("SPOONACULAR_BRIDGE_TIMEOUT", "30"))
+        self.client = client_factory()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="spoonacular-async", daemon=True)
+        self._thread.start()
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """
+        Run one coroutine on the bridge loop and wait for its result.
+
+        Args:
+            coro (Awaitable): Coroutine to run, typically from ``bridge.client``
+            timeout (float, optional): Seconds to wait. Defaults to the bridge timeout.
+
+        Returns:
+            Any: The coroutine's result
+
+        Raises:
+            concurrent.futures.TimeoutError: If the result is not ready in time
+                (the coroutine is cancelled)
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout or self.timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def gather(self, *coros: Awaitable[Any], return_exceptions: bool = False,
+               timeout: Optional[float] = None) -> List[Any]:
+        """
+        Run several coroutines concurrently and return their results in order.
+
+        Args:
+            *coros (Awaitable): Coroutines to run
+            return_exceptions (bool, optional): Return exceptions in place of
+                results instead of raising the first one. Defaults to False.
+            timeout (float, optional): Seconds to wait for all of them
+
+        Returns:
+            List[Any]: Results in the same order as ``coros``
+        """
+        async def _gather() -> List[Any]:
+            return await asyncio.gather(*coros, return_exceptions=return_exceptions)
+
+        return self.run(_gather(), timeout)
+
+    def close(self) -> None:
+        """Close the client, stop the loop and join its thread."""
+        if not self._loop.is_running():
+            return
+        try:
+            self.run(self.client.close(), timeout=5)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+
+
+_shared_bridge: Optional[AsyncBridge] = None
+_shared_bridge_lock = threading.Lock()
+
+
+def get_shared_bridge() -> AsyncBridge:
+    """
+    Get the process-wide AsyncBridge, starting its loop thread on first use.
+
+    Returns:
+        AsyncBridge: The shared bridge
+
+    Raises:
+        ValueError: If the SPOONACULAR_API_KEY environment variable is not set
+    """
+    global _shared_bridge
+    if _shared_bridge is None:
+        with _shared_bridge_lock:
+            if _shared_bridge is None:
+                _shared_bridge = AsyncBridge()
+    return _shared_bridge
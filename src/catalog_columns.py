@@ -0,0 +1,278 @@
+"""
+Catalog Columns Module
+
+This module keeps columnar NumPy copies of the recipe catalog's filterable
+columns, so diet, intolerance, ready-time and calorie filters run as a
+single vectorized mask instead of a SQLite scan:
+
+- ids (int64, ascending)
+- ready_in_minutes (int32, -1 when unknown)
+- calories (float32, NaN when unknown)
+- servings (int16, -1 when unknown)
+- flags (int64, the diet/intolerance bitmask from recipe_catalog.recipe_flags)
+- complete (bool, whether the payload is a complete detail record)
+
+The arrays are saved as .npy files in a versioned snapshot directory and
+memory-mapped read-only, so every worker process shares one copy through the
+page cache. A snapshot is rebuilt from SQLite when the catalog has changed,
+checked at most every max_age seconds; the "current" pointer file is
+replaced atomically, so readers never see a half-written snapshot.
+"""
+
+import os
+import json
+import time
+import shutil
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from recipe_catalog import RecipeCatalog
+
+logger = logging.getLogger(__name__)
+
+# Column name -> dtype of each saved array
+COLUMNS = {
+    "ids": np.int64,
+    "ready_in_minutes": np.int32,
+    "calories": np.float32,
+    "servings": np.int16,
+    "flags": np.int64,
+    "complete": np.bool_
+}
+
+_POINTER = "current"
+
+
+def write_snapshot(directory: str, columns: Dict[str, np.ndarray], version: float = 0.0) -> str:
+    """
+    Save a set of columns as a new snapshot and make it current.
+
+    Args:
+        directory (str): Columns directory
+        columns (Dict[str, np.ndarray]): One array per COLUMNS entry, all the
+            same length and ordered by ascending id
+        version (float, optional): Catalog version the snapshot reflects
+
+    Returns:
+        str: Path of the snapshot directory
+    """
+    os.makedirs(directory, exist_ok=True)
+    name = f"v{time.time_ns()}-{os.getpid()}"
+    snapshot = os.path.join(directory, name)
+    os.makedirs(snapshot)
+    for column, dtype in COLUMNS.items():
+        np.save(os.path.join(snapshot, f"{column}.npy"), np.ascontiguousarray(columns[column], dtype=dtype))
+    with open(os.path.join(snapshot, "meta.json"), "w") as f:
+        json.dump({"version": version, "rows": int(len(columns["ids"]))}, f)
+
+    pointer = os.path.join(directory, _POINTER)
+    with open(f"{pointer}.{name}.tmp", "w") as f:
+        f.write(name)
+    os.replace(f"{pointer}.{name}.tmp", pointer)
+
+    # Older snapshots stay readable by processes that still map them
+    # (unlinking a mapped file is safe on POSIX)
+    for entry in os.listdir(directory):
+        path = os.path.join(directory, entry)
+        if entry != name and entry.startswith("v") and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+    return snapshot
+
+
+class CatalogColumns:
+    """
+    Memory-mapped columnar view of a RecipeCatalog for vectorized filtering.
+
+    Attributes:
+        catalog (RecipeCatalog): Catalog the columns are built from
+        directory (str): Directory holding the snapshots
+        max_age (float): Seconds between checks for catalog changes
+    """
+
+    def __init__(self, catalog: RecipeCatalog, directory: Optional[str] = None, max_age: float = 60.0):
+        self.catalog = catalog
+        self.directory = directory or f"{catalog.path}.columns"
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._columns: Optional[Dict[str, np.ndarray]] = None
+        self._snapshot: Optional[str] = None
+        self._version = -1.0
+        self._checked_at = 0.0
+        self._counters = {"builds": 0, "loads": 0, "filters": 0}
+
+    @classmethod
+    def from_env(cls, catalog: RecipeCatalog) -> "CatalogColumns":
+        """
+        Build columns for a catalog configured from environment variables.
+
+        SPOONACULAR_CATALOG_COLUMNS_DIR sets the snapshot directory (default
+        next to the catalog file) and SPOONACULAR_CATALOG_COLUMNS_MAX_AGE the
+        seconds between change checks.
+        """
+        return cls(catalog, os.getenv("SPOONACULAR_CATALOG_COLUMNS_DIR") or None,
+                   float(os.getenv("SPOONACULAR_CATALOG_COLUMNS_MAX_AGE", "60")))
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """
+        Get the current columns, loading or rebuilding the snapshot if needed.
+
+        Returns:
+            Dict[str, np.ndarray]: Read-only arrays keyed by COLUMNS name
+        """
+        now = time.time()
+        if self._columns is not None and now - self._checked_at < self.max_age:
+            return self._columns
+        with self._lock:
+            if self._columns is not None and now - self._checked_at < self.max_age:
+                return self._columns
+            self._checked_at = now
+            self._load()
+            try:
+                version = self.catalog.version()
+            except sqlite3.Error as e:
+                logger.warning("Recipe catalog version check failed: %s", e)
+                version = self._version
+            if self._columns is None or version > self._version:
+                self._build(version)
+            return self._columns
+
+    def refresh(self) -> None:
+        """Check for catalog changes on the next access, ignoring max_age."""
+        self._checked_at = 0.0
+
+    def _load(self) -> None:
+        """Map the current snapshot if another process (or build) replaced it."""
+        try:
+            with open(os.path.join(self.directory, _POINTER)) as f:
+                name = f.read().strip()
+        except OSError:
+            return
+        snapshot = os.path.join(self.directory, name)
+        if snapshot == self._snapshot:
+            return
+        try:
+            with open(os.path.join(snapshot, "meta.json")) as f:
+                meta = json.load(f)
+            columns = {column: np.load(os.path.join(snapshot, f"{column}.npy"), mmap_mode="r")
+                       for column in COLUMNS}
+        except (OSError, ValueError) as e:
+            logger.warning("Catalog columns snapshot %s unreadable: %s", snapshot, e)
+            return
+        self._columns, self._snapshot, self._version = columns, snapshot, float(meta["version"])
+        self._counters["loads"] += 1
+
+    def _build(self, version: float) -> None:
+        """Export the catalog's filterable columns into a new snapshot."""
+        rows = self.catalog.column_rows()
+        count = len(rows)
+        columns = {
+            "ids": np.fromiter((row[0] for row in rows), np.int64, count),
+            "ready_in_minutes": np.fromiter((-1 if row[1] is None else row[1] for row in rows), np.int32, count),
+            "calories": np.fromiter((np.nan if row[2] is None else row[2] for row in rows), np.float32, count),
+            "servings": np.fromiter((-1 if row[3] is None else row[3] for row in rows), np.int16, count),
+            "flags": np.fromiter((row[4] for row in rows), np.int64, count),
+            "complete": np.fromiter((row[5] for row in rows), np.bool_, count)
+        }
+        try:
+            write_snapshot(self.directory, columns, version)
+        except OSError as e:
+            # Serve from memory until the directory becomes writable
+            logger.warning("Catalog columns snapshot write failed: %s", e)
+            self._columns, self._version = columns, version
+            self._counters["builds"] += 1
+            return
+        self._snapshot = None
+        self._load()
+        self._counters["builds"] += 1
+
+    def mask(self,
+             diet: Optional[str] = None,
+             intolerances: Optional[Iterable[str]] = None,
+             max_ready_time: Optional[int] = None,
+             min_calories: Optional[float] = None,
+             max_calories: Optional[float] = None,
+             complete_only: bool = False) -> np.ndarray:
+        """
+        Evaluate filters over every catalog recipe at once.
+
+        Filters follow RecipeCatalog.search: a recipe whose diet flags,
+        ingredients, ready time or calories are unknown never matches a
+        filter on them.
+
+        Args:
+            diet, intolerances, max_ready_time, min_calories, max_calories:
+                Same filters as SpoonacularClient.search_recipes
+            complete_only (bool, optional): Only match complete detail records
+
+        Returns:
+            np.ndarray: Boolean mask aligned with columns()["ids"]
+        """
+        columns = self.columns()
+        required, forbidden = RecipeCatalog.filter_masks(diet, intolerances)
+        flags = columns["flags"]
+        mask = np.ones(len(flags), dtype=bool)
+        if required:
+            mask &= (flags & required) == required
+        if forbidden:
+            mask &= (flags & forbidden) == 0
+        if max_ready_time:
+            ready = columns["ready_in_minutes"]
+            mask &= (ready >= 0) & (ready <= max_ready_time)
+        # Comparisons with NaN are False, so unknown calories never match
+        if min_calories:
+            mask &= columns["calories"] >= min_calories
+        if max_calories:
+            mask &= columns["calories"] <= max_calories
+        if complete_only:
+            mask &= columns["complete"]
+        self._counters["filters"] += 1
+        return mask
+
+    def filter_ids(self, limit: Optional[int] = None, **filters) -> np.ndarray:
+        """
+        Get the ids of catalog recipes matching filters (see mask).
+
+        Args:
+            limit (int, optional): Return at most this many (lowest) ids
+            **filters: Arguments for mask
+
+        Returns:
+            np.ndarray: Matching recipe ids in ascending order
+        """
+        ids = self.columns()["ids"][self.mask(**filters)]
+        return ids[:limit] if limit is not None else ids
+
+    def sample_ids(self, number: int, rng: Optional[np.random.Generator] = None, **filters) -> List[int]:
+        """
+        Draw distinct random recipe ids matching filters (see mask).
+
+        Args:
+            number (int): Ids wanted
+            rng (np.random.Generator, optional): Random source
+            **filters: Arguments for mask
+
+        Returns:
+            List[int]: Up to number ids, fewer if fewer recipes match
+        """
+        matches = np.flatnonzero(self.mask(**filters))
+        if len(matches) == 0:
+            return []
+        rng = rng or np.random.default_rng()
+        chosen = rng.choice(matches, size=min(number, len(matches)), replace=False)
+        return [int(i) for i in self.columns()["ids"][chosen]]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get snapshot size and build/load/filter counters.
+
+        Returns:
+            Dict[str, Any]: Rows in the mapped snapshot, its catalog version and counters
+        """
+        stats: Dict[str, Any] = dict(self._counters)
+        stats["rows"] = int(len(self._columns["ids"])) if self._columns is not None else 0
+        stats["version"] = self._version
+        return stats
@@ -0,0 +1,228 @@
+"""
+Dad Jokes Module
+
+This module holds the ingredient dad-joke corpus for /random-recipe and
+matches a recipe to its most relevant ingredient. The corpus is compiled
+once, at import, into a lookup table from words and phrases (with plural
+forms) to ingredients, so picking a joke is a single pass over the recipe's
+words whose cost does not grow with the number of corpus entries. Among all
+ingredients mentioned, the one highest in INGREDIENT_PRIORITIES wins, then
+the first matching CATEGORY_TERMS entry; anything else gets a general joke.
+"""
+
+import re
+import random
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+# Ingredient-specific dad jokes, keyed by ingredient
+INGREDIENT_JOKES: Dict[str, List[str]] = {
+    # Pasta & Noodles
+    'pasta': ["What do you call a fake noodle? An impasta! 🍝", "Why did the spaghetti go to the doctor? Because it was feeling a little saucy! 🍝"],
+    'spaghetti': ["What do you call a fake noodle? An impasta! 🍝", "Why did the spaghetti go to the doctor? Because it was feeling a little saucy! 🍝"],
+    'noodle': ["What do you call a fake noodle? An impasta! 🍝", "Why did the noodle go to therapy? It had too many issues to work through! 🍜"],
+    'penne': ["What do you call a fake noodle? An impasta! 🍝", "Why did the penne pasta feel left out? Because it was tubular! 🍝"],
+
+    # Meats
+    'chicken': ["Why did the chicken go to the doctor? Because it was feeling a little under the weather! 🌤️", "What do you call a chicken that crosses the road? A road runner! 🐔"],
+    'beef': ["What do you call a cow that plays hide and seek? A moo-ving target! 🐄", "Why did the cow go to the gym? To get some beef-cake! 💪"],
+    'pork': ["What do you call a pig that does karate? A pork chop! 🥋", "Why did the pig go to the spa? To get a mud bath! 🐷"],
+    'lamb': ["What do you call a sheep that's been in the sun? A sun-baa! 🌞", "Why did the lamb go to school? To get a little sheep-diploma! 🐑"],
+    'turkey': ["What do you call a turkey on Thanksgiving? Dinner! 🦃", "Why did the turkey cross the road? To prove it wasn't chicken! 🦃"],
+
+    # Fish & Seafood
+    'salmon': ["What do you call a fish wearing a bowtie? So-fish-ticated! 🐟", "Why did the salmon blush? Because it saw the ocean's bottom! 🐠"],
+    'tuna': ["What do you call a fish that's good at math? A calcu-lator! 🧮", "Why did the tuna go to the doctor? Because it was feeling a little fishy! 🐟"],
+    'shrimp': ["What do you call a shrimp that's been in the gym? A prawn! 💪", "Why did the shrimp go to the party? Because it was a little shellfish! 🦐"],
+    'cod': ["What do you call a fish that's been in the fridge too long? Cold fish! 🐟", "Why did the cod go to the bank? To get some fishy money! 🐟"],
+
+    # Vegetables
+    'tomato': ["Why did the tomato turn red? Because it saw the salad dressing! 🍅", "What do you call a tomato that's been in the sun? A sun-dried tomato! 🍅"],
+    'lettuce': ["Why did the lettuce win the race? Because it was ahead! 🥬", "What do you call lettuce that's been in the fridge too long? Wilted! 🥬"],
+    'carrot': ["What do you call a carrot that's been in the gym? A buff carrot! 🥕", "Why did the carrot go to the doctor? Because it was feeling a little orange! 🥕"],
+    'onion': ["Why did the onion go to the doctor? Because it was feeling a little tearful! 🧅", "What do you call an onion that's been in the sun? A sun-burned onion! 🧅"],
+    'garlic': ["What do you call garlic that's been in the fridge? Cold garlic! 🧄", "Why did the garlic go to the party? Because it was a little spicy! 🧄"],
+    'potato': ["What do you call a lazy vegetable? A couch potato! 🥔", "Why did the potato go to the doctor? Because it was feeling a little mashed! 🥔"],
+    'broccoli': ["What do you call broccoli that's been in the gym? Buff broccoli! 🥦", "Why did the broccoli go to the doctor? Because it was feeling a little green! 🥦"],
+    'spinach': ["What do you call spinach that's been in the sun? Sun-dried spinach! 🥬", "Why did the spinach go to the party? Because it was a little leafy! 🥬"],
+    'mushroom': ["Why did the mushroom go to the party? Because he was a fungi! 🍄", "What do you call a mushroom that's been in the rain? A wet one! 🍄"],
+
+    # Dairy
+    'cheese': ["What do you call cheese that isn't yours? Nacho cheese! 🧀", "Why did the cheese go to the doctor? Because it was feeling a little blue! 🧀"],
+    'milk': ["What do you call milk that's been in the fridge too long? Sour milk! 🥛", "Why did the milk go to the doctor? Because it was feeling a little curdled! 🥛"],
+    'butter': ["What do you call butter that's been in the sun? Melted butter! 🧈", "Why did the butter go to the party? Because it was a little spread! 🧈"],
+    'cream': ["What do you call cream that's been in the fridge? Cold cream! 🥛", "Why did the cream go to the doctor? Because it was feeling a little whipped! 🥛"],
+
+    # Eggs
+    'egg': ["Why don't eggs tell jokes? They'd crack each other up! 🥚", "What do you call an egg that's been in the fridge too long? Hard-boiled! 🥚"],
+    'eggs': ["Why don't eggs tell jokes? They'd crack each other up! 🥚", "What do you call an egg that's been in the fridge too long? Hard-boiled! 🥚"],
+
+    # Grains & Bread
+    'bread': ["Why did the baker go to the bank? To get some dough! 🥖", "What do you call bread that's been in the oven too long? Toast! 🍞"],
+    'rice': ["What do you call rice that's been in the sun? Sun-dried rice! 🍚", "Why did the rice go to the doctor? Because it was feeling a little grainy! 🍚"],
+    'quinoa': ["What do you call quinoa that's been in the gym? Buff quinoa! 🍚", "Why did the quinoa go to the party? Because it was a little nutty! 🍚"],
+    'oat': ["What do you call oats that's been in the sun? Sun-dried oats! 🥣", "Why did the oats go to the doctor? Because they were feeling a little rolled! 🥣"],
+
+    # Fruits
+    'apple': ["What do you call an apple that's been in the sun? A sun-burned apple! 🍎", "Why did the apple go to the doctor? Because it was feeling a little bruised! 🍎"],
+    'banana': ["What do you call a banana that's been in the sun? A sun-burned banana! 🍌", "Why did the banana go to the doctor? Because it was feeling a little yellow! 🍌"],
+    'orange': ["What do you call an orange that's been in the sun? A sun-burned orange! 🍊", "Why did the orange go to the doctor? Because it was feeling a little peely! 🍊"],
+    'lemon': ["What do you call a lemon that's been in the sun? A sun-burned lemon! 🍋", "Why did the lemon go to the doctor? Because it was feeling a little sour! 🍋"],
+    'lime': ["What do you call a lime that's been in the sun? A sun-burned lime! 🍋", "Why did the lime go to the doctor? Because it was feeling a little green! 🍋"],
+    'grape': ["Why did the grape stop in the middle of the road? Because it ran out of juice! 🍇", "What do you call a grape that's been in the sun? A raisin! 🍇"],
+
+    # Herbs & Spices
+    'basil': ["What do you call basil that's been in the sun? Sun-dried basil! 🌿", "Why did the basil go to the party? Because it was a little herby! 🌿"],
+    'oregano': ["What do you call oregano that's been in the sun? Sun-dried oregano! 🌿", "Why did the oregano go to the doctor? Because it was feeling a little spicy! 🌿"],
+    'thyme': ["What do you call thyme that's been in the sun? Sun-dried thyme! 🌿", "Why did the thyme go to the party? Because it was a little herby! 🌿"],
+    'rosemary': ["What do you call rosemary that's been in the sun? Sun-dried rosemary! 🌿", "Why did the rosemary go to the doctor? Because it was feeling a little woody! 🌿"],
+    'pepper': ["What do you call pepper that's been in the sun? Sun-dried pepper! 🌶️", "Why did the pepper go to the party? Because it was a little spicy! 🌶️"],
+    'salt': ["What do you call salt that's been in the sun? Sun-dried salt! 🧂", "Why did the salt go to the doctor? Because it was feeling a little salty! 🧂"],
+
+    # Nuts & Seeds
+    'almond': ["What do you call an almond that's been in the sun? A sun-burned almond! 🥜", "Why did the almond go to the doctor? Because it was feeling a little nutty! 🥜"],
+    'walnut': ["What do you call a walnut that's been in the sun? A sun-burned walnut! 🥜", "Why did the walnut go to the party? Because it was a little nutty! 🥜"],
+    'peanut': ["What do you call a peanut that's been in the sun? A sun-burned peanut! 🥜", "Why did the peanut go to the doctor? Because it was feeling a little nutty! 🥜"],
+
+    # Desserts & Sweeteners
+    'chocolate': ["What do you call chocolate that's been in the sun? Melted chocolate! 🍫", "Why did the chocolate go to the doctor? Because it was feeling a little sweet! 🍫"],
+    'sugar': ["What do you call sugar that's been in the sun? Sun-dried sugar! 🍯", "Why did the sugar go to the party? Because it was a little sweet! 🍯"],
+    'honey': ["What do you call honey that's been in the sun? Sun-dried honey! 🍯", "Why did the honey go to the doctor? Because it was feeling a little sticky! 🍯"],
+
+    # Beverages
+    'coffee': ["Why did the coffee file a police report? It got mugged! ☕", "What do you call coffee that's been in the fridge? Cold brew! ☕"],
+    'tea': ["What do you call tea that's been in the sun? Sun tea! ☕", "Why did the tea go to the doctor? Because it was feeling a little steeped! ☕"],
+    'wine': ["What do you call wine that's been in the sun? Sun-dried wine! 🍷", "Why did the wine go to the party? Because it was a little grape! 🍷"],
+
+    # General fallbacks
+    'general': [
+        "Why did the chef go to the doctor? Because he was feeling a little under the weather! 🌤️",
+        "What do you call a can opener that doesn't work? A can't opener! 🥫",
+        "Why did the grape stop in the middle of the road? Because it ran out of juice! 🍇",
+        "What do you call a lazy kangaroo? A pouch potato! 🦘",
+        "Why did the scarecrow win an award? Because he was outstanding in his field! 🌾",
+        "What do you call a dinosaur that crashes his car? Tyrannosaurus wrecks! 🦖",
+        "Why did the math book look so sad? Because it had too many problems! 📚",
+        "What do you call a bear with no teeth? A gummy bear! 🐻",
+        "Why did the cookie go to the doctor? Because it was feeling crumbly! 🍪",
+        "What do you call a fish wearing a bowtie? So-fish-ticated! 🐟"
+    ]}
+
+# Ingredients in priority order (most specific first)
+INGREDIENT_PRIORITIES = [
+    # Specific ingredients that should take priority
+    'salmon', 'tuna', 'shrimp', 'cod', 'pork', 'lamb', 'turkey',
+    'tomato', 'lettuce', 'carrot', 'onion', 'garlic', 'potato', 'broccoli', 'spinach',
+    'mushroom', 'apple', 'banana', 'orange', 'lemon', 'lime', 'grape',
+    'basil', 'oregano', 'thyme', 'rosemary', 'pepper', 'salt',
+    'almond', 'walnut', 'peanut', 'chocolate', 'honey',
+    'quinoa', 'oat', 'tea', 'wine',
+    # General categories
+    'pasta', 'spaghetti', 'noodle', 'penne',
+    'chicken', 'beef', 'fish', 'cheese', 'milk', 'butter', 'cream',
+    'egg', 'eggs', 'bread', 'rice', 'coffee', 'sugar'
+]
+
+# Broader categories tried after every ingredient: (label, joke key, terms)
+CATEGORY_TERMS = [
+    ('pasta', 'pasta', ['pasta', 'spaghetti', 'noodle', 'penne', 'fettuccine', 'linguine']),
+    ('chicken', 'chicken', ['chicken', 'poultry', 'breast', 'thigh', 'wing']),
+    ('beef', 'beef', ['beef', 'steak', 'burger', 'meatball', 'roast']),
+    ('fish', 'salmon', ['fish', 'seafood']),
+    ('dessert', 'chocolate', ['dessert', 'cake', 'cookie', 'pie', 'ice cream']),
+    ('bread', 'bread', ['bread', 'toast', 'sandwich', 'bun', 'roll']),
+    ('cheese', 'cheese', ['cheese', 'cheddar', 'mozzarella', 'parmesan']),
+    ('eggs', 'eggs', ['egg', 'omelette', 'scrambled']),
+    ('vegetarian', 'tomato', ['vegetarian', 'vegan', 'salad', 'vegetable', 'tofu'])
+]
+
+GENERAL = 'general'
+
+_WORD = re.compile(r"[a-z]+")
+
+
+def _forms(term: str) -> List[str]:
+    """A term plus the plural forms recipes commonly use."""
+    forms = [term, f"{term}s", f"{term}es"]
+    if term.endswith("y"):
+        forms.append(f"{term[:-1]}ies")
+    return forms
+
+
+class JokeMatcher:
+    """
+    Pick the highest-priority ingredient a text mentions, in one pass.
+
+    Terms match whole words only ("tea" does not match "steak"), multi-word
+    terms match consecutive words, and plurals match their singular.
+    """
+
+    def __init__(self,
+                 jokes: Dict[str, List[str]],
+                 priorities: Sequence[str],
+                 categories: Iterable[Tuple[str, str, Iterable[str]]] = (),
+                 fallback: str = GENERAL):
+        """
+        Args:
+            jokes (Dict[str, List[str]]): Jokes keyed by ingredient; must include fallback
+            priorities (Sequence[str]): Ingredients in priority order; those
+                without jokes are ignored
+            categories (Iterable[Tuple]): (label, joke key, terms) tried, in
+                order, after every ingredient in priorities
+            fallback (str, optional): Joke key when nothing matches. Defaults to "general".
+        """
+        self.jokes = jokes
+        self.fallback = fallback
+        # Term -> (rank, label, joke key); lower rank wins. Single words are
+        # found by set intersection, the few multi-word terms by one regex.
+        self._terms: Dict[str, Tuple[int, str, str]] = {}
+        entries = [(term, term, [term]) for term in priorities if term in jokes]
+        entries += [(label, key, list(terms)) for label, key, terms in categories if key in jokes]
+        for rank, (label, key, terms) in enumerate(entries):
+            for term in terms:
+                for form in _forms(term.lower()):
+                    form = " ".join(_WORD.findall(form))
+                    if form and form not in self._terms:
+                        self._terms[form] = (rank, label, key)
+        self._words = frozenset(term for term in self._terms if " " not in term)
+        phrases = sorted((term for term in self._terms if " " in term), key=len, reverse=True)
+        self._phrases = re.compile(r"\b(?:%s)\b" % "|".join(map(re.escape, phrases))) if phrases else None
+
+    def match(self, text: str) -> Tuple[str, List[str]]:
+        """
+        Find the highest-priority ingredient mentioned in a text.
+
+        Args:
+            text (str): Text to scan
+
+        Returns:
+            Tuple[str, List[str]]: The matched label (or the fallback key) and its jokes
+        """
+        words = _WORD.findall(text.lower())
+        found = set(words) & self._words
+        if self._phrases is not None:
+            found.update(self._phrases.findall(" ".join(words)))
+        if not found:
+            return self.fallback, self.jokes[self.fallback]
+        _, label, key = min(self._terms[term] for term in found)
+        return label, self.jokes[key]
+
+    def match_recipe(self, recipe: Dict[str, Any]) -> Tuple[str, List[str]]:
+        """Match a recipe by its title, summary and ingredient names (see match)."""
+        return self.match(recipe_text(recipe))
+
+    def general_joke(self, rng: Any = random) -> str:
+        """A random fallback joke."""
+        return rng.choice(self.jokes[self.fallback])
+
+
+def recipe_text(recipe: Dict[str, Any]) -> str:
+    """Title, summary and ingredient names/lines of a recipe payload, as one string."""
+    parts = [recipe.get('title') or '', recipe.get('summary') or '']
+    for ingredient in recipe.get('extendedIngredients') or []:
+        parts.append(str(ingredient.get('name', '')))
+        parts.append(str(ingredient.get('original', '')))
+    return ' '.join(parts)
+
+
+# Compiled once per process, at import
+JOKES = JokeMatcher(INGREDIENT_JOKES, INGREDIENT_PRIORITIES, CATEGORY_TERMS)
@@ -3,17 +3,32 @@ Data Parser Module for Spoonacular API Responses
 
 This module handles the parsing and formatting of data received from the Spoonacular API.
 It provides functions to:
-1. Parse search results into a simplified format
+1. Parse search results into a simplified format, whole or one at a time
 2. Parse detailed recipe information into a structured format
-3. Format recipe information for display
+3. Parse either into immutable records (see recipe_models.py)
+4. Format recipe information for display
 
 The module focuses on extracting relevant information and presenting it in a
 user-friendly format while handling missing or invalid data gracefully.
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Iterator, Optional
 
-def parse_recipe_search_results(search_results: Dict[str, Any]) -> List[Dict[str, Any]]:
+from recipe_models import RecipeSummary, RecipeDetail
+
+# Raw complexSearch result fields used by the results grid, mapped to the keys
+# parse_recipe_search_results produces. Pass these as search_recipes(fields=...)
+# to request only what the grid shows.
+SEARCH_RESULT_FIELDS = {
+    "id": "id",
+    "title": "title",
+    "image": "image",
+    "readyInMinutes": "ready_in_minutes",
+    "servings": "servings"
+}
+
+def parse_recipe_search_results(search_results: Dict[str, Any],
+                                fields: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
     """
     Parse recipe search results into a simplified format.
     
@@ -24,29 +39,84 @@ def parse_recipe_search_results(search_results: Dict[str, Any]) -> List[Dict[str
     Args:
         search_results (Dict[str, Any]): Raw search results from the API containing
             a 'results' list of recipe previews
+        fields (Iterable[str], optional): Raw result fields to keep, e.g. the
+            ones a lean search requested (see SEARCH_RESULT_FIELDS). Defaults
+            to all of them.
         
     Returns:
-        List[Dict[str, Any]]: List of simplified recipe information, each containing:
+        List[Dict[str, Any]]: List of simplified recipe information, each containing
+            (or, with fields, only the requested ones of):
             - id: Recipe identifier
             - title: Recipe name
             - image: URL to recipe image
             - ready_in_minutes: Cooking time
             - servings: Number of servings
     """
-    recipes = []
-    
-    # Iterate through results, extracting relevant information
-    for result in search_results.get("results", []):
-        recipe = {
-            "id": result.get("id"),
-            "title": result.get("title"),
-            "image": result.get("image"),
-            "ready_in_minutes": result.get("readyInMinutes"),
-            "servings": result.get("servings")
-        }
-        recipes.append(recipe)
+    return list(iter_recipe_search_results(search_results.get("results", []), fields))
+
+def iter_recipe_search_results(results: Iterable[Dict[str, Any]],
+                               fields: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Parse search results one at a time, e.g. as they stream in.
+    
+    Args:
+        results (Iterable[Dict[str, Any]]): Raw recipe previews, such as
+            SpoonacularClient.iter_search_results yields
+        fields (Iterable[str], optional): Raw result fields to keep. Defaults
+            to all of SEARCH_RESULT_FIELDS.
+        
+    Yields:
+        Dict[str, Any]: Simplified recipe information, as in parse_recipe_search_results
+    """
+    wanted = SEARCH_RESULT_FIELDS
+    if fields is not None:
+        fields = set(fields)
+        wanted = {field: parsed for field, parsed in SEARCH_RESULT_FIELDS.items() if field in fields}
+    for result in results:
+        yield {parsed: result.get(field) for field, parsed in wanted.items()}
+
+def parse_recipe_summaries(search_results: Dict[str, Any]) -> List[RecipeSummary]:
+    """
+    Parse recipe search results into RecipeSummary records.
+    
+    Holds the same information as parse_recipe_search_results: fields a
+    lean result did not provide are None.
     
-    return recipes
+    Args:
+        search_results (Dict[str, Any]): Raw search results with a 'results' list
+        
+    Returns:
+        List[RecipeSummary]: One record per result
+    """
+    return list(iter_recipe_summaries(search_results.get("results", [])))
+
+def iter_recipe_summaries(results: Iterable[Dict[str, Any]]) -> Iterator[RecipeSummary]:
+    """
+    Parse search results into RecipeSummary records one at a time, e.g. as they stream in.
+    
+    Args:
+        results (Iterable[Dict[str, Any]]): Raw recipe previews
+        
+    Yields:
+        RecipeSummary: One record per result
+    """
+    for result in results:
+        yield RecipeSummary.from_api(result)
+
+def parse_recipe_record(recipe_details: Dict[str, Any]) -> RecipeDetail:
+    """
+    Parse detailed recipe information into a RecipeDetail record.
+    
+    The record holds the same information as parse_recipe_details() returns,
+    and RecipeDetail.to_dict() reproduces that dict exactly.
+    
+    Args:
+        recipe_details (Dict[str, Any]): Raw recipe details from the API
+        
+    Returns:
+        RecipeDetail: The parsed recipe
+    """
+    return RecipeDetail.from_api(recipe_details)
 
 def parse_recipe_details(recipe_details: Dict[str, Any]) -> Dict[str, Any]:
     """
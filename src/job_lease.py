@@ -0,0 +1,147 @@
+"""
+Job Lease Module
+
+Background jobs such as the Guardian feed refresh and article ingestion run
+in every worker process, but only one of them should call upstream. A
+JobLease is a named, expiring lease in a SQLite file shared by every process
+on the host: the holder renews it each time it runs, and the other workers
+skip the upstream work (reading what the holder wrote instead) until it
+expires, for example because the holder's process exited.
+
+The holder is identified by host and process id, so a process forked from
+the holder is not mistaken for it.
+"""
+
+import os
+import time
+import socket
+import sqlite3
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "job_leases.db")
+
+
+class JobLease:
+    """
+    A named lease held by at most one process at a time.
+
+    Every acquire runs inside a BEGIN IMMEDIATE transaction, so two workers
+    cannot both take an expired lease. A connection is opened per call,
+    since the lease is checked at most once per job run and connections
+    must not be shared with forked children.
+
+    Attributes:
+        name (str): Lease name, one per job
+        path (str): SQLite file holding the leases
+    """
+
+    def __init__(self, name: str, path: str = DEFAULT_LEASE_PATH):
+        self.name = name
+        self.path = path
+        self._counters = {"acquired": 0, "renewed": 0, "refused": 0, "errors": 0}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                " name TEXT PRIMARY KEY,"
+                " owner TEXT NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+        finally:
+            conn.close()
+
+    @classmethod
+    def from_env(cls, name: str) -> Optional["JobLease"]:
+        """
+        Build a lease stored at JOB_LEASE_PATH (an empty value disables leasing).
+
+        Args:
+            name (str): Lease name
+
+        Returns:
+            Optional[JobLease]: The lease, or None if disabled (every process
+                then runs the job)
+        """
+        path = os.getenv("JOB_LEASE_PATH", DEFAULT_LEASE_PATH)
+        return cls(name, path) if path else None
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5, isolation_level=None)
+
+    @staticmethod
+    def owner() -> str:
+        """Identity of the calling process."""
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def acquire(self, ttl: float) -> bool:
+        """
+        Take or renew the lease for ttl seconds, unless another process holds it.
+
+        A lease that cannot be read is treated as acquired, so a broken lease
+        file never stops the job altogether.
+
+        Args:
+            ttl (float): Seconds the lease is held without another acquire
+
+        Returns:
+            bool: True if the calling process holds the lease
+        """
+        owner, now = self.owner(), time.time()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute("SELECT owner, expires_at FROM leases WHERE name = ?", (self.name,)).fetchone()
+                if row is not None and row[0] != owner and row[1] > now:
+                    conn.execute("COMMIT")
+                    self._counters["refused"] += 1
+                    return False
+                conn.execute("INSERT OR REPLACE INTO leases (name, owner, expires_at) VALUES (?, ?, ?)",
+                             (self.name, owner, now + ttl))
+                conn.execute("COMMIT")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning("Lease %s could not be checked: %s", self.name, e)
+            self._counters["errors"] += 1
+            return True
+        self._counters["renewed" if row is not None and row[0] == owner else "acquired"] += 1
+        return True
+
+    def release(self) -> None:
+        """Give up the lease if the calling process holds it."""
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (self.name, self.owner()))
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning("Lease %s could not be released: %s", self.name, e)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get lease counters.
+
+        Returns:
+            Dict[str, Any]: Acquires, renewals, refusals and errors in this
+                process, plus holder (the current owner, None if unheld)
+        """
+        stats: Dict[str, Any] = dict(self._counters)
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute("SELECT owner, expires_at FROM leases WHERE name = ?", (self.name,)).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            row = None
+        stats["holder"] = row[0] if row is not None and row[1] > time.time() else None
+        return stats
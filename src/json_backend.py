@@ -0,0 +1,112 @@
+"""
+JSON Backend Module
+
+This module picks the fastest available JSON implementation: orjson when it
+is installed (an optional dependency), the standard library json module
+otherwise. Setting JSON_BACKEND=json forces the standard library.
+
+Dataclass records (see recipe_models.py) serialize directly with either
+backend, and RecordJSONProvider plugs the backend into Flask's jsonify.
+"""
+
+import os
+import json
+import dataclasses
+from typing import Any, Callable, Optional, Union
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib json module
+    orjson = None
+
+if os.getenv("JSON_BACKEND", "").lower() == "json":
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+# orjson options matching the stdlib behaviour callers rely on: dict keys may
+# be ints, and datetimes are left to the default hook (Flask formats them as
+# HTTP dates, orjson would use ISO 8601). Dataclasses go through the default
+# hook too: a record's own to_dict() is faster than orjson's generic path for
+# slotted dataclasses.
+_ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+                   | orjson.OPT_PASSTHROUGH_DATACLASS) if orjson is not None else 0
+
+
+def record_default(obj: Any) -> Any:
+    """
+    Convert a dataclass record to a dict, using its to_dict() when it has one.
+
+    Raises:
+        TypeError: If the object is not a dataclass instance
+    """
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        to_dict = getattr(obj, "to_dict", None)
+        if to_dict is not None:
+            return to_dict()
+        return {field.name: getattr(obj, field.name) for field in dataclasses.fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _with_records(default: Optional[Callable[[Any], Any]]) -> Callable[[Any], Any]:
+    """A default hook that handles records, then defers to default."""
+    if default is None:
+        return record_default
+
+    def hook(obj: Any) -> Any:
+        if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+            return record_default(obj)
+        return default(obj)
+
+    return hook
+
+
+def dumps_bytes(obj: Any, default: Optional[Callable[[Any], Any]] = None, sort_keys: bool = False) -> bytes:
+    """
+    Serialize to compact UTF-8 JSON.
+
+    Args:
+        obj (Any): Value to serialize; dataclass records are supported
+        default (Callable, optional): Hook for other unsupported types
+        sort_keys (bool, optional): Sort dict keys. Defaults to False.
+
+    Returns:
+        bytes: The JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_with_records(default),
+                            option=_ORJSON_OPTIONS | (orjson.OPT_SORT_KEYS if sort_keys else 0))
+    return dumps(obj, default, sort_keys).encode("utf-8")
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None, sort_keys: bool = False) -> str:
+    """Serialize to a compact JSON string (see dumps_bytes)."""
+    if orjson is not None:
+        return dumps_bytes(obj, default, sort_keys).decode("utf-8")
+    return json.dumps(obj, default=_with_records(default), separators=(",", ":"),
+                      ensure_ascii=False, sort_keys=sort_keys)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class RecordJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that uses the fast backend for compact responses."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # Pretty-printed (debug) or otherwise customized output keeps the stdlib path
+        if orjson is None or kwargs:
+            kwargs.setdefault("default", _with_records(self.default))
+            return super().dumps(obj, **kwargs)
+        return dumps(obj, self.default, self.sort_keys)
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
@@ -0,0 +1,149 @@
+"""
+JSON Stream Module
+
+This module parses the recipe array of a JSON response incrementally, so
+large search, random and bulk-information responses can be consumed one
+recipe at a time while they download. Only the recipe being decoded (plus
+at most one network chunk) is held in memory, whatever the response size.
+
+The document is walked with json.JSONDecoder.raw_decode: top-level members
+other than the streamed array (e.g. totalResults) are decoded whole and kept
+in JSONArrayStream.fields, and each array element is decoded as soon as its
+closing bracket has arrived.
+"""
+
+import json
+import codecs
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+_WHITESPACE = " \t\n\r"
+
+
+class JSONArrayStream:
+    """
+    Iterate over the elements of a JSON array as its document arrives.
+
+    Attributes:
+        key (str): Top-level member holding the array, or None when the
+            document itself is the array
+        fields (Dict[str, Any]): The document's other top-level members;
+            complete once iteration has finished
+        bytes_read (int): Bytes consumed from the source so far
+    """
+
+    def __init__(self, chunks: Iterable[bytes], key: Optional[str] = None):
+        """
+        Args:
+            chunks (Iterable[bytes]): The raw document, e.g. response.iter_content()
+            key (str, optional): Top-level member holding the array. Defaults to
+                None (the document is a top-level array).
+        """
+        self.key = key
+        self.fields: Dict[str, Any] = {}
+        self.bytes_read = 0
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._exhausted = False
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Yield each array element in order.
+
+        Raises:
+            ValueError: If the document is not valid JSON or lacks the array
+        """
+        if self.key is None:
+            yield from self._array()
+            self._expect_end()
+            return
+
+        self._expect("{")
+        found = False
+        if not self._consume("}"):
+            while True:
+                name = self._value()
+                if not isinstance(name, str):
+                    raise ValueError("Expected an object key")
+                self._expect(":")
+                if name == self.key and self._peek() == "[":
+                    found = True
+                    yield from self._array()
+                else:
+                    self.fields[name] = self._value()
+                if self._consume("}"):
+                    break
+                self._expect(",")
+        self._expect_end()
+        if not found:
+            raise ValueError(f"Response has no {self.key!r} array")
+
+    def _array(self) -> Iterator[Any]:
+        self._expect("[")
+        if self._consume("]"):
+            return
+        while True:
+            yield self._value()
+            # Drop everything already decoded, keeping memory flat
+            self._buffer, self._pos = self._buffer[self._pos:], 0
+            if self._consume("]"):
+                return
+            self._expect(",")
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer; False once the source is exhausted."""
+        if self._exhausted:
+            return False
+        for chunk in self._chunks:
+            if chunk:
+                self.bytes_read += len(chunk)
+                self._buffer += self._decoder.decode(chunk)
+                return True
+        self._buffer += self._decoder.decode(b"", final=True)
+        self._exhausted = True
+        return False
+
+    def _peek(self) -> str:
+        """The next non-whitespace character, or "" at the end of the document."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _consume(self, char: str) -> bool:
+        if self._peek() == char:
+            self._pos += 1
+            return True
+        return False
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} at byte {self.bytes_read}, found {found or 'end of input'!r}")
+        self._pos += 1
+
+    def _expect_end(self) -> None:
+        if self._peek():
+            raise ValueError("Extra data after the JSON document")
+
+    def _value(self) -> Any:
+        """Decode the next complete JSON value, reading more input as needed."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number running up to the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and not self._exhausted and not isinstance(value, (dict, list, str)):
+                self._fill()
+                continue
+            self._pos = end
+            return value
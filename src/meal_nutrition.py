@@ -0,0 +1,259 @@
+"""
+Meal Plan Nutrition Module
+
+This module aggregates nutrition across many recipes at once. Nutrition
+payloads (the "nutrition" member of /recipes/{id}/information with
+includeNutrition, or a nutritionWidget.json response) are turned into one
+dense recipes x nutrients matrix over a fixed nutrient vocabulary
+(NUTRIENTS), so a whole meal plan is scaled by servings and summed per day
+and per week with a handful of vectorized NumPy operations instead of one
+parse_nutrition_data call and dict merge per meal.
+
+MealPlanNutrition fetches the recipes a plan needs in bulk, keeps each
+recipe's nutrient row, and caches each plan's totals until its items change.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Nutrient vocabulary: (Spoonacular name, unit, FDA daily value for a 2000 kcal diet)
+NUTRIENTS: Tuple[Tuple[str, str, float], ...] = (
+    ("Calories", "kcal", 2000),
+    ("Fat", "g", 78),
+    ("Saturated Fat", "g", 20),
+    ("Carbohydrates", "g", 275),
+    ("Sugar", "g", 50),
+    ("Cholesterol", "mg", 300),
+    ("Sodium", "mg", 2300),
+    ("Protein", "g", 50),
+    ("Fiber", "g", 28),
+    ("Vitamin C", "mg", 90),
+    ("Calcium", "mg", 1300),
+    ("Iron", "mg", 18),
+    ("Potassium", "mg", 4700),
+)
+
+NUTRIENT_INDEX = {name.lower(): column for column, (name, _, _) in enumerate(NUTRIENTS)}
+DAILY_VALUES = np.array([daily_value for _, _, daily_value in NUTRIENTS], dtype=np.float64)
+
+DAYS_PER_WEEK = 7
+
+# Mass units, in grams, for amounts reported in another unit than the vocabulary's
+_GRAMS = {"g": 1.0, "mg": 1e-3, "µg": 1e-6, "mcg": 1e-6}
+
+# (recipe_id, day_of_week, servings)
+PlanItem = Tuple[int, int, float]
+
+
+def _unit_factor(unit: str, target: str) -> float:
+    """Multiplier converting an amount in unit to target (1.0 when unknown or equal)."""
+    if unit == target or unit not in _GRAMS or target not in _GRAMS:
+        return 1.0
+    return _GRAMS[unit] / _GRAMS[target]
+
+
+def nutrition_matrix(payloads: Sequence[Optional[Dict[str, Any]]]) -> np.ndarray:
+    """
+    Build a recipes x nutrients matrix of per-serving amounts.
+
+    Args:
+        payloads (Sequence[Dict[str, Any]]): One nutrition payload per row
+            (with a "nutrients" list); None for a recipe without nutrition
+
+    Returns:
+        np.ndarray: float64 array of shape (len(payloads), len(NUTRIENTS));
+            nutrients a payload does not report are 0
+    """
+    rows, columns, amounts = [], [], []
+    for row, payload in enumerate(payloads):
+        for nutrient in (payload or {}).get("nutrients", []):
+            column = NUTRIENT_INDEX.get(str(nutrient.get("name", "")).lower())
+            if column is None:
+                continue
+            rows.append(row)
+            columns.append(column)
+            amounts.append(float(nutrient.get("amount") or 0)
+                           * _unit_factor(nutrient.get("unit", ""), NUTRIENTS[column][1]))
+    matrix = np.zeros((len(payloads), len(NUTRIENTS)), dtype=np.float64)
+    matrix[rows, columns] = amounts
+    return matrix
+
+
+def plan_totals(matrix: np.ndarray,
+                rows: np.ndarray,
+                days: np.ndarray,
+                servings: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Scale meal rows by servings and total them per day and per week.
+
+    Args:
+        matrix (np.ndarray): Per-serving nutrient matrix (see nutrition_matrix)
+        rows (np.ndarray): Matrix row of each meal
+        days (np.ndarray): Day of week (0=Monday) of each meal
+        servings (np.ndarray): Servings of each meal
+
+    Returns:
+        Dict[str, np.ndarray]: "daily" (7 x nutrients), "weekly" (nutrients),
+            "daily_percent_dv" and "weekly_percent_dv" (weekly totals against
+            seven days of daily values)
+    """
+    scaled = matrix[rows] * servings[:, np.newaxis]
+    daily = np.zeros((DAYS_PER_WEEK, matrix.shape[1]), dtype=np.float64)
+    np.add.at(daily, days, scaled)
+    weekly = daily.sum(axis=0)
+    return {
+        "daily": daily,
+        "weekly": weekly,
+        "daily_percent_dv": daily / DAILY_VALUES * 100,
+        "weekly_percent_dv": weekly / (DAILY_VALUES * DAYS_PER_WEEK) * 100
+    }
+
+
+def plan_items(meals: Iterable[Any]) -> List[PlanItem]:
+    """Normalize MealPlanItem rows (or (recipe_id, day_of_week, servings) tuples) to sorted tuples."""
+    items = []
+    for meal in meals:
+        if isinstance(meal, tuple):
+            recipe_id, day, servings = meal
+        else:
+            recipe_id, day, servings = meal.recipe_id, meal.day_of_week, meal.servings
+        items.append((int(recipe_id), int(day), float(servings or 1)))
+    return sorted(items)
+
+
+class MealPlanNutrition:
+    """
+    Nutrition totals per meal plan, cached until the plan's items change.
+
+    Attributes:
+        max_plans (int): Plan summaries kept; least recently used are dropped
+        max_recipes (int): Recipe nutrient rows kept
+    """
+
+    def __init__(self,
+                 fetch: Callable[[List[int]], Dict[int, Dict[str, Any]]],
+                 max_plans: int = 256,
+                 max_recipes: int = 4096):
+        """
+        Args:
+            fetch (Callable): Called with a list of recipe ids; returns recipe
+                information with nutrition keyed by id, fetching in bulk
+                (e.g. SpoonacularClient.get_recipe_information_bulk)
+            max_plans (int, optional): Plan summaries kept. Defaults to 256.
+            max_recipes (int, optional): Recipe nutrient rows kept. Defaults to 4096.
+        """
+        self.fetch = fetch
+        self.max_plans = max_plans
+        self.max_recipes = max_recipes
+        self._lock = threading.Lock()
+        self._plans: "OrderedDict[Any, Tuple[Tuple[PlanItem, ...], Dict[str, Any]]]" = OrderedDict()
+        self._rows: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._counters = {"requests": 0, "hits": 0, "misses": 0, "invalidations": 0,
+                          "recipes_fetched": 0, "fetches": 0}
+
+    def summarize(self, plan_id: Any, meals: Iterable[Any]) -> Dict[str, Any]:
+        """
+        Nutrition totals for a meal plan.
+
+        Args:
+            plan_id (Any): Cache key of the plan (e.g. MealPlan.id)
+            meals (Iterable): MealPlanItem rows, or (recipe_id, day_of_week,
+                servings) tuples
+
+        Returns:
+            Dict[str, Any]: Plain lists, ready for a template or jsonify:
+                - nutrients: [{"name", "unit", "daily_value"}] in column order
+                - daily, daily_percent_dv: 7 rows (Monday first) of per-nutrient values
+                - weekly, weekly_percent_dv, daily_average: per-nutrient values
+                - meals: Number of meals counted
+                - missing: Recipe ids without nutrition data (counted as 0)
+
+        Raises:
+            Exception: Whatever fetch raises for recipes not seen before
+        """
+        items = tuple(plan_items(meals))
+        with self._lock:
+            self._counters["requests"] += 1
+            cached = self._plans.get(plan_id)
+            if cached is not None and cached[0] == items:
+                self._plans.move_to_end(plan_id)
+                self._counters["hits"] += 1
+                return cached[1]
+            self._counters["misses"] += 1
+
+        summary = self._summarize(items)
+        with self._lock:
+            self._plans[plan_id] = (items, summary)
+            self._plans.move_to_end(plan_id)
+            while len(self._plans) > self.max_plans:
+                self._plans.popitem(last=False)
+        return summary
+
+    def invalidate(self, plan_id: Any) -> None:
+        """Drop a plan's cached totals (call when its items change)."""
+        with self._lock:
+            if self._plans.pop(plan_id, None) is not None:
+                self._counters["invalidations"] += 1
+
+    def _summarize(self, items: Tuple[PlanItem, ...]) -> Dict[str, Any]:
+        recipe_ids = list(dict.fromkeys(recipe_id for recipe_id, _, _ in items))
+        vectors = self._recipe_rows(recipe_ids)
+        missing = [recipe_id for recipe_id in recipe_ids if vectors[recipe_id] is None]
+
+        matrix = np.zeros((len(recipe_ids), len(NUTRIENTS)), dtype=np.float64)
+        for row, recipe_id in enumerate(recipe_ids):
+            if vectors[recipe_id] is not None:
+                matrix[row] = vectors[recipe_id]
+        row_of = {recipe_id: row for row, recipe_id in enumerate(recipe_ids)}
+        rows = np.array([row_of[recipe_id] for recipe_id, _, _ in items], dtype=np.intp)
+        days = np.array([day for _, day, _ in items], dtype=np.intp)
+        servings = np.array([servings for _, _, servings in items], dtype=np.float64)
+
+        totals = plan_totals(matrix, rows, days, servings)
+        return {
+            "nutrients": [{"name": name, "unit": unit, "daily_value": daily_value}
+                          for name, unit, daily_value in NUTRIENTS],
+            "daily": np.round(totals["daily"], 1).tolist(),
+            "daily_percent_dv": np.round(totals["daily_percent_dv"]).astype(int).tolist(),
+            "weekly": np.round(totals["weekly"], 1).tolist(),
+            "weekly_percent_dv": np.round(totals["weekly_percent_dv"]).astype(int).tolist(),
+            "daily_average": np.round(totals["weekly"] / DAYS_PER_WEEK, 1).tolist(),
+            "meals": len(items),
+            "missing": missing
+        }
+
+    def _recipe_rows(self, recipe_ids: List[int]) -> Dict[int, Optional[np.ndarray]]:
+        """Nutrient row per recipe (None without nutrition), fetching unseen recipes in one call."""
+        vectors: Dict[int, Optional[np.ndarray]] = {}
+        with self._lock:
+            for recipe_id in recipe_ids:
+                if recipe_id in self._rows:
+                    self._rows.move_to_end(recipe_id)
+                    vectors[recipe_id] = self._rows[recipe_id]
+        unseen = [recipe_id for recipe_id in recipe_ids if recipe_id not in vectors]
+        if unseen:
+            recipes = self.fetch(unseen)
+            payloads = [(recipes.get(recipe_id) or {}).get("nutrition") for recipe_id in unseen]
+            matrix = nutrition_matrix(payloads)
+            with self._lock:
+                self._counters["fetches"] += 1
+                self._counters["recipes_fetched"] += len(unseen)
+                for row, recipe_id in enumerate(unseen):
+                    # A recipe without nutrition is not remembered, so it is retried next time
+                    vectors[recipe_id] = matrix[row] if payloads[row] else None
+                    if payloads[row]:
+                        self._rows[recipe_id] = matrix[row]
+                        self._rows.move_to_end(recipe_id)
+                while len(self._rows) > self.max_recipes:
+                    self._rows.popitem(last=False)
+        return vectors
+
+    def stats(self) -> Dict[str, Any]:
+        """Plan cache hit rate and recipe fetch counters."""
+        with self._lock:
+            stats = dict(self._counters, plans_cached=len(self._plans), recipes_cached=len(self._rows))
+        stats["hit_rate"] = round(stats["hits"] / stats["requests"], 4) if stats["requests"] else 0.0
+        return stats
@@ -0,0 +1,351 @@
+"""
+News Index Module
+
+This module keeps an in-memory inverted index over the Guardian articles in
+the local article store (see article_store.py), so news related to a recipe
+is found without an upstream call. Each article is indexed by three fields:
+
+- title and preview (trail text): word tokens, lower-cased, with plurals folded
+- ingredients: the INGREDIENT_VOCABULARY entries mentioned in either, as
+  single terms (so "olive oil" does not match every article about oil)
+
+A recipe is matched by its title words, ingredient names and ingredient tags,
+scored with BM25 over field-weighted term frequencies. Per-posting BM25
+impacts are precomputed and kept as NumPy arrays per term, so a lookup sums
+a few arrays with one bincount; terms found in most articles are skipped, as
+they cannot separate them.
+
+The index follows the store incrementally: it only reads articles stored or
+changed since the last sequence number it has seen (see ArticleStore.since).
+Refreshes run on the ingestion thread after every run (see
+news_parser.ArticleIngestor); searches only read what has been indexed.
+"""
+
+import re
+import math
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from article_store import ArticleStore
+
+# Common ingredients recognised in article text, singular
+INGREDIENT_VOCABULARY = (
+    "anchovy", "apple", "apricot", "asparagus", "aubergine", "avocado", "bacon", "banana", "basil",
+    "bean", "beef", "beetroot", "black pepper", "blueberry", "broccoli", "brown sugar", "butter",
+    "butternut squash", "cabbage", "cardamom", "carrot", "cauliflower", "celery", "cheddar", "cherry",
+    "chicken", "chickpea", "chilli", "chocolate", "chorizo", "cinnamon", "coconut", "coconut milk", "cod",
+    "coriander", "courgette", "crab", "cream", "cucumber", "cumin", "dill", "duck", "egg", "fennel", "feta",
+    "fig", "garlic", "ginger", "goat cheese", "ground beef", "halloumi", "ham", "honey", "kale", "lamb",
+    "leek", "lemon", "lentil", "lettuce", "lime", "mango", "maple syrup", "milk", "mint", "miso",
+    "mozzarella", "mushroom", "mussel", "mustard", "noodle", "oat", "olive", "olive oil", "onion", "orange",
+    "oregano", "paprika", "parmesan", "parsley", "pasta", "pea", "peach", "peanut", "pear", "pecan",
+    "pepper", "pesto", "pine nut", "pineapple", "pistachio", "plum", "pomegranate", "pork", "potato",
+    "prawn", "pumpkin", "quinoa", "radish", "raspberry", "rhubarb", "rice", "ricotta", "rosemary", "saffron",
+    "sage", "salmon", "sausage", "sesame", "shallot", "shrimp", "soy sauce", "spinach", "squid",
+    "strawberry", "sweet potato", "tahini", "thyme", "tofu", "tomato", "tuna", "turkey", "turmeric",
+    "vanilla", "vinegar", "walnut", "yoghurt", "yogurt",
+)
+
+# Field weights: a word in the title counts three times one in the preview
+FIELD_WEIGHTS = {"title": 3.0, "preview": 1.0, "ingredients": 2.0}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Terms in more than this fraction of articles are skipped when matching
+MAX_DOCUMENT_FREQUENCY = 0.5
+
+# Precomputed impacts are refreshed once the mean document length drifts this much
+AVERAGE_LENGTH_DRIFT = 0.1
+
+_TAG = re.compile(r"<[^>]+>")
+_WORD = re.compile(r"[a-z]+")
+_STOP_WORDS = frozenset(
+    "a an and are as at be best by for from how in into is it its make of on or our perfect recipe the "
+    "this to with you your".split()
+)
+
+
+def _surface_forms(entry: str) -> List[Tuple[str, ...]]:
+    """Word tuples an entry is written as: singular and plural ("cherry" -> "cherries")."""
+    *head, last = entry.split()
+    if last.endswith("y") and not last.endswith(("ey", "ay", "oy")):
+        plurals = [last, last[:-1] + "ies"]
+    else:
+        plurals = [last, last + "s", last + "es"]
+    return [tuple(head + [plural]) for plural in plurals]
+
+
+# Word tuple -> vocabulary entry, matched longest first so "olive oil" wins over "olive"
+_SURFACE_FORMS = {form: entry for entry in INGREDIENT_VOCABULARY for form in _surface_forms(entry)}
+_LONGEST_FORM = max(len(form) for form in _SURFACE_FORMS)
+_WORD_CHARS = re.compile(r"\w+")
+
+
+def fold_plural(word: str) -> str:
+    """Cheap plural folding: "tomatoes" -> "tomato", "berries" -> "berry"."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith(("oes", "shes", "ches", "xes")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens without stop words, plurals folded."""
+    return [fold_plural(word) for word in _WORD.findall(_TAG.sub(" ", text).lower()) if word not in _STOP_WORDS]
+
+
+def tag_ingredients(text: str) -> List[str]:
+    """
+    Find the INGREDIENT_VOCABULARY entries mentioned in a text.
+
+    Args:
+        text (str): Plain or HTML text
+
+    Returns:
+        List[str]: Canonical (singular) entries, once per mention, in order
+    """
+    words = _WORD_CHARS.findall(_TAG.sub(" ", text).lower())
+    tags = []
+    position = 0
+    while position < len(words):
+        for length in range(min(_LONGEST_FORM, len(words) - position), 0, -1):
+            entry = _SURFACE_FORMS.get(tuple(words[position:position + length]))
+            if entry is not None:
+                tags.append(entry)
+                position += length
+                break
+        else:
+            position += 1
+    return tags
+
+
+def recipe_query(recipe: Any) -> Dict[str, float]:
+    """
+    Weighted query terms for a recipe.
+
+    Args:
+        recipe (Any): A RecipeDetail, a parsed recipe dict ("ingredients"), or a
+            raw Spoonacular payload ("extendedIngredients")
+
+    Returns:
+        Dict[str, float]: Term -> weight; title words weigh twice ingredient
+            words, and ingredient tags ("ingredient:" terms) most
+    """
+    if isinstance(recipe, Mapping):
+        title = recipe.get("title") or ""
+        names = [i.get("name") or "" for i in recipe.get("ingredients") or recipe.get("extendedIngredients") or []]
+    else:
+        title = recipe.title or ""
+        names = [i.name or "" for i in recipe.ingredients]
+    terms: Dict[str, float] = {}
+    for term in tokenize(title):
+        terms[term] = terms.get(term, 0.0) + 2.0
+    for term in tokenize(" ".join(names)):
+        terms[term] = terms.get(term, 0.0) + 1.0
+    for tag in tag_ingredients(" ".join([title] + names)):
+        terms["ingredient:" + tag] = terms.get("ingredient:" + tag, 0.0) + 3.0
+    return terms
+
+
+def article_terms(article: Dict[str, Any]) -> Dict[str, float]:
+    """Field-weighted term frequencies of an article (see FIELD_WEIGHTS)."""
+    title, preview = article.get("title") or "", article.get("preview") or ""
+    frequencies: Dict[str, float] = {}
+    for field, terms in (("title", tokenize(title)), ("preview", tokenize(preview)),
+                         ("ingredients", ["ingredient:" + tag for tag in tag_ingredients(f"{title} {preview}")])):
+        weight = FIELD_WEIGHTS[field]
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0.0) + weight
+    return frequencies
+
+
+class NewsIndex:
+    """
+    In-memory BM25 inverted index over an ArticleStore.
+
+    Safe to share between threads: searches and refreshes take a lock, and
+    a refresh indexes batch_size articles per turn of the lock, so a search
+    never waits for more than one batch, even while the index is first built.
+
+    Attributes:
+        store (ArticleStore): Store the articles are read from
+        batch_size (int): Articles indexed per turn of the lock
+    """
+
+    def __init__(self, store: ArticleStore, batch_size: int = 500):
+        """
+        Args:
+            store (ArticleStore): Store the articles are read from
+            batch_size (int, optional): Articles indexed per turn of the
+                lock. Defaults to 500.
+        """
+        self.store = store
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._articles: List[Optional[Dict[str, Any]]] = []
+        self._slots: Dict[str, int] = {}  # article id -> document number
+        self._terms: List[Dict[str, float]] = []  # document number -> term frequencies
+        self._lengths: List[float] = []
+        self._total_length = 0.0
+        self._postings: Dict[str, Dict[int, float]] = {}  # term -> document number -> BM25 impact
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}  # term -> (documents, impacts), built on search
+        self._average_length = 0.0  # the mean length the impacts were computed with
+        self._counters = {"searches": 0, "refreshes": 0, "indexed": 0, "reindexed": 0}
+
+    def refresh(self) -> int:
+        """
+        Index the articles stored or changed since the last refresh.
+
+        Returns:
+            int: Articles indexed
+        """
+        with self._lock:
+            seq = self._seq
+            self._counters["refreshes"] += 1
+        indexed = 0
+        while True:
+            added = self.store.since(seq, self.batch_size)
+            with self._lock:
+                for seq, article in added:
+                    if seq <= self._seq:
+                        continue  # indexed by a concurrent refresh
+                    self._add(article)
+                    self._seq = seq
+                if added and self._drifted():
+                    self._recompute_impacts()
+            indexed += len(added)
+            if len(added) < self.batch_size:
+                return indexed
+
+    def _add(self, article: Dict[str, Any]) -> None:
+        """Index an article, replacing an earlier version; the caller holds the lock."""
+        slot = self._slots.get(article["id"])
+        if slot is None:
+            slot = self._slots[article["id"]] = len(self._articles)
+            self._articles.append(None)
+            self._terms.append({})
+            self._lengths.append(0.0)
+            self._counters["indexed"] += 1
+        else:
+            for term in self._terms[slot]:
+                self._arrays.pop(term, None)
+                postings = self._postings[term]
+                del postings[slot]
+                if not postings:
+                    del self._postings[term]
+            self._total_length -= self._lengths[slot]
+            self._counters["reindexed"] += 1
+        terms = article_terms(article)
+        length = sum(terms.values())
+        self._articles[slot] = {key: article.get(key) for key in ("id", "title", "url", "preview", "thumbnail",
+                                                                  "published_at")}
+        self._terms[slot] = terms
+        self._lengths[slot] = length
+        self._total_length += length
+        if not self._average_length:
+            self._average_length = length or 1.0
+        for term, frequency in terms.items():
+            self._arrays.pop(term, None)
+            self._postings.setdefault(term, {})[slot] = self._impact(frequency, length)
+
+    def _impact(self, frequency: float, length: float) -> float:
+        """BM25 term-frequency component with length normalization."""
+        norm = K1 * (1 - B + B * length / self._average_length)
+        return frequency * (K1 + 1) / (frequency + norm)
+
+    def _drifted(self) -> bool:
+        average = self._total_length / len(self._articles) if self._articles else 0.0
+        return abs(average - self._average_length) > AVERAGE_LENGTH_DRIFT * self._average_length
+
+    def _recompute_impacts(self) -> None:
+        """Recompute every impact for the current mean length; the caller holds the lock."""
+        self._average_length = (self._total_length / len(self._articles)) or 1.0
+        self._arrays.clear()
+        for slot, terms in enumerate(self._terms):
+            length = self._lengths[slot]
+            for term, frequency in terms.items():
+                self._postings[term][slot] = self._impact(frequency, length)
+
+    def search_terms(self, query: Dict[str, float], limit: int = 3) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Score articles against weighted query terms.
+
+        Only articles indexed by the last refresh are scored; a search never
+        reads the store.
+
+        Args:
+            query (Dict[str, float]): Term -> weight (see recipe_query)
+            limit (int, optional): Articles to return. Defaults to 3.
+
+        Returns:
+            List[Tuple[float, Dict[str, Any]]]: (score, article) pairs, best first
+        """
+        with self._lock:
+            self._counters["searches"] += 1
+            documents = len(self._articles)
+            if not documents:
+                return []
+            slots, impacts = [], []
+            for term, weight in query.items():
+                postings = self._postings.get(term)
+                if not postings or len(postings) > MAX_DOCUMENT_FREQUENCY * documents:
+                    continue
+                idf = math.log(1 + (documents - len(postings) + 0.5) / (len(postings) + 0.5))
+                term_slots, term_impacts = self._posting_arrays(term, postings)
+                slots.append(term_slots)
+                impacts.append(term_impacts * (weight * idf))
+            if not slots:
+                return []
+            scores = np.bincount(np.concatenate(slots), weights=np.concatenate(impacts), minlength=documents)
+            if limit < documents:
+                candidates = np.argpartition(scores, -limit)[-limit:]
+            else:
+                candidates = np.arange(documents)
+            best = sorted((int(slot) for slot in candidates if scores[slot] > 0), key=lambda slot: (-scores[slot], slot))
+            return [(round(float(scores[slot]), 4), dict(self._articles[slot])) for slot in best]
+
+    def _posting_arrays(self, term: str, postings: Dict[int, float]) -> Tuple[np.ndarray, np.ndarray]:
+        """A term's postings as (document numbers, impacts) arrays; the caller holds the lock."""
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            arrays = self._arrays[term] = (np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                                           np.fromiter(postings.values(), dtype=np.float64, count=len(postings)))
+        return arrays
+
+    def match_recipe(self, recipe: Any, limit: int = 3) -> List[Dict[str, Any]]:
+        """
+        Find the articles most related to a recipe.
+
+        Args:
+            recipe (Any): A RecipeDetail, parsed recipe dict or raw payload (see recipe_query)
+            limit (int, optional): Articles to return. Defaults to 3.
+
+        Returns:
+            List[Dict[str, Any]]: Parsed articles, best match first
+        """
+        return [article for _, article in self.search_terms(recipe_query(recipe), limit)]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get index size and counters.
+
+        Returns:
+            Dict[str, Any]: Articles, terms and postings indexed, the last
+                store sequence number seen, searches, refreshes, and articles
+                indexed and re-indexed
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            stats["articles"] = len(self._articles)
+            stats["terms"] = len(self._postings)
+            stats["postings"] = sum(len(postings) for postings in self._postings.values())
+            stats["seq"] = self._seq
+        return stats
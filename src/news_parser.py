@@ -3,24 +3,333 @@ News Parser Module for The Guardian API
 
 This module handles fetching and parsing news data from The Guardian
 API, focusing on food, cooking, and culinary culture.
+
+Popular recipe articles are cached and served stale-while-revalidate, so an
+expired feed never makes a page wait on The Guardian. For /food-news, a
+NewsFeed keeps them in memory and refreshes them on a background thread, so
+the page reads only from memory. The web app starts the shared feed and
+ingestion threads once in each worker process (see start_shared_news_jobs);
+a JobLease lets only one worker on the host call The Guardian, while the
+others follow what it writes to the shared cache and article store.
+
+Article lists carry titles, previews and thumbnails only. The HTML body of an
+article, which dwarfs the rest of it, is fetched on demand by its Guardian id
+and cached separately (see NewsParser.get_article_body).
+
+An ArticleIngestor pages through newly published articles (from-date set to
+the last ingestion's watermark) into a local ArticleStore, which answers
+fetch_food_news searches when it is current, so upstream traffic follows new
+content rather than page views. After every ingestion run, an in-memory
+NewsIndex over the store is refreshed, which matches news to recipes (see
+NewsParser.match_news_to_recipe), and a Space-Saving sketch over the store
+is snapshotted, which tracks the ingredients it writes about most (see
+NewsParser.parse_trending_ingredients).
+
+Recipe names are extracted from article titles and previews with patterns
+compiled once at import. The food keywords are merged into one alternation,
+so each text is scanned once, and large backfills can spread articles over a
+process pool (see extract_recipe_names_batch).
 """
 
+import os
+import time
+import logging
+import threading
 import requests
 import re
-from typing import Dict, List, Any
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+
+from api_client import EndpointLatencyTracker
+from article_store import ArticleStore
+from job_lease import JobLease
+from news_index import NewsIndex
+from record_replay import mount_transport
+from single_flight import SingleFlight
+from trending_ingredients import SpaceSaving, TrendingIngredients, count_articles
+from response_cache import TieredCache, StaleWhileRevalidate
+
+logger = logging.getLogger(__name__)
+
+GUARDIAN_API_ROOT = "https://content.guardianapis.com"
+GUARDIAN_API_URL = f"{GUARDIAN_API_ROOT}/search"
+
+# Popular recipe articles: fresh for 15 minutes, then served stale while
+# refreshing for 6 hours, or when The Guardian is failing for 24 hours
+POPULAR_ARTICLES_TTL = 15 * 60
+POPULAR_ARTICLES_STALE_WINDOWS = (6 * 60 * 60, 24 * 60 * 60)
+
+# Article bodies rarely change once published: cached for a day
+ARTICLE_BODY_TTL = 24 * 60 * 60
+
+# Incremental ingestion: the query ingested, every GUARDIAN_INGEST_INTERVAL
+# seconds; a store with no watermark yet starts this many days back
+INGEST_QUERY = "food,recipes"
+INGEST_INTERVAL = 30 * 60
+INGEST_BACKFILL_DAYS = 30
+
+# Guardian content ids, e.g. "food/2024/jan/05/leek-and-potato-soup-recipe"
+_ARTICLE_ID = re.compile(r"[a-z0-9-]+(?:/[a-z0-9-]+)+")
+
+# The /food-news feed: refreshed every GUARDIAN_FEED_TTL seconds (default
+# POPULAR_ARTICLES_TTL), retried sooner after a failed refresh; a cold page
+# view waits at most GUARDIAN_FEED_COLD_START_WAIT seconds for the first load
+NEWS_FEED_PAGE_SIZE = 20
+NEWS_FEED_RETRY_INTERVAL = 60.0
+NEWS_FEED_COLD_START_WAIT = 3.0
+
+_shared_revalidator: Optional[StaleWhileRevalidate] = None
+_shared_revalidator_lock = threading.Lock()
+_shared_parser: Optional["NewsParser"] = None
+_shared_feed: Optional["NewsFeed"] = None
+_shared_ingestor: Optional["ArticleIngestor"] = None
+_shared_lock = threading.Lock()
+_jobs_lock = threading.Lock()
+_jobs_pid: Optional[int] = None  # process the shared jobs were started in
+
+
+# Common food-related keywords to help identify recipes
+FOOD_KEYWORDS = [
+    "recipe", "dish", "pasta", "cake", "bread", "soup", "salad", "chicken",
+    "beef", "fish", "curry", "pizza", "sandwich", "burger", "pie", "cookie",
+    "muffin", "stew", "risotto", "lasagna", "pancake", "waffle", "taco"
+]
+
+
+def _trie_alternation(words: Iterable[str]) -> str:
+    """
+    A regex alternation of words with shared prefixes factored out.
+    
+    ["cake", "chicken", "curry"] becomes "c(?:ake|hicken|urry)", so the
+    engine tries one branch per distinct next character instead of every word.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+# Runs of letters and spaces: every recipe-name pattern matches inside one,
+# so this is the only pattern run over the whole text
+_RUN = re.compile(r'[a-zA-Z\s]+')
+# All food keywords merged into one alternation (matched against lower-cased text)
+_KEYWORD = re.compile(_trie_alternation(FOOD_KEYWORDS))
+_KEYWORD_RANK = {keyword: rank for rank, keyword in enumerate(FOOD_KEYWORDS)}
+# A word character that is not an ASCII letter (digit, underscore, accented
+# letter): a run touching one has no word boundary there
+_GLUE = re.compile(r'[^\Wa-zA-Z]')
+_LETTERS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+# "best [food] recipe", "perfect [food] recipe", ...
+_QUALIFIED_RECIPE = re.compile(r'\b(?:best|perfect|ultimate|easy|simple)\s+([a-zA-Z\s]+?)\s+recipe\b',
+                               re.IGNORECASE)
+# "[food] recipe"
+_RECIPE = re.compile(r'\b([a-zA-Z\s]+?)\s+recipe\b', re.IGNORECASE)
+
+_STOP_WORDS = frozenset(['the', 'and', 'or', 'for', 'with'])
+
 
-GUARDIAN_API_URL = "https://content.guardianapis.com/search"
+def _keyword_runs(text: str) -> List[str]:
+    """
+    Runs of letters and spaces in lower-cased text that contain a food keyword.
+    
+    Each run is cut back to its first and last word boundary: a word glued to
+    a digit or accented letter outside the run (e.g. "me" in "crème") is not
+    part of it.
+    """
+    runs = []
+    for match in _RUN.finditer(text):
+        run = match.group()
+        start, end = match.span()
+        if start and not run[0].isspace() and _GLUE.match(text, start - 1):
+            run = run.lstrip(_LETTERS)
+        if end < len(text) and run and not run[-1].isspace() and _GLUE.match(text, end):
+            run = run.rstrip(_LETTERS)
+        if _KEYWORD.search(run):
+            runs.append(run)
+    return runs
+
+
+def extract_recipes_from_text(text: str) -> List[str]:
+    """
+    Extract up to three recipe names from a piece of text (matched case-insensitively).
+    
+    Names come from "best/perfect/... [food] recipe" phrases, then "[food]
+    recipe" phrases, then runs of words around each FOOD_KEYWORDS entry (one
+    per keyword it contains, in FOOD_KEYWORDS order).
+    
+    Args:
+        text (str): Article title or preview
+        
+    Returns:
+        List[str]: Title-cased recipe names, best first
+    """
+    text = text.lower()
+    if not _KEYWORD.search(text):
+        return []
+    qualified: List[str] = []
+    plain: List[str] = []
+    around = []
+    for index, run in enumerate(_keyword_runs(text)):
+        if "recipe" in run:
+            qualified.extend(_QUALIFIED_RECIPE.findall(run))
+            plain.extend(_RECIPE.findall(run))
+        run = run.strip()
+        if len(run) > 3:
+            around.extend((_KEYWORD_RANK[keyword], index, run) for keyword in FOOD_KEYWORDS if keyword in run)
+    around.sort()
+
+    cleaned = []
+    for recipe in qualified + plain + [run for _, _, run in around]:
+        recipe = recipe.strip()
+        # Remove common stop words and clean up
+        if len(recipe) > 2 and recipe not in _STOP_WORDS:
+            cleaned.append(recipe.title())
+            if len(cleaned) == 3:  # Top 3 matches per text
+                break
+    return cleaned
+
+
+def article_recipe_names(article: Dict[str, Any]) -> List[str]:
+    """Recipe names found in an article's title, then its preview."""
+    return (extract_recipes_from_text(article.get("title", ""))
+            + extract_recipes_from_text(article.get("preview", "")))
+
+
+def extract_recipe_names_batch(articles: Iterable[Dict[str, Any]],
+                               processes: int = 0,
+                               chunksize: int = 256) -> List[List[str]]:
+    """
+    Extract recipe names from many articles, optionally across processes.
+    
+    Extraction is CPU-bound, so a process pool (rather than threads) is what
+    spreads a large backfill over several cores; each worker receives
+    chunksize articles at a time to amortize pickling.
+    
+    Args:
+        articles (Iterable[Dict[str, Any]]): Parsed articles (see NewsParser._parse_articles)
+        processes (int, optional): Worker processes; 0 or 1 extracts in this
+            process. Defaults to 0.
+        chunksize (int, optional): Articles sent to a worker at a time. Defaults to 256.
+        
+    Returns:
+        List[List[str]]: Recipe names per article, in input order
+    """
+    if processes <= 1:
+        return [article_recipe_names(article) for article in articles]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(article_recipe_names, articles, chunksize=chunksize))
+
+
+def _get_shared_revalidator() -> StaleWhileRevalidate:
+    """Get the process-wide news cache, shared by every NewsParser instance."""
+    global _shared_revalidator
+    if _shared_revalidator is None:
+        with _shared_revalidator_lock:
+            if _shared_revalidator is None:
+                _shared_revalidator = StaleWhileRevalidate(TieredCache.from_env())
+    return _shared_revalidator
 
 class NewsParser:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, base_url: Optional[str] = None, transport: Optional[str] = None,
+                 cache: Optional[TieredCache] = None, connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None, store: Optional[ArticleStore] = None):
+        """
+        Args:
+            api_key (str): The Guardian API key
+            base_url (str, optional): API root to send requests to, e.g. a local
+                stub server (GUARDIAN_BASE_URL, default GUARDIAN_API_ROOT)
+            transport (str, optional): "live", "record", "replay" or "replay-timed"
+                (SPOONACULAR_TRANSPORT, default live); see record_replay.py
+            cache (TieredCache, optional): Article cache. Defaults to a process-wide
+                one built from the environment (see TieredCache.from_env).
+            connect_timeout (float, optional): Seconds to wait for a connection
+                (GUARDIAN_CONNECT_TIMEOUT, default 3.05)
+            read_timeout (float, optional): Seconds to wait for a response
+                (GUARDIAN_READ_TIMEOUT, default 10)
+            store (ArticleStore, optional): Local article store that answers
+                searches when current and keeps the articles fetched. Defaults
+                to None (always ask The Guardian).
+        """
         if not api_key:
             raise ValueError("API key for The Guardian API is required.")
         self.api_key = api_key
+        self.base_url = (base_url or os.getenv("GUARDIAN_BASE_URL") or GUARDIAN_API_ROOT).rstrip("/")
+        self.search_url = f"{self.base_url}/search"
+        self.session = requests.Session()
+        mount_transport(self.session, transport)
+        self.revalidator = StaleWhileRevalidate(cache) if cache is not None else _get_shared_revalidator()
+        self.timeout = (
+            connect_timeout if connect_timeout is not None else float(os.getenv("GUARDIAN_CONNECT_TIMEOUT", "3.05")),
+            read_timeout if read_timeout is not None else float(os.getenv("GUARDIAN_READ_TIMEOUT", "10"))
+        )
+        self.latency = EndpointLatencyTracker()
+        self.store = store
+        self.index = NewsIndex(store) if store is not None else None
+        self.trending = TrendingIngredients(store) if store is not None else None
+        self._body_flights = SingleFlight()
+        self._body_lock = threading.Lock()
+        self._body_counters = {"hits": 0, "misses": 0, "errors": 0}
+
+    def _get(self, url: str, params: Dict[str, Any], endpoint: str) -> Dict[str, Any]:
+        """
+        GET a Guardian endpoint with the configured timeouts, recording its latency.
+        
+        Args:
+            url (str): Request URL
+            params (Dict[str, Any]): Query parameters
+            endpoint (str): Name the latency is recorded under, e.g. "/search"
+            
+        Returns:
+            Dict[str, Any]: The decoded "response" object
+            
+        Raises:
+            requests.exceptions.RequestException: If the request fails or times out
+            ValueError: If the response is not valid JSON
+        """
+        started = time.perf_counter()
+        failed = True
+        try:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json().get("response", {})
+            failed = False
+            return data
+        finally:
+            self.latency.record(endpoint, time.perf_counter() - started, error=failed)
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get per-endpoint latency statistics for Guardian requests.
+        
+        Returns:
+            Dict[str, Dict[str, float]]: Statistics keyed by endpoint
+        """
+        return self.latency.snapshot()
+
+    def popular_articles_key(self, page_size: int) -> str:
+        """Cache key of the popular recipe articles for a page size."""
+        return f"guardian:{self.search_url}?q=recipes&order-by=newest&page-size={page_size}"
 
     def fetch_food_news(self, query: str = "food,recipes", page_size: int = 5) -> List[Dict[str, Any]]:
         """
         Fetch food-related news articles from The Guardian.
         
+        With an article store, the store answers instead when it is current
+        and holds page_size matches (see ArticleStore.search_if_current), and
+        articles fetched from The Guardian are added to it.
+        
         Args:
             query (str): The search query. Defaults to "food,recipes".
             page_size (int): The number of articles to return.
@@ -28,117 +337,115 @@ class NewsParser:
         Returns:
             List[Dict[str, Any]]: A list of parsed news articles.
         """
+        if self.store is not None:
+            articles = self.store.search_if_current(query, page_size)
+            if articles is not None:
+                return articles
+        
+        try:
+            articles, _ = self.search_articles(query, page_size=page_size, order_by="relevance")
+            if self.store is not None:
+                self.store.upsert(articles)
+            return articles
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning("Error fetching news from The Guardian API: %s", e)
+            return []
+
+    def search_articles(self,
+                        query: str,
+                        page: int = 1,
+                        page_size: int = 10,
+                        order_by: str = "newest",
+                        from_date: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Fetch one page of Guardian search results, without caching.
+        
+        Args:
+            query (str): The search query
+            page (int, optional): Page number, from 1. Defaults to 1.
+            page_size (int, optional): Articles per page (at most 200). Defaults to 10.
+            order_by (str, optional): "newest", "oldest" or "relevance". Defaults to "newest".
+            from_date (str, optional): Only articles published at or after this
+                ISO 8601 date or time. Defaults to None.
+            
+        Returns:
+            Tuple[List[Dict[str, Any]], int]: The parsed articles and the number of pages
+            
+        Raises:
+            requests.exceptions.RequestException: If the API request fails
+            ValueError: If the response is not valid JSON
+        """
         params = {
             "q": query,
             "api-key": self.api_key,
             "show-fields": "thumbnail,trailText",
+            "page": page,
             "page-size": page_size,
-            "order-by": "relevance"
+            "order-by": order_by
         }
-        
-        try:
-            response = requests.get(GUARDIAN_API_URL, params=params)
-            response.raise_for_status()  # Raise an exception for bad status codes
-            data = response.json().get("response", {}).get("results", [])
-            return self._parse_articles(data)
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching news from The Guardian API: {e}")
-            return []
+        if from_date:
+            params["from-date"] = from_date
+        data = self._get(self.search_url, params, "/search")
+        return self._parse_articles(data.get("results", [])), int(data.get("pages", 1) or 1)
 
     def fetch_popular_recipe_articles(self, page_size: int = 20) -> List[Dict[str, Any]]:
         """
         Fetch articles about popular, trending, or featured recipes.
         
+        Results are cached for POPULAR_ARTICLES_TTL. Past that, the cached
+        articles are returned immediately and refreshed in the background, or
+        returned in place of an error if The Guardian cannot be reached (see
+        POPULAR_ARTICLES_STALE_WINDOWS).
+        
         Args:
             page_size (int): The number of articles to return.
             
         Returns:
             List[Dict[str, Any]]: A list of articles about popular recipes.
         """
-        # Broaden the search query to just 'recipes' for more results
-        query = "recipes"
-        params = {
-            "q": query,
-            "api-key": self.api_key,
-            "show-fields": "thumbnail,trailText,body",
-            "page-size": page_size,
-            "order-by": "newest"
-        }
+        key = self.popular_articles_key(page_size)
+        stale_while_revalidate, stale_if_error = POPULAR_ARTICLES_STALE_WINDOWS
+        
+        def fetch() -> List[Dict[str, Any]]:
+            articles = self._fetch_popular_recipe_articles(page_size)
+            self.revalidator.cache.set(key, articles, POPULAR_ARTICLES_TTL, stale_if_error)
+            return articles
         
         try:
-            response = requests.get(GUARDIAN_API_URL, params=params)
-            response.raise_for_status()
-            data = response.json().get("response", {}).get("results", [])
-            return self._parse_articles(data)
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching popular recipe articles: {e}")
+            return self.revalidator.get(key, fetch, stale_while_revalidate, stale_if_error,
+                                        errors=(requests.exceptions.RequestException, ValueError))
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning("Error fetching popular recipe articles: %s", e)
             return []
 
-    def extract_recipe_names_from_articles(self, articles: List[Dict[str, Any]]) -> List[str]:
+    def _fetch_popular_recipe_articles(self, page_size: int) -> List[Dict[str, Any]]:
+        """
+        Fetch popular recipe articles from The Guardian, without caching.
+        
+        Raises:
+            requests.exceptions.RequestException: If the API request fails
+            ValueError: If the response is not valid JSON
+        """
+        # Broaden the search query to just 'recipes' for more results
+        articles, _ = self.search_articles("recipes", page_size=page_size, order_by="newest")
+        return articles
+
+    def extract_recipe_names_from_articles(self, articles: List[Dict[str, Any]],
+                                           processes: int = 0) -> List[str]:
         """
         Extract potential recipe names from article titles and previews.
         
         Args:
             articles (List[Dict[str, Any]]): List of articles to analyze.
+            processes (int, optional): Worker processes for large batches (see
+                extract_recipe_names_batch). Defaults to 0 (this process).
             
         Returns:
             List[str]: List of potential recipe names found in the articles.
         """
-        recipe_names = []
-        
-        # Common food-related keywords to help identify recipes
-        food_keywords = [
-            "recipe", "dish", "pasta", "cake", "bread", "soup", "salad", "chicken", 
-            "beef", "fish", "curry", "pizza", "sandwich", "burger", "pie", "cookie",
-            "muffin", "stew", "risotto", "lasagna", "pancake", "waffle", "taco"
-        ]
-        
-        for article in articles:
-            title = article.get("title", "").lower()
-            preview = article.get("preview", "").lower()
-            
-            # Extract potential recipe names from titles
-            # Look for patterns like "Best [Food Name] recipe" or "[Food Name]: the perfect recipe"
-            title_recipes = self._extract_recipes_from_text(title, food_keywords)
-            preview_recipes = self._extract_recipes_from_text(preview, food_keywords)
-            
-            recipe_names.extend(title_recipes)
-            recipe_names.extend(preview_recipes)
-        
+        names = extract_recipe_names_batch(articles, processes)
         # Remove duplicates and return unique recipe names
-        return list(set(recipe_names))
-
-    def _extract_recipes_from_text(self, text: str, food_keywords: List[str]) -> List[str]:
-        """
-        Extract recipe names from a piece of text using keyword matching and patterns.
-        """
-        recipes = []
-        
-        # Pattern 1: "best [food] recipe" or "perfect [food] recipe"
-        pattern1 = r'\b(?:best|perfect|ultimate|easy|simple)\s+([a-zA-Z\s]+?)\s+recipe\b'
-        matches1 = re.findall(pattern1, text, re.IGNORECASE)
-        
-        # Pattern 2: "[food] recipe" (simpler pattern)
-        pattern2 = r'\b([a-zA-Z\s]+?)\s+recipe\b'
-        matches2 = re.findall(pattern2, text, re.IGNORECASE)
-        
-        # Pattern 3: Food keywords mentioned with context
-        for keyword in food_keywords:
-            if keyword in text:
-                # Extract surrounding words to form potential recipe names
-                pattern = rf'\b([a-zA-Z\s]*{keyword}[a-zA-Z\s]*)\b'
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                recipes.extend([match.strip() for match in matches if len(match.strip()) > 3])
-        
-        # Clean up the extracted names
-        cleaned_recipes = []
-        for recipe in matches1 + matches2 + recipes:
-            recipe = recipe.strip()
-            # Remove common stop words and clean up
-            if len(recipe) > 2 and recipe not in ['the', 'and', 'or', 'for', 'with']:
-                cleaned_recipes.append(recipe.title())
-        
-        return cleaned_recipes[:3]  # Return top 3 matches per text
+        return list({name for article_names in names for name in article_names})
 
     def _parse_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -148,58 +455,590 @@ class NewsParser:
         for article in articles:
             fields = article.get("fields", {})
             parsed_articles.append({
+                "id": article.get("id"),
                 "title": article.get("webTitle", "No Title"),
                 "url": article.get("webUrl", "#"),
                 "preview": fields.get("trailText", "No preview available."),
                 "thumbnail": fields.get("thumbnail", None),
-                "body": fields.get("body", "")
+                "published_at": article.get("webPublicationDate")
             })
         return parsed_articles
 
-    def parse_trending_ingredients(self, articles: List[Dict[str, Any]]) -> List[str]:
+    def get_article_body(self, article_id: str) -> str:
         """
-        Parse nutritional information into a structured format.
+        Get the HTML body of one article, from cache when possible.
+        
+        List fetches leave bodies out; this looks one up by the article's
+        Guardian id. Concurrent lookups of the same article share one request.
         
         Args:
-            nutrition_data (Dict[str, Any]): Raw nutrition data from the API
+            article_id (str): Guardian content id (the "id" of a parsed article)
             
         Returns:
-            Dict[str, Any]: Structured nutrition information
-        """
-        # Parse nutrients
-        nutrients = {}
-        for nutrient in nutrition_data.get("nutrients", []):
-            nutrients[nutrient.get("name", "").lower()] = {
-                "amount": nutrient.get("amount", 0),
-                "unit": nutrient.get("unit", ""),
-                "percent_daily_needs": nutrient.get("percentOfDailyNeeds", 0)
-            }
-        
-        # Parse caloric breakdown
-        cals = nutrition_data.get("caloricBreakdown", {})
-        caloric_breakdown = {
-            "percent_protein": cals.get("percentProtein", 0),
-            "percent_fat": cals.get("percentFat", 0),
-            "percent_carbs": cals.get("percentCarbs", 0)
-        }
+            str: The article body HTML ("" if the article has none)
+            
+        Raises:
+            ValueError: If article_id is not a Guardian content id, or the
+                response is not valid JSON
+            requests.exceptions.RequestException: If the article cannot be
+                fetched (an HTTPError with status 404 if it does not exist)
+        """
+        if not isinstance(article_id, str) or not _ARTICLE_ID.fullmatch(article_id):
+            raise ValueError(f"Invalid Guardian article id: {article_id!r}")
+        key = f"guardian:{self.base_url}/{article_id}?show-fields=body"
+        cache = self.revalidator.cache
+        body = cache.get(key)
+        if body is not None:
+            self._count_body("hits")
+            return body
+        self._count_body("misses")
         
-        return {
-            "calories": nutrients.get("calories", {}).get("amount", 0),
-            "protein": nutrients.get("protein", {}).get("amount", 0),
-            "fat": nutrients.get("fat", {}).get("amount", 0),
-            "carbohydrates": nutrients.get("carbohydrates", {}).get("amount", 0),
-            "nutrients": nutrients,
-            "caloric_breakdown": caloric_breakdown
-        }
+        def fetch() -> str:
+            params = {"api-key": self.api_key, "show-fields": "body"}
+            try:
+                content = self._get(f"{self.base_url}/{article_id}", params, "/{id}").get("content", {})
+            except (requests.exceptions.RequestException, ValueError):
+                self._count_body("errors")
+                raise
+            body = content.get("fields", {}).get("body", "")
+            cache.set(key, body, ARTICLE_BODY_TTL)
+            return body
+        
+        return self._body_flights.do(key, fetch)
+
+    def _count_body(self, counter: str) -> None:
+        with self._body_lock:
+            self._body_counters[counter] += 1
+
+    def get_article_body_stats(self) -> Dict[str, Any]:
+        """
+        Get article body lookup counters.
+        
+        Returns:
+            Dict[str, Any]: Cache hits, misses and failed fetches, plus hit_rate
+                and lookups collapsed into a concurrent fetch of the same article
+        """
+        with self._body_lock:
+            stats: Dict[str, Any] = dict(self._body_counters)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["coalesced"] = self._body_flights.stats()["collapsed"]
+        return stats
+
+    def parse_trending_ingredients(self, articles: Optional[List[Dict[str, Any]]] = None,
+                                   limit: int = 10) -> List[str]:
+        """
+        Find the ingredients most written about.
+        
+        Without articles, reads the latest snapshot of the article store's
+        trending sketch (see trending_ingredients.TrendingIngredients), which
+        ingestion keeps current. Given articles, streams them through a fresh
+        bounded sketch. Either way, an article counts once per ingredient,
+        weighted down with its age.
+        
+        Args:
+            articles (List[Dict[str, Any]], optional): Parsed articles to
+                count instead of the store
+            limit (int, optional): Ingredients to return. Defaults to 10.
+            
+        Returns:
+            List[str]: Ingredients, most written about first; empty without
+                articles or a store
+        """
+        if articles is None:
+            return self.trending.trending(limit) if self.trending is not None else []
+        now = time.time()
+        sketch = SpaceSaving()
+        count_articles(sketch, articles, now)
+        return [ingredient for ingredient, _, _ in sketch.top(limit, now)]
 
-    def match_news_to_recipe(self, recipe: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def match_news_to_recipe(self, recipe: Any, limit: int = 3) -> List[Dict[str, Any]]:
         """
-        Find relevant news articles based on recipe ingredients or cuisine type.
+        Find relevant news articles based on recipe ingredients and title.
+        
+        Articles come from the in-memory index over the article store, as of
+        its last refresh by the ingestion job, so no request is made to The
+        Guardian; without a store there are none.
+        
+        Args:
+            recipe (Any): A RecipeDetail, parsed recipe dict or raw Spoonacular
+                payload (see news_index.recipe_query)
+            limit (int, optional): Articles to return. Defaults to 3.
+            
+        Returns:
+            List[Dict[str, Any]]: Parsed articles, most related first
         """
-        pass
+        if self.index is None:
+            return []
+        return self.index.match_recipe(recipe, limit)
 
     def get_regional_highlights(self) -> Dict[str, List[Dict[str, Any]]]:
         """
         Get trending recipes and food stories by region.
         """
-        pass 
\ No newline at end of file
+        pass 
+
+class NewsFeed:
+    """
+    Popular recipe articles held in memory and refreshed by a background thread.
+    
+    articles() never calls The Guardian: a daemon thread refetches the feed
+    every ttl seconds (every retry_interval after a failure, keeping the old
+    articles meanwhile) and swaps the new list in. Each refresh is also written
+    to the parser's article cache, so a restarted worker starts from the
+    previous feed. Only a worker with nothing cached waits for the first
+    fetch, and for at most cold_start_wait seconds.
+    
+    With a lease, only the worker holding it refreshes from The Guardian;
+    the others reload the feed from the shared cache every retry_interval
+    and take over the refresh once the lease expires.
+    
+    Attributes:
+        parser (NewsParser): Parser the feed is fetched with
+        ttl (float): Seconds between refreshes
+        lease (JobLease): Lease deciding which worker refreshes, or None
+    """
+
+    def __init__(self,
+                 parser: NewsParser,
+                 ttl: Optional[float] = None,
+                 page_size: int = NEWS_FEED_PAGE_SIZE,
+                 cold_start_wait: Optional[float] = None,
+                 retry_interval: float = NEWS_FEED_RETRY_INTERVAL,
+                 lease: Optional[JobLease] = None):
+        """
+        Args:
+            parser (NewsParser): Parser the feed is fetched with
+            ttl (float, optional): Seconds between refreshes (GUARDIAN_FEED_TTL,
+                default POPULAR_ARTICLES_TTL)
+            page_size (int, optional): Articles in the feed. Defaults to 20.
+            cold_start_wait (float, optional): Seconds a read waits for the first
+                load (GUARDIAN_FEED_COLD_START_WAIT, default 3)
+            retry_interval (float, optional): Seconds before retrying a failed
+                refresh (capped at ttl). Defaults to 60.
+            lease (JobLease, optional): Held by the one worker that refreshes.
+                Defaults to None (this feed always refreshes).
+        """
+        self.parser = parser
+        self.ttl = ttl if ttl is not None else float(os.getenv("GUARDIAN_FEED_TTL", POPULAR_ARTICLES_TTL))
+        self.page_size = page_size
+        self.cold_start_wait = (cold_start_wait if cold_start_wait is not None
+                                else float(os.getenv("GUARDIAN_FEED_COLD_START_WAIT", NEWS_FEED_COLD_START_WAIT)))
+        self.retry_interval = min(retry_interval, self.ttl)
+        self.lease = lease
+        self.key = parser.popular_articles_key(page_size)
+        self._articles: Optional[List[Dict[str, Any]]] = None
+        self._fetched_at: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self._counters = {"reads": 0, "cold_reads": 0, "cold_misses": 0, "refreshes": 0,
+                          "refresh_failures": 0, "restored": 0, "followed": 0}
+        self.after_fork()
+    
+    def after_fork(self) -> None:
+        """Reset the locks and thread handle; a forked child starts its own thread."""
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        if self._articles is not None:
+            self._loaded.set()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Load the persisted feed, if any, and start the refresh thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="news-feed", daemon=True)
+        self._restore()
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the refresh thread."""
+        self._stopped.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+
+    def _restore(self, counter: str = "restored") -> None:
+        """Swap in the cached feed, however old, if it is newer than the current one."""
+        hit = self.parser.revalidator.cache.lookup(self.key)
+        if hit is None:
+            return
+        with self._lock:
+            if self._fetched_at is None or hit.stored_at > self._fetched_at:
+                self._articles, self._fetched_at = hit.value, hit.stored_at
+                self._counters[counter] += 1
+                self._loaded.set()
+
+    def _run(self) -> None:
+        with self._lock:
+            age = time.time() - self._fetched_at if self._fetched_at is not None else self.ttl
+        delay = max(0.0, self.ttl - age)
+        if self.lease is not None and not self.lease.acquire(2 * self.ttl):
+            delay = self.retry_interval
+        while not self._stopped.wait(delay):
+            if self.lease is not None and not self.lease.acquire(2 * self.ttl):
+                self._restore("followed")
+                delay = self.retry_interval
+            else:
+                delay = self.ttl if self.refresh() else self.retry_interval
+
+    def refresh(self) -> bool:
+        """
+        Fetch the feed now and swap it in.
+        
+        Returns:
+            bool: False if The Guardian could not be reached (the current
+                articles are kept)
+        """
+        try:
+            articles = self.parser._fetch_popular_recipe_articles(self.page_size)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning("News feed refresh failed: %s", e)
+            with self._lock:
+                self._counters["refresh_failures"] += 1
+            return False
+        self.parser.revalidator.cache.set(self.key, articles, POPULAR_ARTICLES_TTL,
+                                          max(POPULAR_ARTICLES_STALE_WINDOWS))
+        with self._lock:
+            self._articles, self._fetched_at = articles, time.time()
+            self._counters["refreshes"] += 1
+        self._loaded.set()
+        return True
+
+    def articles(self) -> List[Dict[str, Any]]:
+        """
+        Get the current feed from memory.
+        
+        Returns:
+            List[Dict[str, Any]]: The articles, or an empty list if the first
+                load has not finished within cold_start_wait
+        """
+        with self._lock:
+            self._counters["reads"] += 1
+            articles = self._articles
+            if articles is None:
+                self._counters["cold_reads"] += 1
+        if articles is None:
+            self._loaded.wait(self.cold_start_wait)
+            with self._lock:
+                articles = self._articles
+                if articles is None:
+                    self._counters["cold_misses"] += 1
+        return list(articles or [])
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get feed freshness and refresh counters.
+        
+        Returns:
+            Dict[str, Any]: Counters plus articles, age_seconds (None before the
+                first load), ttl, stale (older than ttl), running, and upstream
+                latency per Guardian endpoint
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            stats["articles"] = len(self._articles or [])
+            fetched_at = self._fetched_at
+            stats["running"] = self._thread is not None and self._thread.is_alive()
+        age = time.time() - fetched_at if fetched_at is not None else None
+        stats["age_seconds"] = round(age, 1) if age is not None else None
+        stats["ttl"] = self.ttl
+        stats["stale"] = age is None or age > self.ttl
+        stats["upstream"] = self.parser.get_latency_stats()
+        if self.lease is not None:
+            stats["lease"] = self.lease.stats()
+        return stats
+
+
+class ArticleIngestor:
+    """
+    Periodic incremental ingestion of Guardian articles into an ArticleStore.
+    
+    Each run asks only for articles published since the query's watermark
+    (from-date), oldest first, and advances the watermark after every page.
+    A run therefore costs requests in proportion to what was published since
+    the previous one, and an interrupted run resumes where it stopped.
+    from-date is inclusive, so the newest article of the previous run comes
+    back once more and is simply updated.
+    
+    With a lease, only the worker holding it ingests; the others refresh
+    their index and trending snapshot from the shared store every
+    retry_interval, and take over ingestion once the lease expires.
+    
+    Attributes:
+        query (str): Guardian search query ingested
+        interval (float): Seconds between runs
+        lease (JobLease): Lease deciding which worker ingests, or None
+    """
+
+    def __init__(self,
+                 parser: NewsParser,
+                 store: ArticleStore,
+                 query: str = INGEST_QUERY,
+                 interval: Optional[float] = None,
+                 page_size: int = 50,
+                 max_pages: int = 10,
+                 backfill_days: float = INGEST_BACKFILL_DAYS,
+                 retry_interval: float = NEWS_FEED_RETRY_INTERVAL,
+                 trending: Optional[TrendingIngredients] = None,
+                 index: Optional[NewsIndex] = None,
+                 lease: Optional[JobLease] = None):
+        """
+        Args:
+            parser (NewsParser): Parser the pages are fetched with
+            store (ArticleStore): Store the articles are written to
+            query (str, optional): Search query. Defaults to INGEST_QUERY.
+            interval (float, optional): Seconds between runs
+                (GUARDIAN_INGEST_INTERVAL, default 30 minutes)
+            page_size (int, optional): Articles per request (at most 200). Defaults to 50.
+            max_pages (int, optional): Requests per run; a run that stops with
+                pages left is followed by another right away. Defaults to 10.
+            backfill_days (float, optional): How far back the first run starts. Defaults to 30.
+            retry_interval (float, optional): Seconds before retrying a failed
+                run (capped at interval). Defaults to 60.
+            trending (TrendingIngredients, optional): Snapshotted after every
+                run, including failed ones. Defaults to None.
+            index (NewsIndex, optional): Refreshed when the thread starts and
+                after every run, including failed ones. Defaults to None.
+            lease (JobLease, optional): Held by the one worker that ingests.
+                Defaults to None (this job always ingests).
+        """
+        self.parser = parser
+        self.store = store
+        self.trending = trending
+        self.index = index
+        self.query = query
+        self.interval = interval if interval is not None else float(os.getenv("GUARDIAN_INGEST_INTERVAL", INGEST_INTERVAL))
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.backfill_days = backfill_days
+        self.retry_interval = min(retry_interval, self.interval)
+        self.lease = lease
+        self._thread: Optional[threading.Thread] = None
+        self._last_run: Optional[float] = None
+        self._counters = {"runs": 0, "failures": 0, "requests": 0, "fetched": 0, "new": 0, "followed": 0}
+        self.after_fork()
+    
+    def after_fork(self) -> None:
+        """Reset the lock and thread handle; a forked child starts its own thread."""
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Start the ingestion thread; the first run starts at once (idempotent)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="news-ingest", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the ingestion thread."""
+        self._stopped.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        if self.index is not None:
+            self.index.refresh()  # the articles already stored are searchable before the first run ends
+        delay = 0.0
+        while not self._stopped.wait(delay):
+            if self.lease is not None and not self.lease.acquire(2 * self.interval):
+                self.follow()
+                delay = self.retry_interval
+                continue
+            watermark = self.store.watermark(self.query)
+            try:
+                _, caught_up = self.run_once()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.warning("Guardian ingestion failed: %s", e)
+                delay = self.retry_interval
+            else:
+                # Run again at once while behind, unless the watermark is stuck
+                behind = not caught_up and self.store.watermark(self.query) != watermark
+                delay = 0.0 if behind else self.interval
+
+    def run_once(self) -> Tuple[int, bool]:
+        """
+        Ingest the articles published since the watermark, up to max_pages requests.
+        
+        Returns:
+            Tuple[int, bool]: Articles not stored before, and whether the run
+                reached the last page
+            
+        Raises:
+            requests.exceptions.RequestException: If a request fails (pages
+                already ingested are kept)
+            ValueError: If a response is not valid JSON
+        """
+        watermark = self.store.watermark(self.query)
+        from_date = watermark or (datetime.now(timezone.utc) - timedelta(days=self.backfill_days)
+                                  ).strftime("%Y-%m-%dT%H:%M:%SZ")
+        new = 0
+        caught_up = False
+        try:
+            for page in range(1, self.max_pages + 1):
+                articles, pages = self.parser.search_articles(self.query, page=page, page_size=self.page_size,
+                                                              order_by="oldest", from_date=from_date)
+                inserted = self.store.upsert(articles)
+                new += inserted
+                published = [a["published_at"] for a in articles if a.get("published_at")]
+                self.store.record_run(self.query, max(published) if published else None)
+                with self._lock:
+                    self._counters["requests"] += 1
+                    self._counters["fetched"] += len(articles)
+                    self._counters["new"] += inserted
+                if page >= pages or len(articles) < self.page_size:
+                    caught_up = True
+                    break
+        except (requests.exceptions.RequestException, ValueError):
+            with self._lock:
+                self._counters["failures"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._counters["runs"] += 1
+                self._last_run = time.time()
+            self._update_readers()
+        return new, caught_up
+    
+    def follow(self) -> None:
+        """Pick up the articles another worker ingested, without calling The Guardian."""
+        with self._lock:
+            self._counters["followed"] += 1
+        self._update_readers()
+    
+    def _update_readers(self) -> None:
+        """Snapshot trending ingredients and refresh the index from the store."""
+        if self.trending is not None:
+            self.trending.update()
+        if self.index is not None:
+            self.index.refresh()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get ingestion counters.
+        
+        Returns:
+            Dict[str, Any]: Runs, failed runs, requests, articles fetched and
+                new, seconds since the last run (None before the first), the
+                query's watermark, and running
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            last_run = self._last_run
+            stats["running"] = self._thread is not None and self._thread.is_alive()
+        stats["last_run_age_seconds"] = round(time.time() - last_run, 1) if last_run is not None else None
+        stats["watermark"] = self.store.watermark(self.query)
+        if self.lease is not None:
+            stats["lease"] = self.lease.stats()
+        return stats
+
+
+def get_shared_news_parser() -> NewsParser:
+    """
+    Get the process-wide NewsParser, backed by the article store from the
+    environment (see ArticleStore.from_env).
+    
+    Returns:
+        NewsParser: The shared parser
+        
+    Raises:
+        ValueError: If the GUARDIAN_API_KEY environment variable is not set
+    """
+    global _shared_parser
+    if _shared_parser is None:
+        with _shared_lock:
+            if _shared_parser is None:
+                _shared_parser = NewsParser(os.getenv("GUARDIAN_API_KEY"), store=ArticleStore.from_env())
+    return _shared_parser
+
+
+def get_shared_news_feed() -> NewsFeed:
+    """
+    Get the process-wide /food-news feed (see start_shared_news_jobs).
+    
+    Returns:
+        NewsFeed: The shared feed
+        
+    Raises:
+        ValueError: If the GUARDIAN_API_KEY environment variable is not set
+    """
+    global _shared_feed
+    if _shared_feed is None:
+        parser = get_shared_news_parser()
+        with _shared_lock:
+            if _shared_feed is None:
+                _shared_feed = NewsFeed(parser, lease=JobLease.from_env("guardian-feed"))
+    return _shared_feed
+
+
+def get_shared_ingestor() -> Optional["ArticleIngestor"]:
+    """
+    Get the process-wide article ingestion job (see start_shared_news_jobs).
+    
+    Returns:
+        Optional[ArticleIngestor]: The shared job, or None if the article
+            store is disabled
+        
+    Raises:
+        ValueError: If the GUARDIAN_API_KEY environment variable is not set
+    """
+    global _shared_ingestor
+    parser = get_shared_news_parser()
+    if parser.store is None:
+        return None
+    if _shared_ingestor is None:
+        with _shared_lock:
+            if _shared_ingestor is None:
+                _shared_ingestor = ArticleIngestor(parser, parser.store, trending=parser.trending,
+                                                   index=parser.index, lease=JobLease.from_env("guardian-ingest"))
+    return _shared_ingestor
+
+
+def start_shared_news_jobs() -> None:
+    """
+    Start the shared feed and article ingestion threads in this process (idempotent).
+    
+    Threads do not survive a fork, so the web app calls this before each
+    request rather than at startup: a worker forked by a pre-forking server
+    starts its own threads on its first request, and later calls return at
+    once. The jobs' leases let only one worker on the host call The
+    Guardian; the rest follow the shared cache and article store.
+    
+    Raises:
+        ValueError: If the GUARDIAN_API_KEY environment variable is not set
+    """
+    global _jobs_pid
+    pid = os.getpid()
+    if _jobs_pid == pid:
+        return
+    with _jobs_lock:
+        if _jobs_pid == pid:
+            return
+        get_shared_news_feed().start()
+        ingestor = get_shared_ingestor()
+        if ingestor is not None:
+            ingestor.start()
+        _jobs_pid = pid
+
+
+def _reset_after_fork() -> None:
+    """Give a forked child fresh locks and job threads of its own to start."""
+    global _shared_revalidator_lock, _shared_lock, _jobs_lock
+    _shared_revalidator_lock = threading.Lock()
+    _shared_lock = threading.Lock()
+    _jobs_lock = threading.Lock()
+    for job in (_shared_feed, _shared_ingestor):
+        if job is not None:
+            job.after_fork()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,176 @@
+"""
+Parse Memo Module
+
+This module memoizes parsed recipes, so a hot recipe page does not rebuild
+its RecipeDetail record (ingredient and instruction flattening included) on
+every view. Entries are keyed by recipe id plus a fingerprint of the raw
+payload, computed by hashing only the fields the parser reads (a few
+microseconds, against tens for a parse): a record is reused until the
+upstream payload changes, and a changed payload simply replaces it.
+
+The memo sits beside the response cache rather than inside it: raw payloads
+stay compressed in the response cache (see response_cache.py), and only the
+compact parsed records are kept here, so the decoded raw dict is never held
+alongside its parsed form. The memo is bounded by entry count and,
+optionally, by the approximate memory its records occupy. Measuring a record
+costs more than parsing it, so without a byte bound sizes are only measured
+(once per record) when stats are read.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from data_parser import parse_recipe_record
+
+
+def recipe_fingerprint(recipe: Dict[str, Any]) -> int:
+    """
+    Fingerprint of the recipe fields parse_recipe_record reads.
+
+    Raises:
+        TypeError: If a field holds an unhashable value (e.g. a dict amount)
+    """
+    return hash((
+        recipe.get("id"), recipe.get("title"), recipe.get("readyInMinutes"), recipe.get("servings"),
+        recipe.get("image"), recipe.get("summary"),
+        recipe.get("vegetarian"), recipe.get("vegan"), recipe.get("glutenFree"), recipe.get("dairyFree"),
+        tuple([(i.get("name"), i.get("amount"), i.get("unit"), i.get("original"))
+               for i in recipe.get("extendedIngredients", ())]),
+        tuple([(step.get("number"), step.get("step"))
+               for instruction_set in recipe.get("analyzedInstructions", ())
+               for step in instruction_set.get("steps", ())])
+    ))
+
+
+# Values shared with the rest of the process rather than held by a record
+_SHARED = (bool, type(None))
+
+
+def deep_size(obj: Any) -> int:
+    """Approximate bytes held by a record: the object plus its fields, recursively."""
+    if isinstance(obj, _SHARED):
+        return 0
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, int, float)):
+        return size
+    if isinstance(obj, (tuple, list)):
+        return size + sum(map(deep_size, obj))
+    if isinstance(obj, dict):
+        return size + sum(deep_size(key) + deep_size(value) for key, value in obj.items())
+    slots = getattr(type(obj), "__slots__", None)
+    if slots is not None:
+        return size + sum(deep_size(getattr(obj, name)) for name in slots)
+    return size
+
+
+class ParseMemo:
+    """
+    Bounded LRU of parsed records keyed by (recipe id, payload fingerprint).
+
+    Attributes:
+        max_entries (int): Records kept before the least recently used is evicted
+        max_bytes (int): Approximate record memory kept (0 = bounded by entries only)
+    """
+
+    def __init__(self,
+                 parse: Callable[[Dict[str, Any]], Any] = parse_recipe_record,
+                 fingerprint: Callable[[Dict[str, Any]], Hashable] = recipe_fingerprint,
+                 max_entries: int = 1024,
+                 max_bytes: int = 0):
+        """
+        Args:
+            parse (Callable, optional): Parser of a raw payload. Defaults to
+                parse_recipe_record.
+            fingerprint (Callable, optional): Cheap fingerprint of a raw payload.
+                Defaults to recipe_fingerprint.
+            max_entries (int, optional): Records kept. Defaults to 1024.
+            max_bytes (int, optional): Approximate record memory kept. Defaults
+                to 0 (no byte bound).
+        """
+        self.parse_fn = parse
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # recipe id -> (fingerprint, parsed record, approximate size or None if not measured yet)
+        self._entries: "OrderedDict[Any, Tuple[Hashable, Any, Optional[int]]]" = OrderedDict()
+        self._bytes = 0  # of measured entries
+        self._counters = {"hits": 0, "misses": 0, "changed": 0, "unfingerprintable": 0, "evictions": 0}
+
+    def parse(self, payload: Dict[str, Any], recipe_id: Optional[Any] = None) -> Any:
+        """
+        Parse a payload, reusing the record parsed earlier from an identical one.
+
+        Args:
+            payload (Dict[str, Any]): Raw recipe payload
+            recipe_id (Any, optional): Memo key. Defaults to payload["id"].
+
+        Returns:
+            Any: The parsed record; shared between callers, so it must be
+                immutable (as RecipeDetail is)
+        """
+        key = payload.get("id") if recipe_id is None else recipe_id
+        try:
+            fingerprint = self.fingerprint(payload)
+        except TypeError:
+            fingerprint = None
+        if key is None or fingerprint is None:
+            with self._lock:
+                self._counters["unfingerprintable"] += 1
+            return self.parse_fn(payload)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return entry[1]
+            self._counters["misses"] += 1
+            if entry is not None:
+                self._counters["changed"] += 1
+
+        parsed = self.parse_fn(payload)
+        size = deep_size(parsed) if self.max_bytes else None
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (fingerprint, parsed, size)
+            self._bytes += size or 0
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or (self.max_bytes and self._bytes > self.max_bytes)):
+                self._discard(next(iter(self._entries)))
+                self._counters["evictions"] += 1
+        return parsed
+
+    def _discard(self, key: Any) -> None:
+        """Remove an entry; the caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2] or 0
+
+    def invalidate(self, recipe_id: Any) -> None:
+        """Drop a recipe's record."""
+        with self._lock:
+            self._discard(recipe_id)
+
+    def clear(self) -> None:
+        """Drop every record."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratio, entry count and approximate memory held."""
+        with self._lock:
+            unmeasured = [(key, entry) for key, entry in self._entries.items() if entry[2] is None]
+        measured = [(key, entry, deep_size(entry[1])) for key, entry in unmeasured]
+        with self._lock:
+            for key, entry, size in measured:
+                if self._entries.get(key) is entry:
+                    self._entries[key] = (entry[0], entry[1], size)
+                    self._bytes += size
+            stats = dict(self._counters, entries=len(self._entries), bytes=self._bytes)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
@@ -0,0 +1,339 @@
+"""
+Quota Module for Spoonacular Points
+
+Spoonacular bills every call in points rather than requests: a complexSearch
+that adds recipe information and fills ingredients for 12 results costs far
+more than a single lookup. This module provides:
+
+1. estimate_point_cost(): the expected point cost of a call, computed from
+   its endpoint and parameters before it is sent
+2. QuotaThrottle: a per-minute token bucket plus a per-day budget, persisted
+   in SQLite so every worker on the host draws from the same allowance and
+   reconciled against the X-API-Quota-* headers Spoonacular returns
+3. QuotaExhaustedError: raised immediately when a call would exceed the
+   budget, instead of spending a round trip on a 402
+4. background_priority(): marks calls made on behalf of no one in particular
+   (pool refills, cache revalidation), which may only spend a share of the
+   budget so they cannot starve user requests
+"""
+
+import os
+import re
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+DEFAULT_QUOTA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "spoonacular_quota.db")
+
+# Per-result surcharges for complexSearch options, per the Spoonacular pricing docs
+_SEARCH_OPTION_COSTS = {
+    "addRecipeInformation": 0.025,
+    "fillIngredients": 0.025,
+    "addRecipeNutrition": 0.025,
+    "addRecipeInstructions": 0.025
+}
+
+_RECIPE_ID_ENDPOINT = re.compile(r"^/recipes/\d+/")
+
+# Set while the current thread makes background calls (see background_priority)
+_priority = threading.local()
+
+
+class QuotaExhaustedError(Exception):
+    """
+    Raised when a request would exceed the local point budget.
+
+    Attributes:
+        scope (str): Which budget ran out ("minute" or "day")
+        cost (float): Estimated point cost of the rejected request
+        retry_after (float): Seconds until the budget can cover the request
+    """
+
+    def __init__(self, scope: str, cost: float, retry_after: float):
+        self.scope = scope
+        self.cost = cost
+        self.retry_after = retry_after
+        super().__init__(f"Spoonacular {scope} quota exhausted "
+                         f"(request needs {cost:.2f} points, retry in {retry_after:.0f}s)")
+
+
+@contextmanager
+def background_priority() -> Iterator[None]:
+    """
+    Charge the calls made by this thread inside the block as background calls.
+
+    A QuotaThrottle lets background calls spend only its background_share of
+    the minute and day budgets, keeping the rest for user requests.
+    """
+    previous = getattr(_priority, "background", False)
+    _priority.background = True
+    try:
+        yield
+    finally:
+        _priority.background = previous
+
+
+def is_background() -> bool:
+    """Whether the current thread is inside background_priority()."""
+    return getattr(_priority, "background", False)
+
+
+def _is_true(value: Any) -> bool:
+    return value is True or str(value).lower() == "true"
+
+
+def estimate_point_cost(endpoint: str, params: Optional[Mapping[str, Any]] = None) -> float:
+    """
+    Estimate the Spoonacular point cost of a request.
+
+    Args:
+        endpoint (str): API endpoint (e.g., "/recipes/complexSearch")
+        params (Mapping[str, Any], optional): Query parameters
+
+    Returns:
+        float: Estimated points; 1.0 for endpoints without a known formula
+    """
+    params = params or {}
+    number = int(params.get("number", 10) or 10)
+
+    if endpoint == "/recipes/complexSearch":
+        per_result = 0.01 + sum(cost for option, cost in _SEARCH_OPTION_COSTS.items()
+                                if _is_true(params.get(option)))
+        return 1 + per_result * number
+    if endpoint == "/recipes/findByIngredients":
+        return 1 + 0.01 * number
+    if endpoint == "/recipes/random":
+        return 1 + 0.01 * number
+    if endpoint == "/recipes/informationBulk":
+        ids = [i for i in str(params.get("ids", "")).split(",") if i.strip()]
+        return 1 + 0.5 * max(0, len(ids) - 1)
+    if _RECIPE_ID_ENDPOINT.match(endpoint) and _is_true(params.get("includeNutrition")):
+        return 1.025
+    return 1.0
+
+
+class QuotaThrottle:
+    """
+    Client-side point budget shared by all processes through SQLite.
+
+    The per-minute budget is a token bucket that refills continuously; the
+    per-day budget resets at midnight UTC, matching Spoonacular's quota day.
+    Every state change happens inside a BEGIN IMMEDIATE transaction, so
+    concurrent workers cannot both spend the last points.
+
+    Calls made inside background_priority() are refused once they would
+    leave less than (1 - background_share) of either budget, so background
+    work can never spend the points reserved for user requests.
+
+    Attributes:
+        per_minute (float): Bucket capacity and refill per minute, in points
+        per_day (float): Daily point budget
+        path (str): SQLite file holding the shared state
+        background_share (float): Fraction of each budget background calls may use
+    """
+
+    def __init__(self, per_minute: float = 60.0, per_day: float = 150.0, path: str = DEFAULT_QUOTA_PATH,
+                 background_share: float = 0.5):
+        self.per_minute = per_minute
+        self.per_day = per_day
+        self.path = path
+        self.background_share = background_share
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS quota_state ("
+            " id INTEGER PRIMARY KEY CHECK (id = 1),"
+            " tokens REAL NOT NULL,"
+            " refilled_at REAL NOT NULL,"
+            " day TEXT NOT NULL,"
+            " day_used REAL NOT NULL)"
+        )
+        conn.execute(
+            "INSERT OR IGNORE INTO quota_state (id, tokens, refilled_at, day, day_used) VALUES (1, ?, ?, ?, 0)",
+            (per_minute, time.time(), self._today())
+        )
+        conn.commit()
+
+    @classmethod
+    def from_env(cls) -> Optional["QuotaThrottle"]:
+        """
+        Build a throttle from environment variables.
+
+        SPOONACULAR_POINTS_PER_MINUTE (default 60), SPOONACULAR_DAILY_POINTS
+        (default 150, the free plan; 0 disables throttling),
+        SPOONACULAR_BACKGROUND_POINTS_SHARE (default 0.5) and
+        SPOONACULAR_QUOTA_PATH (SQLite file).
+
+        Returns:
+            Optional[QuotaThrottle]: The throttle, or None if disabled
+        """
+        per_day = float(os.getenv("SPOONACULAR_DAILY_POINTS", "150"))
+        if per_day <= 0:
+            return None
+        return cls(per_minute=float(os.getenv("SPOONACULAR_POINTS_PER_MINUTE", "60")),
+                   per_day=per_day,
+                   path=os.getenv("SPOONACULAR_QUOTA_PATH", DEFAULT_QUOTA_PATH),
+                   background_share=float(os.getenv("SPOONACULAR_BACKGROUND_POINTS_SHARE", "0.5")))
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    @staticmethod
+    def _seconds_until_reset() -> float:
+        now = datetime.now(timezone.utc)
+        midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return (midnight - now).total_seconds()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection (autocommit; transactions are explicit)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def _load(self, conn: sqlite3.Connection) -> Dict[str, Any]:
+        """Read the state row, applying token refill and the daily reset."""
+        tokens, refilled_at, day, day_used = conn.execute(
+            "SELECT tokens, refilled_at, day, day_used FROM quota_state WHERE id = 1"
+        ).fetchone()
+        now = time.time()
+        tokens = min(self.per_minute, tokens + (now - refilled_at) * self.per_minute / 60.0)
+        today = self._today()
+        if day != today:
+            day, day_used = today, 0.0
+        return {"tokens": tokens, "refilled_at": now, "day": day, "day_used": day_used}
+
+    def _save(self, conn: sqlite3.Connection, state: Dict[str, Any]) -> None:
+        conn.execute(
+            "UPDATE quota_state SET tokens = ?, refilled_at = ?, day = ?, day_used = ? WHERE id = 1",
+            (state["tokens"], state["refilled_at"], state["day"], state["day_used"])
+        )
+
+    def acquire(self, cost: float) -> None:
+        """
+        Spend points for a request, or fail fast if the budget cannot cover it.
+
+        Inside background_priority() only background_share of each budget
+        may be used.
+
+        Args:
+            cost (float): Estimated point cost
+
+        Raises:
+            QuotaExhaustedError: If the minute or day budget is insufficient
+        """
+        background = is_background()
+        day_limit = self.per_day * self.background_share if background else self.per_day
+        reserve = self.per_minute * (1 - self.background_share) if background else 0.0
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            state = self._load(conn)
+            if state["day_used"] + cost > day_limit:
+                raise QuotaExhaustedError("day", cost, self._seconds_until_reset())
+            # A request costing more than the whole bucket may still run from a full bucket
+            needed = min(cost, self.per_minute)
+            if state["tokens"] < min(needed + reserve, self.per_minute):
+                retry_after = (min(needed + reserve, self.per_minute) - state["tokens"]) * 60.0 / self.per_minute
+                raise QuotaExhaustedError("minute", cost, retry_after)
+            state["tokens"] -= needed
+            state["day_used"] += cost
+            self._save(conn, state)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def refund(self, cost: float) -> None:
+        """
+        Give back the points acquire() charged for a request that never got a response.
+
+        Args:
+            cost (float): Points charged by acquire() for the request
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            state = self._load(conn)
+            state["tokens"] = min(self.per_minute, state["tokens"] + min(cost, self.per_minute))
+            state["day_used"] = max(0.0, state["day_used"] - cost)
+            self._save(conn, state)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def reconcile(self, estimated_cost: float, headers: Mapping[str, str]) -> None:
+        """
+        Correct the local state with Spoonacular's quota response headers.
+
+        X-API-Quota-Used is the authoritative points used today; if it is
+        missing, X-API-Quota-Request (this call's actual cost) adjusts the
+        estimate that acquire() charged.
+
+        Args:
+            estimated_cost (float): Points charged by acquire() for this request
+            headers (Mapping[str, str]): Response headers
+        """
+        used = headers.get("X-API-Quota-Used")
+        actual = headers.get("X-API-Quota-Request")
+        if used is None and actual is None:
+            return
+
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            state = self._load(conn)
+            if actual is not None:
+                difference = float(actual) - estimated_cost
+                state["tokens"] = max(0.0, min(self.per_minute, state["tokens"] - difference))
+                state["day_used"] = max(0.0, state["day_used"] + difference)
+            if used is not None:
+                state["day_used"] = float(used)
+            self._save(conn, state)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def mark_exhausted(self) -> None:
+        """Record that Spoonacular rejected a call for quota (HTTP 402) until the daily reset."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            state = self._load(conn)
+            state["day_used"] = max(state["day_used"], self.per_day)
+            self._save(conn, state)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the current budget.
+
+        Returns:
+            Dict[str, Any]: Points left this minute and today (overall and
+                for background calls), and today's usage
+        """
+        state = self._load(self._connection())
+        return {
+            "minute_points_left": round(state["tokens"], 3),
+            "day_points_used": round(state["day_used"], 3),
+            "day_points_left": round(max(0.0, self.per_day - state["day_used"]), 3),
+            "background_day_points_left": round(
+                max(0.0, self.per_day * self.background_share - state["day_used"]), 3),
+            "per_minute": self.per_minute,
+            "per_day": self.per_day,
+            "background_share": self.background_share
+        }
@@ -0,0 +1,195 @@
+"""
+Random Recipe Pool Module
+
+This module keeps pools of pre-fetched random recipes, one per filter
+combination (diet, intolerances, max ready time), so a "shuffle" request is
+answered from memory instead of a /recipes/random round trip. Pools are
+filled in bulk (one request for batch_size recipes costs about as many
+points as one for a single recipe) and topped up by a background worker
+once they drop below low_water, at background quota priority (see
+quota.background_priority). Only an empty pool makes a caller wait for an
+upstream call.
+"""
+
+import time
+import random
+import logging
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from quota import background_priority, estimate_point_cost
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, Tuple[str, ...], int]
+
+
+class RandomRecipePool:
+    """
+    Pre-fetched random recipes per filter combination.
+
+    Attributes:
+        batch_size (int): Recipes fetched per refill
+        low_water (int): Pool size below which a background refill starts
+        max_pools (int): Filter combinations kept; least recently used are dropped
+    """
+
+    def __init__(self,
+                 fetch: Callable[..., List[Dict[str, Any]]],
+                 batch_size: int = 50,
+                 low_water: int = 10,
+                 max_pools: int = 64,
+                 max_workers: int = 2):
+        """
+        Args:
+            fetch (Callable): Called as fetch(number, diet=..., intolerances=...,
+                max_ready_time=...) and returns a list of random recipes
+            batch_size (int, optional): Recipes per refill. Defaults to 50.
+            low_water (int, optional): Refill threshold. Defaults to 10.
+            max_pools (int, optional): Filter combinations kept. Defaults to 64.
+            max_workers (int, optional): Background refill threads. Defaults to 2.
+        """
+        self.fetch = fetch
+        self.batch_size = batch_size
+        self.low_water = low_water
+        self.max_pools = max_pools
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._pools: "OrderedDict[PoolKey, Deque[Dict[str, Any]]]" = OrderedDict()
+        self._refilling: Dict[PoolKey, Any] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._counters = {"requests": 0, "hits": 0, "misses": 0, "refills": 0, "refill_failures": 0,
+                          "recipes_fetched": 0, "recipes_served": 0, "refill_points": 0.0, "refill_seconds": 0.0}
+
+    @staticmethod
+    def key(diet: Optional[str] = None,
+            intolerances: Optional[Iterable[str]] = None,
+            max_ready_time: Optional[int] = None) -> PoolKey:
+        """Normalized pool key for a filter combination."""
+        return ((diet or "").lower(),
+                tuple(sorted({i.strip().lower() for i in intolerances or []})),
+                int(max_ready_time or 0))
+
+    def get(self,
+            number: int = 1,
+            diet: Optional[str] = None,
+            intolerances: Optional[Iterable[str]] = None,
+            max_ready_time: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Take random recipes from the pool for a filter combination.
+
+        An empty pool is refilled synchronously; otherwise recipes are popped
+        in O(1) and a background refill starts once the pool runs low.
+
+        Args:
+            number (int, optional): Recipes wanted. Defaults to 1.
+            diet, intolerances, max_ready_time: Filters, as for get_random_recipes
+
+        Returns:
+            List[Dict[str, Any]]: Up to number recipes (fewer only if upstream
+                has fewer matches)
+
+        Raises:
+            Exception: Whatever fetch raised, when a synchronous refill fails
+        """
+        key = self.key(diet, intolerances, max_ready_time)
+        taken = self._take(key, number)
+        with self._lock:
+            self._counters["requests"] += 1
+            self._counters["hits" if len(taken) == number else "misses"] += 1
+        if len(taken) < number:
+            self._refill(key, max(self.batch_size, number - len(taken)))
+            taken += self._take(key, number - len(taken))
+        with self._lock:
+            self._counters["recipes_served"] += len(taken)
+            remaining = len(self._pools.get(key, ()))
+        if remaining < self.low_water:
+            self._schedule_refill(key)
+        return taken
+
+    def _take(self, key: PoolKey, number: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                return []
+            self._pools.move_to_end(key)
+            return [pool.popleft() for _ in range(min(number, len(pool)))]
+
+    def _refill(self, key: PoolKey, number: int) -> None:
+        """Fetch a batch for a filter combination and add it to its pool."""
+        diet, intolerances, max_ready_time = key
+        filters = {"diet": diet or None, "intolerances": list(intolerances) or None,
+                   "max_ready_time": max_ready_time or None}
+        started = time.perf_counter()
+        try:
+            recipes = self.fetch(number, **filters)
+        except Exception:
+            with self._lock:
+                self._counters["refill_failures"] += 1
+            raise
+        elapsed = time.perf_counter() - started
+        random.shuffle(recipes)
+
+        with self._lock:
+            self._counters["refills"] += 1
+            self._counters["recipes_fetched"] += len(recipes)
+            self._counters["refill_points"] += estimate_point_cost("/recipes/random", {"number": number})
+            self._counters["refill_seconds"] += elapsed
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = deque()
+            queued = {recipe.get("id") for recipe in pool}
+            pool.extend(recipe for recipe in recipes if recipe.get("id") not in queued)
+            self._pools.move_to_end(key)
+            while len(self._pools) > self.max_pools:
+                self._pools.popitem(last=False)
+
+    def _schedule_refill(self, key: PoolKey) -> None:
+        """Start a background refill for a filter combination unless one is running."""
+        with self._lock:
+            if key in self._refilling:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="random-pool")
+            self._refilling[key] = self._executor.submit(self._background_refill, key)
+
+    def _background_refill(self, key: PoolKey) -> None:
+        try:
+            with background_priority():
+                self._refill(key, self.batch_size)
+        except Exception as e:
+            logger.warning("Random recipe pool refill failed for %s: %s", key, e)
+        finally:
+            with self._lock:
+                self._refilling.pop(key, None)
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Wait for background refills in flight (mainly for tests and benchmarks)."""
+        with self._lock:
+            futures = list(self._refilling.values())
+        for future in futures:
+            future.exception(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool sizes, hit rate and refill cost.
+
+        Returns:
+            Dict[str, Any]: Counters plus pools, pooled recipes, hit_rate,
+                refilling, and mean points/milliseconds per refill
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            stats["pools"] = len(self._pools)
+            stats["pooled"] = sum(len(pool) for pool in self._pools.values())
+            stats["refilling"] = len(self._refilling)
+        stats["hit_rate"] = stats["hits"] / stats["requests"] if stats["requests"] else 0.0
+        refills = stats["refills"]
+        stats["points_per_refill"] = round(stats["refill_points"] / refills, 3) if refills else 0.0
+        stats["ms_per_refill"] = round(1000 * stats["refill_seconds"] / refills, 1) if refills else 0.0
+        stats["refill_points"] = round(stats["refill_points"], 3)
+        stats["refill_seconds"] = round(stats["refill_seconds"], 3)
+        return stats
@@ -0,0 +1,145 @@
+"""
+Recipe Batcher Module
+
+This module micro-batches individual recipe detail lookups. Calls to
+RecipeBatcher.get() that arrive within a short window (a few milliseconds)
+are gathered and resolved with a single bulk fetch, and each caller gets back
+only the record it asked for. A batch is flushed early once it reaches
+max_batch ids, and a lookup arriving while no other is pending or in flight
+is fetched at once, since there is nothing to wait for. A batch made up only
+of background lookups (see quota.background_priority) is fetched at
+background priority too.
+"""
+
+import threading
+from concurrent.futures import Future
+from contextlib import nullcontext
+from typing import Callable, Dict, List, Optional
+
+from quota import background_priority, is_background
+
+
+class MissingRecipeError(LookupError):
+    """
+    Raised when a bulk response does not include a requested recipe.
+
+    Attributes:
+        recipe_id (int): The recipe that was not returned
+    """
+
+    def __init__(self, recipe_id: int):
+        self.recipe_id = recipe_id
+        super().__init__(f"Recipe {recipe_id} was not returned by the bulk lookup")
+
+
+class RecipeBatcher:
+    """
+    Gather recipe lookups over a short window into one bulk fetch.
+
+    Attributes:
+        window (float): Seconds to wait for more lookups before flushing
+        max_batch (int): Ids that trigger an immediate flush
+    """
+
+    def __init__(self,
+                 fetch_bulk: Callable[[List[int]], Dict[int, Dict]],
+                 window: float = 0.005,
+                 max_batch: int = 50):
+        """
+        Args:
+            fetch_bulk (Callable): Takes a list of recipe ids and returns records keyed by id
+            window (float, optional): Batching window in seconds. Defaults to 5ms.
+            max_batch (int, optional): Batch size that flushes immediately. Defaults to 50.
+        """
+        self.fetch_bulk = fetch_bulk
+        self.window = window
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._pending: Dict[int, Future] = {}
+        self._foreground = False  # whether a pending lookup was made outside background_priority()
+        self._timer: Optional[threading.Timer] = None
+        self._active = 0  # get() calls not yet answered
+        self._counters = {"lookups": 0, "batches": 0, "largest_batch": 0, "immediate": 0}
+
+    def get(self, recipe_id: int, timeout: Optional[float] = None) -> Dict:
+        """
+        Look up one recipe as part of the current batch.
+
+        A lookup with no other pending or in flight skips the window.
+
+        Args:
+            recipe_id (int): ID of the recipe
+            timeout (float, optional): Seconds to wait for the batch
+
+        Returns:
+            Dict: The recipe record
+
+        Raises:
+            MissingRecipeError: If the bulk response did not include the recipe
+            Exception: Whatever the bulk fetch raised, for every caller in the batch
+        """
+        recipe_id = int(recipe_id)
+        flush_now = False
+        with self._lock:
+            self._counters["lookups"] += 1
+            self._active += 1
+            self._foreground = self._foreground or not is_background()
+            future = self._pending.get(recipe_id)
+            if future is None:
+                future = self._pending[recipe_id] = Future()
+                if self._active == 1:
+                    flush_now = True
+                    self._counters["immediate"] += 1
+                else:
+                    flush_now = len(self._pending) >= self.max_batch
+                    if self._timer is None and not flush_now:
+                        self._timer = threading.Timer(self.window, self.flush)
+                        self._timer.daemon = True
+                        self._timer.start()
+        try:
+            if flush_now:
+                self.flush()
+            return future.result(timeout)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def flush(self) -> None:
+        """Resolve every pending lookup with one bulk fetch."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            foreground, self._foreground = self._foreground, False
+            timer, self._timer = self._timer, None
+            if batch:
+                self._counters["batches"] += 1
+                self._counters["largest_batch"] = max(self._counters["largest_batch"], len(batch))
+        if timer is not None:
+            timer.cancel()
+        if not batch:
+            return
+
+        try:
+            with nullcontext() if foreground else background_priority():
+                records = self.fetch_bulk(list(batch))
+        except BaseException as e:
+            for future in batch.values():
+                future.set_exception(e)
+            return
+
+        for recipe_id, future in batch.items():
+            record = records.get(recipe_id)
+            if record is None:
+                future.set_exception(MissingRecipeError(recipe_id))
+            else:
+                future.set_result(record)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get batching counters.
+
+        Returns:
+            Dict[str, int]: Lookups received, bulk fetches issued, the largest
+                batch, and lookups fetched at once without waiting for the window
+        """
+        with self._lock:
+            return dict(self._counters)
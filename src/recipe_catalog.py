@@ -0,0 +1,552 @@
+"""
+Recipe Catalog Module
+
+This module keeps a persistent local catalog of every recipe payload the app
+receives from Spoonacular (search results, random recipes, detail and bulk
+lookups), so repeated searches can be answered without an upstream call:
+
+- recipes: one row per recipe with the filterable columns, a bitmask of the
+  diets it satisfies and intolerances it triggers, and the richest payload
+  seen so far (later payloads are merged over earlier ones)
+- ingredients: one row per recipe ingredient
+- recipes_fts: an FTS5 index over title, ingredient names and summary
+
+Searches are ranked by BM25 (title weighted above ingredients above summary)
+blended with popularity, which roughly tracks Spoonacular's own relevance
+ordering. search_if_covered() answers only queries Spoonacular has recently
+answered for the same filters, and only when the catalog holds enough
+matches, judged against the result total Spoonacular reported.
+"""
+
+import os
+import re
+import math
+import json
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "recipe_catalog.db")
+
+# Diets in the order of their bits in recipes.flags (matches BaseSpoonacularClient.VALID_DIETS)
+DIETS = [
+    "gluten free", "ketogenic", "vegetarian", "lacto-vegetarian",
+    "ovo-vegetarian", "vegan", "pescetarian", "paleo", "primal", "low fodmap", "whole30"
+]
+
+# Intolerances in the order of their bits (matches BaseSpoonacularClient.VALID_INTOLERANCES)
+INTOLERANCES = [
+    "dairy", "egg", "gluten", "grain", "peanut", "seafood",
+    "sesame", "shellfish", "soy", "sulfite", "tree nut", "wheat"
+]
+
+DIET_BITS = {diet: 1 << i for i, diet in enumerate(DIETS)}
+INTOLERANCE_BITS = {intolerance: 1 << (16 + i) for i, intolerance in enumerate(INTOLERANCES)}
+
+# Set when the payload carried recipe information (diet flags) / an ingredient list.
+# Filters on unknown data never match, so partial records are not served for them.
+INFO_KNOWN = 1 << 30
+INGREDIENTS_KNOWN = 1 << 31
+
+# Spoonacular "diets" labels that satisfy each diet filter
+_DIET_LABELS = {
+    "gluten free": {"gluten free"},
+    "ketogenic": {"ketogenic"},
+    "vegetarian": {"lacto ovo vegetarian", "vegetarian", "vegan"},
+    "lacto-vegetarian": {"lacto ovo vegetarian", "lacto vegetarian", "vegan"},
+    "ovo-vegetarian": {"lacto ovo vegetarian", "ovo vegetarian", "vegan"},
+    "vegan": {"vegan"},
+    "pescetarian": {"pescatarian", "pescetarian", "lacto ovo vegetarian", "vegan"},
+    "paleo": {"paleolithic", "paleo"},
+    "primal": {"primal"},
+    "low fodmap": {"fodmap friendly", "low fodmap"},
+    "whole30": {"whole 30", "whole30"}
+}
+
+# Ingredient-name patterns that trigger each intolerance (a best-effort
+# approximation of Spoonacular's own classification)
+INTOLERANCE_PATTERNS = {
+    "dairy": re.compile(r"\b(milk|butter|cheese|cream|yogurt|yoghurt|ghee|parmesan|mozzarella|ricotta)\b"),
+    "egg": re.compile(r"\beggs?\b|\bmayonnaise\b"),
+    "gluten": re.compile(r"\b(wheat|flour|bread|pasta|barley|rye|couscous|semolina|noodles?|seitan)\b"),
+    "grain": re.compile(r"\b(wheat|flour|bread|pasta|rice|oats?|barley|rye|corn|quinoa|couscous|noodles?)\b"),
+    "peanut": re.compile(r"\bpeanuts?\b"),
+    "seafood": re.compile(r"\b(fish|salmon|tuna|cod|anchov\w*|sardines?|trout|halibut|tilapia|mackerel)\b"),
+    "sesame": re.compile(r"\b(sesame|tahini)\b"),
+    "shellfish": re.compile(r"\b(shrimps?|prawns?|crab|lobster|clams?|mussels?|oysters?|scallops?)\b"),
+    "soy": re.compile(r"\b(soy|soya|tofu|edamame|miso|tempeh)\b"),
+    "sulfite": re.compile(r"\b(wine|vinegar|dried fruit)\b"),
+    "tree nut": re.compile(r"\b(almonds?|walnuts?|pecans?|cashews?|pistachios?|hazelnuts?|macadamia|pine nuts?)\b"),
+    "wheat": re.compile(r"\b(wheat|flour|bread|pasta|couscous|semolina|noodles?|seitan)\b")
+}
+
+# How much of a recipe a search needs: any row, recipe information, recipe
+# information with ingredients, or a complete detail record (ingredients and
+# instructions)
+DETAIL_LEVELS = ("any", "info", "ingredients", "complete")
+
+# Weight of log-popularity relative to BM25 when ranking
+POPULARITY_WEIGHT = 0.15
+
+# Upstream totals older than this no longer count towards coverage
+QUERY_TOTAL_MAX_AGE = 7 * 24 * 60 * 60
+
+_TAG = re.compile(r"<[^>]+>")
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def recipe_flags(recipe: Dict[str, Any]) -> int:
+    """
+    Compute the diet/intolerance bitmask for a recipe payload.
+
+    Args:
+        recipe (Dict[str, Any]): Recipe in any Spoonacular shape
+
+    Returns:
+        int: DIET_BITS satisfied, INTOLERANCE_BITS triggered, plus INFO_KNOWN
+            and INGREDIENTS_KNOWN when that data was present
+    """
+    flags = 0
+    if "vegetarian" in recipe or "diets" in recipe:
+        flags |= INFO_KNOWN
+        labels = {label.lower() for label in recipe.get("diets", [])}
+        if recipe.get("vegetarian"):
+            labels.add("vegetarian")
+        if recipe.get("vegan"):
+            labels.add("vegan")
+        if recipe.get("glutenFree"):
+            labels.add("gluten free")
+        if recipe.get("lowFodmap"):
+            labels.add("low fodmap")
+        for diet, accepted in _DIET_LABELS.items():
+            if labels & accepted:
+                flags |= DIET_BITS[diet]
+
+    ingredients = recipe.get("extendedIngredients")
+    if ingredients is not None:
+        flags |= INGREDIENTS_KNOWN
+        names = " ".join(str(i.get("name", "")).lower() for i in ingredients)
+        for intolerance, pattern in INTOLERANCE_PATTERNS.items():
+            if pattern.search(names):
+                flags |= INTOLERANCE_BITS[intolerance]
+        # The upstream flags are authoritative where they exist
+        if recipe.get("dairyFree") is True:
+            flags &= ~INTOLERANCE_BITS["dairy"]
+        elif recipe.get("dairyFree") is False:
+            flags |= INTOLERANCE_BITS["dairy"]
+        if recipe.get("glutenFree") is True:
+            flags &= ~INTOLERANCE_BITS["gluten"]
+        elif recipe.get("glutenFree") is False:
+            flags |= INTOLERANCE_BITS["gluten"]
+    return flags
+
+
+def recipe_calories(recipe: Dict[str, Any]) -> Optional[float]:
+    """Calories per serving from a payload's nutrition block, if present."""
+    for nutrient in (recipe.get("nutrition") or {}).get("nutrients", []):
+        if str(nutrient.get("name", "")).lower() == "calories":
+            return float(nutrient.get("amount", 0))
+    return None
+
+
+def match_expression(query: str) -> Optional[str]:
+    """
+    Build an FTS5 MATCH expression requiring every word of a query.
+
+    Returns:
+        Optional[str]: The expression, or None if the query has no words
+    """
+    tokens = _TOKEN.findall(query.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"' for token in tokens)
+
+
+class RecipeCatalog:
+    """
+    Persistent SQLite catalog of recipes with full-text search.
+
+    Each thread gets its own connection; the database runs in WAL mode so
+    searches are never blocked by ingestion in another worker.
+
+    Attributes:
+        path (str): Path of the SQLite database file
+        min_coverage (float): Fraction of the wanted results the catalog must
+            hold before search_if_covered answers locally
+    """
+
+    def __init__(self, path: str = DEFAULT_CATALOG_PATH, min_coverage: float = 1.0):
+        self.path = path
+        self.min_coverage = min_coverage
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = {"ingested": 0, "local_hits": 0, "local_misses": 0}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(
+            "CREATE TABLE IF NOT EXISTS recipes ("
+            " id INTEGER PRIMARY KEY,"
+            " title TEXT NOT NULL,"
+            " image TEXT,"
+            " ready_in_minutes INTEGER,"
+            " servings INTEGER,"
+            " calories REAL,"
+            " likes INTEGER NOT NULL DEFAULT 0,"
+            " flags INTEGER NOT NULL DEFAULT 0,"
+            " complete INTEGER NOT NULL DEFAULT 0,"
+            " payload BLOB NOT NULL,"
+            " updated_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS ix_recipes_updated_at ON recipes (updated_at);"
+            "CREATE TABLE IF NOT EXISTS ingredients ("
+            " recipe_id INTEGER NOT NULL,"
+            " position INTEGER NOT NULL,"
+            " name TEXT NOT NULL,"
+            " amount REAL,"
+            " unit TEXT,"
+            " aisle TEXT,"
+            " PRIMARY KEY (recipe_id, position));"
+            "CREATE INDEX IF NOT EXISTS ix_ingredients_name ON ingredients (name);"
+            "CREATE VIRTUAL TABLE IF NOT EXISTS recipes_fts USING fts5("
+            " title, ingredients, summary, tokenize='porter unicode61');"
+            "CREATE TABLE IF NOT EXISTS catalog_queries ("
+            " key TEXT PRIMARY KEY,"
+            " total_results INTEGER NOT NULL,"
+            " fetched_at REAL NOT NULL);"
+        )
+        conn.commit()
+
+    @classmethod
+    def from_env(cls) -> Optional["RecipeCatalog"]:
+        """
+        Build a catalog configured from environment variables.
+
+        SPOONACULAR_CATALOG_PATH sets the SQLite file (an empty value disables
+        the catalog) and SPOONACULAR_CATALOG_MIN_COVERAGE the coverage threshold.
+
+        Returns:
+            Optional[RecipeCatalog]: The catalog, or None if disabled
+        """
+        path = os.getenv("SPOONACULAR_CATALOG_PATH", DEFAULT_CATALOG_PATH)
+        if not path:
+            return None
+        return cls(path, float(os.getenv("SPOONACULAR_CATALOG_MIN_COVERAGE", "1.0")))
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += amount
+
+    def ingest(self, recipes: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add or update recipes from any Spoonacular payload shape.
+
+        Each payload is merged over what the catalog already holds for the
+        recipe, so a lean search result never erases ingredients or
+        instructions stored from an earlier detail lookup. fillIngredients
+        lists are mapped to extendedIngredients.
+
+        Args:
+            recipes (Iterable[Dict[str, Any]]): Recipe payloads with at least id and title
+
+        Returns:
+            int: Number of recipes written
+        """
+        conn = self._connection()
+        written = 0
+        try:
+            with conn:
+                for recipe in recipes:
+                    recipe_id = recipe.get("id")
+                    if recipe_id is None or not recipe.get("title"):
+                        continue
+                    recipe = dict(recipe)
+                    if "extendedIngredients" not in recipe and (
+                            "usedIngredients" in recipe or "missedIngredients" in recipe):
+                        recipe["extendedIngredients"] = (list(recipe.get("usedIngredients", [])) +
+                                                         list(recipe.get("missedIngredients", [])))
+                    for key in ("usedIngredients", "missedIngredients", "unusedIngredients",
+                                "usedIngredientCount", "missedIngredientCount"):
+                        recipe.pop(key, None)
+
+                    row = conn.execute("SELECT payload FROM recipes WHERE id = ?", (recipe_id,)).fetchone()
+                    if row is not None:
+                        recipe = dict(json.loads(zlib.decompress(row[0]).decode("utf-8")), **recipe)
+                    self._write(conn, int(recipe_id), recipe)
+                    written += 1
+        except sqlite3.Error as e:
+            logger.warning("Recipe catalog ingest failed: %s", e)
+            return 0
+        self._count("ingested", written)
+        return written
+
+    def _write(self, conn: sqlite3.Connection, recipe_id: int, recipe: Dict[str, Any]) -> None:
+        """Write one merged recipe to all three tables."""
+        ingredients = recipe.get("extendedIngredients") or []
+        complete = "extendedIngredients" in recipe and "analyzedInstructions" in recipe
+        payload = zlib.compress(json.dumps(recipe, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+        conn.execute(
+            "INSERT OR REPLACE INTO recipes (id, title, image, ready_in_minutes, servings, calories,"
+            " likes, flags, complete, payload, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (recipe_id, recipe["title"], recipe.get("image"), recipe.get("readyInMinutes"),
+             recipe.get("servings"), recipe_calories(recipe), int(recipe.get("aggregateLikes") or 0),
+             recipe_flags(recipe), int(complete), payload, time.time())
+        )
+        conn.execute("DELETE FROM ingredients WHERE recipe_id = ?", (recipe_id,))
+        conn.executemany(
+            "INSERT INTO ingredients (recipe_id, position, name, amount, unit, aisle) VALUES (?, ?, ?, ?, ?, ?)",
+            [(recipe_id, position, str(i.get("name", "")).lower(), i.get("amount"), i.get("unit"), i.get("aisle"))
+             for position, i in enumerate(ingredients)]
+        )
+        conn.execute("DELETE FROM recipes_fts WHERE rowid = ?", (recipe_id,))
+        conn.execute(
+            "INSERT INTO recipes_fts (rowid, title, ingredients, summary) VALUES (?, ?, ?, ?)",
+            (recipe_id, recipe["title"], " ".join(str(i.get("name", "")) for i in ingredients),
+             _TAG.sub(" ", recipe.get("summary") or ""))
+        )
+
+    def version(self) -> float:
+        """Time of the latest catalog write (0.0 when empty), a cheap change marker."""
+        row = self._connection().execute("SELECT MAX(updated_at) FROM recipes").fetchone()
+        return float(row[0] or 0.0)
+
+    def column_rows(self) -> List[Tuple[int, Optional[int], Optional[float], Optional[int], int, int]]:
+        """
+        Get the filterable columns of every recipe, ordered by id.
+
+        Returns:
+            List[Tuple]: (id, ready_in_minutes, calories, servings, flags, complete) rows
+        """
+        return self._connection().execute(
+            "SELECT id, ready_in_minutes, calories, servings, flags, complete FROM recipes ORDER BY id"
+        ).fetchall()
+
+    def get_many(self, recipe_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """
+        Get stored recipe payloads by id.
+
+        Args:
+            recipe_ids (Iterable[int]): Recipe ids
+
+        Returns:
+            List[Dict[str, Any]]: Payloads in the order given, skipping unknown ids
+        """
+        recipe_ids = [int(i) for i in recipe_ids]
+        if not recipe_ids:
+            return []
+        placeholders = ",".join("?" * len(recipe_ids))
+        rows = self._connection().execute(
+            f"SELECT id, payload FROM recipes WHERE id IN ({placeholders})", recipe_ids).fetchall()
+        payloads = {row[0]: json.loads(zlib.decompress(row[1]).decode("utf-8")) for row in rows}
+        return [payloads[i] for i in recipe_ids if i in payloads]
+
+    @staticmethod
+    def filter_masks(diet: Optional[str] = None,
+                     intolerances: Optional[Iterable[str]] = None) -> Tuple[int, int]:
+        """
+        Translate diet and intolerance filters into bitmasks over recipes.flags.
+
+        Returns:
+            Tuple[int, int]: (bits that must be set, bits that must be clear)
+        """
+        required, forbidden = 0, 0
+        if diet:
+            required |= DIET_BITS.get(diet.lower(), 0) | INFO_KNOWN
+        for intolerance in intolerances or []:
+            bit = INTOLERANCE_BITS.get(intolerance.strip().lower())
+            if bit:
+                required |= INGREDIENTS_KNOWN
+                forbidden |= bit
+        return required, forbidden
+
+    def search(self,
+               query: str,
+               number: int = 10,
+               offset: int = 0,
+               diet: Optional[str] = None,
+               intolerances: Optional[Iterable[str]] = None,
+               max_ready_time: Optional[int] = None,
+               min_calories: Optional[int] = None,
+               max_calories: Optional[int] = None,
+               detail: str = "any") -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Search the catalog.
+
+        Matches must contain every word of the query in the title, ingredient
+        names or summary (with Porter stemming). They are ranked by BM25 with a
+        log-popularity boost; an empty query ranks by popularity alone.
+
+        Args:
+            query (str): Search query
+            number (int, optional): Results to return. Defaults to 10.
+            offset (int, optional): Results to skip. Defaults to 0.
+            diet, intolerances, max_ready_time, min_calories, max_calories:
+                Same filters as SpoonacularClient.search_recipes
+            detail (str, optional): Least detail a match must hold, one of
+                DETAIL_LEVELS. Defaults to "any".
+
+        Returns:
+            Tuple[List[Dict[str, Any]], int]: The page of recipe payloads and
+                the total number of matches
+        """
+        required, forbidden = self.filter_masks(diet, intolerances)
+        if detail in ("info", "ingredients"):
+            required |= INFO_KNOWN
+        conditions = ["(r.flags & ?) = ?", "(r.flags & ?) = 0"]
+        args: List[Any] = [required, required, forbidden]
+        if detail == "ingredients":
+            conditions.append("EXISTS (SELECT 1 FROM ingredients i WHERE i.recipe_id = r.id)")
+        if detail == "complete":
+            conditions.append("r.complete = 1")
+        if max_ready_time:
+            conditions.append("r.ready_in_minutes IS NOT NULL AND r.ready_in_minutes <= ?")
+            args.append(max_ready_time)
+        if min_calories:
+            conditions.append("r.calories IS NOT NULL AND r.calories >= ?")
+            args.append(min_calories)
+        if max_calories:
+            conditions.append("r.calories IS NOT NULL AND r.calories <= ?")
+            args.append(max_calories)
+
+        expression = match_expression(query)
+        conn = self._connection()
+        if expression is None:
+            where = " AND ".join(conditions)
+            total = conn.execute(f"SELECT COUNT(*) FROM recipes r WHERE {where}", args).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT r.payload FROM recipes r WHERE {where} ORDER BY r.likes DESC, r.id LIMIT ? OFFSET ?",
+                args + [number, offset]
+            ).fetchall()
+            return [json.loads(zlib.decompress(row[0]).decode("utf-8")) for row in rows], total
+
+        where = " AND ".join(["recipes_fts MATCH ?"] + conditions)
+        args = [expression] + args
+        source = "recipes_fts JOIN recipes r ON r.id = recipes_fts.rowid"
+        total = conn.execute(f"SELECT COUNT(*) FROM {source} WHERE {where}", args).fetchone()[0]
+
+        # Take the best BM25 candidates, then blend in popularity
+        candidates = max(4 * (offset + number), 100)
+        rows = conn.execute(
+            f"SELECT r.payload, bm25(recipes_fts, 10.0, 4.0, 1.0) AS rank, r.likes FROM {source}"
+            f" WHERE {where} ORDER BY rank LIMIT ?",
+            args + [candidates]
+        ).fetchall()
+        rows.sort(key=lambda row: row[1] * (1 + POPULARITY_WEIGHT * math.log1p(row[2])))
+        page = rows[offset:offset + number]
+        return [json.loads(zlib.decompress(row[0]).decode("utf-8")) for row in page], total
+
+    @staticmethod
+    def query_key(query: str,
+                  diet: Optional[str] = None,
+                  intolerances: Optional[Iterable[str]] = None,
+                  max_ready_time: Optional[int] = None,
+                  min_calories: Optional[int] = None,
+                  max_calories: Optional[int] = None) -> str:
+        """Key identifying a query and its filters, independent of paging."""
+        return json.dumps([
+            _TOKEN.findall(query.lower()), (diet or "").lower(),
+            sorted(i.strip().lower() for i in intolerances or []),
+            max_ready_time or 0, min_calories or 0, max_calories or 0
+        ])
+
+    def record_query(self, total_results: int, query: str, **filters) -> None:
+        """
+        Remember how many results Spoonacular reported for a query and filters.
+
+        Args:
+            total_results (int): The upstream totalResults
+            query (str): Search query
+            **filters: diet, intolerances, max_ready_time, min_calories, max_calories
+        """
+        conn = self._connection()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO catalog_queries (key, total_results, fetched_at) VALUES (?, ?, ?)",
+                    (self.query_key(query, **filters), int(total_results), time.time())
+                )
+        except sqlite3.Error as e:
+            logger.warning("Recipe catalog query record failed: %s", e)
+
+    def search_if_covered(self,
+                          query: str,
+                          number: int = 10,
+                          offset: int = 0,
+                          detail: str = "any",
+                          **filters) -> Optional[Dict[str, Any]]:
+        """
+        Answer a search locally if the catalog covers it well enough.
+
+        Only queries Spoonacular answered for the same query and filters
+        within QUERY_TOTAL_MAX_AGE are answered locally: a query never fetched
+        is a miss however many matches its text finds here. The wanted count
+        is offset + number, capped at the total Spoonacular reported, and the
+        catalog answers when it holds at least min_coverage of that count.
+
+        Args:
+            query (str): Search query
+            number (int, optional): Results to return. Defaults to 10.
+            offset (int, optional): Results to skip. Defaults to 0.
+            detail (str, optional): Least detail a match must hold (see search)
+            **filters: diet, intolerances, max_ready_time, min_calories, max_calories
+
+        Returns:
+            Optional[Dict[str, Any]]: A complexSearch-shaped response with
+                "source": "catalog", or None if the catalog cannot answer
+        """
+        try:
+            row = self._connection().execute(
+                "SELECT total_results FROM catalog_queries WHERE key = ? AND fetched_at > ?",
+                (self.query_key(query, **filters), time.time() - QUERY_TOTAL_MAX_AGE)
+            ).fetchone()
+            if row is None:
+                self._count("local_misses")
+                return None
+            results, total = self.search(query, number, offset, detail=detail, **filters)
+        except sqlite3.Error as e:
+            logger.warning("Recipe catalog search failed: %s", e)
+            self._count("local_misses")
+            return None
+
+        if total < math.ceil(min(offset + number, row[0]) * self.min_coverage):
+            self._count("local_misses")
+            return None
+
+        self._count("local_hits")
+        return {"results": results, "offset": offset, "number": len(results),
+                "totalResults": total, "source": "catalog"}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get catalog size and local hit counters.
+
+        Returns:
+            Dict[str, Any]: Recipes (and how many are complete), ingredient rows,
+                recorded queries, recipes ingested and local hits/misses
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+        conn = self._connection()
+        try:
+            stats["recipes"], stats["complete"] = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(complete), 0) FROM recipes").fetchone()
+            stats["ingredients"] = conn.execute("SELECT COUNT(*) FROM ingredients").fetchone()[0]
+            stats["queries"] = conn.execute("SELECT COUNT(*) FROM catalog_queries").fetchone()[0]
+        except sqlite3.Error as e:
+            stats["error"] = str(e)
+        return stats
@@ -0,0 +1,143 @@
+"""
+Recipe Models Module
+
+This module defines compact, immutable records for parsed recipes:
+RecipeSummary (a search result card), RecipeDetail (a recipe page) and its
+Ingredient and Step parts. They are frozen dataclasses with __slots__, so
+they hold no per-instance __dict__, can be shared between threads and
+caches safely, and serialize directly with the JSON backend (see
+json_backend.py). Their JSON form has the same keys as the dicts built by
+data_parser.parse_recipe_search_results and parse_recipe_details.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Union
+
+import json_backend
+
+
+@dataclass(frozen=True, slots=True)
+class Ingredient:
+    """One ingredient line of a recipe."""
+    name: str
+    amount: float
+    unit: str
+    original: str
+
+    @classmethod
+    def from_api(cls, ingredient: Dict[str, Any]) -> "Ingredient":
+        """Build from a Spoonacular extendedIngredients entry."""
+        return cls(ingredient.get("name", ""), ingredient.get("amount", 0),
+                   ingredient.get("unit", ""), ingredient.get("original", ""))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "amount": self.amount, "unit": self.unit, "original": self.original}
+
+
+@dataclass(frozen=True, slots=True)
+class Step:
+    """One instruction step of a recipe."""
+    number: int
+    step: str
+
+    @classmethod
+    def from_api(cls, step: Dict[str, Any]) -> "Step":
+        """Build from a Spoonacular analyzedInstructions step."""
+        return cls(step.get("number", 0), step.get("step", ""))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"number": self.number, "step": self.step}
+
+
+@dataclass(frozen=True, slots=True)
+class RecipeSummary:
+    """A recipe search result, with whichever grid fields the result provided."""
+    id: int
+    title: Optional[str] = None
+    image: Optional[str] = None
+    ready_in_minutes: Optional[int] = None
+    servings: Optional[int] = None
+
+    @classmethod
+    def from_api(cls, result: Dict[str, Any]) -> "RecipeSummary":
+        """Build from a complexSearch result (full or lean, see SEARCH_RESULT_FIELDS)."""
+        return cls(result.get("id"), result.get("title"), result.get("image"),
+                   result.get("readyInMinutes"), result.get("servings"))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RecipeSummary":
+        """Rebuild from to_dict() output."""
+        return cls(data.get("id"), data.get("title"), data.get("image"),
+                   data.get("ready_in_minutes"), data.get("servings"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "title": self.title, "image": self.image,
+                "ready_in_minutes": self.ready_in_minutes, "servings": self.servings}
+
+    def to_json(self) -> str:
+        return json_backend.dumps(self)
+
+    @classmethod
+    def from_json(cls, data: Union[str, bytes]) -> "RecipeSummary":
+        return cls.from_dict(json_backend.loads(data))
+
+
+@dataclass(frozen=True, slots=True)
+class RecipeDetail:
+    """A parsed recipe page: basic information, ingredients, steps and diet flags."""
+    id: Optional[int]
+    title: Optional[str]
+    ready_in_minutes: Optional[int]
+    servings: Optional[int]
+    image: Optional[str]
+    summary: Optional[str]
+    ingredients: Tuple[Ingredient, ...]
+    instructions: Tuple[Step, ...]
+    vegetarian: bool = False
+    vegan: bool = False
+    gluten_free: bool = False
+    dairy_free: bool = False
+
+    @classmethod
+    def from_api(cls, recipe: Dict[str, Any]) -> "RecipeDetail":
+        """Build from a Spoonacular recipe payload (see data_parser.parse_recipe_details)."""
+        return cls(
+            recipe.get("id"), recipe.get("title"), recipe.get("readyInMinutes"), recipe.get("servings"),
+            recipe.get("image"), recipe.get("summary"),
+            tuple(Ingredient.from_api(i) for i in recipe.get("extendedIngredients", [])),
+            tuple(Step.from_api(step)
+                  for instruction_set in recipe.get("analyzedInstructions", [])
+                  for step in instruction_set.get("steps", [])),
+            recipe.get("vegetarian", False), recipe.get("vegan", False),
+            recipe.get("glutenFree", False), recipe.get("dairyFree", False)
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RecipeDetail":
+        """Rebuild from to_dict() output."""
+        return cls(
+            data.get("id"), data.get("title"), data.get("ready_in_minutes"), data.get("servings"),
+            data.get("image"), data.get("summary"),
+            tuple(Ingredient(i["name"], i["amount"], i["unit"], i["original"]) for i in data.get("ingredients", [])),
+            tuple(Step(s["number"], s["step"]) for s in data.get("instructions", [])),
+            data.get("vegetarian", False), data.get("vegan", False),
+            data.get("gluten_free", False), data.get("dairy_free", False)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The same dict data_parser.parse_recipe_details builds."""
+        return {
+            "id": self.id, "title": self.title, "ready_in_minutes": self.ready_in_minutes,
+            "servings": self.servings, "image": self.image, "summary": self.summary,
+            "ingredients": [i.to_dict() for i in self.ingredients],
+            "instructions": [s.to_dict() for s in self.instructions],
+            "vegetarian": self.vegetarian, "vegan": self.vegan,
+            "gluten_free": self.gluten_free, "dairy_free": self.dairy_free
+        }
+
+    def to_json(self) -> str:
+        return json_backend.dumps(self)
+
+    @classmethod
+    def from_json(cls, data: Union[str, bytes]) -> "RecipeDetail":
+        return cls.from_dict(json_backend.loads(data))
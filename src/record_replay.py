@@ -0,0 +1,184 @@
+"""
+Record/Replay Transport Module
+
+This module provides requests transport adapters that capture upstream
+responses to disk once and play them back later, so load tests and
+benchmarks can run offline without spending API quota:
+
+- RecordingAdapter sends requests normally and saves every response
+  (status, headers, body and observed latency) as a JSON fixture
+- ReplayAdapter answers requests from those fixtures, optionally sleeping
+  for the recorded latency to reproduce production latency profiles
+
+Fixtures are keyed by path and sorted query string with API keys removed,
+so they replay against any host (including the local stub server) and never
+contain credentials. Set SPOONACULAR_TRANSPORT=record|replay and
+SPOONACULAR_FIXTURES_DIR to enable a mode for the API clients.
+"""
+
+import os
+import json
+import time
+import hashlib
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Query parameters holding credentials; never part of a key or a fixture
+SECRET_PARAMS = frozenset({"apiKey", "api-key"})
+
+# Response headers worth keeping in a fixture
+RECORDED_HEADERS = ("Content-Type", "Retry-After", "X-API-Quota-Request", "X-API-Quota-Used", "X-API-Quota-Left")
+
+
+def fixture_key(method: str, url: str) -> str:
+    """
+    Build the host-independent fixture key for a request.
+
+    Args:
+        method (str): HTTP method
+        url (str): Full request URL (or just path and query)
+
+    Returns:
+        str: Key such as "GET /food/wine/pairing?food=steak"
+    """
+    parts = urlsplit(url)
+    query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if name not in SECRET_PARAMS)
+    path = parts.path or "/"
+    return f"{method.upper()} {path}?{urlencode(query)}" if query else f"{method.upper()} {path}"
+
+
+class FixtureStore:
+    """
+    Directory of recorded responses, one JSON file per fixture key.
+
+    Attributes:
+        directory (str): Where fixtures are stored
+    """
+
+    def __init__(self, directory: str = DEFAULT_FIXTURES_DIR):
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the fixture recorded for a key, or None."""
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, key: str, status: int, headers: Mapping[str, str], body: str, elapsed_ms: float) -> None:
+        """Write (or overwrite) the fixture for a key."""
+        os.makedirs(self.directory, exist_ok=True)
+        fixture = {
+            "key": key,
+            "status": status,
+            "headers": {name: headers[name] for name in RECORDED_HEADERS if name in headers},
+            "elapsed_ms": round(elapsed_ms, 2),
+            "body": body
+        }
+        with open(self._path(key), "w", encoding="utf-8") as f:
+            json.dump(fixture, f, ensure_ascii=False)
+
+
+class RecordingAdapter(HTTPAdapter):
+    """HTTPAdapter that saves every response it receives as a fixture."""
+
+    def __init__(self, store: FixtureStore, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        started = time.perf_counter()
+        response = super().send(request, **kwargs)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        # Reading .text buffers the body, which stays available to the caller
+        self.store.save(fixture_key(request.method, request.url), response.status_code,
+                        response.headers, response.text, elapsed_ms)
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Adapter that answers requests from recorded fixtures without any network I/O.
+
+    Requests without a fixture raise requests.exceptions.ConnectionError, the
+    same failure an unreachable upstream produces.
+    """
+
+    def __init__(self, store: FixtureStore, replay_latency: bool = False):
+        """
+        Args:
+            store (FixtureStore): Recorded fixtures
+            replay_latency (bool, optional): Sleep for each fixture's recorded
+                latency before answering. Defaults to False.
+        """
+        super().__init__()
+        self.store = store
+        self.replay_latency = replay_latency
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        key = fixture_key(request.method, request.url)
+        fixture = self.store.load(key)
+        if fixture is None:
+            raise requests.exceptions.ConnectionError(f"No recorded fixture for {key}", request=request)
+        if self.replay_latency:
+            time.sleep(fixture.get("elapsed_ms", 0) / 1000)
+
+        response = requests.Response()
+        response.status_code = fixture["status"]
+        response.headers = CaseInsensitiveDict(fixture.get("headers", {}))
+        response._content = fixture["body"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.reason = "Replayed"
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def mount_transport(session: requests.Session,
+                    mode: Optional[str] = None,
+                    directory: Optional[str] = None,
+                    **adapter_kwargs) -> Optional[BaseAdapter]:
+    """
+    Mount a record or replay adapter on a session.
+
+    Args:
+        session (requests.Session): Session to configure
+        mode (str, optional): "record", "replay", "replay-timed" (replay with
+            recorded latency) or "live"; defaults to SPOONACULAR_TRANSPORT
+        directory (str, optional): Fixture directory; defaults to SPOONACULAR_FIXTURES_DIR
+        **adapter_kwargs: Extra HTTPAdapter arguments for recording (e.g. pool sizes)
+
+    Returns:
+        Optional[BaseAdapter]: The mounted adapter, or None in live mode
+
+    Raises:
+        ValueError: If the mode is not recognized
+    """
+    mode = (mode or os.getenv("SPOONACULAR_TRANSPORT", "live")).lower()
+    if mode == "live":
+        return None
+    store = FixtureStore(directory or os.getenv("SPOONACULAR_FIXTURES_DIR", DEFAULT_FIXTURES_DIR))
+    if mode == "record":
+        adapter = RecordingAdapter(store, **adapter_kwargs)
+    elif mode in ("replay", "replay-timed"):
+        adapter = ReplayAdapter(store, replay_latency=mode == "replay-timed")
+    else:
+        raise ValueError("Invalid transport mode. Valid options are: live, record, replay, replay-timed")
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return adapter
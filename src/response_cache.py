@@ -0,0 +1,534 @@
+"""
+Response Cache Module
+
+This module provides a two-tier cache for upstream API responses:
+
+1. MemoryLRUCache: a bounded, per-process LRU for the hottest entries
+2. SQLiteCache: a shared on-disk tier that every gunicorn worker on the host
+   can read, so one worker's upstream call warms the others
+
+TieredCache combines them: reads check memory first, then disk (promoting
+disk hits into memory); writes go to both. Values are JSON-serialized with
+compact separators and zlib-compressed, and both tiers hold only those bytes,
+so every read returns a fresh object that callers are free to mutate.
+
+Entries can outlive their TTL by a stale window. StaleWhileRevalidate uses
+that window to answer from an expired entry immediately while refreshing it
+in the background (stale-while-revalidate), or to fall back to it when the
+upstream call fails (stale-if-error).
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, ContextManager, Dict, Optional, Set, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "spoonacular_cache.db")
+
+# A stored value: compressed payload, when it was written, when it stops being
+# fresh, and when it may no longer be served even as stale data
+CacheEntry = namedtuple("CacheEntry", ["data", "stored_at", "expires_at", "stale_until"])
+
+# A decoded lookup result; fresh while time.time() < expires_at
+CachedValue = namedtuple("CachedValue", ["value", "stored_at", "expires_at"])
+
+
+def encode_value(value: Any) -> bytes:
+    """Serialize a JSON-compatible value to compact, compressed bytes."""
+    return zlib.compress(json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+
+def decode_value(data: bytes) -> Any:
+    """Inverse of encode_value."""
+    return json.loads(zlib.decompress(data).decode("utf-8"))
+
+
+class MemoryLRUCache:
+    """
+    Thread-safe in-process LRU cache of CacheEntry objects.
+
+    Attributes:
+        max_entries (int): Entries kept before the least recently used is evicted
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Get an entry that is fresh or still within its stale window, marking it as recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.stale_until <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry, evicting the least recently used ones if full."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count and total stored bytes."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": sum(len(entry.data) for entry in self._entries.values())
+            }
+
+
+class SQLiteCache:
+    """
+    On-disk cache shared by all processes on the host.
+
+    Each thread gets its own connection. The database runs in WAL mode so
+    readers in other workers are never blocked by a writer.
+
+    Attributes:
+        path (str): Path of the SQLite database file
+    """
+
+    # Expired rows are swept once every this many writes
+    PURGE_INTERVAL = 200
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " stale_until REAL NOT NULL)"
+        )
+        # Databases created before stale windows existed lack the column
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(response_cache)")}
+        if "stale_until" not in columns:
+            conn.execute("ALTER TABLE response_cache ADD COLUMN stale_until REAL")
+            conn.execute("UPDATE response_cache SET stale_until = expires_at")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_response_cache_stale ON response_cache (stale_until)")
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Get an entry that is fresh or still within its stale window."""
+        row = self._connection().execute(
+            "SELECT value, stored_at, expires_at, stale_until FROM response_cache"
+            " WHERE key = ? AND stale_until > ?",
+            (key, time.time())
+        ).fetchone()
+        return CacheEntry(bytes(row[0]), row[1], row[2], row[3]) if row else None
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry, replacing any previous value."""
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO response_cache (key, value, stored_at, expires_at, stale_until)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (key, entry.data, entry.stored_at, entry.expires_at, entry.stale_until)
+        )
+        conn.commit()
+        self._writes += 1
+        if self._writes % self.PURGE_INTERVAL == 0:
+            self.purge_expired()
+
+    def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+        conn = self._connection()
+        conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+        conn.commit()
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        conn = self._connection()
+        conn.execute("DELETE FROM response_cache")
+        conn.commit()
+
+    def purge_expired(self) -> int:
+        """
+        Delete rows past their stale window.
+
+        Returns:
+            int: Number of rows removed
+        """
+        conn = self._connection()
+        removed = conn.execute("DELETE FROM response_cache WHERE stale_until <= ?", (time.time(),)).rowcount
+        conn.commit()
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count and total stored bytes."""
+        count, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM response_cache"
+        ).fetchone()
+        return {"entries": count, "bytes": size}
+
+
+class TieredCache:
+    """
+    Memory LRU in front of a shared SQLite cache.
+
+    Errors from the disk tier are logged and treated as misses so that a
+    locked or unwritable cache file never fails a user request.
+    """
+
+    def __init__(self, memory: Optional[MemoryLRUCache] = None, disk: Optional[SQLiteCache] = None):
+        """
+        Args:
+            memory (MemoryLRUCache, optional): In-process tier. Defaults to a 512-entry LRU.
+            disk (SQLiteCache, optional): Shared tier. None disables the disk tier.
+        """
+        self.memory = memory or MemoryLRUCache()
+        self.disk = disk
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "stale_hits": 0, "misses": 0, "writes": 0}
+
+    @classmethod
+    def from_env(cls) -> "TieredCache":
+        """
+        Build a cache configured from environment variables.
+
+        SPOONACULAR_CACHE_PATH sets the SQLite file (an empty value disables
+        the disk tier) and SPOONACULAR_CACHE_MEMORY_ENTRIES the LRU size.
+        """
+        path = os.getenv("SPOONACULAR_CACHE_PATH", DEFAULT_CACHE_PATH)
+        memory = MemoryLRUCache(int(os.getenv("SPOONACULAR_CACHE_MEMORY_ENTRIES", "512")))
+        return cls(memory=memory, disk=SQLiteCache(path) if path else None)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _disk_get(self, key: str) -> Optional[CacheEntry]:
+        try:
+            return self.disk.get(key)
+        except sqlite3.Error as e:
+            logger.warning("Disk cache read failed for %s: %s", key, e)
+            return None
+
+    def lookup(self, key: str) -> Optional[CachedValue]:
+        """
+        Get a cached value along with its freshness, including stale entries.
+
+        A stale memory entry is checked against the disk tier first, since
+        another worker may already have refreshed it.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[CachedValue]: A freshly decoded copy of the value with its
+                timestamps, or None if there is no fresh or stale entry
+        """
+        now = time.time()
+        counter = "memory_hits"
+        entry = self.memory.get(key)
+        if (entry is None or entry.expires_at <= now) and self.disk is not None:
+            disk_entry = self._disk_get(key)
+            if disk_entry is not None and (entry is None or disk_entry.expires_at > entry.expires_at):
+                entry = disk_entry
+                counter = "disk_hits"
+                self.memory.set(key, entry)
+
+        if entry is None:
+            self._count("misses")
+            return None
+        self._count(counter if entry.expires_at > now else "stale_hits")
+        return CachedValue(decode_value(entry.data), entry.stored_at, entry.expires_at)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a fresh cached value.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[Any]: A freshly decoded copy of the value, or None on a
+                miss or if the entry is stale
+        """
+        hit = self.lookup(key)
+        if hit is None or hit.expires_at <= time.time():
+            return None
+        return hit.value
+
+    def set(self, key: str, value: Any, ttl: float, stale_ttl: float = 0.0) -> None:
+        """
+        Store a value in both tiers.
+
+        Args:
+            key (str): Cache key
+            value (Any): JSON-compatible value
+            ttl (float): Seconds until the entry is no longer fresh
+            stale_ttl (float, optional): Further seconds the entry is kept for
+                stale serving. Defaults to 0.
+        """
+        now = time.time()
+        entry = CacheEntry(encode_value(value), now, now + ttl, now + ttl + max(stale_ttl, 0.0))
+        self.memory.set(key, entry)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, entry)
+            except sqlite3.Error as e:
+                logger.warning("Disk cache write failed for %s: %s", key, e)
+        self._count("writes")
+
+    def delete(self, key: str) -> None:
+        """Remove a key from both tiers."""
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self) -> None:
+        """Remove everything from both tiers."""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters and per-tier sizes.
+
+        Returns:
+            Dict[str, Any]: Counters (memory/disk hits are fresh hits), fresh hit
+                ratio, and memory/disk entry counts and bytes
+        """
+        with self._lock:
+            counters = dict(self._counters)
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        lookups = hits + counters["stale_hits"] + counters["misses"]
+        counters["hit_ratio"] = round(hits / lookups, 4) if lookups else 0.0
+        counters["memory"] = self.memory.stats()
+        if self.disk is not None:
+            try:
+                counters["disk"] = self.disk.stats()
+            except sqlite3.Error as e:
+                counters["disk"] = {"error": str(e)}
+        return counters
+
+
+class StaleWhileRevalidate:
+    """
+    Serve cached values past their TTL while refreshing them.
+
+    For a key with a stale entry:
+
+    - within ``stale_while_revalidate`` seconds of expiry, the stale value is
+      returned at once and ``fetch`` runs on a background worker (at most one
+      refresh per key at a time)
+    - after that, but within ``stale_if_error`` seconds of expiry, ``fetch``
+      runs inline and the stale value is returned only if it raises
+
+    ``fetch`` is responsible for writing its result to the cache, and the
+    cache entry must have been stored with a stale_ttl covering both windows.
+    """
+
+    def __init__(self, cache: TieredCache, max_workers: int = 2,
+                 background: Optional[Callable[[], ContextManager[Any]]] = None):
+        """
+        Args:
+            cache (TieredCache): Cache holding the entries
+            max_workers (int, optional): Background refresh threads. Defaults to 2.
+            background (Callable, optional): Context manager factory entered
+                around every background refresh, e.g. quota.background_priority
+        """
+        self.cache = cache
+        self.background = background
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cache-refresh")
+        self._lock = threading.Lock()
+        self._refreshing: Set[str] = set()
+        self._counters = {"fresh": 0, "stale_while_revalidate": 0, "stale_if_error": 0, "misses": 0,
+                          "refreshes": 0, "refresh_failures": 0}
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def get(self,
+            key: str,
+            fetch: Callable[[], Any],
+            stale_while_revalidate: float = 0.0,
+            stale_if_error: float = 0.0,
+            errors: Tuple[Type[BaseException], ...] = (Exception,)) -> Any:
+        """
+        Get a value from the cache, serving or refreshing stale entries as allowed.
+
+        Args:
+            key (str): Cache key
+            fetch (Callable): Fetches the value from upstream and caches it
+            stale_while_revalidate (float, optional): Seconds after expiry an
+                entry is served while refreshed in the background. Defaults to 0.
+            stale_if_error (float, optional): Seconds after expiry an entry is
+                served when fetch fails. Defaults to 0.
+            errors (Tuple[Type[BaseException], ...], optional): Exceptions that
+                trigger stale-if-error. Defaults to any Exception.
+
+        Returns:
+            Any: The fresh, stale or newly fetched value
+
+        Raises:
+            Exception: Whatever fetch raised, if no stale value may be served
+        """
+        hit = self.cache.lookup(key)
+        if hit is None:
+            self._count("misses")
+            return fetch()
+
+        age = time.time() - hit.expires_at
+        if age < 0:
+            self._count("fresh")
+            return hit.value
+        if age < stale_while_revalidate:
+            self._count("stale_while_revalidate")
+            self.refresh(key, fetch)
+            return hit.value
+
+        try:
+            return fetch()
+        except errors as e:
+            if age >= stale_if_error:
+                raise
+            logger.warning("Serving stale %s after upstream error: %s", key, e)
+            self._count("stale_if_error")
+            return hit.value
+
+    async def get_async(self,
+                        key: str,
+                        fetch: Callable[[], Awaitable[Any]],
+                        refresh: Callable[[], Any],
+                        stale_while_revalidate: float = 0.0,
+                        stale_if_error: float = 0.0,
+                        errors: Tuple[Type[BaseException], ...] = (Exception,)) -> Any:
+        """
+        Coroutine version of get().
+
+        Args:
+            key (str): Cache key
+            fetch (Callable): Coroutine function that fetches the value and caches it
+            refresh (Callable): Blocking equivalent of fetch, run by the
+                background workers for stale-while-revalidate
+            stale_while_revalidate, stale_if_error, errors: See get()
+
+        Returns:
+            Any: The fresh, stale or newly fetched value
+
+        Raises:
+            Exception: Whatever fetch raised, if no stale value may be served
+        """
+        hit = self.cache.lookup(key)
+        if hit is None:
+            self._count("misses")
+            return await fetch()
+
+        age = time.time() - hit.expires_at
+        if age < 0:
+            self._count("fresh")
+            return hit.value
+        if age < stale_while_revalidate:
+            self._count("stale_while_revalidate")
+            self.refresh(key, refresh)
+            return hit.value
+
+        try:
+            return await fetch()
+        except errors as e:
+            if age >= stale_if_error:
+                raise
+            logger.warning("Serving stale %s after upstream error: %s", key, e)
+            self._count("stale_if_error")
+            return hit.value
+
+    def refresh(self, key: str, fetch: Callable[[], Any]) -> bool:
+        """
+        Run fetch in the background unless a refresh of the key is already running.
+
+        Returns:
+            bool: True if a refresh was scheduled
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self._counters["refreshes"] += 1
+
+        def run() -> None:
+            try:
+                if self.background is not None:
+                    with self.background():
+                        fetch()
+                else:
+                    fetch()
+            except Exception as e:
+                logger.warning("Background refresh of %s failed: %s", key, e)
+                self._count("refresh_failures")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._executor.submit(run)
+        return True
+
+    def wait(self) -> None:
+        """Block until all scheduled refreshes have finished (for tests and shutdown)."""
+        while True:
+            with self._lock:
+                if not self._refreshing:
+                    return
+            time.sleep(0.005)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get fresh vs stale serve counters.
+
+        Returns:
+            Dict[str, Any]: Fresh serves, stale serves (while revalidating and
+                on error), misses, background refreshes and their failures,
+                and refreshes currently running
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            counters["refreshing"] = len(self._refreshing)
+        served = counters["fresh"] + counters["stale_while_revalidate"] + counters["stale_if_error"]
+        counters["stale_ratio"] = round((served - counters["fresh"]) / served, 4) if served else 0.0
+        return counters
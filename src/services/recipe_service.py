@@ -1,14 +1,14 @@
-import redis
 from typing import Dict, List, Any, Optional
-from api_client import SpoonacularClient
-from news_parser import NewsParser
+from api_client import get_shared_client
+from news_parser import get_shared_news_parser
 import os
 
 class RecipeService:
     def __init__(self):
-        self.client = SpoonacularClient()
-        self.redis_client = redis.from_url(os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
-        self.news_parser = NewsParser(api_key=os.getenv("NEWS_API_KEY")) if os.getenv("NEWS_API_KEY") else None
+        # Responses are cached by the shared client (memory + shared SQLite tiers)
+        self.client = get_shared_client()
+        # Related news is matched against the locally ingested articles
+        self.news_parser = get_shared_news_parser() if os.getenv("GUARDIAN_API_KEY") else None
 
     def build_search_filters(self, data: Dict, user) -> Dict:
         """Build search filters with user preferences."""
@@ -55,32 +55,12 @@ class RecipeService:
         return filters
 
     def search_recipes(self, query: str, number: int = 12, **filters) -> Dict[str, Any]:
-        """Search recipes with caching."""
-        cache_key = f"search:{query}:{hash(frozenset(filters.items()))}"
-        cached_result = self.redis_client.get(cache_key)
-        
-        if cached_result:
-            return cached_result
-        
-        results = self.client.search_recipes(query, number=number, **filters)
-        
-        # Cache for 5 minutes
-        self.redis_client.setex(cache_key, 300, results)
-        return results
+        """Search recipes (cached by the API client)."""
+        return self.client.search_recipes(query, number=number, **filters)
 
     def get_recipe_details(self, recipe_id: int) -> Dict[str, Any]:
-        """Get recipe details with caching."""
-        cache_key = f"recipe:{recipe_id}"
-        cached_result = self.redis_client.get(cache_key)
-        
-        if cached_result:
-            return cached_result
-        
-        recipe_data = self.client.get_recipe_information(recipe_id)
-        
-        # Cache for 1 hour
-        self.redis_client.setex(cache_key, 3600, recipe_data)
-        return recipe_data
+        """Get recipe details (cached by the API client, or harvested from search results)."""
+        return self.client.get_recipe_details(recipe_id)
 
     def get_similar_recipes(self, recipe_id: int, limit: int = 6) -> List[Dict]:
         """Get similar recipes based on current recipe."""
@@ -93,12 +73,12 @@ class RecipeService:
             return []
 
     def get_related_news(self, query: str, limit: int = 3) -> List[Dict]:
-        """Get related news articles."""
+        """Get related news articles for a recipe title, without a Guardian request."""
         if not self.news_parser:
             return []
         
         try:
-            return self.news_parser.fetch_food_news(query=query, page_size=limit)
+            return self.news_parser.match_news_to_recipe({"title": query}, limit)
         except Exception as e:
             print(f"Error fetching related news: {e}")
             return []
@@ -4,7 +4,7 @@ Recipe Suggestion Service - Provides recipe recommendations based on inventory
 from typing import List, Dict, Optional, Tuple
 from services.inventory_service import InventoryService
 from services.storage_service import StorageService
-from api_client import SpoonacularClient
+from api_client import get_shared_client
 from models import db
 
 
@@ -15,7 +15,7 @@ class RecipeSuggestionService:
         self.db = db_session or db.session
         self.inventory_service = InventoryService()
         self.storage_service = StorageService()
-        self.spoonacular_client = SpoonacularClient()
+        self.spoonacular_client = get_shared_client()
     
     def suggest_recipes_from_inventory(self, user_id: int, max_results: int = 10) -> List[Dict]:
         """
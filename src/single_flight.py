@@ -0,0 +1,159 @@
+"""
+Single-Flight Module
+
+This module provides request coalescing for concurrent identical calls.
+When several threads ask for the same key at the same time, only the first
+(the "leader") runs the underlying function; the others wait for it and
+receive the same result, or the same exception.
+
+Nothing is cached: once the leader finishes, the next call for that key
+starts a new flight. Coroutines take part through do_async(): threads and
+coroutines asking for the same key share one flight, whichever leads it.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+class _Flight:
+    """State shared between the leader and the waiters of one in-flight call."""
+
+    __slots__ = ("done", "result", "error", "waiters", "futures")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+        self.futures: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []  # waiting coroutines
+
+    def finish(self) -> None:
+        """Wake every waiting thread and coroutine; the caller holds the SingleFlight lock."""
+        self.done.set()
+        for loop, future in self.futures:
+            loop.call_soon_threadsafe(_resolve, future)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls that share a key into one execution.
+
+    Safe to share between the threads of a gthread worker. Counters are kept
+    so the amount of collapsed work can be reported.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self._calls = 0
+        self._executed = 0
+        self._collapsed = 0
+
+    def _join(self, key: str) -> Tuple[_Flight, bool]:
+        """Get the flight for a key, starting one if none is in progress; the caller holds the lock."""
+        self._calls += 1
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = _Flight()
+            self._executed += 1
+            return flight, True
+        flight.waiters += 1
+        self._collapsed += 1
+        return flight, False
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run ``fn`` for ``key`` unless an identical call is already in flight.
+
+        Args:
+            key (str): Identity of the call; equal keys are coalesced
+            fn (Callable): Zero-argument function performing the actual work
+
+        Returns:
+            Any: The result of the (possibly shared) call
+
+        Raises:
+            Exception: Whatever ``fn`` raised, re-raised in every waiter
+        """
+        with self._lock:
+            flight, leader = self._join(key)
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                flight.finish()
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Coroutine version of do(): await ``fn()`` for ``key`` unless the call is in flight.
+
+        Waiting never blocks the event loop, whether the flight is led by a
+        coroutine or by a thread.
+
+        Args:
+            key (str): Identity of the call; equal keys are coalesced
+            fn (Callable): Zero-argument coroutine function performing the actual work
+
+        Returns:
+            Any: The result of the (possibly shared) call
+
+        Raises:
+            Exception: Whatever ``fn`` raised, re-raised in every waiter
+        """
+        with self._lock:
+            flight, leader = self._join(key)
+            if not leader:
+                loop = asyncio.get_running_loop()
+                future = loop.create_future()
+                flight.futures.append((loop, future))
+
+        if not leader:
+            await future
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = await fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                flight.finish()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get coalescing counters.
+
+        Returns:
+            Dict[str, int]: Total calls, upstream executions, collapsed calls
+                and the number of flights currently in progress
+        """
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "executed": self._executed,
+                "collapsed": self._collapsed,
+                "in_flight": len(self._flights)
+            }
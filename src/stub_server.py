@@ -0,0 +1,669 @@
+"""
+Local Stub Server for Spoonacular and The Guardian
+
+This module serves stand-in responses for every upstream endpoint the app
+uses, so SpoonacularClient and NewsParser can be load-tested and benchmarked
+without spending real quota:
+
+- Spoonacular: /recipes/complexSearch, /recipes/{id}/information,
+  /recipes/informationBulk, /recipes/{id}/nutritionWidget.json,
+  /recipes/{id}/analyzedInstructions, /recipes/random,
+  /recipes/findByIngredients and /food/wine/pairing
+- The Guardian (under /guardian): /search and single-article content lookups
+
+Responses come from recorded fixtures (see record_replay.py) when a fixture
+directory is given and has a matching entry; otherwise deterministic
+synthetic data is generated, so the same recipe id always returns the same
+recipe. Latency, error rate, rate limiting and limited bandwidth can be
+injected.
+
+Usage:
+    python src/stub_server.py --port 8089 --latency-ms 150 --jitter-ms 50 --error-rate 0.02 --rate-limit 20
+
+    SPOONACULAR_BASE_URL=http://127.0.0.1:8089 \\
+    GUARDIAN_BASE_URL=http://127.0.0.1:8089/guardian python src/app.py
+"""
+
+import re
+import json
+import time
+import zlib
+import random
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qsl
+
+from quota import estimate_point_cost
+from record_replay import FixtureStore, fixture_key
+
+# (name, aisle, unit, category) for synthetic ingredients
+INGREDIENTS = [
+    ("chicken breast", "Meat", "pound", "meat"),
+    ("ground beef", "Meat", "pound", "meat"),
+    ("bacon", "Meat", "slices", "meat"),
+    ("salmon", "Seafood", "fillets", "seafood"),
+    ("shrimp", "Seafood", "pound", "shellfish"),
+    ("egg", "Milk, Eggs, Other Dairy", "", "egg"),
+    ("butter", "Milk, Eggs, Other Dairy", "tablespoons", "dairy"),
+    ("milk", "Milk, Eggs, Other Dairy", "cup", "dairy"),
+    ("heavy cream", "Milk, Eggs, Other Dairy", "cup", "dairy"),
+    ("parmesan cheese", "Cheese", "cup", "dairy"),
+    ("cheddar cheese", "Cheese", "cup", "dairy"),
+    ("pasta", "Pasta and Rice", "ounces", "wheat"),
+    ("flour", "Baking", "cups", "wheat"),
+    ("bread", "Bakery/Bread", "slices", "wheat"),
+    ("rice", "Pasta and Rice", "cups", "grain"),
+    ("quinoa", "Pasta and Rice", "cup", "grain"),
+    ("soy sauce", "Ethnic Foods", "tablespoons", "soy"),
+    ("tofu", "Ethnic Foods", "ounces", "soy"),
+    ("peanut butter", "Nut butters, Jams, and Honey", "tablespoons", "peanut"),
+    ("almonds", "Nuts", "cup", "tree nut"),
+    ("sesame seeds", "Spices and Seasonings", "tablespoon", "sesame"),
+    ("white wine", "Alcoholic Beverages", "cup", "sulfite"),
+    ("honey", "Nut butters, Jams, and Honey", "tablespoons", "sweetener"),
+    ("sugar", "Baking", "cup", "sweetener"),
+    ("olive oil", "Oil, Vinegar, Salad Dressing", "tablespoons", "plant"),
+    ("garlic", "Produce", "cloves", "plant"),
+    ("onion", "Produce", "", "plant"),
+    ("tomato", "Produce", "", "plant"),
+    ("spinach", "Produce", "cups", "plant"),
+    ("mushroom", "Produce", "ounces", "plant"),
+    ("potato", "Produce", "", "plant"),
+    ("carrot", "Produce", "", "plant"),
+    ("broccoli", "Produce", "cups", "plant"),
+    ("bell pepper", "Produce", "", "plant"),
+    ("lemon", "Produce", "", "plant"),
+    ("basil", "Produce", "leaves", "plant"),
+    ("chickpeas", "Canned and Jarred", "cups", "plant"),
+    ("black beans", "Canned and Jarred", "cups", "plant"),
+    ("salt", "Spices and Seasonings", "teaspoon", "plant"),
+    ("black pepper", "Spices and Seasonings", "teaspoon", "plant"),
+]
+
+ADJECTIVES = ["Easy", "Creamy", "Spicy", "Classic", "Roasted", "Smoky", "Quick", "Herbed", "Crispy", "Rustic"]
+DISHES = ["Pasta", "Soup", "Salad", "Stir Fry", "Curry", "Tacos", "Bake", "Risotto", "Skillet", "Bowl"]
+WINES = ["merlot", "pinot noir", "chardonnay", "sauvignon blanc", "riesling", "malbec", "prosecco"]
+SEASONS = ["spring", "summer", "autumn", "winter"]
+
+_MEAT = {"meat", "seafood", "shellfish"}
+_ANIMAL = _MEAT | {"egg", "dairy"}
+_GLUTEN = {"wheat"}
+
+# Daily values used to compute percentOfDailyNeeds (name, unit, daily value)
+NUTRIENT_PROFILE = [
+    ("Calories", "kcal", 2000), ("Fat", "g", 65), ("Saturated Fat", "g", 20),
+    ("Carbohydrates", "g", 300), ("Sugar", "g", 50), ("Cholesterol", "mg", 300),
+    ("Sodium", "mg", 2400), ("Protein", "g", 50), ("Fiber", "g", 25),
+    ("Vitamin C", "mg", 60), ("Calcium", "mg", 1000), ("Iron", "mg", 18),
+    ("Potassium", "mg", 3500),
+]
+
+GUARDIAN_ARTICLE_COUNT = 5000
+
+# Body chunk size when bandwidth is throttled (see StubServer.bytes_per_second)
+SLOW_CHUNK_BYTES = 16 * 1024
+
+
+def _image(recipe_id: int) -> str:
+    return f"https://img.spoonacular.com/recipes/{recipe_id}-556x370.jpg"
+
+
+def synthetic_nutrition(recipe_id: int) -> Dict[str, Any]:
+    """Deterministic nutrition data in the nutritionWidget.json shape."""
+    rng = random.Random(recipe_id * 31 + 7)
+    calories = rng.randint(150, 950)
+    nutrients = []
+    for name, unit, daily_value in NUTRIENT_PROFILE:
+        if name == "Calories":
+            amount = float(calories)
+        else:
+            amount = round(rng.uniform(0.05, 0.6) * daily_value * calories / 2000 * 3, 2)
+        nutrients.append({
+            "name": name,
+            "amount": amount,
+            "unit": unit,
+            "percentOfDailyNeeds": round(amount / daily_value * 100, 2)
+        })
+    protein, fat = rng.randint(10, 40), rng.randint(15, 45)
+    return {
+        "calories": str(calories),
+        "carbs": f"{nutrients[3]['amount']:.0f}g",
+        "fat": f"{nutrients[1]['amount']:.0f}g",
+        "protein": f"{nutrients[7]['amount']:.0f}g",
+        "nutrients": nutrients,
+        "caloricBreakdown": {
+            "percentProtein": float(protein),
+            "percentFat": float(fat),
+            "percentCarbs": float(100 - protein - fat)
+        },
+        "weightPerServing": {"amount": rng.randint(150, 650), "unit": "g"}
+    }
+
+
+def synthetic_recipe(recipe_id: int, include_nutrition: bool = False) -> Dict[str, Any]:
+    """
+    Deterministic recipe in the /recipes/{id}/information shape.
+
+    Args:
+        recipe_id (int): Recipe id; the same id always yields the same recipe
+        include_nutrition (bool, optional): Add a nutrition block. Defaults to False.
+
+    Returns:
+        Dict[str, Any]: Recipe information
+    """
+    rng = random.Random(recipe_id)
+    picks = rng.sample(INGREDIENTS, rng.randint(5, 10))
+    main = picks[0][0]
+    title = f"{rng.choice(ADJECTIVES)} {main.title()} {rng.choice(DISHES)}"
+    categories = {category for _, _, _, category in picks}
+
+    vegetarian = not categories & _MEAT
+    vegan = not categories & _ANIMAL and "honey" not in [name for name, _, _, _ in picks]
+    gluten_free = not categories & _GLUTEN
+    dairy_free = "dairy" not in categories
+    diets = []
+    if gluten_free:
+        diets.append("gluten free")
+    if dairy_free:
+        diets.append("dairy free")
+    if vegan:
+        diets.append("vegan")
+    elif vegetarian:
+        diets.append("lacto ovo vegetarian")
+    if not categories & (_GLUTEN | {"grain", "sweetener", "dairy"}) and "soy" not in categories:
+        diets.append("paleolithic")
+
+    ingredients = []
+    for position, (name, aisle, unit, _) in enumerate(picks):
+        amount = round(rng.choice([0.25, 0.5, 1, 1.5, 2, 3, 4, 8]), 2)
+        original = f"{amount:g} {unit} {name}".replace("  ", " ")
+        ingredients.append({
+            "id": 1000 + INGREDIENTS.index((name, aisle, unit, _)),
+            "aisle": aisle,
+            "name": name,
+            "nameClean": name,
+            "original": original,
+            "originalName": name,
+            "amount": amount,
+            "unit": unit,
+            "meta": [],
+            "image": f"{name.replace(' ', '-')}.jpg"
+        })
+
+    steps = []
+    for number in range(1, rng.randint(3, 7) + 1):
+        name = rng.choice(picks)[0]
+        verb = rng.choice(["Chop", "Whisk", "Saute", "Simmer", "Fold in", "Season", "Roast", "Stir in"])
+        steps.append({"number": number, "step": f"{verb} the {name} and cook for {rng.randint(2, 20)} minutes."})
+
+    recipe = {
+        "id": recipe_id,
+        "title": title,
+        "image": _image(recipe_id),
+        "imageType": "jpg",
+        "servings": rng.randint(1, 8),
+        "readyInMinutes": rng.choice([10, 15, 20, 25, 30, 35, 45, 50, 60, 75, 90, 120, 150]),
+        "sourceName": "Stub Kitchen",
+        "sourceUrl": f"https://stub.example.com/recipes/{recipe_id}",
+        "spoonacularScore": round(rng.uniform(20, 99), 2),
+        "aggregateLikes": rng.randint(0, 5000),
+        "healthScore": rng.randint(0, 100),
+        "pricePerServing": round(rng.uniform(50, 600), 2),
+        "cheap": rng.random() < 0.2,
+        "veryPopular": rng.random() < 0.1,
+        "vegetarian": vegetarian,
+        "vegan": vegan,
+        "glutenFree": gluten_free,
+        "dairyFree": dairy_free,
+        "diets": diets,
+        "dishTypes": [rng.choice(["lunch", "main course", "dinner", "side dish", "breakfast"])],
+        "cuisines": [rng.choice(["Italian", "Mexican", "Asian", "American", "Mediterranean", "Indian"])],
+        "summary": (f"<b>{title}</b> takes about {rng.randint(10, 150)} minutes and features "
+                    f"{', '.join(name for name, _, _, _ in picks[:3])}. A stub recipe for offline testing."),
+        "extendedIngredients": ingredients,
+        "analyzedInstructions": [{"name": "", "steps": steps}],
+        "instructions": " ".join(step["step"] for step in steps)
+    }
+    if include_nutrition:
+        recipe["nutrition"] = synthetic_nutrition(recipe_id)
+    return recipe
+
+
+def _matches_filters(recipe: Dict[str, Any], params: Dict[str, str]) -> bool:
+    """Apply the complexSearch/random filters to a synthetic recipe."""
+    diet = params.get("diet", "").lower()
+    if diet in ("vegan",) and not recipe["vegan"]:
+        return False
+    if diet in ("vegetarian", "lacto-vegetarian", "ovo-vegetarian") and not recipe["vegetarian"]:
+        return False
+    if diet == "gluten free" and not recipe["glutenFree"]:
+        return False
+    if diet in ("paleo", "primal") and "paleolithic" not in recipe["diets"]:
+        return False
+    names = " ".join(i["name"] for i in recipe["extendedIngredients"])
+    for intolerance in filter(None, params.get("intolerances", "").lower().split(",")):
+        intolerance = intolerance.strip()
+        categories = {category for name, _, _, category in INGREDIENTS if name in names}
+        if intolerance == "gluten" and not recipe["glutenFree"]:
+            return False
+        if intolerance == "dairy" and not recipe["dairyFree"]:
+            return False
+        if intolerance in categories:
+            return False
+    if params.get("maxReadyTime") and recipe["readyInMinutes"] > int(params["maxReadyTime"]):
+        return False
+    return True
+
+
+def _search_candidates(seed: str):
+    """Yield an endless deterministic sequence of candidate recipe ids for a seed."""
+    base = zlib.crc32(seed.encode("utf-8"))
+    for i in range(100000):
+        yield 100000 + (base + i * 7919) % 900000
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    HTTP server answering Spoonacular and Guardian requests locally.
+
+    Attributes:
+        latency_ms (float): Added delay per request
+        jitter_ms (float): Random extra delay, uniformly 0..jitter_ms
+        error_rate (float): Probability of answering 500 instead
+        rate_limit (float): Requests per second before answering 429 (0 disables)
+        bytes_per_second (float): Response body bandwidth, sent in small chunks (0 = unthrottled)
+        fixtures (FixtureStore): Recorded responses served in preference to synthetic ones
+        counters (Dict[str, int]): Requests served, errors and 429s injected, fixture hits
+    """
+
+    daemon_threads = True
+
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0,
+                 error_rate: float = 0.0,
+                 rate_limit: float = 0.0,
+                 fixtures_dir: Optional[str] = None,
+                 replay_latency: bool = False,
+                 seed: int = 0,
+                 bytes_per_second: float = 0.0):
+        super().__init__((host, port), StubRequestHandler)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.fixtures = FixtureStore(fixtures_dir) if fixtures_dir else None
+        self.replay_latency = replay_latency
+        self.bytes_per_second = bytes_per_second
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counters = {"requests": 0, "errors_injected": 0, "rate_limited": 0, "fixture_hits": 0}
+        self.points_used = 0.0
+        self._tokens = rate_limit
+        self._refilled_at = time.monotonic()
+        self._thread: Optional[threading.Thread] = None
+        self._guardian_now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to point SpoonacularClient at."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def guardian_url(self) -> str:
+        """Base URL to point NewsParser at."""
+        return f"{self.base_url}/guardian"
+
+    def start(self) -> "StubServer":
+        """Serve in a background daemon thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def take_token(self) -> bool:
+        """Token-bucket rate limiting; returns False when the request should get a 429."""
+        if self.rate_limit <= 0:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled_at) * self.rate_limit)
+            self._refilled_at = now
+            if self._tokens < 1:
+                self.counters["rate_limited"] += 1
+                return False
+            self._tokens -= 1
+            return True
+
+    # Spoonacular ------------------------------------------------------------
+
+    def spoonacular(self, path: str, params: Dict[str, str]) -> Tuple[int, Any]:
+        """Route a Spoonacular request to its synthetic handler."""
+        include_nutrition = params.get("includeNutrition", "").lower() == "true"
+        match = re.fullmatch(r"/recipes/(\d+)/(information|nutritionWidget\.json|analyzedInstructions)", path)
+        if match:
+            recipe_id, kind = int(match.group(1)), match.group(2)
+            if kind == "information":
+                return 200, synthetic_recipe(recipe_id, include_nutrition)
+            if kind == "analyzedInstructions":
+                return 200, synthetic_recipe(recipe_id)["analyzedInstructions"]
+            return 200, synthetic_nutrition(recipe_id)
+        if path == "/recipes/informationBulk":
+            ids = [int(i) for i in params.get("ids", "").split(",") if i.strip()]
+            return 200, [synthetic_recipe(i, include_nutrition) for i in ids]
+        if path == "/recipes/complexSearch":
+            return 200, self.complex_search(params)
+        if path == "/recipes/random":
+            return 200, self.random_recipes(params)
+        if path == "/recipes/findByIngredients":
+            return 200, self.find_by_ingredients(params)
+        if path == "/food/wine/pairing":
+            return 200, self.wine_pairing(params.get("food", ""))
+        return 404, {"status": "failure", "code": 404, "message": f"Unknown endpoint {path}"}
+
+    def complex_search(self, params: Dict[str, str]) -> Dict[str, Any]:
+        query = params.get("query", "").lower()
+        tokens = [token for token in re.split(r"\W+", query) if token]
+        number = int(params.get("number", 10))
+        offset = int(params.get("offset", 0))
+        add_nutrition = params.get("addRecipeNutrition", "").lower() == "true"
+        add_info = add_nutrition or params.get("addRecipeInformation", "").lower() == "true"
+        fill = params.get("fillIngredients", "").lower() == "true"
+        add_instructions = params.get("addRecipeInstructions", "").lower() == "true"
+
+        matches = []
+        for scanned, recipe_id in enumerate(_search_candidates(query)):
+            if len(matches) >= offset + number or scanned >= 4000:
+                break
+            recipe = synthetic_recipe(recipe_id)
+            text = (recipe["title"] + " " + " ".join(i["name"] for i in recipe["extendedIngredients"])).lower()
+            if all(token in text for token in tokens) and _matches_filters(recipe, params):
+                matches.append(recipe)
+
+        results = []
+        for recipe in matches[offset:offset + number]:
+            result = {"id": recipe["id"], "title": recipe["title"], "image": recipe["image"], "imageType": "jpg"}
+            if add_info:
+                result.update({key: value for key, value in recipe.items()
+                               if key not in ("extendedIngredients", "analyzedInstructions", "instructions")})
+                if add_instructions:
+                    result["analyzedInstructions"] = recipe["analyzedInstructions"]
+            if fill:
+                result["usedIngredientCount"] = 0
+                result["missedIngredientCount"] = len(recipe["extendedIngredients"])
+                result["missedIngredients"] = recipe["extendedIngredients"]
+                result["usedIngredients"] = []
+                result["unusedIngredients"] = []
+            if add_nutrition:
+                result["nutrition"] = synthetic_nutrition(recipe["id"])
+            results.append(result)
+        return {"results": results, "offset": offset, "number": number, "totalResults": len(matches)}
+
+    def random_recipes(self, params: Dict[str, str]) -> Dict[str, Any]:
+        number = int(params.get("number", 1))
+        recipes = []
+        for _ in range(number * 50):
+            if len(recipes) >= number:
+                break
+            with self.lock:
+                recipe_id = self.rng.randint(100000, 999999)
+            recipe = synthetic_recipe(recipe_id)
+            if _matches_filters(recipe, params):
+                recipes.append(recipe)
+        return {"recipes": recipes}
+
+    def find_by_ingredients(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        wanted = [name.strip().lower() for name in params.get("ingredients", "").split(",") if name.strip()]
+        number = int(params.get("number", 10))
+        ranking = int(params.get("ranking", 1))
+        scored = []
+        for scanned, recipe_id in enumerate(_search_candidates("findByIngredients")):
+            if scanned >= 600:
+                break
+            recipe = synthetic_recipe(recipe_id)
+            used = [i for i in recipe["extendedIngredients"]
+                    if any(name in i["name"] or i["name"] in name for name in wanted)]
+            if not used:
+                continue
+            missed = [i for i in recipe["extendedIngredients"] if i not in used]
+            scored.append((recipe, used, missed))
+        if ranking == 2:
+            scored.sort(key=lambda item: (len(item[2]), -len(item[1])))
+        else:
+            scored.sort(key=lambda item: (-len(item[1]), len(item[2])))
+        return [{
+            "id": recipe["id"],
+            "title": recipe["title"],
+            "image": recipe["image"],
+            "imageType": "jpg",
+            "likes": recipe["aggregateLikes"],
+            "usedIngredientCount": len(used),
+            "missedIngredientCount": len(missed),
+            "usedIngredients": used,
+            "missedIngredients": missed,
+            "unusedIngredients": []
+        } for recipe, used, missed in scored[:number]]
+
+    def wine_pairing(self, food: str) -> Dict[str, Any]:
+        rng = random.Random(zlib.crc32(food.lower().encode("utf-8")))
+        wines = rng.sample(WINES, 3)
+        return {
+            "pairedWines": wines,
+            "pairingText": f"{food.title()} works well with {wines[0]}, {wines[1]} and {wines[2]}.",
+            "productMatches": [{
+                "id": rng.randint(1000, 9999),
+                "title": f"Stub Cellars {wines[0].title()} {rng.randint(2015, 2022)}",
+                "description": f"A balanced {wines[0]} for {food}.",
+                "price": f"${rng.randint(9, 60)}.99",
+                "averageRating": round(rng.uniform(0.6, 1.0), 2),
+                "ratingCount": rng.randint(3, 400),
+                "score": round(rng.uniform(0.6, 0.95), 2),
+                "link": "https://stub.example.com/wine"
+            }]
+        }
+
+    # The Guardian -----------------------------------------------------------
+
+    def guardian_article(self, index: int, fields: List[str]) -> Dict[str, Any]:
+        """Deterministic Guardian article; index 0 is the newest."""
+        rng = random.Random(index * 13 + 5)
+        name = rng.choice(INGREDIENTS)[0]
+        dish = rng.choice(DISHES).lower()
+        title = rng.choice([
+            f"{rng.choice(['Nigel Slater', 'Meera Sodha', 'Felicity Cloake', 'Yotam Ottolenghi'])}'s {name} {dish} recipe",
+            f"How to make the perfect {name} {dish}",
+            f"The best {dish} recipes for {rng.choice(SEASONS)}",
+            f"{rng.choice(ADJECTIVES)} {name} and {rng.choice(INGREDIENTS)[0]} {dish}: the perfect recipe",
+        ])
+        published = self._guardian_now - timedelta(hours=3 * index)
+        slug = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+        article_id = f"food/{published:%Y/%b/%d}/{slug}-{index}".lower()
+        article = {
+            "id": article_id,
+            "type": "article",
+            "sectionId": "food",
+            "sectionName": "Food",
+            "webPublicationDate": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "webTitle": title,
+            "webUrl": f"https://www.theguardian.com/{article_id}",
+            "apiUrl": f"https://content.guardianapis.com/{article_id}",
+        }
+        if fields:
+            available = {
+                "thumbnail": f"https://media.guim.co.uk/stub/{index}/500.jpg",
+                "trailText": f"A {rng.choice(ADJECTIVES).lower()} take on {name} {dish}, ready in {rng.randint(15, 90)} minutes.",
+                "body": "".join(f"<p>{rng.choice(ADJECTIVES)} {name} with {rng.choice(INGREDIENTS)[0]}. "
+                                f"Cook the {dish} gently and season to taste.</p>" for _ in range(40)),
+            }
+            article["fields"] = {field: available[field] for field in fields if field in available}
+        return article
+
+    def guardian(self, path: str, params: Dict[str, str]) -> Tuple[int, Any]:
+        """Route a Guardian request to search or content lookup."""
+        fields = [field for field in params.get("show-fields", "").split(",") if field]
+        if path == "/search":
+            return 200, self.guardian_search(params, fields)
+        match = re.search(r"-(\d+)$", path)
+        if match and int(match.group(1)) < GUARDIAN_ARTICLE_COUNT:
+            article = self.guardian_article(int(match.group(1)), fields)
+            if article["id"] == path.strip("/"):
+                return 200, {"response": {"status": "ok", "userTier": "developer", "total": 1, "content": article}}
+        return 404, {"response": {"status": "error", "message": "The requested resource could not be found."}}
+
+    def guardian_search(self, params: Dict[str, str], fields: List[str]) -> Dict[str, Any]:
+        terms = [term for term in re.split(r"[,\s]+|\bOR\b", params.get("q", "").lower()) if term and term != "or"]
+        page_size = min(200, int(params.get("page-size", 10)))
+        page = max(1, int(params.get("page", 1)))
+        from_date = params.get("from-date")
+        cutoff = datetime.fromisoformat(from_date.replace("Z", "+00:00")) if from_date else None
+        if cutoff is not None and cutoff.tzinfo is None:
+            cutoff = cutoff.replace(tzinfo=timezone.utc)
+
+        matching = []
+        for index in range(GUARDIAN_ARTICLE_COUNT):
+            if cutoff is not None and self._guardian_now - timedelta(hours=3 * index) < cutoff:
+                break
+            article = self.guardian_article(index, ["trailText"])
+            text = (article["webTitle"] + " " + article["fields"]["trailText"]).lower()
+            if not terms or any(term.rstrip("s") in text for term in terms):
+                matching.append(index)
+        if params.get("order-by") == "oldest":
+            matching.reverse()
+
+        start = (page - 1) * page_size
+        results = [self.guardian_article(index, fields) for index in matching[start:start + page_size]]
+        return {"response": {
+            "status": "ok",
+            "userTier": "developer",
+            "total": len(matching),
+            "startIndex": start + 1,
+            "pageSize": page_size,
+            "currentPage": page,
+            "pages": max(1, -(-len(matching) // page_size)),
+            "orderBy": params.get("order-by", "relevance"),
+            "results": results
+        }}
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """Applies fault injection, then serves a fixture or synthetic response."""
+
+    protocol_version = "HTTP/1.1"
+    server: StubServer
+
+    def do_GET(self):
+        server = self.server
+        parts = urlsplit(self.path)
+        params = dict(parse_qsl(parts.query, keep_blank_values=True))
+        with server.lock:
+            server.counters["requests"] += 1
+            delay = server.latency_ms + server.rng.uniform(0, server.jitter_ms)
+            inject_error = server.rng.random() < server.error_rate
+
+        if not server.take_token():
+            return self._send(429, {"status": "failure", "code": 429, "message": "Too many requests"},
+                              {"Retry-After": "1"})
+        if inject_error:
+            with server.lock:
+                server.counters["errors_injected"] += 1
+            time.sleep(delay / 1000)
+            return self._send(500, {"status": "failure", "code": 500, "message": "Injected error"})
+
+        guardian = parts.path == "/guardian" or parts.path.startswith("/guardian/")
+        path = parts.path[len("/guardian"):] or "/" if guardian else parts.path
+        query = f"?{parts.query}" if parts.query else ""
+
+        fixture = server.fixtures.load(fixture_key("GET", path + query)) if server.fixtures else None
+        if fixture is not None:
+            with server.lock:
+                server.counters["fixture_hits"] += 1
+            if server.replay_latency:
+                delay += fixture.get("elapsed_ms", 0)
+            time.sleep(delay / 1000)
+            return self._send_raw(fixture["status"], fixture["body"].encode("utf-8"), fixture.get("headers", {}))
+
+        time.sleep(delay / 1000)
+        if guardian:
+            status, body = server.guardian(path, params)
+            return self._send(status, body)
+
+        status, body = server.spoonacular(path, params)
+        headers = {}
+        if status == 200:
+            cost = estimate_point_cost(path, params)
+            with server.lock:
+                server.points_used += cost
+                used = server.points_used
+            headers = {"X-API-Quota-Request": f"{cost:.3f}", "X-API-Quota-Used": f"{used:.3f}"}
+        return self._send(status, body, headers)
+
+    def _send(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        self._send_raw(status, json.dumps(body).encode("utf-8"), headers or {})
+
+    def _send_raw(self, status: int, payload: bytes, headers: Dict[str, str]) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            if name.lower() not in ("content-type", "content-length"):
+                self.send_header(name, value)
+        self.end_headers()
+        rate = self.server.bytes_per_second
+        if rate <= 0:
+            self.wfile.write(payload)
+            return
+        # Trickle the body out, as a slow network would deliver it
+        for start in range(0, len(payload), SLOW_CHUNK_BYTES):
+            self.wfile.write(payload[start:start + SLOW_CHUNK_BYTES])
+            self.wfile.flush()
+            time.sleep(min(SLOW_CHUNK_BYTES, len(payload) - start) / rate)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main() -> None:
+    """Run the stub server from the command line."""
+    parser = argparse.ArgumentParser(description="Local Spoonacular/Guardian stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="fixed delay per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="extra random delay per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of a 500 response")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="requests/second before 429s (0 = off)")
+    parser.add_argument("--fixtures", default=None, help="directory of recorded fixtures to serve")
+    parser.add_argument("--replay-latency", action="store_true", help="add each fixture's recorded latency")
+    parser.add_argument("--bytes-per-second", type=float, default=0.0,
+                        help="response body bandwidth (0 = unthrottled)")
+    args = parser.parse_args()
+
+    server = StubServer(args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate,
+                        args.rate_limit, args.fixtures, args.replay_latency,
+                        bytes_per_second=args.bytes_per_second)
+    print(f"Spoonacular stub: {server.base_url}  Guardian stub: {server.guardian_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
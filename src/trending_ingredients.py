@@ -0,0 +1,318 @@
+"""
+Trending Ingredients Module
+
+This module tracks which ingredients The Guardian is writing about, from the
+articles in the local article store (see article_store.py). Each article's
+title and preview are tagged against news_index.INGREDIENT_VOCABULARY, and
+every ingredient an article mentions counts once towards a Space-Saving
+sketch: a fixed number of counters, so memory stays bounded however many
+articles pass through, while the heaviest hitters are kept with a known
+maximum overcount.
+
+Counts decay with the article's age (half-life GUARDIAN_TRENDING_HALF_LIFE).
+Decay is forward: an article published at t adds 2 ** ((t - landmark) /
+half_life), and a count is scaled down to the present only when it is read.
+The counters are never aged in place and their order does not change as time
+passes, so the sketch's min-heap stays valid.
+
+TrendingIngredients follows the store by sequence number (see
+ArticleStore.since), like the news index, and is snapshotted after every
+ingestion run. A snapshot costs the articles stored since the previous one
+plus sorting the counters, never a rescan of the store.
+"""
+
+import os
+import time
+import heapq
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from article_store import ArticleStore
+from news_index import tag_ingredients
+
+# Counters kept by the sketch (the vocabulary has about 130 entries)
+TRENDING_CAPACITY = 64
+
+# Half-life of an article's contribution: 3 days
+TRENDING_HALF_LIFE = 3 * 24 * 60 * 60
+
+# Ingredients per snapshot, and snapshots (ingestion runs) kept
+TRENDING_TOP = 10
+TRENDING_SNAPSHOTS = 48
+
+# Forward-decay weights are rebased before 2 ** exponent nears float overflow
+_MAX_EXPONENT = 512.0
+
+
+def article_ingredients(article: Dict[str, Any]) -> Set[str]:
+    """Distinct vocabulary entries mentioned in an article's title and preview."""
+    return set(tag_ingredients(f"{article.get('title') or ''} {article.get('preview') or ''}"))
+
+
+def published_timestamp(article: Dict[str, Any], default: float) -> float:
+    """
+    An article's publication time as a Unix timestamp.
+
+    Args:
+        article (Dict[str, Any]): Parsed article ("published_at" in ISO 8601)
+        default (float): Timestamp used when the date is missing or invalid
+
+    Returns:
+        float: The publication time, never later than default
+    """
+    published = article.get("published_at")
+    if not published:
+        return default
+    try:
+        return min(datetime.fromisoformat(published.replace("Z", "+00:00")).timestamp(), default)
+    except ValueError:
+        return default
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitters sketch with exponentially decayed counts.
+
+    At most capacity items are counted. An item arriving when all counters
+    are taken replaces the smallest one and inherits its count, which is
+    recorded as the item's error: a reported count is never below the true
+    decayed count and at most error above it. Not thread-safe.
+
+    Attributes:
+        capacity (int): Counters kept
+        half_life (float): Seconds for a contribution to decay by half
+    """
+
+    def __init__(self, capacity: int = TRENDING_CAPACITY, half_life: float = TRENDING_HALF_LIFE,
+                 landmark: Optional[float] = None):
+        """
+        Args:
+            capacity (int, optional): Counters kept. Defaults to TRENDING_CAPACITY.
+            half_life (float, optional): Decay half-life in seconds. Defaults to 3 days.
+            landmark (float, optional): Timestamp of weight 1. Defaults to the
+                first occurrence added.
+
+        Raises:
+            ValueError: If capacity or half_life is not positive
+        """
+        if capacity < 1 or half_life <= 0:
+            raise ValueError("capacity and half_life must be positive")
+        self.capacity = capacity
+        self.half_life = half_life
+        self._landmark = landmark
+        self._counts: Dict[str, float] = {}
+        self._errors: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []  # (count, item), with stale entries skipped on pop
+        self._total = 0.0
+        self.evictions = 0
+
+    def add(self, item: str, at: float) -> None:
+        """
+        Count one occurrence of an item.
+
+        Args:
+            item (str): The item
+            at (float): Timestamp of the occurrence
+        """
+        if self._landmark is None:
+            self._landmark = at
+        elif (at - self._landmark) / self.half_life > _MAX_EXPONENT:
+            self._rebase(at)
+        weight = 2.0 ** ((at - self._landmark) / self.half_life)
+        self._total += weight
+        count = self._counts.get(item)
+        if count is None:
+            if len(self._counts) < self.capacity:
+                count = 0.0
+            else:
+                count, victim = self._pop_min()
+                del self._counts[victim], self._errors[victim]
+                self.evictions += 1
+            self._errors[item] = count
+        count += weight
+        self._counts[item] = count
+        heapq.heappush(self._heap, (count, item))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+
+    def _pop_min(self) -> Tuple[float, str]:
+        while True:
+            count, item = heapq.heappop(self._heap)
+            if self._counts.get(item) == count:
+                return count, item
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(count, item) for item, count in self._counts.items()]
+        heapq.heapify(self._heap)
+
+    def _rebase(self, landmark: float) -> None:
+        """Move the landmark forward, scaling every count down to match."""
+        scale = 2.0 ** ((self._landmark - landmark) / self.half_life)
+        self._counts = {item: count * scale for item, count in self._counts.items()}
+        self._errors = {item: error * scale for item, error in self._errors.items()}
+        self._total *= scale
+        self._landmark = landmark
+        self._rebuild_heap()
+
+    def top(self, limit: int, now: float) -> List[Tuple[str, float, float]]:
+        """
+        Get the heaviest items.
+
+        Args:
+            limit (int): Items to return
+            now (float): Timestamp the counts are decayed to
+
+        Returns:
+            List[Tuple[str, float, float]]: (item, decayed count, error), largest first
+        """
+        if self._landmark is None:
+            return []
+        decay = 2.0 ** ((self._landmark - now) / self.half_life)
+        best = heapq.nlargest(limit, self._counts.items(), key=lambda entry: entry[1])
+        return [(item, count * decay, self._errors[item] * decay) for item, count in best]
+
+    def total(self, now: float) -> float:
+        """Decayed count of every occurrence added, evicted or not."""
+        if self._landmark is None:
+            return 0.0
+        return self._total * 2.0 ** ((self._landmark - now) / self.half_life)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+
+def count_articles(sketch: SpaceSaving, articles: Iterable[Dict[str, Any]], now: float) -> int:
+    """
+    Add the ingredients of articles to a sketch, each at its publication time.
+
+    Args:
+        sketch (SpaceSaving): Sketch counted into
+        articles (Iterable[Dict[str, Any]]): Parsed articles
+        now (float): Timestamp for articles without a publication date
+
+    Returns:
+        int: Ingredient mentions counted
+    """
+    mentions = 0
+    for article in articles:
+        at = published_timestamp(article, now)
+        for ingredient in sorted(article_ingredients(article)):
+            sketch.add(ingredient, at)
+            mentions += 1
+    return mentions
+
+
+class TrendingIngredients:
+    """
+    Decayed ingredient counts over an ArticleStore, snapshotted per ingestion run.
+
+    Safe to share between threads. An article whose text changes is stored
+    under a new sequence number and counted again.
+
+    Attributes:
+        store (ArticleStore): Store the articles are read from
+        top (int): Ingredients per snapshot
+    """
+
+    def __init__(self,
+                 store: ArticleStore,
+                 capacity: int = TRENDING_CAPACITY,
+                 half_life: Optional[float] = None,
+                 top: int = TRENDING_TOP,
+                 snapshots: int = TRENDING_SNAPSHOTS):
+        """
+        Args:
+            store (ArticleStore): Store the articles are read from
+            capacity (int, optional): Sketch counters. Defaults to TRENDING_CAPACITY.
+            half_life (float, optional): Decay half-life in seconds
+                (GUARDIAN_TRENDING_HALF_LIFE, default 3 days)
+            top (int, optional): Ingredients per snapshot. Defaults to 10.
+            snapshots (int, optional): Snapshots kept. Defaults to 48.
+        """
+        self.store = store
+        self.top = top
+        half_life = (half_life if half_life is not None
+                     else float(os.getenv("GUARDIAN_TRENDING_HALF_LIFE", TRENDING_HALF_LIFE)))
+        self._sketch = SpaceSaving(capacity, half_life)
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._snapshots: deque = deque(maxlen=snapshots)
+        self._counters = {"updates": 0, "articles": 0, "mentions": 0}
+
+    def update(self) -> Dict[str, Any]:
+        """
+        Count the articles stored since the last update and take a snapshot.
+
+        Returns:
+            Dict[str, Any]: The snapshot: taken_at (Unix time), seq, articles
+                counted since the previous snapshot, and top, a list of
+                ingredient, score (decayed article count), error (most the
+                score may overcount by) and change (score gained since the
+                previous snapshot, after decay)
+        """
+        with self._lock:
+            added = self.store.since(self._seq)
+            now = time.time()
+            mentions = count_articles(self._sketch, (article for _, article in added), now)
+            if added:
+                self._seq = added[-1][0]
+            self._counters["updates"] += 1
+            self._counters["articles"] += len(added)
+            self._counters["mentions"] += mentions
+            previous = self._snapshots[-1] if self._snapshots else None
+            decay = 2.0 ** ((previous["taken_at"] - now) / self._sketch.half_life) if previous else 0.0
+            before = {entry["ingredient"]: entry["score"] * decay for entry in previous["top"]} if previous else {}
+            snapshot = {
+                "taken_at": now,
+                "seq": self._seq,
+                "articles": len(added),
+                "top": [{"ingredient": ingredient, "score": round(score, 4), "error": round(error, 4),
+                         "change": round(score - before.get(ingredient, 0.0), 4)}
+                        for ingredient, score, error in self._sketch.top(self.top, now)],
+            }
+            self._snapshots.append(snapshot)
+        return snapshot
+
+    def trending(self, limit: Optional[int] = None) -> List[str]:
+        """
+        Get the top ingredients of the latest snapshot, taking one if there is none.
+
+        Args:
+            limit (int, optional): Ingredients to return. Defaults to top.
+
+        Returns:
+            List[str]: Ingredients, most written about first
+        """
+        with self._lock:
+            snapshot = self._snapshots[-1] if self._snapshots else None
+        if snapshot is None:
+            snapshot = self.update()
+        return [entry["ingredient"] for entry in snapshot["top"][:limit]]
+
+    def snapshots(self) -> List[Dict[str, Any]]:
+        """Get the snapshots kept, oldest first."""
+        with self._lock:
+            return list(self._snapshots)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get sketch size and counters.
+
+        Returns:
+            Dict[str, Any]: Updates, articles and ingredient mentions counted,
+                counters in use, capacity, evictions, half_life, the last store
+                sequence number seen, snapshots kept, and the latest top
+                ingredients
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            stats["counters"] = len(self._sketch)
+            stats["capacity"] = self._sketch.capacity
+            stats["evictions"] = self._sketch.evictions
+            stats["half_life"] = self._sketch.half_life
+            stats["seq"] = self._seq
+            stats["snapshots"] = len(self._snapshots)
+            stats["top"] = [entry["ingredient"] for entry in self._snapshots[-1]["top"]] if self._snapshots else []
+        return stats
@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+"""
+Test script for the Spoonacular API client transport layer
+
+These tests run against a throwaway local HTTP server, so no API key or
+network access is needed.
+"""
+
+import os
+import sys
+import json
+import time
+from urllib.parse import urlparse, parse_qs
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('SPOONACULAR_API_KEY', 'test-key')
+
+from api_client import SpoonacularClient, canonical_request_key
+from response_cache import MemoryLRUCache, SQLiteCache, TieredCache
+from quota import QuotaThrottle, QuotaExhaustedError, background_priority, estimate_point_cost
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """Replies with the next scripted (status, headers, body) tuple, or asks the server's responder."""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.paths.append(self.path)
+            server.clients.add(self.client_address)
+            if server.script:
+                status, headers, body = server.script.pop(0)
+            elif server.responder:
+                status, headers, body = server.responder(self.path)
+            else:
+                status, headers, body = 200, {}, {'ok': True}
+        time.sleep(server.delay)
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Start a local scripted HTTP server on a free port."""
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), ScriptedHandler)
+    httpd.protocol_version = 'HTTP/1.1'
+    ScriptedHandler.protocol_version = 'HTTP/1.1'
+    httpd.lock = threading.Lock()
+    httpd.script = []
+    httpd.paths = []
+    httpd.clients = set()
+    httpd.delay = 0
+    httpd.responder = None
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_client(server, **kwargs):
+    kwargs.setdefault('enable_cache', False)
+    kwargs.setdefault('enable_throttle', False)
+    kwargs.setdefault('batch_window', 0)
+    kwargs.setdefault('enable_catalog', False)
+    return SpoonacularClient(base_url=f"http://127.0.0.1:{server.server_address[1]}", **kwargs)
+
+
+def test_retries_honor_retry_after(server):
+    """A 429 with Retry-After and a 503 are retried before the 200 is returned."""
+    server.script = [
+        (429, {'Retry-After': '0'}, {'status': 'failure'}),
+        (503, {}, {'status': 'failure'}),
+        (200, {}, {'id': 42, 'title': 'Soup'}),
+    ]
+    client = make_client(server, max_retries=3, backoff_factor=0.01)
+
+    result = client.get_recipe_information(42)
+
+    assert result == {'id': 42, 'title': 'Soup'}
+    assert len(server.paths) == 3
+    stats = client.get_latency_stats()['/recipes/{id}/information']
+    assert stats['count'] == 3
+    assert stats['errors'] == 2
+
+
+def test_gives_up_after_max_retries(server):
+    """Persistent server errors surface as HTTPError once retries are exhausted."""
+    server.script = [(500, {}, {})] * 5
+    client = make_client(server, max_retries=1, backoff_factor=0.01)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get_wine_pairing('steak')
+    assert len(server.paths) == 2
+
+
+def test_client_errors_are_not_retried(server):
+    """A 4xx other than 429 fails immediately."""
+    server.script = [(404, {}, {})]
+    client = make_client(server, max_retries=3, backoff_factor=0.01)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get_recipe_nutrition(7)
+    assert len(server.paths) == 1
+
+
+def test_session_reuses_connections(server):
+    """Sequential requests share one keep-alive connection from the pool."""
+    client = make_client(server)
+
+    for recipe_id in range(5):
+        client.get_recipe_information(recipe_id)
+
+    assert len(server.clients) == 1
+    assert all('apiKey=test-key' in path for path in server.paths)
+
+
+def test_explicit_zero_options_are_kept(server, monkeypatch):
+    """Zero is a value, not a request for the environment default."""
+    monkeypatch.setenv('SPOONACULAR_MAX_RETRIES', '5')
+    monkeypatch.setenv('SPOONACULAR_READ_TIMEOUT', '30')
+    client = make_client(server, connect_timeout=0, read_timeout=0, max_retries=0, backoff_factor=0)
+    assert client.timeout == (0, 0)
+    assert (client.max_retries, client.backoff_factor) == (0, 0)
+
+
+def test_canonical_key_ignores_api_key_and_ordering():
+    """Equivalent parameter sets produce the same key; the API key never appears."""
+    a = canonical_request_key('/recipes/complexSearch',
+                              {'query': ' Pasta ', 'intolerances': 'egg,dairy', 'apiKey': 'secret', 'fillIngredients': True})
+    b = canonical_request_key('/recipes/complexSearch',
+                              {'fillIngredients': True, 'intolerances': ['dairy', 'egg'], 'query': 'pasta'})
+    assert a == b
+    assert 'secret' not in a
+    assert a == '/recipes/complexSearch?fillIngredients=true&intolerances=dairy,egg&query=pasta'
+
+
+def test_concurrent_identical_requests_are_coalesced(server):
+    """Ten threads asking for the same recipe at once cost one upstream call."""
+    server.delay = 0.2
+    server.script = [(200, {}, {'id': 716429, 'title': 'Pasta'})]
+    client = make_client(server)
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        results = list(pool.map(lambda _: client.get_recipe_information(716429), range(10)))
+
+    assert len(server.paths) == 1
+    assert all(result == {'id': 716429, 'title': 'Pasta'} for result in results)
+    stats = client.get_coalescing_stats()
+    assert stats['executed'] == 1
+    assert stats['collapsed'] == 9
+    assert stats['in_flight'] == 0
+
+
+def test_coalesced_waiters_share_the_exception(server):
+    """Every waiter of a failed flight sees the same error."""
+    server.delay = 0.2
+    server.script = [(404, {}, {})]
+    client = make_client(server, max_retries=0)
+
+    def fetch(_):
+        try:
+            client.get_recipe_information(1)
+        except requests.exceptions.HTTPError as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        errors = list(pool.map(fetch, range(5)))
+
+    assert len(server.paths) == 1
+    assert all(isinstance(error, requests.exceptions.HTTPError) for error in errors)
+
+
+def test_responses_are_cached_per_endpoint(server, tmp_path):
+    """Cacheable endpoints hit upstream once; /recipes/random is never cached."""
+    cache = TieredCache(disk=SQLiteCache(str(tmp_path / 'cache.db')))
+    client = make_client(server, cache=cache, enable_cache=True)
+
+    first = client.get_recipe_information(5)
+    first['mutated'] = True
+    second = client.get_recipe_information(5)
+    client.get_random_recipes()
+    client.get_random_recipes()
+
+    assert len(server.paths) == 3
+    assert second == {'ok': True}
+    assert cache.stats()['memory_hits'] == 1
+
+
+def test_disk_tier_is_shared_between_clients(server, tmp_path):
+    """A second client (e.g. another worker) is served from the SQLite tier."""
+    path = str(tmp_path / 'cache.db')
+    writer = make_client(server, cache=TieredCache(disk=SQLiteCache(path)), enable_cache=True)
+    reader_cache = TieredCache(memory=MemoryLRUCache(), disk=SQLiteCache(path))
+    reader = make_client(server, cache=reader_cache, enable_cache=True)
+
+    writer.get_wine_pairing('Steak')
+    result = reader.get_wine_pairing('steak ')
+
+    assert result == {'ok': True}
+    assert len(server.paths) == 1
+    assert reader_cache.stats()['disk_hits'] == 1
+
+
+def test_memory_lru_evicts_least_recently_used():
+    """The memory tier never grows past max_entries."""
+    cache = TieredCache(memory=MemoryLRUCache(max_entries=2))
+    cache.set('a', {'v': 1}, ttl=60)
+    cache.set('b', {'v': 2}, ttl=60)
+    cache.get('a')
+    cache.set('c', {'v': 3}, ttl=60)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == {'v': 1}
+    assert cache.get('c') == {'v': 3}
+
+
+def test_point_cost_estimates():
+    """Search options add per-result surcharges; bulk lookups are discounted."""
+    assert estimate_point_cost('/recipes/123/information', {'includeNutrition': False}) == 1.0
+    assert estimate_point_cost('/recipes/complexSearch', {'number': 10}) == pytest.approx(1.1)
+    assert estimate_point_cost('/recipes/complexSearch', {
+        'number': 12, 'addRecipeInformation': True, 'fillIngredients': True}) == pytest.approx(1.72)
+    assert estimate_point_cost('/recipes/informationBulk', {'ids': '1,2,3,4'}) == pytest.approx(2.5)
+
+
+def test_exhausted_budget_fails_fast(server, tmp_path):
+    """Once the daily budget is spent, calls raise without reaching upstream."""
+    throttle = QuotaThrottle(per_minute=60, per_day=2, path=str(tmp_path / 'quota.db'))
+    client = make_client(server, throttle=throttle, enable_throttle=True)
+
+    client.get_recipe_information(1)
+    client.get_recipe_information(2)
+    with pytest.raises(QuotaExhaustedError) as excinfo:
+        client.get_recipe_information(3)
+
+    assert excinfo.value.scope == 'day'
+    assert len(server.paths) == 2
+
+
+def test_budget_is_shared_and_reconciled(server, tmp_path):
+    """Quota headers correct the estimate, and a second throttle on the same file sees it."""
+    path = str(tmp_path / 'quota.db')
+    server.script = [(200, {'X-API-Quota-Request': '1', 'X-API-Quota-Used': '140.5'}, {'ok': True})]
+    client = make_client(server, throttle=QuotaThrottle(per_day=150, path=path), enable_throttle=True)
+
+    client.get_wine_pairing('steak')
+    other_worker = QuotaThrottle(per_day=150, path=path)
+
+    assert other_worker.stats()['day_points_used'] == 140.5
+
+
+def test_minute_bucket_limits_bursts(tmp_path):
+    """The token bucket rejects a burst beyond the per-minute allowance."""
+    throttle = QuotaThrottle(per_minute=3, per_day=100, path=str(tmp_path / 'quota.db'))
+    for _ in range(3):
+        throttle.acquire(1)
+    with pytest.raises(QuotaExhaustedError) as excinfo:
+        throttle.acquire(1)
+
+    assert excinfo.value.scope == 'minute'
+    assert 0 < excinfo.value.retry_after <= 20
+
+
+def test_points_are_refunded_without_a_response(tmp_path):
+    """A call that never reached Spoonacular costs nothing."""
+    throttle = QuotaThrottle(per_minute=60, per_day=10, path=str(tmp_path / 'quota.db'))
+    client = SpoonacularClient(base_url='http://127.0.0.1:9', throttle=throttle, enable_cache=False,
+                               batch_window=0, enable_catalog=False, max_retries=1, backoff_factor=0.01)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get_wine_pairing('steak')
+    stats = throttle.stats()
+    assert stats['day_points_used'] == 0 and stats['minute_points_left'] == pytest.approx(60, abs=0.1)
+
+
+def test_background_calls_leave_the_user_share(tmp_path):
+    """Background calls stop at their share of the budget; user calls may use the rest."""
+    throttle = QuotaThrottle(per_minute=60, per_day=4, path=str(tmp_path / 'quota.db'), background_share=0.5)
+    with background_priority():
+        throttle.acquire(1)
+        throttle.acquire(1)
+        with pytest.raises(QuotaExhaustedError) as excinfo:
+            throttle.acquire(1)
+    assert excinfo.value.scope == 'day'
+    throttle.acquire(1)
+    throttle.acquire(1)
+    assert throttle.stats()['day_points_left'] == 0
+
+    bucket = QuotaThrottle(per_minute=4, per_day=100, path=str(tmp_path / 'bucket.db'), background_share=0.5)
+    with background_priority():
+        bucket.acquire(1)
+        bucket.acquire(1)
+        with pytest.raises(QuotaExhaustedError) as excinfo:
+            bucket.acquire(1)
+    assert excinfo.value.scope == 'minute'
+    bucket.acquire(1)
+
+
+def bulk_responder(path):
+    """Answer /recipes/informationBulk with one record per requested id."""
+    query = parse_qs(urlparse(path).query)
+    ids = [int(i) for i in query['ids'][0].split(',')]
+    return 200, {}, [{'id': i, 'title': f'Recipe {i}'} for i in ids if i != 404]
+
+
+def test_bulk_lookup_uses_cache_and_one_request(server, tmp_path):
+    """A week of meal-plan ids costs one request, and populates per-recipe entries."""
+    server.responder = bulk_responder
+    client = make_client(server, cache=TieredCache(disk=SQLiteCache(str(tmp_path / 'c.db'))), enable_cache=True)
+    week = [1, 2, 3, 4, 5, 6, 7] * 4
+
+    recipes = client.get_recipe_information_bulk(week)
+    single = client.get_recipe_information(3)
+
+    assert sorted(recipes) == [1, 2, 3, 4, 5, 6, 7]
+    assert single == {'id': 3, 'title': 'Recipe 3'}
+    assert len(server.paths) == 1
+    assert server.paths[0].startswith('/recipes/informationBulk?')
+
+
+def test_concurrent_lookups_are_micro_batched(server):
+    """Lookups arriving while one is in flight share one bulk call."""
+    server.responder = bulk_responder
+    server.delay = 0.1
+    client = make_client(server, batch_window=0.05)
+
+    with ThreadPoolExecutor(max_workers=7) as pool:
+        first = pool.submit(client.get_recipe_information, 9)
+        time.sleep(0.02)  # 9 is on the wire; the rest wait for the window
+        results = list(pool.map(client.get_recipe_information, [10, 11, 12, 10, 13, 14]))
+
+    assert first.result()['id'] == 9
+    assert [r['id'] for r in results] == [10, 11, 12, 10, 13, 14]
+    assert len(server.paths) == 2
+    stats = client.get_batching_stats()
+    assert stats['largest_batch'] == 5 and stats['immediate'] == 1
+
+
+def test_lone_lookup_skips_the_window_and_404s_like_before(server):
+    """A single lookup is sent at once; an unknown id is an HTTPError 404, not a LookupError."""
+    server.responder = bulk_responder
+    client = make_client(server, batch_window=1.0)
+
+    started = time.perf_counter()
+    assert client.get_recipe_information(3)['id'] == 3
+    assert time.perf_counter() - started < 0.5
+    with pytest.raises(requests.exceptions.HTTPError) as excinfo:
+        client.get_recipe_information(404)
+    assert excinfo.value.response.status_code == 404
+    assert client.get_batching_stats()['immediate'] == 2
+
+
+def test_ingredient_search_is_normalized_and_shaped(server, tmp_path):
+    """Pantry lists differing only in order/case share an entry; results carry extendedIngredients."""
+    server.script = [(200, {}, [{
+        'id': 1, 'title': 'Omelette',
+        'usedIngredients': [{'name': 'egg', 'amount': 2, 'unit': ''}],
+        'missedIngredients': [{'name': 'chives', 'amount': 1, 'unit': 'tbsp'}],
+    }])]
+    client = make_client(server, cache=TieredCache(disk=SQLiteCache(str(tmp_path / 'c.db'))), enable_cache=True)
+
+    first = client.search_recipes_by_ingredients(['Eggs ', 'cheese', 'eggs'], number=5)
+    second = client.search_recipes_by_ingredients(['cheese', 'eggs'], number=5)
+
+    assert len(server.paths) == 1
+    assert 'ingredients=cheese%2Ceggs' in server.paths[0]
+    assert [i['name'] for i in second[0]['extendedIngredients']] == ['egg', 'chives']
+    assert first == second
+
+    with pytest.raises(ValueError):
+        client.search_recipes_by_ingredients(['egg'], ranking=3)
+
+
+def test_stale_entries_are_served_while_revalidating(server):
+    """An expired wine pairing is returned at once and refreshed in the background."""
+    server.delay = 0.2
+    server.script = [(200, {}, {'pairedWines': ['fresh']})]
+    client = make_client(server, cache=TieredCache(), enable_cache=True)
+    key = canonical_request_key('/food/wine/pairing', {'food': 'steak'})
+    client.cache.set(key, {'pairedWines': ['stale']}, ttl=-1, stale_ttl=3600)
+
+    started = time.perf_counter()
+    stale = client.get_wine_pairing('steak')
+    elapsed = time.perf_counter() - started
+    client._revalidator.wait()
+
+    assert stale == {'pairedWines': ['stale']}
+    assert elapsed < 0.15
+    assert client.get_wine_pairing('steak') == {'pairedWines': ['fresh']}
+    assert len(server.paths) == 1
+    stats = client.get_cache_stats()['revalidation']
+    assert stats['stale_while_revalidate'] == 1
+    assert stats['fresh'] == 1
+    assert stats['refreshes'] == 1
+
+
+def test_stale_recipes_are_refreshed_through_the_batcher(server):
+    """Background refreshes of stale recipe details go out as a bulk request."""
+    server.responder = bulk_responder
+    client = make_client(server, cache=TieredCache(), enable_cache=True, batch_window=0.01)
+    key = canonical_request_key('/recipes/5/information', {'includeNutrition': False})
+    client.cache.set(key, {'id': 5, 'title': 'Old'}, ttl=-1, stale_ttl=3600)
+
+    assert client.get_recipe_information(5) == {'id': 5, 'title': 'Old'}
+    client._revalidator.wait()
+
+    assert client.get_recipe_information(5) == {'id': 5, 'title': 'Recipe 5'}
+    assert server.paths[0].startswith('/recipes/informationBulk?')
+
+
+def test_background_refreshes_spend_only_the_background_share(server, tmp_path):
+    """With no background share left, stale entries are still served but not refreshed."""
+    server.responder = bulk_responder
+    throttle = QuotaThrottle(per_day=10, path=str(tmp_path / 'quota.db'), background_share=0)
+    client = make_client(server, cache=TieredCache(), enable_cache=True, batch_window=0.01,
+                         throttle=throttle, enable_throttle=True)
+    key = canonical_request_key('/recipes/5/information', {'includeNutrition': False})
+    client.cache.set(key, {'id': 5, 'title': 'Old'}, ttl=-1, stale_ttl=3600)
+
+    assert client.get_recipe_information(5) == {'id': 5, 'title': 'Old'}
+    client._revalidator.wait()
+    assert server.paths == [] and client.get_cache_stats()['revalidation']['refresh_failures'] == 1
+    assert client.get_recipe_information(6) == {'id': 6, 'title': 'Recipe 6'}
+
+
+def test_stale_if_error(server):
+    """Past the revalidate window, a failing upstream falls back to the stale entry."""
+    server.script = [(500, {}, {})] * 2
+    client = make_client(server, cache=TieredCache(), enable_cache=True, max_retries=1, backoff_factor=0.01)
+    stale_while_revalidate, stale_if_error = client.STALE_WINDOWS['/recipes/{id}/nutritionWidget.json']
+    key = canonical_request_key('/recipes/9/nutritionWidget.json')
+    client.cache.set(key, {'calories': '100'}, ttl=-(stale_while_revalidate + 60), stale_ttl=stale_if_error)
+
+    assert client.get_recipe_nutrition(9) == {'calories': '100'}
+    assert len(server.paths) == 2
+    assert client.get_cache_stats()['revalidation']['stale_if_error'] == 1
+
+    # Endpoints without a stale window still raise
+    server.script = [(500, {}, {})] * 2
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.search_recipes('soup')
+
+
+def test_search_results_are_harvested_for_the_detail_page(server):
+    """A search asking for the detail fields, followed by a click on a result, costs one upstream call."""
+    server.script = [(200, {}, {'results': [{
+        'id': 21, 'title': 'Dal', 'image': 'dal.jpg', 'readyInMinutes': 30, 'servings': 4,
+        'summary': 'Lentils', 'vegan': True,
+        'usedIngredients': [], 'missedIngredients': [{'name': 'lentils', 'amount': 1, 'unit': 'cup'}],
+        'analyzedInstructions': [{'steps': [{'number': 1, 'step': 'Simmer.'}]}],
+    }]})]
+    client = make_client(server, cache=TieredCache(), enable_cache=True)
+
+    client.search_recipes('dal', fields=client.DETAIL_FIELDS)
+    details = client.get_recipe_details(21)
+
+    assert len(server.paths) == 1
+    assert 'addRecipeInstructions=True' in server.paths[0]
+    server.script = [(200, {}, {'results': []})]
+    client.search_recipes('soup')
+    assert 'addRecipeInstructions' not in server.paths[1]
+    assert details['extendedIngredients'] == [{'name': 'lentils', 'amount': 1, 'unit': 'cup'}]
+    assert client.get_harvest_stats()['complete_hits'] == 1
+
+
+def test_partial_records_fetch_only_instructions(server):
+    """A harvested record missing instructions is completed with one cheap call."""
+    server.script = [
+        (200, {}, {'results': [{'id': 8, 'title': 'Stew', 'image': 's.jpg', 'readyInMinutes': 90,
+                                'servings': 6, 'summary': 'Hearty', 'extendedIngredients': []}]}),
+        (200, {}, [{'steps': [{'number': 1, 'step': 'Braise.'}]}]),
+    ]
+    client = make_client(server, cache=TieredCache(), enable_cache=True)
+
+    client.search_recipes('stew')
+    first = client.get_recipe_details(8)
+    second = client.get_recipe_details(8)
+
+    assert server.paths[1].startswith('/recipes/8/analyzedInstructions?')
+    assert len(server.paths) == 2
+    assert first == second
+    assert first['analyzedInstructions'][0]['steps'][0]['step'] == 'Braise.'
+    assert client.get_harvest_stats() == {'harvested': 1, 'complete_hits': 1, 'partial_hits': 1, 'misses': 0}
+
+
+def test_records_that_cannot_be_served_are_not_harvested(server):
+    """A lean result lacking ingredients is not cached; the click fetches the recipe once."""
+    server.script = [
+        (200, {}, {'results': [{'id': 5, 'title': 'Soup', 'image': 's.jpg', 'readyInMinutes': 20,
+                                'servings': 2}]}),
+        (200, {}, {'id': 5, 'title': 'Soup', 'extendedIngredients': [], 'analyzedInstructions': []}),
+    ]
+    client = make_client(server, cache=TieredCache(), enable_cache=True)
+
+    client.search_recipes('soup', fields=['title', 'image', 'readyInMinutes', 'servings'])
+    assert client.cache.get(client._harvest_key(5)) is None
+    assert client.get_recipe_details(5)['title'] == 'Soup'
+    assert server.paths[1].startswith('/recipes/5/information?')
+    assert client.get_harvest_stats() == {'harvested': 0, 'complete_hits': 0, 'partial_hits': 0, 'misses': 1}
+
+
+def test_search_options_are_the_cheapest_cover():
+    """Requested fields map to the cheapest complexSearch options."""
+    assert SpoonacularClient._search_options(['id', 'title', 'image'], 12) == {}
+    assert SpoonacularClient._search_options(['title', 'readyInMinutes', 'servings'], 12) == {
+        'addRecipeInformation': True}
+    assert SpoonacularClient._search_options(['servings', 'nutrition'], 12) == {'addRecipeNutrition': True}
+    assert SpoonacularClient._search_options(['extendedIngredients', 'analyzedInstructions'], 12) == {
+        'fillIngredients': True, 'addRecipeInstructions': True}
+    with pytest.raises(ValueError):
+        SpoonacularClient._search_options(['wine'], 12)
+
+
+def test_lean_search_projects_results(server):
+    """A lean search asks only for what the grid needs and returns only those fields."""
+    server.script = [(200, {}, {'results': [
+        {'id': 1, 'title': 'Soup', 'image': 's.jpg', 'imageType': 'jpg', 'readyInMinutes': 20,
+         'servings': 2, 'summary': 'Long text', 'diets': ['vegan']},
+    ], 'totalResults': 1})]
+    client = make_client(server)
+
+    result = client.search_recipes('soup', number=12, fields=['id', 'title', 'image', 'readyInMinutes', 'servings'])
+
+    assert 'addRecipeInformation=True' in server.paths[0]
+    assert 'fillIngredients' not in server.paths[0]
+    assert 'addRecipeInstructions' not in server.paths[0]
+    assert result['totalResults'] == 1
+    assert result['results'] == [{'id': 1, 'title': 'Soup', 'image': 's.jpg', 'readyInMinutes': 20, 'servings': 2}]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
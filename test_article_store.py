@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script for the local Guardian article store and incremental ingestion
+"""
+
+import os
+import sys
+
+import pytest
+import requests
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('SPOONACULAR_API_KEY', 'test-key')
+
+from article_store import ArticleStore, covers, match_expression
+from news_parser import ArticleIngestor, NewsParser
+from response_cache import TieredCache
+from stub_server import StubServer
+
+
+def article(index, title, preview='', published_at=None):
+    return {'id': f'food/2024/jan/01/article-{index}', 'title': title, 'url': f'https://example.com/{index}',
+            'preview': preview, 'thumbnail': None,
+            'published_at': published_at or f'2024-01-01T{index:02d}:00:00Z'}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArticleStore(str(tmp_path / 'articles.db'))
+
+
+@pytest.fixture
+def stub():
+    with StubServer() as server:
+        yield server
+
+
+def test_match_expression():
+    """Commas separate alternatives; words of one term are all required."""
+    assert match_expression('food,recipes') == '("food") OR ("recipes")'
+    assert match_expression('leek soup') == '("leek" "soup")'
+    assert match_expression(' , ') is None
+
+
+def test_upsert_search_and_since(store):
+    """Articles are stored once, searched by BM25 and listed incrementally."""
+    assert store.upsert([article(1, 'Leek and potato soup'), article(2, 'Chocolate cake', '<b>Rich</b> soup-free')]) == 2
+    assert store.upsert([article(1, 'Leek and potato soup', 'Now with a preview')]) == 0
+
+    results, total = store.search('soups')
+    assert total == 2 and results[0]['title'] == 'Leek and potato soup'
+    assert store.search('chocolate,leek')[1] == 2
+    assert store.search('')[0][0]['id'] == article(2, '')['id']
+
+    seqs = [seq for seq, _ in store.since()]
+    assert len(seqs) == 2
+    # Changed text is renumbered so incremental readers see it again
+    store.upsert([article(2, 'Chocolate fudge cake', '<b>Rich</b> soup-free')])
+    changed = store.since(max(seqs))
+    assert [a['title'] for _, a in changed] == ['Chocolate fudge cake']
+    assert store.search('fudge')[1] == 1 and store.search('rich')[1] == 1
+    assert store.get(article(2, '')['id'])['title'] == 'Chocolate fudge cake'
+
+
+def test_watermark_only_moves_forward(store):
+    store.record_run('food', '2024-01-02T00:00:00Z')
+    store.record_run('food', '2024-01-01T00:00:00Z')
+    store.record_run('food', None)
+    assert store.watermark('food') == '2024-01-02T00:00:00Z'
+    assert store.watermark('other') is None
+
+
+def test_ingestion_is_incremental(stub, store):
+    """The first run backfills page by page; the next asks only for new articles."""
+    parser = NewsParser('test-key', base_url=stub.guardian_url, cache=TieredCache())
+    ingestor = ArticleIngestor(parser, store, query='recipe', page_size=10, backfill_days=3)
+
+    new, caught_up = ingestor.run_once()
+    assert caught_up and 20 <= new <= 25
+    first_run_requests = stub.counters['requests']
+    assert first_run_requests == -(-new // 10)
+    newest = store.search('')[0][0]
+    assert store.watermark('recipe') == newest['published_at']
+
+    assert ingestor.run_once() == (0, True)
+    assert stub.counters['requests'] == first_run_requests + 1
+    stats = ingestor.stats()
+    assert (stats['runs'], stats['new'], stats['failures']) == (2, new, 0)
+
+
+def test_ingestion_resumes_after_max_pages(stub, store):
+    """A run capped at max_pages leaves the watermark where the next run picks up."""
+    parser = NewsParser('test-key', base_url=stub.guardian_url, cache=TieredCache())
+    ingestor = ArticleIngestor(parser, store, query='recipe', page_size=5, max_pages=2, backfill_days=3)
+    assert ingestor.run_once() == (10, False)
+    total = 10
+    while True:
+        new, caught_up = ingestor.run_once()
+        total += new
+        if caught_up:
+            break
+    assert store.stats()['articles'] == total
+
+    failing = ArticleIngestor(NewsParser('test-key', base_url='http://127.0.0.1:9', cache=TieredCache()), store)
+    with pytest.raises(requests.exceptions.RequestException):
+        failing.run_once()
+    assert failing.stats()['failures'] == 1
+
+
+def test_fetch_food_news_answers_from_current_store(stub, store):
+    """Searches go upstream until an ingestion run makes the store current."""
+    parser = NewsParser('test-key', base_url=stub.guardian_url, cache=TieredCache(), store=store)
+    upstream = parser.fetch_food_news('recipe', page_size=3)
+    assert len(upstream) == 3 and stub.counters['requests'] == 1
+    assert store.stats()['articles'] == 3 and store.stats()['local_misses'] == 1
+
+    ArticleIngestor(parser, store, query='recipe', page_size=50, backfill_days=3).run_once()
+    requests_before = stub.counters['requests']
+    local = parser.fetch_food_news('recipe', page_size=3)
+    assert len(local) == 3 and set(local[0]) == set(upstream[0])
+    assert stub.counters['requests'] == requests_before
+    assert store.stats()['local_hits'] == 1
+
+    # Too few local matches: ask The Guardian
+    parser.fetch_food_news('no-such-dish', page_size=3)
+    assert stub.counters['requests'] == requests_before + 1
+
+
+def test_store_is_current_only_for_covered_queries(stub, store):
+    """A fresh run of one query does not make unrelated searches current."""
+    assert covers('food,recipes', 'vegan recipes') and covers('recipe', 'recipe,salad recipe')
+    assert not covers('food,recipes', 'salad') and not covers('food,recipes', '')
+
+    parser = NewsParser('test-key', base_url=stub.guardian_url, cache=TieredCache(), store=store)
+    ArticleIngestor(parser, store, query='recipe', page_size=50, backfill_days=3).run_once()
+    word = store.search('')[0][0]['title'].split()[0]
+    assert store.search(word, 1)[1] >= 1 and not covers('recipe', word)
+    assert store.search_if_current(word, 1) is None
+    assert store.search_if_current('recipe', 1) is not None
+
+    store.record_run(word, None)  # ran, but never ingested anything
+    assert store.search_if_current(word, 1) is None
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
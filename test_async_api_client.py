@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Test script for the asyncio Spoonacular client and its sync bridge
+
+The client is exercised against a local stub server that sleeps on every
+request and records how many requests were in flight at once, and shares the
+cache, coalescer and point budget of a sync SpoonacularClient.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('SPOONACULAR_API_KEY', 'test-key')
+
+from api_client import SpoonacularClient
+from async_api_client import AsyncSpoonacularClient, AsyncBridge
+from quota import QuotaThrottle, QuotaExhaustedError
+from response_cache import TieredCache
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Echoes the request path after a short delay, tracking peak concurrency."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.peak = max(server.peak, server.in_flight)
+            status = server.statuses.pop(0) if server.statuses else 200
+        time.sleep(server.delay)
+        with server.lock:
+            server.in_flight -= 1
+        payload = json.dumps({'path': self.path}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        if status == 429:
+            self.send_header('Retry-After', '0')
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Start a local slow stub server on a free port."""
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    httpd.lock = threading.Lock()
+    httpd.requests = 0
+    httpd.in_flight = 0
+    httpd.peak = 0
+    httpd.delay = 0.1
+    httpd.statuses = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_sync_client(server, **kwargs):
+    kwargs.setdefault('enable_cache', False)
+    kwargs.setdefault('enable_throttle', False)
+    return SpoonacularClient(base_url=f"http://127.0.0.1:{server.server_address[1]}", batch_window=0,
+                             enable_catalog=False, random_pool_size=0, backoff_factor=0.01, **kwargs)
+
+
+def make_bridge(server, max_concurrency, sync_client=None):
+    sync_client = sync_client or make_sync_client(server)
+
+    def factory():
+        return AsyncSpoonacularClient(sync_client, max_concurrency=max_concurrency, backoff_factor=0.01)
+    return AsyncBridge(client_factory=factory)
+
+
+def test_bridge_runs_calls_concurrently(server):
+    """Four 100ms calls through the bridge finish in roughly one round trip."""
+    bridge = make_bridge(server, max_concurrency=4)
+    client = bridge.client
+    try:
+        started = time.perf_counter()
+        results = bridge.gather(
+            client.get_recipe_information(1),
+            client.get_recipe_nutrition(1),
+            client.get_wine_pairing('steak'),
+            client.search_recipes('pasta', diet='vegan'),
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        bridge.close()
+
+    assert results[0]['path'].startswith('/recipes/1/information?')
+    assert 'includeNutrition=false' in results[0]['path']
+    assert results[1]['path'].startswith('/recipes/1/nutritionWidget.json')
+    assert 'food=steak' in results[2]['path']
+    assert 'diet=vegan' in results[3]['path']
+    assert server.peak == 4
+    assert elapsed < 0.35
+
+
+def test_semaphore_bounds_concurrency(server):
+    """No more than max_concurrency requests are ever in flight."""
+    bridge = make_bridge(server, max_concurrency=2)
+    client = bridge.client
+    try:
+        bridge.gather(*(client.get_recipe_information(i) for i in range(6)))
+    finally:
+        bridge.close()
+
+    assert server.peak == 2
+
+
+def test_async_client_retries_rate_limits(server):
+    """A 429 is retried and the eventual 200 is returned."""
+    server.statuses = [429]
+    server.delay = 0
+    bridge = make_bridge(server, max_concurrency=1)
+    try:
+        result = bridge.run(bridge.client.get_random_recipes(number=3))
+    finally:
+        bridge.close()
+
+    assert 'number=3' in result['path']
+    assert bridge.client.get_latency_stats()['/recipes/random']['count'] == 2
+
+
+def test_validation_matches_sync_client(server):
+    """Filters are validated by the shared base class before any request."""
+    client = AsyncSpoonacularClient(make_sync_client(server))
+    with pytest.raises(ValueError):
+        client._search_params('pasta', diet='carnivore')
+
+
+def test_sync_and_async_share_the_cache(server):
+    """A response cached by either client answers the other without an upstream call."""
+    server.delay = 0
+    sync_client = make_sync_client(server, enable_cache=True, cache=TieredCache())
+    bridge = make_bridge(server, max_concurrency=2, sync_client=sync_client)
+    try:
+        sync_client.get_wine_pairing('steak')
+        assert bridge.run(bridge.client.get_wine_pairing('steak')) == sync_client.get_wine_pairing('steak')
+        bridge.run(bridge.client.get_recipe_nutrition(7))
+        sync_client.get_recipe_nutrition(7)
+    finally:
+        bridge.close()
+
+    assert server.requests == 2
+    assert sync_client.get_cache_stats()['revalidation']['fresh'] == 3
+
+
+def test_identical_calls_coalesce_across_sync_and_async(server):
+    """Concurrent identical calls from coroutines and threads share one upstream request."""
+    sync_client = make_sync_client(server)
+    bridge = make_bridge(server, max_concurrency=8, sync_client=sync_client)
+    try:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(bridge.gather, *(bridge.client.get_wine_pairing('fish') for _ in range(5)))
+            time.sleep(0.02)
+            follower = pool.submit(sync_client.get_wine_pairing, 'fish')
+            results = leader.result() + [follower.result()]
+    finally:
+        bridge.close()
+
+    assert server.requests == 1
+    assert all(result == results[0] for result in results)
+    assert sync_client.get_coalescing_stats()['collapsed'] == 5
+
+
+def test_async_calls_spend_the_shared_budget(server, tmp_path):
+    """Async requests are charged to the sync client's throttle and fail fast once it runs out."""
+    server.delay = 0
+    throttle = QuotaThrottle(per_minute=60, per_day=2, path=str(tmp_path / 'quota.db'))
+    sync_client = make_sync_client(server, enable_throttle=True, throttle=throttle)
+    bridge = make_bridge(server, max_concurrency=2, sync_client=sync_client)
+    try:
+        bridge.run(bridge.client.get_wine_pairing('steak'))
+        sync_client.get_wine_pairing('lamb')
+        with pytest.raises(QuotaExhaustedError):
+            bridge.run(bridge.client.get_wine_pairing('duck'))
+    finally:
+        bridge.close()
+
+    assert server.requests == 2
+    assert throttle.stats()['day_points_used'] == 2
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
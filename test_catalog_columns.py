@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for vectorized filtering over the recipe catalog's NumPy columns
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('SPOONACULAR_API_KEY', 'test-key')
+
+from api_client import SpoonacularClient
+from catalog_columns import CatalogColumns
+from recipe_catalog import RecipeCatalog
+from stub_server import StubServer
+
+
+def recipe(recipe_id, title, ingredients, ready=30, calories=None, **info):
+    payload = dict({
+        'id': recipe_id, 'title': title, 'readyInMinutes': ready, 'servings': 2,
+        'vegetarian': False, 'vegan': False, 'glutenFree': False, 'dairyFree': True, 'diets': [],
+        'extendedIngredients': [{'name': name, 'amount': 1, 'unit': ''} for name in ingredients],
+        'analyzedInstructions': [{'steps': [{'number': 1, 'step': 'Cook.'}]}],
+    }, **info)
+    if calories is not None:
+        payload['nutrition'] = {'nutrients': [{'name': 'Calories', 'amount': calories, 'unit': 'kcal'}]}
+    return payload
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = RecipeCatalog(str(tmp_path / 'catalog.db'))
+    catalog.ingest([
+        recipe(1, 'Chicken Curry', ['chicken', 'curry paste', 'rice'], calories=650),
+        recipe(2, 'Vegan Chickpea Curry', ['chickpeas', 'coconut milk'], calories=420,
+               vegetarian=True, vegan=True, diets=['vegan', 'gluten free'], glutenFree=True),
+        recipe(3, 'Peanut Noodles', ['peanut butter', 'noodles'], ready=15),
+        recipe(4, 'Rice Pudding', ['rice', 'milk', 'sugar'], ready=90, dairyFree=False, calories=300),
+        {'id': 5, 'title': 'Mystery Stew'},
+    ])
+    return catalog
+
+
+@pytest.mark.parametrize('filters', [
+    {},
+    {'diet': 'vegan'},
+    {'intolerances': ['dairy']},
+    {'intolerances': ['peanut', 'grain']},
+    {'max_ready_time': 20},
+    {'min_calories': 400},
+    {'max_calories': 500, 'intolerances': ['dairy']},
+])
+def test_mask_matches_catalog_search(catalog, filters):
+    """The vectorized mask selects exactly what the SQLite search does."""
+    columns = CatalogColumns(catalog)
+    results, _ = catalog.search('', number=100, **filters)
+    assert columns.filter_ids(**filters).tolist() == sorted(r['id'] for r in results)
+
+
+def test_snapshot_is_memory_mapped_and_shared(catalog):
+    """A second instance maps the saved snapshot instead of rebuilding it."""
+    first = CatalogColumns(catalog)
+    first.columns()
+    second = CatalogColumns(catalog)
+    columns = second.columns()
+
+    assert isinstance(columns['flags'], np.memmap)
+    assert second.stats()['builds'] == 0 and second.stats()['loads'] == 1
+    assert second.stats()['rows'] == 5
+
+
+def test_rebuilds_after_catalog_changes(catalog):
+    """New recipes appear once the change check runs."""
+    columns = CatalogColumns(catalog, max_age=3600)
+    assert 6 not in columns.filter_ids(diet='vegan').tolist()
+
+    catalog.ingest([recipe(6, 'Tofu Bowl', ['tofu', 'rice'], vegetarian=True, vegan=True, diets=['vegan'])])
+    assert 6 not in columns.filter_ids(diet='vegan').tolist()
+    columns.refresh()
+    assert columns.filter_ids(diet='vegan').tolist() == [2, 6]
+    assert len([d for d in os.listdir(columns.directory) if d.startswith('v')]) == 1
+
+
+def test_random_recipes_drawn_from_catalog(catalog):
+    """Offline-first random recipes come from matching complete records."""
+    with StubServer() as stub:
+        client = SpoonacularClient(base_url=stub.base_url, enable_cache=False, enable_throttle=False,
+                                   batch_window=0, catalog=catalog)
+        local = client.get_random_recipes(number=2, intolerances=['dairy'], offline_first=True)
+        upstream = client.get_random_recipes(number=2, diet='vegan', offline_first=True)
+
+    assert local['source'] == 'catalog'
+    assert {r['id'] for r in local['recipes']} <= {1, 2, 3}
+    assert 'source' not in upstream
+    assert stub.counters['requests'] == 1
+    assert client.get_catalog_stats()['columns']['rows'] == 5
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
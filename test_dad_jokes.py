@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for the precompiled dad-joke ingredient matcher
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from dad_jokes import JOKES, JokeMatcher, INGREDIENT_JOKES
+
+
+@pytest.mark.parametrize('text, label', [
+    ('Grilled Salmon with Garlic Butter', 'salmon'),
+    ('Garlic Butter Chicken', 'garlic'),
+    ('Roasted Tomatoes', 'tomato'),
+    ('Beef Steak Sandwich', 'beef'),
+    ('Pan-seared steak', 'beef'),
+    ('Seafood Paella', 'fish'),
+    ('Vanilla Ice Cream', 'cream'),
+    ('Triple Layer Cake', 'dessert'),
+    ('Crispy Tofu Bowl', 'vegetarian'),
+    ('Something Mysterious', 'general'),
+])
+def test_highest_priority_ingredient_wins(text, label):
+    """Specific ingredients outrank categories; unmatched text gets a general joke."""
+    assert JOKES.match(text)[0] == label
+
+
+def test_matches_whole_words_only():
+    """Keywords inside other words ("tea" in "steak", "oat" in "boat") do not match."""
+    assert JOKES.match('steak on a boat')[0] == 'beef'
+    assert JOKES.match('saltwater coast')[0] == 'general'
+
+
+def test_multi_word_terms():
+    """Phrases match as consecutive words."""
+    matcher = JokeMatcher({'general': ['g'], 'dessert': ['d']}, [],
+                          [('dessert', 'dessert', ['ice cream'])])
+    assert matcher.match('Ice  cream sundae')[0] == 'dessert'
+    assert matcher.match('cream on ice')[0] == 'general'
+
+
+def test_match_recipe_reads_ingredients():
+    """Ingredient names count, not just the title."""
+    recipe = {'title': 'Weeknight Special', 'summary': '',
+              'extendedIngredients': [{'name': 'shrimps', 'original': '200g shrimps'}]}
+    label, jokes = JOKES.match_recipe(recipe)
+    assert label == 'shrimp'
+    assert jokes == INGREDIENT_JOKES['shrimp']
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script for the cross-process job lease
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('SPOONACULAR_API_KEY', 'test-key')
+
+from job_lease import JobLease
+
+
+def worker_lease(path, owner, name='feed'):
+    """A lease as seen from another process."""
+    lease = JobLease(name, path)
+    lease.owner = lambda: owner
+    return lease
+
+
+def test_one_holder_at_a_time(tmp_path):
+    """The holder renews its lease; other workers are refused until it lapses."""
+    path = str(tmp_path / 'leases.db')
+    first, second = worker_lease(path, 'host:1'), worker_lease(path, 'host:2')
+
+    assert first.acquire(60)
+    assert first.acquire(60)
+    assert not second.acquire(60)
+    assert worker_lease(path, 'host:3', name='ingest').acquire(60)
+    assert first.stats() == {'acquired': 1, 'renewed': 1, 'refused': 0, 'errors': 0, 'holder': 'host:1'}
+    assert second.stats()['refused'] == 1
+
+
+def test_expired_or_released_lease_is_taken_over(tmp_path):
+    """A lapsed holder (e.g. an exited worker) is replaced by the next worker to ask."""
+    path = str(tmp_path / 'leases.db')
+    first, second = worker_lease(path, 'host:1'), worker_lease(path, 'host:2')
+
+    assert first.acquire(0.05)
+    time.sleep(0.1)
+    assert second.acquire(60)
+    assert not first.acquire(60)
+
+    second.release()
+    first.release()  # not the holder; no effect
+    assert first.stats()['holder'] is None
+    assert first.acquire(60)
+
+
+def test_lease_is_per_process():
+    """The owner includes the process id, so a forked child does not inherit the lease."""
+    assert JobLease.owner().endswith(f":{os.getpid()}")
+
+
+def test_from_env(tmp_path, monkeypatch):
+    """JOB_LEASE_PATH sets the lease file; an empty value disables leasing."""
+    monkeypatch.setenv('JOB_LEASE_PATH', str(tmp_path / 'leases.db'))
+    assert JobLease.from_env('feed').path == str(tmp_path / 'leases.db')
+    monkeypatch.setenv('JOB_LEASE_PATH', '')
+    assert JobLease.from_env('feed') is None
+
+
+def test_unreadable_lease_does_not_stop_the_job(tmp_path):
+    """A lease file that cannot be opened counts as held, with a warning."""
+    lease = JobLease('feed', str(tmp_path / 'leases.db'))
+    lease.path = str(tmp_path)  # a directory, not a database
+    assert lease.acquire(60)
+    assert lease.stats()['errors'] == 1
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming JSON parsing of large search and bulk responses
+"""
+
+import os
+import sys
+import json
+import time
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('SPOONACULAR_API_KEY', 'test-key')
+
+from api_client import SpoonacularClient
+from data_parser import iter_recipe_summaries, parse_recipe_summaries
+from json_stream import JSONArrayStream
+from recipe_catalog import RecipeCatalog
+from response_cache import TieredCache
+from stub_server import StubServer, synthetic_recipe
+
+
+def chunked(document, size):
+    data = document.encode('utf-8') if isinstance(document, str) else document
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('size', [1, 3, 64, 100000])
+def test_stream_matches_json_loads_at_any_chunk_size(size):
+    """Elements and other members come out the same however the bytes are split."""
+    document = {'offset': 0, 'results': [synthetic_recipe(100000 + i) for i in range(5)],
+                'number': 5, 'totalResults': 12345, 'note': 'crème brûlée ☕'}
+    stream = JSONArrayStream(chunked(json.dumps(document, ensure_ascii=False), size), 'results')
+    assert list(stream) == document['results']
+    assert stream.fields == {k: v for k, v in document.items() if k != 'results'}
+    assert stream.bytes_read == len(json.dumps(document, ensure_ascii=False).encode('utf-8'))
+
+
+def test_numbers_split_across_chunks():
+    """A number cut at a chunk boundary is not decoded early."""
+    assert list(JSONArrayStream([b'[12', b'34, 5', b'.25', b'e1, -', b'7]'])) == [1234, 52.5, -7]
+    stream = JSONArrayStream([b'{"results": [], "totalResults": 1', b'00}'], 'results')
+    assert list(stream) == [] and stream.fields == {'totalResults': 100}
+
+
+def test_elements_arrive_before_the_document_ends():
+    """Each element is yielded as soon as its own bytes are in."""
+    read = []
+
+    def source():
+        for chunk in (b'[{"id": 1}, ', b'{"id": 2}', b']'):
+            read.append(chunk)
+            yield chunk
+
+    stream = iter(JSONArrayStream(source()))
+    assert next(stream) == {'id': 1}
+    assert len(read) == 1
+
+
+@pytest.mark.parametrize('document', [b'{"results": 5}', b'{"other": []}', b'[1, 2', b'[1] [2]', b'', b'{"results": [1,]}'])
+def test_invalid_documents_raise_value_error(document):
+    """Missing arrays, truncation and trailing data are all errors."""
+    with pytest.raises(ValueError):
+        list(JSONArrayStream(chunked(document, 2) if document else [], 'results' if document.startswith(b'{') else None))
+
+
+@pytest.fixture
+def stub():
+    with StubServer() as server:
+        yield server
+
+
+def client_for(stub, tmp_path, **kwargs):
+    return SpoonacularClient(base_url=stub.base_url, enable_throttle=False, batch_window=0,
+                             random_pool_size=0, catalog=RecipeCatalog(str(tmp_path / 'c.db')), **kwargs)
+
+
+def test_streamed_search_matches_search_recipes(stub, tmp_path):
+    """Streaming returns the same results, harvests them and records the query."""
+    client = client_for(stub, tmp_path, enable_cache=False)
+    client.STREAM_BATCH = 7
+    streamed = list(client.iter_search_results('chicken', number=30))
+    assert [r['id'] for r in streamed] == [r['id'] for r in client.search_recipes('chicken', number=30)['results']]
+    assert client.catalog.search_if_covered('chicken', number=30) is not None
+
+    summaries = list(iter_recipe_summaries(client.iter_search_results('rice', number=10, fields=['title'])))
+    assert summaries == parse_recipe_summaries(client.search_recipes('rice', number=10, fields=['title']))
+
+
+def test_streamed_bulk_information_is_cached(stub, tmp_path):
+    """Bulk recipes stream in, are cached, and come from the cache next time."""
+    client = client_for(stub, tmp_path, cache=TieredCache())
+    client.BULK_MAX_IDS = 40
+    ids = list(range(300000, 300090))
+    first = list(client.iter_recipe_information_bulk(ids + ids[:5]))
+    assert sorted(r['id'] for r in first) == ids
+    assert first[0] == synthetic_recipe(ids[0])
+    requests_made = stub.counters['requests']
+    assert requests_made == 3
+
+    second = list(client.iter_recipe_information_bulk(ids[:10] + [300500]))
+    assert sorted(r['id'] for r in second) == ids[:10] + [300500]
+    assert stub.counters['requests'] == requests_made + 1
+    assert client.catalog.get_many([300500])
+
+
+def test_first_result_arrives_before_slow_body_finishes(tmp_path):
+    """Over a slow link the first recipe is parsed well before the download ends."""
+    with StubServer(bytes_per_second=400000) as slow:
+        client = client_for(slow, tmp_path, enable_cache=False)
+        started = time.perf_counter()
+        stream = client.iter_recipe_information_bulk(range(400000, 400100))
+        next(stream)
+        first = time.perf_counter() - started
+        assert len(list(stream)) == 99
+        total = time.perf_counter() - started
+    assert first < total / 2
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
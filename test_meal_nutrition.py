@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for batched meal plan nutrition totals
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('SPOONACULAR_API_KEY', 'test-key')
+
+from api_client import SpoonacularClient
+from data_parser import parse_nutrition_data
+from meal_nutrition import MealPlanNutrition, NUTRIENTS, NUTRIENT_INDEX, DAILY_VALUES, nutrition_matrix
+from response_cache import TieredCache
+from stub_server import StubServer, synthetic_nutrition
+
+CALORIES, SODIUM, PROTEIN = NUTRIENT_INDEX['calories'], NUTRIENT_INDEX['sodium'], NUTRIENT_INDEX['protein']
+
+
+class FakeFetch:
+    """Returns stub nutrition for any id, recording each call."""
+
+    def __init__(self, without_nutrition=()):
+        self.calls = []
+        self.without_nutrition = set(without_nutrition)
+
+    def __call__(self, recipe_ids):
+        self.calls.append(list(recipe_ids))
+        return {recipe_id: {'id': recipe_id, 'nutrition': synthetic_nutrition(recipe_id)}
+                for recipe_id in recipe_ids if recipe_id not in self.without_nutrition}
+
+
+def test_matrix_uses_fixed_vocabulary_and_units():
+    """Rows follow NUTRIENTS; unknown nutrients are ignored and mass units converted."""
+    matrix = nutrition_matrix([
+        {'nutrients': [{'name': 'Calories', 'amount': 500, 'unit': 'kcal'},
+                       {'name': 'Sodium', 'amount': 1.2, 'unit': 'g'},
+                       {'name': 'Vitamin K', 'amount': 80, 'unit': 'µg'}]},
+        None,
+    ])
+    assert matrix.shape == (2, len(NUTRIENTS))
+    assert matrix[0, CALORIES] == 500 and matrix[0, SODIUM] == pytest.approx(1200)
+    assert not matrix[1].any()
+
+    parsed = parse_nutrition_data(synthetic_nutrition(101))
+    assert nutrition_matrix([synthetic_nutrition(101)])[0, PROTEIN] == parsed['protein']
+
+
+def test_totals_scale_by_servings_and_sum_per_day():
+    """Daily and weekly totals match a per-meal loop over parse_nutrition_data."""
+    fetch = FakeFetch()
+    engine = MealPlanNutrition(fetch)
+    meals = [(101, 0, 1), (102, 0, 2), (101, 3, 3), (103, 6, 1)]
+    summary = engine.summarize(1, meals)
+
+    expected = np.zeros((7, len(NUTRIENTS)))
+    for recipe_id, day, servings in meals:
+        nutrients = parse_nutrition_data(synthetic_nutrition(recipe_id))['nutrients']
+        for name, _, _ in NUTRIENTS:
+            expected[day, NUTRIENT_INDEX[name.lower()]] += nutrients[name.lower()]['amount'] * servings
+    assert np.allclose(summary['daily'], expected, atol=0.05)
+    assert np.allclose(summary['weekly'], expected.sum(axis=0), atol=0.05)
+    assert summary['weekly_percent_dv'][CALORIES] == round(expected[:, CALORIES].sum() / (7 * DAILY_VALUES[CALORIES]) * 100)
+    assert summary['meals'] == 4 and summary['missing'] == []
+    assert fetch.calls == [[101, 102, 103]]
+
+
+def test_plans_are_cached_until_items_change():
+    """Unchanged plans are served from cache; changed or invalidated ones are recomputed."""
+    fetch = FakeFetch()
+    engine = MealPlanNutrition(fetch)
+    first = engine.summarize(1, [(101, 0, 1)])
+    assert engine.summarize(1, [(101, 0, 1)]) is first
+
+    changed = engine.summarize(1, [(101, 0, 1), (102, 1, 1)])
+    assert changed is not first
+    engine.invalidate(1)
+    again = engine.summarize(1, [(101, 0, 1), (102, 1, 1)])
+    assert again == changed and again is not changed
+
+    # Recipe rows are kept, so only 102 was ever fetched after 101
+    assert fetch.calls == [[101], [102]]
+    stats = engine.stats()
+    assert (stats['hits'], stats['misses'], stats['invalidations']) == (1, 3, 1)
+
+
+def test_recipes_without_nutrition_count_as_zero_and_are_retried():
+    """Missing nutrition is reported, not cached, and fetched again later."""
+    fetch = FakeFetch(without_nutrition={102})
+    engine = MealPlanNutrition(fetch)
+    summary = engine.summarize(1, [(101, 0, 1), (102, 0, 1)])
+    assert summary['missing'] == [102]
+    assert summary['daily'][0][CALORIES] == pytest.approx(float(synthetic_nutrition(101)['calories']))
+    engine.summarize(2, [(102, 0, 1)])
+    assert fetch.calls == [[101, 102], [102]]
+
+
+def test_client_fetches_a_whole_plan_in_one_bulk_request(tmp_path):
+    """A week of meals needs a single upstream request, and none once cached."""
+    with StubServer() as stub:
+        client = SpoonacularClient(base_url=stub.base_url, cache=TieredCache(), enable_throttle=False,
+                                   enable_catalog=False, batch_window=0, random_pool_size=0)
+        meals = [(200000 + i % 9, i % 7, 1 + i % 3) for i in range(28)]
+        summary = client.get_meal_plan_nutrition(7, meals)
+        assert stub.counters['requests'] == 1
+        client.invalidate_meal_plan_nutrition(7)
+        assert client.get_meal_plan_nutrition(7, meals) == summary
+        assert stub.counters['requests'] == 1
+    assert client.get_nutrition_stats()['recipes_fetched'] == 9
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
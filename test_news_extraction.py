@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test script for precompiled recipe-name extraction from news articles
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'benchmarks'))
+os.environ.setdefault('SPOONACULAR_API_KEY', 'test-key')
+
+from news_extraction import guardian_articles, legacy_article_recipe_names, legacy_extract_recipes_from_text
+from news_parser import NewsParser, article_recipe_names, extract_recipe_names_batch, extract_recipes_from_text
+
+
+EDGE_TEXTS = [
+    "",
+    "nothing edible here",
+    "the best chocolate cake recipe you will ever bake",
+    "crème brûlée cake and 3pancakes with fish2go",
+    "grandma's chicken soup; beef stew, fish pie & a taco",
+    "pie",
+    "an easy pasta recipe, a simple risotto recipe and a perfect pizza recipe",
+    "recipes_for_soup and cake_day",
+    "burger\n\nbread\tsandwich",
+]
+
+
+@pytest.mark.parametrize('text', EDGE_TEXTS)
+def test_matches_per_keyword_patterns(text):
+    """The single scan finds the same names, in the same order, as one pattern per keyword."""
+    assert extract_recipes_from_text(text) == legacy_extract_recipes_from_text(text)
+
+
+def test_matches_per_keyword_patterns_on_stub_articles():
+    """Identical names for every synthetic Guardian article."""
+    articles = guardian_articles(300)
+    assert [article_recipe_names(a) for a in articles] == [legacy_article_recipe_names(a) for a in articles]
+
+
+def test_names_are_case_insensitive_and_limited_to_three():
+    """Mixed case matches as lower case; at most three names per text."""
+    names = extract_recipes_from_text("Best Lemon CAKE Recipe")
+    assert names == extract_recipes_from_text("best lemon cake recipe")
+    assert names[0] == "Lemon Cake"
+    assert len(extract_recipes_from_text(EDGE_TEXTS[4])) == 3
+
+
+def test_batch_across_processes_matches_inline():
+    """A process pool returns the same names, in input order."""
+    articles = guardian_articles(50)
+    inline = extract_recipe_names_batch(articles)
+    assert extract_recipe_names_batch(articles, processes=2, chunksize=8) == inline
+
+
+def test_parser_dedupes_names_across_articles():
+    """NewsParser keeps each name found in any article once."""
+    parser = NewsParser(api_key='test-key')
+    articles = [{"title": "Easy pasta recipe", "preview": ""},
+                {"title": "Another easy pasta recipe", "preview": "pasta recipe"}]
+    names = parser.extract_recipe_names_from_articles(articles)
+    assert len(names) == len(set(names))
+    assert set(names) == {name for article in articles for name in article_recipe_names(article)}
+    assert "Pasta" in names
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
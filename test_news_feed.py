@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Test script for the background-refreshed /food-news feed
+"""
+
+import os
+import sys
+import time
+
+import pytest
+import requests
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('SPOONACULAR_API_KEY', 'test-key')
+
+import news_parser
+from job_lease import JobLease
+from news_parser import NewsFeed, NewsParser
+from response_cache import SQLiteCache, TieredCache
+from stub_server import StubServer
+
+
+@pytest.fixture
+def stub():
+    with StubServer() as server:
+        yield server
+
+
+def make_feed(base_url, ttl=60.0, cold_start_wait=5.0, **parser_options):
+    parser = NewsParser('test-key', base_url=base_url, cache=TieredCache(), **parser_options)
+    return NewsFeed(parser, ttl=ttl, page_size=5, cold_start_wait=cold_start_wait, retry_interval=0.05)
+
+
+def test_cold_start_waits_for_first_load_then_reads_from_memory(stub):
+    """Only the first read waits on The Guardian; later reads make no requests."""
+    feed = make_feed(stub.guardian_url)
+    feed.start()
+    try:
+        articles = feed.articles()
+        assert len(articles) == 5 and all(article['title'] for article in articles)
+        requests_after_load = stub.counters['requests']
+        for _ in range(20):
+            assert feed.articles() == articles
+        assert stub.counters['requests'] == requests_after_load
+        stats = feed.stats()
+        assert (stats['reads'], stats['cold_reads'], stats['refreshes']) == (21, 1, 1)
+        assert stats['age_seconds'] < 5 and not stats['stale'] and stats['running']
+        assert stats['upstream']['/search']['count'] == 1
+    finally:
+        feed.stop()
+
+
+def test_restarted_feed_starts_from_cached_articles(stub):
+    """A cached feed is served at once; a fresh one delays the first refresh."""
+    feed = make_feed(stub.guardian_url)
+    feed.parser.revalidator.cache.set(feed.key, [{'title': 'Cached'}], ttl=60, stale_ttl=60)
+    feed.start()
+    try:
+        assert feed.articles() == [{'title': 'Cached'}]
+        time.sleep(0.1)
+        assert stub.counters['requests'] == 0
+        assert feed.stats()['restored'] == 1 and feed.stats()['cold_reads'] == 0
+    finally:
+        feed.stop()
+
+
+def test_background_refresh_replaces_the_feed(stub):
+    """The feed is refetched every ttl seconds and written back to the cache."""
+    feed = make_feed(stub.guardian_url, ttl=0.05)
+    feed.parser.revalidator.cache.set(feed.key, [{'title': 'Old news'}], ttl=-1, stale_ttl=3600)
+    feed.start()
+    try:
+        assert feed.articles() == [{'title': 'Old news'}]
+        deadline = time.time() + 5
+        while feed.stats()['refreshes'] < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        assert feed.stats()['refreshes'] >= 2
+        assert feed.articles()[0]['title'] != 'Old news'
+        assert feed.parser.revalidator.cache.get(feed.key) is not None
+    finally:
+        feed.stop()
+
+
+def test_unreachable_guardian_keeps_old_articles():
+    """Failed refreshes keep the current feed; a cold feed gives up after cold_start_wait."""
+    cold = make_feed('http://127.0.0.1:9', cold_start_wait=0.2)
+    cold.start()
+    try:
+        started = time.perf_counter()
+        assert cold.articles() == []
+        assert time.perf_counter() - started < 2
+        assert cold.stats()['cold_misses'] == 1 and cold.stats()['refresh_failures'] >= 1
+    finally:
+        cold.stop()
+
+    kept = make_feed('http://127.0.0.1:9', ttl=0.05)
+    kept.parser.revalidator.cache.set(kept.key, [{'title': 'Kept'}], ttl=-1, stale_ttl=3600)
+    kept.start()
+    try:
+        assert kept.articles() == [{'title': 'Kept'}]
+        time.sleep(0.2)
+        assert kept.articles() == [{'title': 'Kept'}]
+        assert kept.stats()['refresh_failures'] >= 1 and kept.stats()['stale']
+    finally:
+        kept.stop()
+
+
+def test_only_the_lease_holder_calls_the_guardian(stub, tmp_path):
+    """Other workers follow the holder's feed through the shared cache, and take over when it lapses."""
+    def worker(owner):
+        lease = JobLease('guardian-feed', str(tmp_path / 'leases.db'))
+        lease.owner = lambda: owner
+        parser = NewsParser('test-key', base_url=stub.guardian_url,
+                            cache=TieredCache(disk=SQLiteCache(str(tmp_path / 'cache.db'))))
+        return NewsFeed(parser, ttl=60, page_size=5, cold_start_wait=5, retry_interval=0.05, lease=lease)
+
+    holder, follower = worker('host:1'), worker('host:2')
+    assert holder.lease.acquire(60)
+    follower.start()
+    try:
+        assert holder.refresh()
+        assert follower.articles() == holder.articles()
+        assert stub.counters['requests'] == 1
+        assert follower.stats()['followed'] == 1 and follower.stats()['refreshes'] == 0
+
+        holder.lease.release()
+        deadline = time.time() + 5
+        while follower.stats()['refreshes'] == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        assert follower.stats()['refreshes'] == 1
+        assert follower.stats()['lease']['holder'] == 'host:2'
+    finally:
+        follower.stop()
+
+
+def test_forked_worker_starts_its_own_threads(stub, monkeypatch):
+    """Threads do not survive a fork; the child's first start_shared_news_jobs starts them again."""
+    parser = NewsParser('test-key', base_url=stub.guardian_url, cache=TieredCache())
+    feed = NewsFeed(parser, ttl=60, page_size=5, retry_interval=0.05)
+    monkeypatch.setattr(news_parser, '_shared_parser', parser)
+    monkeypatch.setattr(news_parser, '_shared_feed', feed)
+    monkeypatch.setattr(news_parser, '_jobs_pid', None)
+    news_parser.start_shared_news_jobs()
+    try:
+        assert feed.stats()['running']
+        pid = os.fork()
+        if pid == 0:
+            forked_stopped = feed.stats()['running'] is False
+            news_parser.start_shared_news_jobs()
+            os._exit(0 if forked_stopped and feed.stats()['running'] and feed.articles() else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.WEXITSTATUS(status) == 0
+        assert feed.stats()['running']
+    finally:
+        feed.stop()
+
+
+def test_slow_guardian_times_out():
+    """Requests are bounded by the read timeout and counted as errors."""
+    with StubServer(latency_ms=1000) as slow:
+        feed = make_feed(slow.guardian_url, read_timeout=0.1)
+        started = time.perf_counter()
+        assert feed.refresh() is False
+        assert time.perf_counter() - started < 0.9
+        assert feed.parser.get_latency_stats()['/search']['errors'] == 1
+
+
+def test_list_fetches_leave_out_bodies(stub):
+    """Listed articles carry their id and date but not the body."""
+    feed = make_feed(stub.guardian_url)
+    assert feed.refresh()
+    article = feed.articles()[0]
+    feed.stop()
+    assert article['id'].startswith('food/') and article['published_at']
+    assert 'body' not in article
+
+
+def test_article_body_is_fetched_once_and_cached(stub):
+    """A body lookup hits The Guardian once per article; bad ids never reach it."""
+    parser = NewsParser('test-key', base_url=stub.guardian_url, cache=TieredCache())
+    article_id = parser.fetch_food_news('recipe', page_size=1)[0]['id']
+    requests_before = stub.counters['requests']
+
+    body = parser.get_article_body(article_id)
+    assert body.startswith('<p>')
+    assert parser.get_article_body(article_id) == body
+    assert stub.counters['requests'] == requests_before + 1
+    stats = parser.get_article_body_stats()
+    assert (stats['hits'], stats['misses'], stats['hit_rate']) == (1, 1, 0.5)
+
+    for bad_id in ('search', '../search', 'food/x?api-key=y', None):
+        with pytest.raises(ValueError):
+            parser.get_article_body(bad_id)
+    assert stub.counters['requests'] == requests_before + 1
+
+    with pytest.raises(requests.exceptions.HTTPError) as error:
+        parser.get_article_body('food/2020/jan/01/no-such-article')
+    assert error.value.response.status_code == 404
+    assert parser.get_article_body_stats()['errors'] == 1
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-memory news index that matches articles to recipes
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('SPOONACULAR_API_KEY', 'test-key')
+
+from article_store import ArticleStore
+from data_parser import parse_recipe_record
+from news_index import NewsIndex, recipe_query, tag_ingredients, tokenize
+from news_parser import ArticleIngestor, NewsParser
+from response_cache import TieredCache
+from stub_server import StubServer, synthetic_recipe
+
+ARTICLES = [
+    ('prawns', 'Garlic prawns with chilli', 'Sizzling prawns, plenty of garlic and a pinch of chilli.'),
+    ('oil', 'How to choose olive oil', 'Everything you need to know about oil for cooking.'),
+    ('cake', 'The perfect chocolate cake recipe', 'Rich, dark and gooey: a chocolate cake for every occasion.'),
+    ('soup', 'Leek and potato soup', 'A winter classic with leeks, potatoes and cream.'),
+    ('tomatoes', 'Summer tomatoes three ways', 'Ripe tomatoes with basil and olive oil.'),
+]
+
+
+def article(slug, title, preview):
+    return {'id': f'food/2024/jan/01/{slug}', 'title': title, 'url': f'https://example.com/{slug}',
+            'preview': preview, 'thumbnail': None, 'published_at': '2024-01-01T00:00:00Z'}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ArticleStore(str(tmp_path / 'articles.db'))
+    store.upsert(article(*row) for row in ARTICLES)
+    return store
+
+
+def test_tagging_and_tokens():
+    """Vocabulary entries are found in their plural forms; multi-word entries win."""
+    assert tag_ingredients('Chillies, <b>olive oil</b> and cherries; sweet potatoes') == [
+        'chilli', 'olive oil', 'cherry', 'sweet potato']
+    assert tokenize('The best Tomatoes and berries recipe') == ['tomato', 'berry']
+    query = recipe_query({'title': 'Garlic Prawns', 'extendedIngredients': [{'name': 'olive oil'}]})
+    assert query['ingredient:prawn'] > query['prawn'] > query['olive']
+
+
+def test_recipe_matches_related_articles(store):
+    """The article sharing a recipe's title and ingredients ranks first."""
+    index = NewsIndex(store)
+    index.refresh()
+    recipe = {'title': 'Chilli garlic prawns', 'ingredients': [{'name': 'prawns'}, {'name': 'garlic'}]}
+    matches = index.match_recipe(recipe)
+    assert matches[0]['title'] == 'Garlic prawns with chilli'
+    assert index.match_recipe({'title': 'Tomato salad', 'ingredients': [{'name': 'olive oil'}]}, limit=1)[0][
+        'title'] == 'Summer tomatoes three ways'
+    assert index.match_recipe({'title': 'Unrelated', 'ingredients': []}) == []
+    assert index.stats()['articles'] == len(ARTICLES)
+
+
+def test_index_follows_the_store_incrementally(store):
+    """Only new or changed articles are (re-)indexed."""
+    index = NewsIndex(store, batch_size=2)
+    assert index.refresh() == len(ARTICLES)
+    assert index.refresh() == 0
+
+    store.upsert([article('lamb', 'Slow roast lamb', 'Lamb shoulder with rosemary.')])
+    assert index.match_recipe({'title': 'Roast lamb with rosemary'}) == []  # searches never refresh
+    assert index.refresh() == 1
+    assert index.match_recipe({'title': 'Roast lamb with rosemary'})[0]['title'] == 'Slow roast lamb'
+    store.upsert([article('cake', 'Lemon drizzle cake', 'Sharp lemon icing on a soft sponge.')])
+    assert index.refresh() == 1
+    matches = index.match_recipe({'title': 'Lemon cake'})
+    assert [m['title'] for m in matches].count('Lemon drizzle cake') == 1
+    assert index.match_recipe({'title': 'Chocolate gateau'}) == []
+    stats = index.stats()
+    assert (stats['articles'], stats['indexed'], stats['reindexed']) == (len(ARTICLES) + 1, len(ARTICLES) + 1, 1)
+    assert stats['refreshes'] == 4
+
+
+def test_parser_matches_records_without_upstream_calls(store):
+    """match_news_to_recipe accepts a RecipeDetail and needs no network."""
+    offline = NewsParser('test-key', base_url='http://127.0.0.1:9', cache=TieredCache(), store=store)
+    offline.index.refresh()
+    record = parse_recipe_record(dict(synthetic_recipe(101), title='Garlic prawns',
+                                      extendedIngredients=[{'name': 'prawns'}]))
+    assert offline.match_news_to_recipe(record)[0]['title'] == 'Garlic prawns with chilli'
+    assert NewsParser('test-key', cache=TieredCache()).match_news_to_recipe(record) == []
+
+
+def test_ingestion_refreshes_the_index(store):
+    """The ingestion job indexes what it stores; searches in between see the last refresh."""
+    with StubServer() as stub:
+        parser = NewsParser('test-key', base_url=stub.guardian_url, cache=TieredCache(), store=store)
+        ingestor = ArticleIngestor(parser, store, query='recipe', page_size=50, backfill_days=3,
+                                   index=parser.index)
+        assert parser.index.stats()['articles'] == 0
+        ingestor.run_once()
+    assert parser.index.stats()['articles'] == store.stats()['articles'] > len(ARTICLES)
+    assert parser.index.stats()['searches'] == 0
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
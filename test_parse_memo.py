@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script for the memoized recipe parse layer
+"""
+
+import os
+import sys
+import copy
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('SPOONACULAR_API_KEY', 'test-key')
+
+from api_client import SpoonacularClient
+from data_parser import parse_recipe_record
+from parse_memo import ParseMemo, recipe_fingerprint
+from response_cache import TieredCache
+from stub_server import StubServer, synthetic_recipe
+
+
+def test_identical_payloads_reuse_the_record():
+    """A fresh copy of the same payload hits; the record equals a direct parse."""
+    memo = ParseMemo()
+    payload = synthetic_recipe(101)
+    first = memo.parse(payload)
+    assert first == parse_recipe_record(payload)
+    assert memo.parse(copy.deepcopy(payload)) is first
+    stats = memo.stats()
+    assert (stats['hits'], stats['misses'], stats['hit_rate']) == (1, 1, 0.5)
+    assert stats['entries'] == 1 and stats['bytes'] > 1000
+
+
+def test_changed_payload_is_reparsed():
+    """Any change to a parsed field gives a new fingerprint and replaces the record."""
+    memo = ParseMemo()
+    payload = synthetic_recipe(101)
+    first = memo.parse(payload)
+
+    changed = copy.deepcopy(payload)
+    changed['analyzedInstructions'][0]['steps'][-1]['step'] += ' Serve warm.'
+    assert recipe_fingerprint(changed) != recipe_fingerprint(payload)
+    second = memo.parse(changed)
+    assert second.instructions[-1].step.endswith('Serve warm.')
+    assert memo.stats()['changed'] == 1 and memo.stats()['entries'] == 1
+
+    # Fields the parser ignores do not matter
+    ignored = dict(changed, aggregateLikes=12345)
+    assert memo.parse(ignored) is second
+
+
+def test_memo_is_bounded_by_entries_and_bytes():
+    """Least recently used records are evicted past either limit."""
+    memo = ParseMemo(max_entries=3)
+    for recipe_id in range(101, 106):
+        memo.parse(synthetic_recipe(recipe_id))
+    assert memo.stats()['entries'] == 3 and memo.stats()['evictions'] == 2
+
+    one = ParseMemo()
+    one.parse(synthetic_recipe(101))
+    by_bytes = ParseMemo(max_bytes=int(one.stats()['bytes'] * 2.5))
+    for recipe_id in range(101, 106):
+        by_bytes.parse(synthetic_recipe(recipe_id))
+    assert 1 <= by_bytes.stats()['entries'] <= 3
+    assert by_bytes.stats()['bytes'] <= by_bytes.max_bytes
+
+
+def test_unhashable_payloads_are_parsed_without_memo():
+    """A payload that cannot be fingerprinted is still parsed."""
+    memo = ParseMemo()
+    payload = synthetic_recipe(101)
+    payload['extendedIngredients'][0]['amount'] = {'metric': 1}
+    assert memo.parse(payload).ingredients[0].amount == {'metric': 1}
+    assert memo.stats()['unfingerprintable'] == 1 and memo.stats()['entries'] == 0
+
+
+def test_client_memoizes_recipe_records():
+    """Repeated page views parse once; a disabled memo still parses."""
+    with StubServer() as stub:
+        client = SpoonacularClient(base_url=stub.base_url, cache=TieredCache(), enable_throttle=False,
+                                   enable_catalog=False, batch_window=0, random_pool_size=0)
+        first = client.get_recipe_record(4242)
+        assert client.get_recipe_record(4242) is first
+        assert client.get_parse_memo_stats()['hits'] == 1
+
+        plain = SpoonacularClient(base_url=stub.base_url, cache=TieredCache(), enable_throttle=False,
+                                  enable_catalog=False, batch_window=0, random_pool_size=0, parse_memo_size=0)
+        assert plain.get_recipe_record(4242) == first
+        assert plain.get_parse_memo_stats() == {}
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
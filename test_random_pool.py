@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for the background-refilled random recipe pool
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('SPOONACULAR_API_KEY', 'test-key')
+
+from api_client import SpoonacularClient
+from quota import is_background
+from random_pool import RandomRecipePool
+from stub_server import StubServer
+
+
+class FakeRandom:
+    """Hands out sequential recipe ids and records every fetch."""
+
+    def __init__(self):
+        self.calls = []
+        self.background = []
+        self.next_id = 1
+        self.lock = threading.Lock()
+
+    def __call__(self, number, **filters):
+        with self.lock:
+            self.calls.append((number, filters))
+            self.background.append(is_background())
+            start, self.next_id = self.next_id, self.next_id + number
+        return [{'id': i, 'title': f'Recipe {i}'} for i in range(start, start + number)]
+
+
+def test_empty_pool_is_filled_in_bulk():
+    """The first request fetches a whole batch; later ones are pool hits."""
+    fetch = FakeRandom()
+    pool = RandomRecipePool(fetch, batch_size=20, low_water=5)
+    served = [pool.get(diet='Vegan')[0]['id'] for _ in range(10)]
+    pool.wait()
+
+    assert len(set(served)) == 10
+    assert fetch.calls == [(20, {'diet': 'vegan', 'intolerances': None, 'max_ready_time': None})]
+    stats = pool.stats()
+    assert stats['misses'] == 1 and stats['hits'] == 9
+    assert stats['pooled'] == 10 and stats['refills'] == 1
+    assert stats['points_per_refill'] == pytest.approx(1.2)
+
+
+def test_low_water_triggers_background_refill():
+    """Dropping below low_water tops the pool up without blocking callers."""
+    fetch = FakeRandom()
+    pool = RandomRecipePool(fetch, batch_size=10, low_water=4)
+    for _ in range(7):
+        pool.get()
+    pool.wait()
+
+    assert len(fetch.calls) == 2
+    assert pool.stats()['pooled'] == 13
+    # Only the refill nobody waited for runs at background quota priority
+    assert fetch.background == [False, True]
+    assert pool.stats()['misses'] == 1
+
+
+def test_filter_combinations_have_separate_pools():
+    """Each diet/intolerance/time combination is pooled separately, order-insensitively."""
+    fetch = FakeRandom()
+    pool = RandomRecipePool(fetch, batch_size=5, low_water=0, max_pools=2)
+    pool.get(intolerances=['Dairy', 'egg'])
+    pool.get(intolerances=['egg', 'dairy'])
+    pool.get(max_ready_time=30)
+    pool.get(diet='vegan')
+
+    assert len(fetch.calls) == 3
+    assert fetch.calls[0][1]['intolerances'] == ['dairy', 'egg']
+    assert pool.stats()['pools'] == 2
+
+
+def test_failed_synchronous_refill_raises():
+    """An empty pool whose refill fails surfaces the upstream error."""
+    def fail(number, **filters):
+        raise RuntimeError('upstream down')
+
+    pool = RandomRecipePool(fail, batch_size=5)
+    with pytest.raises(RuntimeError):
+        pool.get()
+    assert pool.stats()['refill_failures'] == 1
+
+
+def test_client_serves_shuffles_from_pool(tmp_path):
+    """Pooled random recipes cost one bulk upstream call for many shuffles."""
+    with StubServer() as stub:
+        client = SpoonacularClient(base_url=stub.base_url, enable_cache=False, enable_throttle=False,
+                                   batch_window=0, enable_catalog=False, random_pool_size=30)
+        shuffles = [client.get_random_recipes(number=1, diet='vegetarian', pooled=True) for _ in range(15)]
+        client._random_pool.wait()
+
+    assert all(s['source'] == 'pool' and len(s['recipes']) == 1 for s in shuffles)
+    assert all(s['recipes'][0]['vegetarian'] for s in shuffles)
+    assert stub.counters['requests'] == 1
+    assert client.get_random_pool_stats()['hit_rate'] == pytest.approx(14 / 15)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
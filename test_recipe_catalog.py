@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script for the local recipe catalog and offline-first search
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('SPOONACULAR_API_KEY', 'test-key')
+
+from api_client import SpoonacularClient
+from recipe_catalog import RecipeCatalog, recipe_flags, DIET_BITS, INTOLERANCE_BITS, INFO_KNOWN
+from stub_server import StubServer, synthetic_recipe
+
+
+def recipe(recipe_id, title, ingredients, likes=0, **info):
+    return dict({
+        'id': recipe_id, 'title': title, 'aggregateLikes': likes, 'readyInMinutes': 30, 'servings': 2,
+        'summary': f'A recipe for {title}', 'vegetarian': False, 'vegan': False, 'glutenFree': False,
+        'dairyFree': True, 'diets': [],
+        'extendedIngredients': [{'name': name, 'amount': 1, 'unit': ''} for name in ingredients],
+        'analyzedInstructions': [{'steps': [{'number': 1, 'step': 'Cook.'}]}],
+    }, **info)
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = RecipeCatalog(str(tmp_path / 'catalog.db'))
+    catalog.ingest([
+        recipe(1, 'Chicken Curry', ['chicken', 'curry paste', 'rice'], likes=50),
+        recipe(2, 'Vegan Chickpea Curry', ['chickpeas', 'coconut milk'], likes=900,
+               vegetarian=True, vegan=True, diets=['vegan', 'gluten free'], glutenFree=True),
+        recipe(3, 'Peanut Noodles', ['peanut butter', 'noodles'], likes=10, readyInMinutes=15),
+        recipe(4, 'Rice Pudding', ['rice', 'milk', 'sugar'], likes=5, summary='Curry-free dessert', dairyFree=False),
+    ])
+    return catalog
+
+
+def test_flags_capture_diets_and_intolerances():
+    """Diet labels set diet bits and ingredient names set intolerance bits."""
+    flags = recipe_flags(recipe(1, 'Satay', ['peanut butter', 'soy sauce', 'egg noodles'],
+                                vegetarian=True, diets=['lacto ovo vegetarian']))
+    assert flags & DIET_BITS['vegetarian'] and not flags & DIET_BITS['vegan']
+    assert flags & INTOLERANCE_BITS['peanut'] and flags & INTOLERANCE_BITS['soy']
+    assert flags & INTOLERANCE_BITS['egg'] and not flags & INTOLERANCE_BITS['dairy']
+    assert not recipe_flags({'id': 9, 'title': 'Bare'}) & INFO_KNOWN
+
+
+def test_search_ranks_title_matches_and_popularity(catalog):
+    """Title matches outrank summary-only matches; popularity breaks near-ties."""
+    results, total = catalog.search('curry')
+    assert total == 3
+    assert [r['id'] for r in results] == [2, 1, 4]
+
+
+def test_search_filters(catalog):
+    """Diet, intolerance and time filters are applied locally."""
+    assert [r['id'] for r in catalog.search('curry', diet='vegan')[0]] == [2]
+    assert [r['id'] for r in catalog.search('', intolerances=['dairy'])[0]] == [2, 1, 3]
+    assert [r['id'] for r in catalog.search('', intolerances=['peanut', 'grain'])[0]] == [2]
+    assert [r['id'] for r in catalog.search('', max_ready_time=20)[0]] == [3]
+
+
+def test_ingest_merges_payloads(catalog):
+    """A lean payload never erases detail stored earlier."""
+    catalog.ingest([{'id': 3, 'title': 'Spicy Peanut Noodles', 'image': 'n.jpg'}])
+    results, _ = catalog.search('spicy', detail='complete')
+    assert results[0]['extendedIngredients'][0]['name'] == 'peanut butter'
+    assert results[0]['image'] == 'n.jpg'
+
+
+def test_coverage_uses_recorded_upstream_totals(catalog):
+    """Queries are answered locally only once the catalog holds enough matches."""
+    assert catalog.search_if_covered('curry', number=5) is None
+    assert catalog.search_if_covered('curry', number=1) is None  # never fetched, though 3 match
+    catalog.record_query(3, 'curry')
+    local = catalog.search_if_covered('curry', number=5)
+    assert local['source'] == 'catalog'
+    assert local['totalResults'] == 3
+    assert catalog.stats()['local_hits'] == 1
+
+
+def test_offline_first_search_skips_upstream(tmp_path):
+    """A repeated offline-first search is served from the catalog."""
+    with StubServer() as stub:
+        client = SpoonacularClient(base_url=stub.base_url, enable_cache=False, enable_throttle=False,
+                                   batch_window=0, catalog=RecipeCatalog(str(tmp_path / 'c.db')))
+        first = client.search_recipes('chicken', number=4, offline_first=True)
+        second = client.search_recipes('chicken', number=4, offline_first=True)
+        grid = client.search_recipes('chicken', number=4, offline_first=True, fields=['id', 'title'])
+
+    assert stub.counters['requests'] == 1
+    assert 'source' not in first
+    assert second['source'] == 'catalog'
+    assert {r['id'] for r in second['results']} == {r['id'] for r in first['results']}
+    assert set(grid['results'][0]) == {'id', 'title'}
+    assert synthetic_recipe(second['results'][0]['id'])['title'] == second['results'][0]['title']
+
+
+def test_offline_first_search_never_fetched_goes_upstream(tmp_path):
+    """Matching text in the catalog is not enough: the query itself must have been fetched."""
+    with StubServer() as stub:
+        client = SpoonacularClient(base_url=stub.base_url, enable_cache=False, enable_throttle=False,
+                                   batch_window=0, catalog=RecipeCatalog(str(tmp_path / 'c.db')))
+        client.search_recipes('pasta', number=10, offline_first=True)
+        assert client.catalog.search('cheese pasta', number=1)[1] >= 1
+        overlapping = client.search_recipes('cheese pasta', number=1, offline_first=True)
+
+    assert stub.counters['requests'] == 2
+    assert 'source' not in overlapping
+    assert client.catalog.stats()['local_misses'] == 2
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test script for slotted recipe records and the JSON backend
+"""
+
+import os
+import sys
+import json
+import dataclasses
+
+import pytest
+from flask import Flask, jsonify
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import json_backend
+from data_parser import (parse_recipe_details, parse_recipe_record, parse_recipe_search_results,
+                         parse_recipe_summaries)
+from recipe_models import RecipeDetail, RecipeSummary, Ingredient
+from stub_server import synthetic_recipe
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def backend(request, monkeypatch):
+    """Run a test with each JSON backend."""
+    if request.param == 'orjson':
+        if json_backend.orjson is None:
+            pytest.skip('orjson is not installed')
+    else:
+        monkeypatch.setattr(json_backend, 'orjson', None)
+    return request.param
+
+
+def test_record_matches_parsed_dict():
+    """RecipeDetail holds exactly what parse_recipe_details returns."""
+    payload = synthetic_recipe(123456)
+    record = parse_recipe_record(payload)
+    assert record.to_dict() == parse_recipe_details(payload)
+    assert isinstance(record.ingredients[0], Ingredient)
+
+
+def test_records_are_compact_and_immutable():
+    """Records carry no per-instance __dict__ and cannot be modified."""
+    record = parse_recipe_record(synthetic_recipe(123456))
+    assert not hasattr(record, '__dict__') and not hasattr(record.ingredients[0], '__dict__')
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        record.title = 'changed'
+
+
+def test_json_round_trip(backend):
+    """Records serialize to the parsed-dict JSON and load back equal."""
+    payload = synthetic_recipe(654321)
+    record = parse_recipe_record(payload)
+    assert json.loads(record.to_json()) == parse_recipe_details(payload)
+    assert RecipeDetail.from_json(record.to_json()) == record
+    assert json_backend.loads(json_backend.dumps_bytes([record])) == [record.to_dict()]
+
+
+def test_summaries_from_lean_results(backend):
+    """Fields a lean result lacks are None."""
+    summaries = parse_recipe_summaries({'results': [
+        {'id': 1, 'title': 'Soup', 'image': 'soup.jpg', 'readyInMinutes': 20, 'servings': 2},
+        {'id': 2, 'title': 'Stew'},
+    ]})
+    assert summaries[0].to_dict() == parse_recipe_search_results({'results': [
+        {'id': 1, 'title': 'Soup', 'image': 'soup.jpg', 'readyInMinutes': 20, 'servings': 2}]})[0]
+    assert summaries[1] == RecipeSummary(2, 'Stew')
+    assert summaries[1].to_dict() == parse_recipe_search_results({'results': [{'id': 2, 'title': 'Stew'}]})[0]
+    assert RecipeSummary.from_json(summaries[1].to_json()) == summaries[1]
+
+
+def test_jsonify_records(backend):
+    """Flask responses serialize records through the provider."""
+    app = Flask(__name__)
+    app.json = json_backend.RecordJSONProvider(app)
+    record = parse_recipe_record(synthetic_recipe(111111))
+    with app.app_context():
+        response = jsonify({'success': True, 'recipe': record})
+    assert json.loads(response.get_data()) == {'success': True, 'recipe': record.to_dict()}
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
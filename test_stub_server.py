@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Test script for the local stub server and record/replay transport
+
+The API clients are pointed at an in-process StubServer, so these tests run
+offline and exercise the same request paths production traffic takes.
+"""
+
+import os
+import sys
+import json
+
+import pytest
+import requests
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('SPOONACULAR_API_KEY', 'test-key')
+
+from api_client import SpoonacularClient
+from data_parser import SEARCH_RESULT_FIELDS, parse_recipe_search_results
+from news_parser import NewsParser, POPULAR_ARTICLES_STALE_WINDOWS
+from record_replay import FixtureStore, fixture_key
+from response_cache import TieredCache
+from stub_server import StubServer, synthetic_recipe
+
+
+@pytest.fixture
+def stub():
+    """Start a stub server on a free port."""
+    with StubServer() as server:
+        yield server
+
+
+def make_client(base_url, **kwargs):
+    kwargs.setdefault('enable_cache', False)
+    kwargs.setdefault('enable_throttle', False)
+    kwargs.setdefault('batch_window', 0)
+    kwargs.setdefault('enable_catalog', False)
+    return SpoonacularClient(base_url=base_url, backoff_factor=0.01, **kwargs)
+
+
+def test_synthetic_recipes_are_deterministic():
+    """The same id always produces the same recipe."""
+    assert synthetic_recipe(716429) == synthetic_recipe(716429)
+    assert synthetic_recipe(716429)['title'] != synthetic_recipe(716430)['title']
+
+
+def test_client_against_stub(stub):
+    """Every client endpoint gets a well-formed response from the stub."""
+    with make_client(stub.base_url) as client:
+        search = client.search_recipes('pasta', number=3, diet='vegetarian')
+        assert 0 < len(search['results']) <= 3
+        for result in search['results']:
+            assert 'pasta' in (result['title'] + str(result.get('missedIngredients'))).lower()
+            assert result['vegetarian'] is True
+
+        recipe_id = search['results'][0]['id']
+        info = client.get_recipe_information(recipe_id)
+        assert info['id'] == recipe_id
+        assert info['extendedIngredients']
+
+        assert client.get_recipe_nutrition(recipe_id)['nutrients'][0]['name'] == 'Calories'
+        assert client.get_wine_pairing('steak')['pairedWines']
+        assert len(client.get_random_recipes(number=2)['recipes']) == 2
+
+        found = client.search_recipes_by_ingredients(['garlic', 'tomato'], number=5)
+        assert found and all(r['usedIngredientCount'] >= 1 for r in found)
+
+    assert stub.counters['requests'] == 6
+
+
+def test_news_parser_against_stub(stub):
+    """NewsParser search requests are served by the Guardian stand-in."""
+    parser = NewsParser('test-key', base_url=stub.guardian_url)
+    articles = parser.fetch_food_news('recipe', page_size=4)
+    assert len(articles) == 4
+    assert all(article['title'] for article in articles)
+
+
+def test_guardian_content_lookup(stub):
+    """Single articles can be fetched by their id."""
+    search = requests.get(f"{stub.guardian_url}/search", params={'page-size': 1}).json()
+    article_id = search['response']['results'][0]['id']
+    content = requests.get(f"{stub.guardian_url}/{article_id}", params={'show-fields': 'body'}).json()
+    assert content['response']['content']['id'] == article_id
+    assert content['response']['content']['fields']['body'].startswith('<p>')
+
+
+def test_injected_rate_limit():
+    """Requests beyond the rate limit get 429 with Retry-After."""
+    with StubServer(rate_limit=2) as stub:
+        session = requests.Session()
+        responses = [session.get(f"{stub.base_url}/food/wine/pairing", params={'food': 'fish'})
+                     for _ in range(4)]
+        limited = [r for r in responses if r.status_code == 429]
+        assert limited and limited[0].headers['Retry-After'] == '1'
+        assert stub.counters['rate_limited'] >= 1
+
+
+def test_injected_errors():
+    """An error rate of 1 turns every request into a 500."""
+    with StubServer(error_rate=1.0) as stub:
+        with make_client(stub.base_url, max_retries=1) as client:
+            with pytest.raises(requests.exceptions.HTTPError):
+                client.get_wine_pairing('fish')
+        assert stub.counters['errors_injected'] == 2
+
+
+def test_record_then_replay(stub, tmp_path, monkeypatch):
+    """Recorded responses replay offline with no API key in the fixtures."""
+    monkeypatch.setenv('SPOONACULAR_FIXTURES_DIR', str(tmp_path))
+    with make_client(stub.base_url, transport='record') as recorder:
+        recorded = recorder.get_recipe_information(716429)
+
+    fixtures = [path.read_text() for path in tmp_path.iterdir()]
+    assert len(fixtures) == 1
+    assert 'test-key' not in fixtures[0]
+
+    with make_client('http://127.0.0.1:9', transport='replay', max_retries=0) as replayer:
+        assert replayer.get_recipe_information(716429) == recorded
+        with pytest.raises(requests.exceptions.ConnectionError):
+            replayer.get_recipe_information(1)
+
+
+def test_stub_serves_recorded_fixtures(tmp_path):
+    """The stub prefers a recorded fixture over synthetic data."""
+    store = FixtureStore(str(tmp_path))
+    store.save(fixture_key('GET', '/food/wine/pairing?food=steak&apiKey=secret'), 200,
+               {'Content-Type': 'application/json'}, '{"pairedWines": ["recorded"]}', 5.0)
+    with StubServer(fixtures_dir=str(tmp_path)) as server:
+        with make_client(server.base_url) as client:
+            assert client.get_wine_pairing('steak') == {'pairedWines': ['recorded']}
+        assert server.counters['fixture_hits'] == 1
+
+
+def test_popular_articles_stale_while_revalidate(stub):
+    """Cached popular articles are served stale, refreshed, and kept on upstream errors."""
+    parser = NewsParser('test-key', base_url=stub.guardian_url, cache=TieredCache())
+    key = f"guardian:{parser.search_url}?q=recipes&order-by=newest&page-size=3"
+    parser.revalidator.cache.set(key, [{'title': 'Old news'}], ttl=-1, stale_ttl=3600)
+
+    assert parser.fetch_popular_recipe_articles(page_size=3) == [{'title': 'Old news'}]
+    parser.revalidator.wait()
+    fresh = parser.fetch_popular_recipe_articles(page_size=3)
+    assert len(fresh) == 3 and fresh[0]['title'] != 'Old news'
+
+    failing = NewsParser('test-key', base_url='http://127.0.0.1:9', cache=TieredCache())
+    stale_while_revalidate, stale_if_error = POPULAR_ARTICLES_STALE_WINDOWS
+    failing.revalidator.cache.set(f"guardian:{failing.search_url}?q=recipes&order-by=newest&page-size=3",
+                                  [{'title': 'Kept'}], ttl=-(stale_while_revalidate + 60), stale_ttl=stale_if_error)
+    assert failing.fetch_popular_recipe_articles(page_size=3) == [{'title': 'Kept'}]
+    assert failing.fetch_popular_recipe_articles(page_size=4) == []
+
+
+def test_search_then_details_against_stub(stub):
+    """Default stub search results lack only the instructions, fetched on the click."""
+    with make_client(stub.base_url, cache=TieredCache(), enable_cache=True) as client:
+        result = client.search_recipes('chicken', number=2)['results'][0]
+        details = client.get_recipe_details(result['id'])
+        assert client.get_harvest_stats()['partial_hits'] == 1
+    assert stub.counters['requests'] == 2
+    assert details['extendedIngredients'] and details['analyzedInstructions']
+
+
+def test_search_route_then_recipe_route_cost_one_call(stub, monkeypatch):
+    """Through the Flask routes, a search followed by a click on a result makes one upstream call."""
+    import api_client
+    from app import create_app
+
+    monkeypatch.delenv('GUARDIAN_API_KEY', raising=False)
+    client = make_client(stub.base_url, cache=TieredCache(), enable_cache=True)
+    monkeypatch.setattr(api_client, '_shared_client', client)
+    app = create_app()
+
+    with app.test_client() as browser:
+        search = browser.post('/search', data={'query': 'chicken'}).get_json()
+        assert search['success'] and search['recipes']
+        page = browser.get(f"/recipe/{search['recipes'][0]['id']}")
+
+    assert page.status_code == 200
+    assert search['recipes'][0]['title'].encode() in page.data
+    assert stub.counters['requests'] == 1
+    assert client.get_harvest_stats()['complete_hits'] == 1
+
+
+def test_lean_search_is_cheaper_against_stub(stub):
+    """The grid-only projection costs fewer points and fewer bytes than a full search."""
+    with make_client(stub.base_url) as client:
+        full = client.search_recipes('pasta', number=12)
+        full_points = stub.points_used
+        lean = client.search_recipes('pasta', number=12, fields=SEARCH_RESULT_FIELDS)
+        lean_points = stub.points_used - full_points
+
+    assert lean_points < full_points
+    assert len(json.dumps(lean)) < len(json.dumps(full)) / 3
+    parsed = parse_recipe_search_results(lean)
+    assert set(parsed[0]) == {'id', 'title', 'image', 'ready_in_minutes', 'servings'}
+    assert None not in parsed[0].values()
+    assert parse_recipe_search_results(lean, fields=['id', 'title'])[0] == {
+        'id': parsed[0]['id'], 'title': parsed[0]['title']}
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))
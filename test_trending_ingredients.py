@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming trending-ingredient detection over the article store
+"""
+
+import os
+import sys
+import time
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault('SPOONACULAR_API_KEY', 'test-key')
+
+from article_store import ArticleStore
+from news_parser import ArticleIngestor, NewsParser
+from response_cache import TieredCache
+from stub_server import StubServer
+from trending_ingredients import SpaceSaving, TrendingIngredients
+
+DAY = 24 * 60 * 60
+
+
+def days_ago(days):
+    return datetime.fromtimestamp(time.time() - days * DAY, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def article(index, title, preview='', published_at=None):
+    return {'id': f'food/2024/jan/01/article-{index}', 'title': title, 'url': f'https://example.com/{index}',
+            'preview': preview, 'thumbnail': None, 'published_at': published_at or days_ago(1)}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArticleStore(str(tmp_path / 'articles.db'))
+
+
+def test_space_saving_bounds_counts():
+    """Heavy hitters survive a long tail; every count is within its error of the truth."""
+    rng = random.Random(0)
+    stream = ['garlic'] * 300 + ['lemon'] * 200 + ['basil'] * 100 + [f'tail-{i}' for i in range(2000)]
+    rng.shuffle(stream)
+    sketch = SpaceSaving(capacity=20, half_life=1e12, landmark=0.0)
+    for item in stream:
+        sketch.add(item, 0.0)
+    assert len(sketch) == 20 and sketch.evictions > 0
+    top = sketch.top(3, 0.0)
+    assert [item for item, _, _ in top] == ['garlic', 'lemon', 'basil']
+    for item, count, error in top:
+        assert count - error <= stream.count(item) <= count
+    assert sketch.total(0.0) == pytest.approx(len(stream))
+
+
+def test_space_saving_decay_and_rebase():
+    """Counts halve every half-life; rebasing the landmark keeps them unchanged."""
+    sketch = SpaceSaving(capacity=4, half_life=DAY, landmark=0.0)
+    sketch.add('kale', 0.0)
+    sketch.add('kale', 0.0)
+    sketch.add('leek', 2 * DAY)
+    assert dict((item, count) for item, count, _ in sketch.top(2, 2 * DAY)) == pytest.approx(
+        {'kale': 0.5, 'leek': 1.0})
+    sketch.add('leek', 600 * DAY)  # past the rebase threshold
+    assert sketch.top(1, 600 * DAY)[0][1] == pytest.approx(1.0)
+    assert sketch.top(2, 600 * DAY)[1][0] == 'kale'
+    with pytest.raises(ValueError):
+        SpaceSaving(capacity=0)
+
+
+def test_snapshots_follow_the_store(store):
+    """Each update counts only new articles; recent articles outweigh old ones."""
+    trending = TrendingIngredients(store, half_life=DAY)
+    store.upsert([article(i, 'Rhubarb crumble', published_at=days_ago(4)) for i in range(5)])
+    store.upsert([article(10 + i, 'Garlic prawns', 'with chillies', published_at=days_ago(0.5))
+                  for i in range(2)])
+    first = trending.update()
+    assert first['articles'] == 7
+    assert [entry['ingredient'] for entry in first['top']][:2] in (['chilli', 'garlic'], ['garlic', 'chilli'])
+    assert trending.trending(3) == [entry['ingredient'] for entry in first['top'][:3]]
+
+    store.upsert([article(20, 'Rhubarb and ginger', published_at=days_ago(0.5))])
+    second = trending.update()
+    assert second['articles'] == 1
+    scores = {entry['ingredient']: entry for entry in second['top']}
+    assert scores['ginger']['change'] > 0 and scores['rhubarb']['change'] > 0
+    assert trending.update()['articles'] == 0
+    stats = trending.stats()
+    assert (stats['updates'], stats['articles'], stats['snapshots']) == (3, 8, 3)
+    assert len(trending.snapshots()) == 3
+
+
+def test_ingestion_snapshots_trending_ingredients(store):
+    """Every ingestion run takes a snapshot; the parser reads it without upstream calls."""
+    with StubServer() as stub:
+        parser = NewsParser('test-key', base_url=stub.guardian_url, cache=TieredCache(), store=store)
+        assert parser.parse_trending_ingredients() == []  # empty store
+        ingestor = ArticleIngestor(parser, store, query='recipe', page_size=50, backfill_days=3,
+                                   trending=parser.trending)
+        ingestor.run_once()
+        requests_before = stub.counters['requests']
+        trending = parser.parse_trending_ingredients(limit=5)
+        assert len(trending) == 5 and stub.counters['requests'] == requests_before
+        assert parser.trending.stats()['articles'] == store.stats()['articles']
+
+    articles = [article(i, 'Miso aubergine', 'with sesame') for i in range(3)] + [article(9, 'Plain toast')]
+    assert set(parser.parse_trending_ingredients(articles, limit=3)) == {'miso', 'aubergine', 'sesame'}
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, '-q']))